@@ -12,7 +12,7 @@ from backend.models import (  # noqa: F401,E402
     MemoryObservation,
     MemoryRelation,
 )
-from backend.models import Base  # noqa: F401,E402
+from backend.models import Base, load_all_models  # noqa: F401,E402
 from alembic import context  # noqa: E402
 from sqlalchemy import engine_from_config  # noqa: F401,E402
 from logging.config import fileConfig  # noqa: E402
@@ -26,6 +26,9 @@ config = context.config
 if config.config_file_name is not None:
     fileConfig(config.config_file_name)
 
+# Lazily loaded models must be registered before autogenerate runs.
+load_all_models()
+
 # add your model's MetaData object here
 # for 'autogenerate' support
 target_metadata = Base.metadata  # Adjusted target_metadata
@@ -0,0 +1,42 @@
+"""add memory passages
+
+Revision ID: memory_passages
+Revises: phase1_enhancements
+Create Date: 2025-07-01 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'memory_passages'
+down_revision = 'phase1_enhancements'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'memory_passages',
+        sa.Column('id', sa.String(36), primary_key=True),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=False),
+        sa.Column(
+            'entity_id', sa.String(36),
+            sa.ForeignKey('memory_entities.id', ondelete='CASCADE'), nullable=False,
+        ),
+        sa.Column('ordinal', sa.Integer(), nullable=False),
+        sa.Column('heading', sa.String(255), nullable=True),
+        sa.Column('start_offset', sa.Integer(), nullable=False),
+        sa.Column('end_offset', sa.Integer(), nullable=False),
+        sa.Column('content', sa.Text(), nullable=False),
+    )
+    op.create_index(
+        'idx_memory_passages_entity_ordinal', 'memory_passages',
+        ['entity_id', 'ordinal'], unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('idx_memory_passages_entity_ordinal', table_name='memory_passages')
+    op.drop_table('memory_passages')
@@ -0,0 +1,59 @@
+"""add task leases
+
+Revision ID: task_leases
+Revises: memory_passages
+Create Date: 2025-07-15 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'task_leases'
+down_revision = 'memory_passages'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    with op.batch_alter_table('tasks') as batch_op:
+        batch_op.add_column(sa.Column(
+            'priority_rank', sa.SmallInteger(), nullable=False, server_default='2'
+        ))
+        batch_op.add_column(sa.Column('lease_owner', sa.String(255), nullable=True))
+        batch_op.add_column(sa.Column('lease_expires_at', sa.DateTime(), nullable=True))
+    op.execute(
+        "UPDATE tasks SET priority_rank = CASE lower(priority) "
+        "WHEN 'critical' THEN 0 WHEN 'high' THEN 1 WHEN 'low' THEN 3 ELSE 2 END"
+    )
+    op.create_index(
+        'ix_tasks_claim', 'tasks', ['status', 'priority_rank', 'created_at'],
+        unique=False,
+    )
+    op.create_index(
+        'ix_tasks_lease_expires_at', 'tasks', ['lease_expires_at'], unique=False
+    )
+    op.create_table(
+        'task_capability_requirements',
+        sa.Column('project_id', sa.String(36), nullable=False),
+        sa.Column('task_number', sa.Integer(), nullable=False),
+        sa.Column('capability', sa.String(255), nullable=False),
+        sa.PrimaryKeyConstraint(
+            'project_id', 'task_number', 'capability',
+            name='pk_task_capability_requirements',
+        ),
+        sa.ForeignKeyConstraint(
+            ['project_id', 'task_number'], ['tasks.project_id', 'tasks.task_number'],
+            ondelete='CASCADE'
+        ),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('task_capability_requirements')
+    op.drop_index('ix_tasks_lease_expires_at', table_name='tasks')
+    op.drop_index('ix_tasks_claim', table_name='tasks')
+    with op.batch_alter_table('tasks') as batch_op:
+        batch_op.drop_column('lease_expires_at')
+        batch_op.drop_column('lease_owner')
+        batch_op.drop_column('priority_rank')
@@ -0,0 +1,25 @@
+"""add task transition project index
+
+Revision ID: task_transition_project_index
+Revises: task_leases
+Create Date: 2025-07-20 00:00:00.000000
+
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = 'task_transition_project_index'
+down_revision = 'task_leases'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        'idx_task_status_project_time', 'task_status_transitions',
+        ['task_project_id', 'transitioned_at'], unique=False
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('idx_task_status_project_time', table_name='task_status_transitions')
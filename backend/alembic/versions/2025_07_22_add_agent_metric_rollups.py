@@ -0,0 +1,43 @@
+"""add agent metric rollups
+
+Revision ID: agent_metric_rollups
+Revises: task_transition_project_index
+Create Date: 2025-07-22 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'agent_metric_rollups'
+down_revision = 'task_transition_project_index'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    with op.batch_alter_table('agent_performance_metrics') as batch_op:
+        batch_op.add_column(sa.Column('metric_period', sa.String(10), nullable=True))
+        batch_op.add_column(sa.Column(
+            'metric_total', sa.Numeric(20, 4), nullable=False, server_default='0'
+        ))
+    op.create_index(
+        'uq_agent_performance_window', 'agent_performance_metrics',
+        ['agent_id', 'metric_period', 'metric_type', 'metric_period_start'],
+        unique=True,
+    )
+    op.create_table(
+        'metric_rollup_watermarks',
+        sa.Column('name', sa.String(50), nullable=False),
+        sa.Column('processed_until', sa.DateTime(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint('name'),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('metric_rollup_watermarks')
+    op.drop_index('uq_agent_performance_window', table_name='agent_performance_metrics')
+    with op.batch_alter_table('agent_performance_metrics') as batch_op:
+        batch_op.drop_column('metric_total')
+        batch_op.drop_column('metric_period')
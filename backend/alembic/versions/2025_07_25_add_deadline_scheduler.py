@@ -0,0 +1,34 @@
+"""add deadline scheduler indexes and worker leases
+
+Revision ID: deadline_scheduler
+Revises: agent_metric_rollups
+Create Date: 2025-07-25 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'deadline_scheduler'
+down_revision = 'agent_metric_rollups'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_tasks_due_date', 'tasks', ['due_date'])
+    op.create_index('idx_file_assets_expires_at', 'file_assets', ['expires_at'])
+    op.create_table(
+        'worker_leases',
+        sa.Column('name', sa.String(50), nullable=False),
+        sa.Column('owner', sa.String(255), nullable=False),
+        sa.Column('expires_at', sa.DateTime(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint('name'),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('worker_leases')
+    op.drop_index('idx_file_assets_expires_at', table_name='file_assets')
+    op.drop_index('ix_tasks_due_date', table_name='tasks')
@@ -0,0 +1,32 @@
+"""add workflow execution commands
+
+Revision ID: workflow_execution_commands
+Revises: deadline_scheduler
+Create Date: 2025-07-26 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'workflow_execution_commands'
+down_revision = 'deadline_scheduler'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'workflow_execution_commands',
+        sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('execution_id', sa.String(36), nullable=False),
+        sa.Column('outcome', sa.String(20), nullable=False),
+        sa.Column('output', sa.Text(), nullable=True),
+        sa.Column('error', sa.Text(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('workflow_execution_commands')
@@ -0,0 +1,284 @@
+"""
+Application factory.
+
+``create_app(profile=...)`` builds the API with only the feature sets a
+deployment needs. Router packages are imported when their feature is
+enabled, so a ``core`` process never pays for the memory, rules or MCP
+stacks, and ``fastapi_mcp`` is only imported when the MCP server is mounted.
+
+Per-feature import times are kept on ``app.state.import_timings`` and logged
+at startup; ``python -m backend.benchmarks.startup`` compares profiles.
+
+The factory is safe to run under several workers (``uvicorn --factory
+--workers N`` or gunicorn with ``UvicornWorker``): table creation is
+serialized with a cross-process lock and counters live in
+:mod:`backend.core.shared_state`.
+"""
+import asyncio
+import importlib
+import logging
+import os
+import sys
+import time
+from contextlib import asynccontextmanager
+from typing import Dict, Iterable, NamedTuple, Optional, Tuple
+
+from fastapi import FastAPI
+from fastapi.middleware.cors import CORSMiddleware
+
+from backend.core.responses import setup_response_layer
+
+logger = logging.getLogger(__name__)
+
+API_VERSION = "2.1.0"
+API_PREFIX = "/api/v1"
+
+
+class Feature(NamedTuple):
+    """A router package and where to mount it."""
+    module: str
+    prefix: str
+    tags: Tuple[str, ...] = ()
+
+
+FEATURES: Dict[str, Feature] = {
+    "projects": Feature(
+        "backend.routers.projects", f"{API_PREFIX}/projects", ("projects",)
+    ),
+    "tasks": Feature("backend.routers.tasks", f"{API_PREFIX}/projects", ("tasks",)),
+    "comments": Feature("backend.routers.comments", API_PREFIX),
+    "agents": Feature("backend.routers.agents", API_PREFIX),
+    "memory": Feature("backend.routers.memory", f"{API_PREFIX}/memory", ("memory",)),
+    "rules": Feature("backend.routers.rules", f"{API_PREFIX}/rules", ("rules",)),
+    "workflows": Feature("backend.routers.workflows", API_PREFIX),
+    "project_templates": Feature("backend.routers.project_templates", API_PREFIX),
+    "audit_logs": Feature(
+        "backend.routers.audit_logs", f"{API_PREFIX}/audit-logs", ("audit-logs",)
+    ),
+    "mcp": Feature("backend.routers.mcp", API_PREFIX),
+}
+
+# Features that are not routers: "metrics" exposes Prometheus metrics at
+# /metrics and "mcp_server" mounts the fastapi_mcp server at /mcp.
+SPECIAL_FEATURES = ("metrics", "mcp_server")
+CORE_FEATURES = ("projects", "tasks", "comments", "agents")
+PROFILES: Dict[str, Tuple[str, ...]] = {
+    "minimal": (),
+    "core": CORE_FEATURES + ("metrics",),
+    "mcp": CORE_FEATURES + ("memory", "mcp", "metrics", "mcp_server"),
+    "full": tuple(FEATURES) + SPECIAL_FEATURES,
+}
+DEFAULT_PROFILE = "full"
+
+
+class BackgroundService(NamedTuple):
+    """A periodic task started by ``lifespan`` and the features that need it."""
+    module: str
+    attribute: str
+    features: Tuple[str, ...]
+    setting: Optional[str] = None
+
+
+# Imported and started only when one of ``features`` is enabled (and, with a
+# ``setting``, only while that settings flag is on); stopped in reverse order.
+BACKGROUND_SERVICES = (
+    BackgroundService(
+        "backend.core.counters", "counters", ("projects", "memory", "mcp")
+    ),
+    BackgroundService(
+        "backend.services.agent_metrics_service", "agent_metrics_rollup",
+        ("agents", "mcp"),
+    ),
+    BackgroundService(
+        "backend.services.workflow_runner", "workflow_runner", ("workflows", "mcp"),
+        "workflow_runner",
+    ),
+    BackgroundService(
+        "backend.services.deadline_scheduler", "deadline_scheduler", ("tasks",),
+        "deadline_scheduler",
+    ),
+)
+
+
+def resolve_features(profile: str, extra: Iterable[str] = ()) -> Tuple[str, ...]:
+    """Return the ordered feature names for ``profile`` plus ``extra``."""
+    if profile not in PROFILES:
+        raise ValueError(
+            f"Unknown profile '{profile}'. Choose from: {', '.join(PROFILES)}"
+        )
+    features = list(PROFILES[profile])
+    for name in extra:
+        if name not in FEATURES and name not in SPECIAL_FEATURES:
+            raise ValueError(f"Unknown feature '{name}'")
+        if name not in features:
+            features.append(name)
+    return tuple(features)
+
+
+def background_services(features: Iterable[str]) -> Tuple[BackgroundService, ...]:
+    """Return the background services needed by ``features``."""
+    enabled = set(features)
+    return tuple(
+        service for service in BACKGROUND_SERVICES
+        if enabled.intersection(service.features)
+    )
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Create missing tables on startup and dispose of the engine on shutdown.
+
+    Table creation runs under a cross-process lock so concurrent workers do
+    not race on ``create_all``. With a shared state backend, a background
+    task picks up cache invalidations made by other workers. The OpenAPI
+    document and tool catalogue are built before serving. Buffered
+    access counters are flushed periodically and once more on shutdown, and
+    the semantic index, if it was built, is saved for the next start.
+    Agent performance metrics are rolled up periodically. Workers running
+    workflows compete for the runner lease; its holder resumes open
+    executions and writes their state periodically and on shutdown. One
+    worker at a time runs the deadline scheduler. Each of these is imported
+    and started only when the profile has a feature that needs it (see
+    :data:`BACKGROUND_SERVICES`). Logging goes through the queue-backed
+    pipeline while the app runs.
+    """
+    from backend.config.app_config import settings
+    from backend.core.catalogue import catalogue_for
+    from backend.core.shared_state import get_shared_state, startup_lock
+    from backend.core.structured_logging import start_logging, stop_logging
+    from backend.database import engine, init_db
+
+    if settings.log_pipeline:
+        start_logging()
+
+    if app.state.init_db:
+        try:
+            with startup_lock("init_db"):
+                await init_db()
+        except Exception as e:
+            logger.warning(f"Database initialization failed: {e}")
+    try:
+        catalogue_for(app)
+    except Exception as e:
+        logger.warning(f"Could not build the tool catalogue: {e}")
+    shared_state = get_shared_state()
+    poller = None
+    if shared_state.backend.name != "local":
+        poller = asyncio.create_task(shared_state.run_invalidation_poller())
+    services = []
+    for service in background_services(app.state.features):
+        if service.setting is None or getattr(settings, service.setting):
+            module = importlib.import_module(service.module)
+            services.append(getattr(module, service.attribute))
+            services[-1].start()
+    logger.info(
+        "Started profile '%s' (pid %s) with features: %s",
+        app.state.profile, os.getpid(), ", ".join(app.state.features) or "none",
+    )
+    yield
+    for running in reversed(services):
+        await running.stop()
+    semantic = sys.modules.get("backend.services.semantic_search_service")
+    if semantic is not None:
+        try:
+            semantic.semantic_index.save()
+        except Exception as e:
+            logger.warning(f"Could not save semantic index: {e}")
+    if poller is not None:
+        poller.cancel()
+    await shared_state.close()
+    await engine.dispose()
+    stop_logging()
+
+
+def _mount_feature(app: FastAPI, name: str) -> None:
+    started = time.perf_counter()
+    if name == "metrics":
+        from backend.metrics import setup_metrics
+
+        setup_metrics(app)
+    elif name == "mcp_server":
+        from backend.mcp_config import create_mcp_server
+
+        mcp = create_mcp_server(app)
+        if mcp is not None:
+            mcp.mount()
+        else:
+            logger.warning("MCP server not available; skipping /mcp mount")
+    else:
+        feature = FEATURES[name]
+        module = importlib.import_module(feature.module)
+        app.include_router(
+            module.router, prefix=feature.prefix, tags=list(feature.tags) or None
+        )
+    app.state.import_timings[name] = round((time.perf_counter() - started) * 1000, 2)
+
+
+def create_app(
+    profile: Optional[str] = None,
+    features: Iterable[str] = (),
+    init_db: bool = True,
+) -> FastAPI:
+    """Build the FastAPI application for ``profile``.
+
+    ``profile`` defaults to the ``APP_PROFILE`` environment variable, then
+    ``"full"``. ``features`` adds individual feature sets on top of the
+    profile. Set ``init_db=False`` to skip table creation at startup (e.g.
+    when migrations are managed by Alembic).
+    """
+    profile = profile or os.getenv("APP_PROFILE", DEFAULT_PROFILE)
+    enabled = resolve_features(profile, features)
+
+    app = FastAPI(
+        title="Task Manager API",
+        description="A comprehensive task management system with MCP integration",
+        version=API_VERSION,
+        lifespan=lifespan,
+    )
+    app.state.profile = profile
+    app.state.features = enabled
+    app.state.init_db = init_db
+    app.state.import_timings = {}
+
+    # orjson responses and negotiated compression
+    setup_response_layer(app)
+
+    app.add_middleware(
+        CORSMiddleware,
+        allow_origins=os.getenv(
+            "CORS_ORIGINS", "http://localhost:3000,http://127.0.0.1:3000"
+        ).split(","),
+        allow_credentials=True,
+        allow_methods=["*"],
+        allow_headers=["*"],
+    )
+
+    # Request IDs, timing, security headers and (with "metrics") Prometheus
+    # metrics, in one pure-ASGI pass outside everything else.
+    from backend.middleware.request_middleware import RequestMiddleware
+
+    app.add_middleware(RequestMiddleware, metrics="metrics" in enabled)
+
+    @app.get("/", operation_id="get_root")
+    async def root():
+        return {
+            "message": "Task Manager API", "version": API_VERSION, "profile": profile
+        }
+
+    @app.get("/health", operation_id="health_check")
+    async def health_check():
+        return {"status": "healthy", "version": API_VERSION, "profile": profile}
+
+    # The MCP server introspects routes, so it is mounted last.
+    for name in sorted(enabled, key=lambda feature: feature == "mcp_server"):
+        try:
+            _mount_feature(app, name)
+        except ImportError as e:
+            logger.warning(f"Feature '{name}' not available: {e}")
+
+    from backend.core.catalogue import serve_openapi
+
+    serve_openapi(app)
+
+    logger.debug("Feature import timings (ms): %s", app.state.import_timings)
+    return app
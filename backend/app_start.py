@@ -24,10 +24,14 @@ import uvicorn
 try:
     from backend.database import get_db, engine, Base
     from backend.config.app_config import settings
+    from backend.core.responses import setup_response_layer
+    from backend.core.counters import counters
 except ImportError:
     # Fallback to relative imports
     import database
     from database import get_db, engine, Base
+    from core.responses import setup_response_layer
+    from core.counters import counters
     try:
         from config.app_config import settings
     except ImportError:
@@ -58,9 +62,12 @@ async def lifespan(app: FastAPI):
     print(f"API Version: 2.0.1")
     print("="*60 + "\n")
     
+    # Buffered access counters are flushed periodically and on shutdown
+    counters.start()
     yield
     
     logger.info("🛑 Shutting down Task Manager API...")
+    await counters.stop()
 
 def create_app() -> FastAPI:
     """Create and configure FastAPI application"""
@@ -71,6 +78,9 @@ def create_app() -> FastAPI:
         lifespan=lifespan,
     )
     
+    # orjson responses and negotiated compression
+    setup_response_layer(app)
+    
     # Add CORS middleware
     app.add_middleware(
         CORSMiddleware,
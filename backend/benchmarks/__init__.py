@@ -0,0 +1,4 @@
+"""Performance benchmarks.
+
+Run individual modules with ``python -m backend.benchmarks.<name>``.
+"""
@@ -0,0 +1,157 @@
+"""
+Agent performance metrics benchmark.
+
+Seeds 90 days of completions and tool executions for a set of agents, then
+compares an agent dashboard read that aggregates the raw rows on every view
+against reading the rolled-up ``agent_performance_metrics``, and a full
+backfill against the incremental rollup of the last five minutes of rows.
+
+Usage::
+
+    python -m backend.benchmarks.agent_metrics --agents 20 --rows 200000
+"""
+import argparse
+import asyncio
+import os
+import random
+import statistics
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+from sqlalchemy import case, func, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+from backend.benchmarks.common import print_table
+from backend.database import Base
+from backend.enums import TaskStatusEnum
+from backend.services.agent_metrics_service import (
+    DONE_STATUSES, EXECUTIONS, HANDOFFS, METRICS_TABLE, TRANSITIONS, WATERMARKS,
+    AgentMetricsService, rollup,
+)
+
+END = datetime(2025, 7, 7)
+START = END - timedelta(days=90)
+
+
+def rows(count: int, agents: int, start: datetime, end: datetime, seed: int):
+    rng = random.Random(seed)
+    span = (end - start).total_seconds()
+    transitions, executions = [], []
+    for n in range(count):
+        agent = f"agent-{rng.randrange(agents)}"
+        at = start + timedelta(seconds=rng.uniform(0, span))
+        if n % 2:
+            transitions.append({
+                "task_project_id": "p1", "task_task_number": n,
+                "from_status": TaskStatusEnum.IN_PROGRESS,
+                "to_status": TaskStatusEnum.COMPLETED, "agent_id": agent,
+                "automated": False, "requires_approval": False, "transitioned_at": at,
+                "duration_seconds": rng.randrange(60, 7200),
+            })
+        else:
+            executions.append({
+                "tool_name": "claim_task_tool", "agent_id": agent,
+                "execution_id": f"{seed}-{n}",
+                "execution_status": "error" if rng.random() < 0.05 else "success",
+                "execution_time_ms": 5, "retry_count": 0, "executed_at": at,
+            })
+    return transitions, executions
+
+
+async def seed(engine, transitions, executions) -> None:
+    async with engine.begin() as conn:
+        for table, batch in ((TRANSITIONS, transitions), (EXECUTIONS, executions)):
+            for offset in range(0, len(batch), 20000):
+                await conn.execute(insert(table), batch[offset:offset + 20000])
+
+
+async def raw_dashboard(db: AsyncSession, agent_id: str) -> int:
+    """Daily completions, mean duration and error rate straight from the source rows."""
+    day = func.date(TRANSITIONS.c.transitioned_at)
+    completions = (await db.execute(
+        select(day, func.count(), func.avg(TRANSITIONS.c.duration_seconds))
+        .where(
+            TRANSITIONS.c.agent_id == agent_id,
+            TRANSITIONS.c.to_status.in_(DONE_STATUSES),
+        )
+        .group_by(day)
+    )).all()
+    day = func.date(EXECUTIONS.c.executed_at)
+    errors = (await db.execute(
+        select(day, func.avg(
+            case((EXECUTIONS.c.execution_status != "success", 1.0), else_=0.0)
+        ))
+        .where(EXECUTIONS.c.agent_id == agent_id)
+        .group_by(day)
+    )).all()
+    return len(completions) + len(errors)
+
+
+async def timed(case_fn, repeat: int = 5) -> float:
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        await case_fn()
+        samples.append((time.perf_counter() - started) * 1000)
+    return round(statistics.median(samples), 3)
+
+
+async def run(agents: int, count: int) -> list:
+    results = []
+    with tempfile.TemporaryDirectory() as workdir:
+        engine = create_async_engine(
+            f"sqlite+aiosqlite:///{os.path.join(workdir, 'bench.db')}"
+        )
+        async with engine.begin() as conn:
+            await conn.run_sync(
+                Base.metadata.create_all,
+                tables=[TRANSITIONS, HANDOFFS, EXECUTIONS, METRICS_TABLE, WATERMARKS]
+            )
+        await seed(engine, *rows(count, agents, START, END, seed=1))
+        async with AsyncSession(engine) as db:
+            started = time.perf_counter()
+            backfill = await rollup(db, now=END, lag_seconds=0)
+            results.append({
+                "case": "rollup_full_backfill",
+                "ms": round((time.perf_counter() - started) * 1000, 1),
+                "windows": backfill["windows"],
+            })
+            recent = rows(
+                max(count // (90 * 288), 1), agents, END, END + timedelta(minutes=5),
+                seed=2,
+            )
+            await seed(engine, *recent)
+            started = time.perf_counter()
+            increment = await rollup(db, now=END + timedelta(minutes=5), lag_seconds=0)
+            results.append({
+                "case": "rollup_last_5_minutes",
+                "ms": round((time.perf_counter() - started) * 1000, 1),
+                "windows": increment["windows"],
+            })
+
+            service = AgentMetricsService(db)
+            results.append({
+                "case": "dashboard_raw_aggregation",
+                "ms": await timed(lambda: raw_dashboard(db, "agent-0")),
+            })
+            results.append({
+                "case": "dashboard_rollup_read",
+                "ms": await timed(lambda: service.agent_metrics(
+                    "agent-0", "daily", limit=400
+                )),
+            })
+        await engine.dispose()
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--agents", type=int, default=20)
+    parser.add_argument("--rows", type=int, default=200000)
+    args = parser.parse_args()
+    print_table(asyncio.run(run(args.agents, args.rows)), ["case", "ms", "windows"])
+
+
+if __name__ == "__main__":
+    main()
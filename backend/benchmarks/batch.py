@@ -0,0 +1,113 @@
+"""
+MCP batch endpoint benchmark.
+
+Compares creating N memory entities the way an agent does today — one tool call
+each, every call with its own session and commit — against one
+:class:`BatchRunner` run, atomic and with per-step savepoints, plus a run of
+independent reads dispatched concurrently versus in order.
+
+Usage::
+
+    python -m backend.benchmarks.batch --steps 100
+"""
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+
+from fastapi import APIRouter, Depends
+from fastapi.routing import APIRoute
+from pydantic import BaseModel
+from sqlalchemy import func, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+from backend import models
+from backend.benchmarks.common import print_table
+from backend.core.responses import ORJSONResponse
+from backend.database import Base
+from backend.routers.mcp.batch import BatchRunner
+from backend.routers.mcp.core import get_db_session
+from backend.schemas.batch import BatchRequest
+
+entities = models.MemoryEntity.__table__
+tools = APIRouter()
+
+
+class EntityIn(BaseModel):
+    name: str
+
+
+@tools.post("/mcp-tools/entity/create", operation_id="add_entity")
+async def add_entity(entity: EntityIn, db: AsyncSession = Depends(get_db_session)):
+    await db.execute(insert(entities).values(entity_type="note", name=entity.name))
+    await db.commit()
+    return ORJSONResponse({"success": True})
+
+
+@tools.get("/mcp-tools/entity/count", operation_id="count_entities")
+async def count_entities(db: AsyncSession = Depends(get_db_session)):
+    await asyncio.sleep(0.002)  # stands in for a slower query or remote lookup
+    return {
+        "count": (await db.execute(select(func.count()).select_from(entities))).scalar()
+    }
+
+
+ROUTES = {route.operation_id: route for route in tools.routes if isinstance(
+    route, APIRoute
+)}
+
+
+async def one_by_one(engine, steps: int) -> None:
+    for n in range(steps):
+        async with AsyncSession(engine) as db:
+            await add_entity(EntityIn(name=f"entity {n}"), db)
+
+
+async def run(steps: int) -> list:
+    results = []
+    with tempfile.TemporaryDirectory() as workdir:
+        engine = create_async_engine(
+            f"sqlite+aiosqlite:///{os.path.join(workdir, 'bench.db')}"
+        )
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all, tables=[entities])
+        runner = BatchRunner(ROUTES, engine)
+        writes = [
+            {"tool": "add_entity", "args": {"name": f"entity {n}"}}
+            for n in range(steps)
+        ]
+        reads = [{"tool": "count_entities"} for _ in range(steps // 10 or 1)]
+
+        cases = [
+            ("separate_calls", lambda: one_by_one(engine, steps)),
+            ("batch_atomic", lambda: runner.run(BatchRequest(steps=writes))),
+            (
+                "batch_savepoint",
+                lambda: runner.run(BatchRequest(steps=writes, mode="savepoint")),
+            ),
+            ("reads_concurrent", lambda: runner.run(BatchRequest(steps=reads))),
+            (
+                "reads_after_write",
+                lambda: runner.run(BatchRequest(steps=writes[:1] + reads)),
+            ),
+        ]
+        for name, case in cases:
+            started = time.perf_counter()
+            await case()
+            results.append({
+                "strategy": name, "ms": round((time.perf_counter() - started) * 1000, 1)
+            })
+        await engine.dispose()
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--steps", type=int, default=100)
+    args = parser.parse_args()
+    print_table(asyncio.run(run(min(args.steps, 100))))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+"""
+OpenAPI and tool catalogue serving benchmark.
+
+Times the full profile's OpenAPI document and MCP tool list served per
+request the old way — FastAPI's cached schema re-encoded with the stdlib
+JSON encoder and gzipped on every hit, and the tool list rebuilt from the
+routes — against the precomputed catalogue, including a 304 revalidation.
+First-build cost is reported separately.
+
+Usage::
+
+    python -m backend.benchmarks.catalogue --repeat 50
+"""
+import argparse
+import gzip
+import json
+import time
+
+from fastapi.routing import APIRoute
+from starlette.requests import Request
+
+from backend.app_factory import create_app
+from backend.benchmarks.common import print_table, time_call
+from backend.core.catalogue import artifact_response, catalogue_for
+
+
+def request(headers: dict) -> Request:
+    raw = [(key.lower().encode(), value.encode()) for key, value in headers.items()]
+    return Request({"type": "http", "method": "GET", "path": "/", "headers": raw})
+
+
+def old_tool_list(app) -> bytes:
+    tools = []
+    for route in app.routes:
+        if isinstance(route, APIRoute) and route.name.startswith("mcp_"):
+            description = (
+                route.description.split("\n")[0]
+                if route.description else "No description"
+            )
+            tools.append({
+                "name": route.name, "path": route.path, "description": description
+            })
+    return json.dumps({"success": True, "tools": tools}).encode()
+
+
+def run(repeat: int) -> list:
+    app = create_app("full", init_db=False)
+    started = time.perf_counter()
+    app.openapi()
+    generate_ms = (time.perf_counter() - started) * 1000
+    started = time.perf_counter()
+    catalogue = catalogue_for(app)
+    build_ms = (time.perf_counter() - started) * 1000
+
+    accept = request({"Accept-Encoding": "gzip"})
+    revalidate = request({
+        "Accept-Encoding": "gzip", "If-None-Match": catalogue.openapi.etag
+    })
+
+    def old_openapi():
+        return gzip.compress(json.dumps(app.openapi()).encode(), 6)
+
+    cases = [
+        ("openapi_per_request", old_openapi, len(old_openapi())),
+        (
+            "openapi_artifact", lambda: artifact_response(catalogue.openapi, accept),
+            len(catalogue.openapi.encoded["gzip"]),
+        ),
+        ("openapi_304", lambda: artifact_response(catalogue.openapi, revalidate), 0),
+        (
+            "tools_per_request", lambda: gzip.compress(old_tool_list(app), 6),
+            len(gzip.compress(old_tool_list(app))),
+        ),
+        ("tools_compact", lambda: artifact_response(catalogue.tools("compact"), accept),
+         len(catalogue.tools("compact").encoded["gzip"])),
+        ("tools_full", lambda: artifact_response(catalogue.tools("full"), accept),
+         len(catalogue.tools("full").encoded["gzip"])),
+    ]
+    results = [
+        {
+            "case": "first_openapi_generation", "median_ms": round(generate_ms, 3),
+            "wire_kb": "",
+        },
+        {
+            "case": "first_catalogue_build", "median_ms": round(build_ms, 3),
+            "wire_kb": "",
+        },
+    ]
+    for name, fn, size in cases:
+        results.append({
+            "case": name, "median_ms": time_call(fn, repeat)["median_ms"],
+            "wire_kb": round(size / 1024, 1),
+        })
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+    print_table(run(args.repeat))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""
+Shared helpers for the benchmark scripts.
+
+Each benchmark is a plain module runnable with ``python -m
+backend.benchmarks.<name>``. Scenarios are timed in-process; memory-sensitive
+scenarios can be re-run in a fresh interpreter with :func:`run_isolated` so
+their peak RSS is not polluted by earlier scenarios.
+"""
+import gc
+import json
+import os
+import resource
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+
+def max_rss_kb() -> int:
+    """Peak resident set size of this process in KiB."""
+    usage = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # macOS reports bytes, Linux reports KiB.
+    return usage // 1024 if sys.platform == "darwin" else usage
+
+
+def time_call(
+    fn: Callable[[], Any], repeat: int = 5, warmup: int = 1
+) -> Dict[str, float]:
+    """Run ``fn`` several times and return latency statistics in milliseconds."""
+    for _ in range(warmup):
+        fn()
+    samples = []
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return {
+        "median_ms": round(statistics.median(samples), 3),
+        "min_ms": round(min(samples), 3),
+        "max_ms": round(max(samples), 3),
+    }
+
+
+def peak_alloc_kb(fn: Callable[[], Any]) -> int:
+    """Peak Python heap allocated while running ``fn``, in KiB."""
+    gc.collect()
+    tracemalloc.start()
+    try:
+        fn()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak // 1024
+
+
+def run_isolated(module: str, *args: str) -> Dict[str, Any]:
+    """Run ``python -m module args...`` and parse its last stdout line as JSON."""
+    root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    output = subprocess.run(
+        [sys.executable, "-m", module, *args],
+        cwd=root,
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def print_table(
+    rows: Iterable[Dict[str, Any]], columns: Optional[List[str]] = None
+) -> None:
+    """Print result dicts as an aligned plain-text table."""
+    rows = list(rows)
+    if not rows:
+        return
+    columns = columns or list(rows[0].keys())
+    widths = {
+        col: max(len(col), *(len(str(row.get(col, ""))) for row in rows))
+        for col in columns
+    }
+    print("  ".join(col.ljust(widths[col]) for col in columns))
+    print("  ".join("-" * widths[col] for col in columns))
+    for row in rows:
+        print("  ".join(str(row.get(col, "")).ljust(widths[col]) for col in columns))
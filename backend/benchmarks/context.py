@@ -0,0 +1,163 @@
+"""
+Task context assembly benchmark.
+
+Compares what an agent fetches before starting a task — the task, all its
+comments, the full content of the memory entities matching it and every
+active mandate, one query after another — against one budgeted
+:meth:`ContextService.assemble` call, cold and cached.
+
+Usage::
+
+    python -m backend.benchmarks.context --comments 200 --entities 200 --budget 4000
+"""
+import argparse
+import asyncio
+import os
+import random
+import tempfile
+import time
+
+import orjson
+from sqlalchemy import insert, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from backend import models
+from backend.benchmarks.common import print_table
+from backend.database import Base
+from backend.enums import TaskStatusEnum
+from backend.models.task_dependency import TaskDependency
+from backend.services import context_service, memory_service
+from backend.services.context_service import ContextService
+from backend.services.semantic_search_service import SemanticMemoryIndex
+
+WORDS = [
+    "schema", "migration", "index", "cache", "deploy", "rollback", "query", "table",
+    "user", "session",
+]
+
+
+async def seed(path: str, comments: int, entities: int):
+    rng = random.Random(5)
+    engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+    tables = [
+        models.Project, models.Agent, models.Task, TaskDependency, models.Comment,
+        models.UniversalMandate, models.MemoryEntity, models.MemoryObservation,
+        models.MemoryPassage, models.ProjectFileAssociation, models.AgentRole,
+    ]
+    async with engine.begin() as conn:
+        await conn.run_sync(
+            Base.metadata.create_all, tables=[model.__table__ for model in tables]
+        )
+        await conn.execute(
+            insert(models.Project.__table__), [{"id": "p1", "name": "Bench"}]
+        )
+        await conn.execute(insert(models.Task.__table__), [
+            {"project_id": "p1", "task_number": n,
+             "title": f"Task {n} " + " ".join(rng.sample(WORDS, 3)),
+             "description": " ".join(rng.choices(WORDS, k=40)),
+             "status": TaskStatusEnum.TO_DO}
+            for n in range(1, 51)
+        ])
+        await conn.execute(insert(TaskDependency.__table__), [
+            {"predecessor_project_id": "p1", "predecessor_task_number": n,
+             "successor_project_id": "p1", "successor_task_number": n + 1,
+             "type": "finish_to_start"}
+            for n in range(1, 50)
+        ])
+        await conn.execute(insert(models.Comment.__table__), [
+            {
+                "task_project_id": "p1", "task_task_number": 25,
+                "content": " ".join(rng.choices(WORDS, k=60)),
+            }
+            for _ in range(comments)
+        ])
+        await conn.execute(insert(models.UniversalMandate.__table__), [
+            {
+                "mandate": f"Mandate {n}: " + " ".join(rng.choices(WORDS, k=20)),
+                "is_active": True,
+            }
+            for n in range(10)
+        ])
+        await conn.execute(insert(models.MemoryEntity.__table__), [
+            {"entity_type": "file", "name": f"doc_{n}.md", "content": "".join(
+                f"# Section {s}\n" + " ".join(rng.choices(WORDS, k=300)) + "\n"
+                for s in range(20)
+            )}
+            for n in range(entities)
+        ])
+    return engine
+
+
+async def round_trips(sessions) -> bytes:
+    """The per-tool calls an agent makes today, one after another."""
+    payload = {}
+    async with sessions() as db:
+        tasks, comments = models.Task.__table__, models.Comment.__table__
+        task = (await db.execute(
+            select(tasks).where(tasks.c.project_id == "p1", tasks.c.task_number == 25)
+        )).first()
+        payload["task"] = {key: str(value) for key, value in task._asdict().items()}
+        payload["comments"] = [
+            row.content for row in (await db.execute(
+                select(comments.c.content).where(
+                    comments.c.task_project_id == "p1",
+                    comments.c.task_task_number == 25,
+                )
+            )).all()
+        ]
+        service = memory_service.MemoryService(db)
+        hits = await service.semantic_search(task.title, limit=10, fields=["id"])
+        payload["memory"] = [await service.get_content_range(hit["id"]) for hit in hits]
+        mandates = models.UniversalMandate.__table__
+        payload["mandates"] = [
+            row.mandate for row in (await db.execute(select(mandates.c.mandate))).all()
+        ]
+    return orjson.dumps(payload)
+
+
+async def run(comments: int, entities: int, budget: int) -> list:
+    results = []
+    with tempfile.TemporaryDirectory() as workdir:
+        memory_service.semantic_index = SemanticMemoryIndex(os.path.join(
+            workdir, "index"
+        ))
+        engine = await seed(os.path.join(workdir, "bench.db"), comments, entities)
+        sessions = async_sessionmaker(
+            engine, class_=AsyncSession, expire_on_commit=False
+        )
+        await round_trips(sessions)  # warm the semantic index for both strategies
+
+        started = time.perf_counter()
+        body = await round_trips(sessions)
+        results.append({
+            "strategy": "round_trips", "ms": (time.perf_counter() - started) * 1000,
+            "kb": len(body) / 1024,
+        })
+
+        service = ContextService(sessions)
+        await service.assemble("p1", 25, budget)  # splits passages on first use
+        context_service._cache.clear()
+        for name in ("assemble_cold", "assemble_cached"):
+            started = time.perf_counter()
+            body = orjson.dumps(await service.assemble("p1", 25, budget))
+            results.append({
+                "strategy": name, "ms": (time.perf_counter() - started) * 1000,
+                "kb": len(body) / 1024,
+            })
+        await engine.dispose()
+    for result in results:
+        result["ms"], result["kb"] = round(result["ms"], 1), round(result["kb"], 1)
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--comments", type=int, default=200)
+    parser.add_argument("--entities", type=int, default=200)
+    parser.add_argument("--budget", type=int, default=4000)
+    args = parser.parse_args()
+    print_table(asyncio.run(run(args.comments, args.entities, args.budget)))
+
+
+if __name__ == "__main__":
+    main()
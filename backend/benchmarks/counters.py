@@ -0,0 +1,89 @@
+"""
+Access counter benchmark.
+
+Compares recording N project views as one ``UPDATE`` transaction per view
+(the read-modify-write the read paths would otherwise do) against buffering
+them in :class:`CoalescingCounters` and flushing once.
+
+Usage::
+
+    python -m backend.benchmarks.counters --hits 1000 10000 --projects 100
+"""
+import argparse
+import asyncio
+import os
+import random
+import tempfile
+import time
+
+from sqlalchemy import insert, update
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from backend import models
+from backend.benchmarks.common import print_table
+from backend.core.counters import CoalescingCounters
+from backend.database import Base
+
+
+async def seed(path: str, projects: int):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all, tables=[models.Project.__table__])
+        await conn.execute(insert(models.Project.__table__), [
+            {"id": f"p{n}", "name": f"Project {n}", "view_count": 0}
+            for n in range(projects)
+        ])
+    return engine
+
+
+async def per_hit(engine, keys) -> float:
+    table = models.Project.__table__
+    started = time.perf_counter()
+    for key in keys:
+        async with engine.begin() as conn:
+            await conn.execute(
+                update(table).where(table.c.id == key).values(
+                    view_count=table.c.view_count + 1
+                )
+            )
+    return (time.perf_counter() - started) * 1000
+
+
+async def coalesced(engine, keys) -> float:
+    counters = CoalescingCounters(engine=engine)
+    started = time.perf_counter()
+    for key in keys:
+        counters.incr("project_views", key)
+    await counters.flush()
+    return (time.perf_counter() - started) * 1000
+
+
+async def run(hits: int, projects: int) -> list:
+    rng = random.Random(hits)
+    keys = [f"p{rng.randrange(projects)}" for _ in range(hits)]
+    results = []
+    for name, strategy in (("update_per_hit", per_hit), ("coalesced", coalesced)):
+        with tempfile.TemporaryDirectory() as workdir:
+            engine = await seed(os.path.join(workdir, "bench.db"), projects)
+            elapsed = await strategy(engine, keys)
+            await engine.dispose()
+        results.append({
+            "hits": hits, "strategy": name, "total_ms": round(elapsed, 1),
+            "us_per_hit": round(elapsed * 1000 / hits, 2),
+        })
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--hits", type=int, nargs="+", default=[1000, 10000])
+    parser.add_argument("--projects", type=int, default=100)
+    args = parser.parse_args()
+    results = []
+    for hits in args.hits:
+        results.extend(asyncio.run(run(hits, args.projects)))
+    print_table(results)
+
+
+if __name__ == "__main__":
+    main()
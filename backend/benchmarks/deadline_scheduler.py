@@ -0,0 +1,130 @@
+"""
+Deadline scheduler benchmark.
+
+Seeds N open tasks with due dates spread over a year, then simulates an
+hour of minute ticks: a cron job scanning the whole tasks table each
+minute, a cron job running a ``due_date`` range query each minute, and
+:meth:`DeadlineScheduler.run_once` each minute (lease renewal, a refill
+every ``SCHEDULER_REFILL_SECONDS`` and the overdue notices it writes).
+
+Usage::
+
+    python -m backend.benchmarks.deadline_scheduler --tasks 200000
+"""
+import argparse
+import asyncio
+import os
+import random
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+from sqlalchemy import insert, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from backend.benchmarks.common import print_table
+from backend.database import Base
+from backend.enums import TaskStatusEnum
+from backend.services.deadline_scheduler import (
+    AUDIT, FILE_JOBS, FILE_TAGS, FILES, LEASES, TASKS, TRANSITIONS, WATERMARKS,
+    DeadlineScheduler,
+)
+from backend.services.status_transition_service import REGISTRY, RULES, VALUES
+from backend.services.task_queue_service import FINAL_STATUSES
+
+START = datetime(2025, 7, 7)
+MINUTES = 60
+
+
+def tasks(count: int, seed: int = 5) -> list:
+    rng = random.Random(seed)
+    return [
+        {"project_id": f"p{number % 50}", "task_number": number,
+         "title": f"task {number}", "status": TaskStatusEnum.TO_DO,
+         "priority": "medium", "created_at": START, "updated_at": START,
+         "due_date": START + timedelta(seconds=rng.uniform(0, 365 * 86400))}
+        for number in range(1, count + 1)
+    ]
+
+
+async def full_scan(db: AsyncSession, since: datetime, now: datetime) -> int:
+    rows = await db.execute(select(
+        TASKS.c.project_id, TASKS.c.task_number, TASKS.c.due_date, TASKS.c.status
+    ))
+    return sum(
+        1 for _, _, due, status in rows
+        if due is not None and since < due <= now and status not in FINAL_STATUSES
+    )
+
+
+async def range_query(db: AsyncSession, since: datetime, now: datetime) -> int:
+    rows = await db.execute(
+        select(TASKS.c.project_id, TASKS.c.task_number)
+        .where(
+            TASKS.c.due_date > since, TASKS.c.due_date <= now,
+            TASKS.c.status.notin_(FINAL_STATUSES),
+        )
+    )
+    return len(rows.all())
+
+
+async def run(count: int) -> list:
+    results = []
+    with tempfile.TemporaryDirectory() as workdir:
+        engine = create_async_engine(
+            f"sqlite+aiosqlite:///{os.path.join(workdir, 'bench.db')}"
+        )
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all, tables=[
+                TASKS, TRANSITIONS, REGISTRY, VALUES, RULES, FILES, FILE_TAGS,
+                FILE_JOBS, AUDIT, WATERMARKS, LEASES,
+            ])
+            batch = tasks(count)
+            for offset in range(0, len(batch), 20000):
+                await conn.execute(insert(TASKS), batch[offset:offset + 20000])
+        sessions = async_sessionmaker(
+            engine, class_=AsyncSession, expire_on_commit=False
+        )
+
+        for name, case in (
+            ("cron_full_scan", full_scan), ("cron_range_query", range_query)
+        ):
+            found = 0
+            started = time.perf_counter()
+            async with sessions() as db:
+                for minute in range(MINUTES):
+                    now = START + timedelta(minutes=minute + 1)
+                    found += await case(db, now - timedelta(minutes=1), now)
+            elapsed = time.perf_counter() - started
+            results.append({
+                "case": name, "due": found, "total_ms": round(elapsed * 1000, 1),
+                "ms_per_minute": round(elapsed * 1000 / MINUTES, 2),
+            })
+
+        scheduler = DeadlineScheduler(sessions, owner="bench")
+        fired = 0
+        started = time.perf_counter()
+        for minute in range(MINUTES + 1):
+            ran = await scheduler.run_once(now=START + timedelta(minutes=minute))
+            fired += ran.get("overdue", 0)
+        elapsed = time.perf_counter() - started
+        results.append({
+            "case": "scheduler_heap", "due": fired,
+            "total_ms": round(elapsed * 1000, 1),
+            "ms_per_minute": round(elapsed * 1000 / MINUTES, 2),
+        })
+        await engine.dispose()
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--tasks", type=int, default=200000)
+    args = parser.parse_args()
+    print_table(
+        asyncio.run(run(args.tasks)), ["case", "due", "total_ms", "ms_per_minute"]
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+"""
+List endpoint hydration benchmark.
+
+Compares the two ways a task list page can be produced:
+
+* ``orm``  - load ORM entities, validate them into ``schemas.Task`` and render
+  through ``jsonable_encoder`` + stdlib ``json`` (the previous behaviour).
+* ``rows`` - select only the schema columns as ``Row`` tuples and render them
+  with ``ORJSONResponse`` (what ``TaskService.get_task_rows`` does).
+
+Usage::
+
+    python -m backend.benchmarks.list_hydration --rows 10000
+
+Each variant is also re-run in a fresh interpreter to report its peak RSS.
+"""
+import argparse
+import datetime
+import json
+
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy import create_engine, select
+from sqlalchemy.orm import Session, registry
+from sqlalchemy.pool import StaticPool
+from starlette.responses import JSONResponse
+
+from backend import models
+from backend.core.responses import ORJSONResponse, list_payload
+from backend.enums import TaskStatusEnum
+from backend.schemas.task import Task
+from backend.schemas.api_responses import ListResponse
+from backend.services.task_service import TASK_ROW_FIELDS
+from backend.benchmarks.common import (
+    max_rss_kb, peak_alloc_kb, print_table, run_isolated, time_call,
+)
+
+TASKS = models.Task.__table__
+
+
+class _TaskEntity:
+    """Plain mapped class over the tasks table, without relationships."""
+
+
+registry().map_imperatively(_TaskEntity, TASKS)
+
+
+def build_engine(row_count: int):
+    engine = create_engine(
+        "sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool
+    )
+    tables = [models.Project.__table__, models.Agent.__table__, TASKS]
+    models.Base.metadata.create_all(engine, tables=tables)
+    now = datetime.datetime.utcnow()
+    statuses = list(TaskStatusEnum)
+    with engine.begin() as conn:
+        conn.execute(
+            models.Project.__table__.insert(), [{"id": "bench", "name": "bench"}]
+        )
+        conn.execute(TASKS.insert(), [
+            {
+                "id": f"bench-{n}",
+                "project_id": "bench",
+                "task_number": n,
+                "title": f"Task {n}",
+                "description": "lorem ipsum dolor sit amet " * 20,
+                "status": statuses[n % len(statuses)],
+                "priority": "medium",
+                "created_at": now,
+                "updated_at": now,
+            }
+            for n in range(1, row_count + 1)
+        ])
+    return engine
+
+
+def render_orm(engine, row_count: int) -> bytes:
+    with Session(engine) as session:
+        entities = session.scalars(select(_TaskEntity).limit(row_count)).all()
+        page = ListResponse[Task](
+            data=[Task.model_validate(entity) for entity in entities],
+            total=row_count, page=1, page_size=row_count,
+        )
+        return JSONResponse(jsonable_encoder(page)).body
+
+
+def render_rows(engine, row_count: int) -> bytes:
+    with engine.connect() as conn:
+        columns = [TASKS.c[name] for name in TASK_ROW_FIELDS]
+        rows = conn.execute(select(*columns).limit(row_count)).all()
+        return ORJSONResponse(list_payload(rows, row_count, 0, row_count)).body
+
+
+VARIANTS = {"orm": render_orm, "rows": render_rows}
+
+
+def measure(variant: str, row_count: int, repeat: int) -> dict:
+    engine = build_engine(row_count)
+    render = VARIANTS[variant]
+    body = render(engine, row_count)
+    result = {"variant": variant, "rows": row_count, "bytes": len(body)}
+    result.update(time_call(lambda: render(engine, row_count), repeat=repeat))
+    result["peak_alloc_kb"] = peak_alloc_kb(lambda: render(engine, row_count))
+    return result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=10000)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument(
+        "--variant", choices=sorted(VARIANTS), help="run one variant and print JSON"
+    )
+    args = parser.parse_args()
+
+    if args.variant:
+        result = measure(args.variant, args.rows, args.repeat)
+        result["max_rss_kb"] = max_rss_kb()
+        print(json.dumps(result))
+        return
+
+    results = [
+        run_isolated(__spec__.name, "--variant", name, "--rows", str(args.rows),
+                     "--repeat", str(args.repeat))
+        for name in sorted(VARIANTS)
+    ]
+    print_table(results)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,143 @@
+"""
+Logging pipeline overhead benchmark.
+
+Reports the cost on the calling thread (the event loop, in the app) of one
+log call: the previous setup with text formatting and I/O done inline versus
+the queue-backed JSON pipeline, for a file in the page cache and for a sink
+that blocks for 200 us per write (a slow disk or a full stderr pipe); a record
+dropped by per-logger sampling; and a disabled DEBUG call with a
+``model_dump_json()`` payload built eagerly in an f-string versus deferred
+with ``lazy``.
+
+Usage::
+
+    python -m backend.benchmarks.logging_pipeline --records 5000
+"""
+import argparse
+import logging
+import os
+import tempfile
+import time
+
+from backend.benchmarks.common import print_table, time_call
+from backend.core.structured_logging import (
+    build_handlers, lazy, start_logging, stop_logging,
+)
+from backend.schemas.memory import MemoryEntityCreate
+
+logger = logging.getLogger("bench.logging")
+sampled = logging.getLogger("bench.logging.sampled")
+
+
+class SlowSink(logging.Handler):
+    def emit(self, record: logging.LogRecord) -> None:
+        self.format(record)
+        time.sleep(0.0002)
+
+
+def per_call_us(fn, records: int, repeat: int, pipeline=None) -> float:
+    def batch():
+        for n in range(records):
+            fn(n)
+        if pipeline is not None:
+            pipeline.queue.join()  # leave no backlog competing with the next batch
+
+    started = time.perf_counter()
+    batch()
+    wall = time.perf_counter() - started
+    if pipeline is not None:
+        # Time only the calls, not the wait for the listener to catch up.
+        samples = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            for n in range(records):
+                fn(n)
+            samples.append(time.perf_counter() - started)
+            pipeline.queue.join()
+        return round(sorted(samples)[len(samples) // 2] * 1e6 / records, 2)
+    if not wall:
+        return 0.0
+    return round(time_call(batch, repeat, warmup=0)["median_ms"] * 1000 / records, 2)
+
+
+def run(records: int, repeat: int) -> list:
+    root = logging.getLogger()
+    entity = MemoryEntityCreate(
+        entity_type="note", name="benchmark entity", content="x" * 2000,
+        source="benchmark", entity_metadata={"tags": ["a", "b"], "score": 0.5},
+    )
+    results = []
+    with tempfile.TemporaryDirectory() as workdir:
+        inline_log = os.path.join(workdir, "inline.log")
+        for sink, make_handler, count in (
+            ("file", lambda: logging.FileHandler(inline_log), records),
+            ("slow_sink", SlowSink, records // 10),
+        ):
+            handler = make_handler()
+            handler.setFormatter(logging.Formatter(
+                "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+            ))
+            root.addHandler(handler)
+            root.setLevel(logging.INFO)
+
+            def inline(n):
+                logger.info("Request %d handled", n)
+
+            results.append({
+                "case": f"inline_text_{sink}",
+                "us_per_call": per_call_us(inline, count, repeat),
+            })
+            root.removeHandler(handler)
+            handler.close()
+
+            handlers = build_handlers(
+                "json", os.path.join(workdir, "queued-{pid}.log")
+            )[1:]
+            if sink == "slow_sink":
+                handlers = [SlowSink()]
+            pipeline = start_logging(
+                handlers=handlers, level=logging.INFO, sampling={sampled.name: 0.0},
+                queue_size=count * 2,
+            )
+
+            def queued(n):
+                logger.info("Request %d handled", n, extra={"status": 200})
+
+            results.append({
+                "case": f"queued_json_{sink}",
+                "us_per_call": per_call_us(queued, count, repeat, pipeline),
+            })
+            if sink == "file":
+
+                def sampled_out(n):
+                    sampled.info("Request %d handled", n)
+
+                def eager(n):
+                    logger.debug(f"created entity: {entity.model_dump_json()}")
+
+                def deferred(n):
+                    logger.debug("created entity: %s", lazy(entity.model_dump_json))
+
+                for case, fn, with_pipeline in (
+                    ("sampled_out", sampled_out, pipeline),
+                    ("debug_off_eager_payload", eager, None),
+                    ("debug_off_lazy_payload", deferred, None),
+                ):
+                    results.append({
+                        "case": case,
+                        "us_per_call": per_call_us(fn, records, repeat, with_pipeline),
+                    })
+            stop_logging()
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--records", type=int, default=5000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    print_table(run(args.records, args.repeat))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+"""
+Request middleware overhead benchmark.
+
+Drives a small FastAPI app directly through ASGI calls, with no server or
+socket in the way, and reports the median per-request time with no
+middleware, with the previous three ``BaseHTTPMiddleware`` layers (request
+ID and logging, security headers, Prometheus) and with the single pure-ASGI
+:class:`RequestMiddleware` doing the same work, for a JSON endpoint and a
+streamed one.
+
+Usage::
+
+    python -m backend.benchmarks.middleware --requests 2000
+"""
+import argparse
+import asyncio
+import logging
+import statistics
+import time
+import uuid
+
+from fastapi import FastAPI
+from fastapi.responses import StreamingResponse
+from starlette.middleware.base import BaseHTTPMiddleware
+
+from backend.benchmarks.common import print_table
+from backend.metrics import ERROR_COUNT, REQUEST_COUNT, REQUEST_LATENCY
+from backend.middleware.request_middleware import SECURITY_HEADERS, RequestMiddleware
+
+logger = logging.getLogger("benchmark.middleware")
+
+
+class LegacyRequestMiddleware(BaseHTTPMiddleware):
+    async def dispatch(self, request, call_next):
+        request_id = str(uuid.uuid4())
+        request.state.request_id = request_id
+        logger.info(f"Request {request_id}: {request.method} {request.url.path}")
+        start = time.time()
+        response = await call_next(request)
+        duration = time.time() - start
+        response.headers["X-Request-ID"] = request_id
+        response.headers["X-Request-Duration"] = f"{duration:.6f}"
+        logger.info(f"Response {request_id}: {response.status_code} in {duration:.6f}s")
+        return response
+
+
+class LegacySecurityMiddleware(BaseHTTPMiddleware):
+    async def dispatch(self, request, call_next):
+        response = await call_next(request)
+        for name, value in SECURITY_HEADERS:
+            if name not in response.headers:
+                response.headers[name] = value
+        return response
+
+
+class LegacyPrometheusMiddleware(BaseHTTPMiddleware):
+    async def dispatch(self, request, call_next):
+        method, endpoint = request.method, request.url.path
+        start = time.perf_counter()
+        response = await call_next(request)
+        REQUEST_LATENCY.labels(method, endpoint).observe(time.perf_counter() - start)
+        REQUEST_COUNT.labels(method, endpoint, str(response.status_code)).inc()
+        if response.status_code >= 400:
+            ERROR_COUNT.labels(method, endpoint, str(response.status_code)).inc()
+        return response
+
+
+def build(stack: str) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/items/{item_id}")
+    async def item(item_id: int):
+        return {"id": item_id, "name": "item"}
+
+    @app.get("/stream")
+    async def stream():
+        async def events():
+            for n in range(10):
+                yield f"data: {n}\n\n"
+        return StreamingResponse(events(), media_type="text/event-stream")
+
+    if stack == "legacy":
+        app.add_middleware(LegacyPrometheusMiddleware)
+        app.add_middleware(LegacyRequestMiddleware)
+        app.add_middleware(LegacySecurityMiddleware)
+    elif stack == "single":
+        app.add_middleware(RequestMiddleware, metrics=True, log_sample_rate=0)
+    return app
+
+
+async def call(app, path: str) -> None:
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1",
+        "method": "GET", "scheme": "http", "path": path, "raw_path": path.encode(),
+        "root_path": "", "query_string": b"", "headers": [(b"host", b"bench")],
+        "client": ("127.0.0.1", 1), "server": ("bench", 80),
+    }
+    pending = [{"type": "http.request", "body": b"", "more_body": False}]
+    done = asyncio.Event()
+
+    async def receive():
+        if pending:
+            return pending.pop()
+        await done.wait()
+        return {"type": "http.disconnect"}
+
+    async def send(message):
+        if message["type"] == "http.response.body" and not message.get("more_body"):
+            done.set()
+
+    await app(scope, receive, send)
+
+
+async def run(requests: int) -> list:
+    results = []
+    for path in ("/items/1", "/stream"):
+        baseline = None
+        for stack in ("none", "legacy", "single"):
+            app = build(stack)
+            for _ in range(50):
+                await call(app, path)
+            timings = []
+            for _ in range(requests):
+                started = time.perf_counter()
+                await call(app, path)
+                timings.append((time.perf_counter() - started) * 1e6)
+            median = statistics.median(timings)
+            baseline = median if baseline is None else baseline
+            results.append({
+                "endpoint": path, "middleware": stack, "median_us": round(median, 1),
+                "overhead_us": round(median - baseline, 1),
+            })
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=2000)
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, handlers=[logging.NullHandler()])
+    print_table(asyncio.run(run(args.requests)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+"""
+Passage retrieval benchmark.
+
+Stores one large synthetic source file as a memory entity and compares the
+payload of fetching its whole content against the top passages for a
+query about one function, plus the time to split the file and to answer
+the passage query.
+
+Usage::
+
+    python -m backend.benchmarks.passages --sizes-mb 0.5 5
+"""
+import argparse
+import asyncio
+import os
+import random
+import tempfile
+import time
+
+import orjson
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+from backend import models
+from backend.benchmarks.common import print_table, time_call
+from backend.core.passages import split_passages
+from backend.database import Base
+from backend.services.memory_service import MemoryService
+
+WORDS = [
+    "value", "result", "config", "request", "session", "cache", "index", "record",
+    "buffer", "token",
+]
+
+
+def source_file(size: int, seed: int) -> str:
+    rng = random.Random(seed)
+    functions, total = [], 0
+    while total < size:
+        body = "\n".join(
+            f"    {rng.choice(WORDS)}_{n} = "
+            f"{rng.choice(WORDS)}({rng.choice(WORDS)}, {rng.randrange(100)})"
+            for n in range(rng.randrange(5, 40))
+        )
+        number = len(functions)
+        function = (
+            f"def handler_{number}(request):\n"
+            f"    \"\"\"Handle request {number}.\"\"\"\n"
+            f"{body}\n    return value_0\n\n\n"
+        )
+        functions.append(function)
+        total += len(function)
+    return "".join(functions)
+
+
+async def run(size_mb: float, limit: int) -> dict:
+    content = source_file(int(size_mb * 1024 * 1024), 7)
+    target = f"handler_{content.count('def handler_') // 2}"
+    split = time_call(lambda: split_passages(content, "code"), repeat=3, warmup=0)
+    with tempfile.TemporaryDirectory() as workdir:
+        engine = create_async_engine(
+            f"sqlite+aiosqlite:///{os.path.join(workdir, 'bench.db')}"
+        )
+        async with engine.begin() as conn:
+            tables = [models.MemoryEntity.__table__, models.MemoryPassage.__table__]
+            await conn.run_sync(Base.metadata.create_all, tables=tables)
+            await conn.execute(insert(models.MemoryEntity.__table__), [
+                {
+                    "id": "big", "entity_type": "file", "name": "handlers.py",
+                    "content": content,
+                },
+            ])
+        async with AsyncSession(engine) as session:
+            service = MemoryService(session)
+            started = time.perf_counter()
+            # first use stores passages
+            await service.search_passages(target, entity_id="big", limit=limit)
+            first_ms = (time.perf_counter() - started) * 1000
+            started = time.perf_counter()
+            passages = await service.search_passages(
+                target, entity_id="big", limit=limit
+            )
+            query_ms = (time.perf_counter() - started) * 1000
+            whole = await service.get_content_range("big")
+        await engine.dispose()
+    full_bytes = len(orjson.dumps(whole))
+    passage_bytes = len(orjson.dumps(passages))
+    return {
+        "size_mb": size_mb,
+        "passages": len(split_passages(content, "code")),
+        "split_ms": round(split["median_ms"], 1),
+        "first_query_ms": round(first_ms, 1),
+        "query_ms": round(query_ms, 1),
+        "hit": f"def {target}(" in passages[0]["content"],
+        "full_kb": round(full_bytes / 1024, 1),
+        "passages_kb": round(passage_bytes / 1024, 1),
+        "reduction": f"{full_bytes / passage_bytes:.0f}x",
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes-mb", type=float, nargs="+", default=[0.5, 5])
+    parser.add_argument("--limit", type=int, default=3)
+    args = parser.parse_args()
+    print_table([asyncio.run(run(size, args.limit)) for size in args.sizes_mb])
+
+
+if __name__ == "__main__":
+    main()
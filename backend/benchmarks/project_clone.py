@@ -0,0 +1,163 @@
+"""
+Project clone benchmark.
+
+Seeds a project of N tasks (each depending on the one before it, with a
+comment and a capability requirement per task) and copies it twice: by
+reading every row into Python and inserting copies with executemany, as a
+client-side copy through the ORM would at best, and with
+:meth:`ProjectService.clone_project` (``INSERT ... SELECT`` per page of task
+numbers). Reports elapsed time and the peak Python heap of each copy; run
+with several ``--tasks`` values to see how memory scales.
+
+Usage::
+
+    python -m backend.benchmarks.project_clone --tasks 20000 100000
+"""
+import argparse
+import asyncio
+import gc
+import os
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+
+from sqlalchemy import insert, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from backend.benchmarks.common import print_table
+from backend.crud.task_transitions import TRANSITIONS
+from backend.database import Base
+from backend.enums import TaskStatusEnum
+from backend.services.project_service import (
+    CAPABILITIES, COMMENTS, DEPENDENCIES, PROJECT_FILES, PROJECTS, TASKS,
+    ProjectService,
+)
+
+NOW = datetime(2025, 7, 7)
+SEED_BATCH = 20000
+
+
+def seed_rows(count: int):
+    for offset in range(0, count, SEED_BATCH):
+        numbers = range(offset + 1, min(offset + SEED_BATCH, count) + 1)
+        yield TASKS, [
+            {"project_id": "p1", "task_number": n, "title": f"task {n}",
+             "status": TaskStatusEnum.TO_DO, "priority": "medium", "created_at": NOW,
+             "updated_at": NOW}
+            for n in numbers
+        ]
+        yield DEPENDENCIES, [
+            {"predecessor_project_id": "p1", "predecessor_task_number": n - 1,
+             "successor_project_id": "p1", "successor_task_number": n,
+             "type": "finishes_to_start"}
+            for n in numbers if n > 1
+        ]
+        yield COMMENTS, [
+            {"id": f"c{n}", "content": f"note on task {n}", "task_project_id": "p1",
+             "task_task_number": n, "created_at": NOW, "updated_at": NOW}
+            for n in numbers
+        ]
+        yield CAPABILITIES, [
+            {"project_id": "p1", "task_number": n, "capability": "python"}
+            for n in numbers
+        ]
+
+
+async def read_and_insert(db: AsyncSession, name: str) -> int:
+    clone_id = f"copy-{name}"
+    project = dict(
+        (await db.execute(select(PROJECTS).where(PROJECTS.c.id == "p1"))).one()._mapping
+    )
+    await db.execute(insert(PROJECTS).values({**project, "id": clone_id, "name": name}))
+    copied = 0
+    for table, column in ((TASKS, "project_id"), (CAPABILITIES, "project_id"),
+                          (DEPENDENCIES, "successor_project_id"),
+                          (COMMENTS, "task_project_id")):
+        rows = [
+            dict(row._mapping) for row in await db.execute(
+                select(table).where(table.c[column] == "p1")
+            )
+        ]
+        for row in rows:
+            for key in (
+                "project_id", "predecessor_project_id", "successor_project_id",
+                "task_project_id",
+            ):
+                if key in row:
+                    row[key] = clone_id
+            if table is COMMENTS:
+                row["id"] = f"{clone_id}-{row['id']}"
+        await db.execute(insert(table), rows)
+        copied += len(rows)
+    await db.commit()
+    return copied
+
+
+async def clone(db: AsyncSession, name: str) -> int:
+    cloned = await ProjectService(db).clone_project("p1", name)
+    return sum(
+        cloned[key] for key in ("tasks", "capabilities", "dependencies", "comments")
+    )
+
+
+async def measured(sessions, case: str, copy, count: int) -> dict:
+    gc.collect()
+    tracemalloc.start()
+    started = time.perf_counter()
+    try:
+        async with sessions() as db:
+            rows = await copy(db, f"{case} {count}")
+        elapsed = time.perf_counter() - started
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return {
+        "case": case, "tasks": count, "rows": rows, "ms": round(elapsed * 1000, 1),
+        "peak_heap_kb": peak // 1024,
+    }
+
+
+async def run(counts: list) -> list:
+    results = []
+    for count in counts:
+        with tempfile.TemporaryDirectory() as workdir:
+            engine = create_async_engine(
+                f"sqlite+aiosqlite:///{os.path.join(workdir, 'bench.db')}"
+            )
+            async with engine.begin() as conn:
+                await conn.run_sync(Base.metadata.create_all, tables=[
+                    PROJECTS, TASKS, CAPABILITIES, DEPENDENCIES, COMMENTS,
+                    PROJECT_FILES, TRANSITIONS,
+                ])
+                await conn.execute(insert(PROJECTS).values(
+                    id="p1", name="source", is_archived=False, created_at=NOW,
+                    updated_at=NOW,
+                ))
+                for table, rows in seed_rows(count):
+                    if rows:
+                        await conn.execute(insert(table), rows)
+            sessions = async_sessionmaker(
+                engine, class_=AsyncSession, expire_on_commit=False
+            )
+            results.append(await measured(
+                sessions, "read_and_insert", read_and_insert, count
+            ))
+            results.append(await measured(
+                sessions, "insert_select_clone", clone, count
+            ))
+            await engine.dispose()
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--tasks", type=int, nargs="+", default=[20000, 100000])
+    args = parser.parse_args()
+    print_table(
+        asyncio.run(run(args.tasks)), ["case", "tasks", "rows", "ms", "peak_heap_kb"]
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""
+Prompt library search benchmark.
+
+Compares the former full-scan scorer (lowercase and substring-match every
+prompt per query) against :class:`PromptIndex` for search and filtered list
+queries over synthetic libraries of several sizes.
+
+Usage::
+
+    python -m backend.benchmarks.prompt_search --sizes 1000 10000 50000
+"""
+import argparse
+import random
+
+from backend.benchmarks.common import print_table, time_call
+from backend.mcp_tools.prompt_library_tools import PromptIndex
+
+WORDS = (
+    "plan review refactor deploy migrate test benchmark document release triage "
+    "schema index cache query worker queue api client server budget risk timeline "
+    "architecture security audit rollback feature bug incident design spec"
+).split()
+ROLES = ["developer", "architect", "reviewer", "project_manager", "tester"]
+QUERIES = [
+    "rollback migration", "cache query budget", "security audit",
+    "incident timeline risk",
+]
+# Body text follows a Zipf-like distribution over a larger vocabulary, so
+# common words appear in most prompts and domain words in few.
+VOCABULARY = WORDS + [f"term{n}" for n in range(5000)]
+ZIPF_WEIGHTS = [1 / rank for rank in range(1, len(VOCABULARY) + 1)]
+
+
+def library(size: int, seed: int = 7):
+    rng = random.Random(seed)
+    for n in range(size):
+        metadata = {
+            "prompt_id": f"prompt_{n}",
+            "name": " ".join(rng.sample(WORDS, 3)).title(),
+            "category": rng.choice([
+                "task_planning", "analysis", "review", "debugging"
+            ]),
+            "tags": rng.sample(WORDS, 3),
+            "agent_roles": rng.sample(ROLES, rng.randint(0, 2)),
+            "usage_count": rng.randint(0, 1000),
+        }
+        content = " ".join(rng.choices(VOCABULARY, ZIPF_WEIGHTS, k=120)) + " {context}"
+        yield content, metadata
+
+
+def scan_search(prompts, query: str):
+    """The pre-index scorer: substring checks over every prompt."""
+    words = query.lower().split()
+    scored = []
+    for content, metadata in prompts:
+        name, content_lower = metadata["name"].lower(), content.lower()
+        score = sum(1.0 for w in words if w in name) + sum(
+            0.5 for w in words if w in content_lower
+        )
+        score += sum(0.7 for tag in metadata["tags"] for w in words if w in tag.lower())
+        if score > 0:
+            scored.append((metadata["prompt_id"], score))
+    scored.sort(key=lambda item: item[1], reverse=True)
+    return scored[:20]
+
+
+def scan_list(prompts, tags, role):
+    matched = [
+        metadata for _, metadata in prompts
+        if any(tag in metadata["tags"] for tag in tags)
+        and (not metadata["agent_roles"] or role in metadata["agent_roles"])
+    ]
+    matched.sort(key=lambda metadata: metadata["usage_count"], reverse=True)
+    return matched[:50]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 50000])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    results = []
+    for size in args.sizes:
+        prompts = list(library(size))
+        index = PromptIndex()
+        build = time_call(
+            lambda: [index.upsert(*p) for p in prompts], repeat=1, warmup=0
+        )
+        results.append({
+            "prompts": size, "step": "index:build", "median_ms": build["median_ms"]
+        })
+        steps = {
+            "scan:search": lambda: [scan_search(prompts, q) for q in QUERIES],
+            "index:search": lambda: [index.search(q, 20) for q in QUERIES],
+            "scan:list": lambda: scan_list(prompts, ["cache", "audit"], "reviewer"),
+            "index:list": lambda: index.filter(
+                tags=["cache", "audit"], agent_role="reviewer"
+            ),
+        }
+        for step, fn in steps.items():
+            results.append({
+                "prompts": size, "step": step, **time_call(fn, repeat=args.repeat)
+            })
+    print_table(results, ["prompts", "step", "median_ms", "min_ms", "max_ms"])
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""
+Project ready-set benchmark.
+
+Finds every open task whose predecessors are all final in a project of N
+tasks, the old way — list the open tasks, then fetch each task's
+predecessors with their statuses (``get_direct_predecessors``, one query per
+task) — against :meth:`TaskQueueService.ready_tasks`, one query.
+
+Usage::
+
+    python -m backend.benchmarks.ready_set --tasks 10000
+"""
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+from backend.benchmarks.common import print_table
+from backend.benchmarks.task_queue import seed
+from backend.database import Base
+from backend.services.task_queue_service import (
+    DEPENDENCIES, FINAL_STATUSES, REQUIREMENTS, TASKS, TaskQueueService,
+)
+
+PROJECT = "bench"
+
+
+async def per_task_predecessors(db: AsyncSession) -> int:
+    open_tasks = (await db.execute(
+        select(TASKS.c.task_number).where(
+            TASKS.c.project_id == PROJECT, TASKS.c.status.notin_(FINAL_STATUSES)
+        )
+    )).scalars().all()
+    ready = 0
+    for number in open_tasks:
+        predecessors = (await db.execute(
+            select(DEPENDENCIES.c.predecessor_task_number).where(
+                DEPENDENCIES.c.successor_project_id == PROJECT,
+                DEPENDENCIES.c.successor_task_number == number)
+        )).scalars().all()
+        statuses = (await db.execute(
+            select(TASKS.c.status).where(
+                TASKS.c.project_id == PROJECT, TASKS.c.task_number.in_(predecessors)
+            )
+        )).scalars().all() if predecessors else []
+        ready += all(status in FINAL_STATUSES for status in statuses)
+    return ready
+
+
+async def run(tasks: int) -> list:
+    results = []
+    with tempfile.TemporaryDirectory() as workdir:
+        engine = create_async_engine(
+            f"sqlite+aiosqlite:///{os.path.join(workdir, 'bench.db')}"
+        )
+        async with engine.begin() as conn:
+            await conn.run_sync(
+                Base.metadata.create_all, tables=[TASKS, DEPENDENCIES, REQUIREMENTS]
+            )
+        await seed(engine, tasks, PROJECT)
+        async with AsyncSession(engine) as db:
+            cases = [
+                ("per_task_queries", lambda: per_task_predecessors(db)),
+                (
+                    "single_query",
+                    lambda: TaskQueueService(db).ready_tasks(PROJECT, limit=tasks),
+                ),
+            ]
+            for name, case in cases:
+                await case()
+                started = time.perf_counter()
+                found = await case()
+                results.append({
+                    "strategy": name,
+                    "ms": round((time.perf_counter() - started) * 1000, 1),
+                    "ready": found if isinstance(found, int) else found["total"],
+                })
+        await engine.dispose()
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--tasks", type=int, default=10000)
+    args = parser.parse_args()
+    print_table(asyncio.run(run(args.tasks)))
+
+
+if __name__ == "__main__":
+    main()
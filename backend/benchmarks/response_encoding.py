@@ -0,0 +1,79 @@
+"""
+Response encoding benchmark.
+
+For task-list payloads of several sizes, reports JSON encode time (stdlib
+``json`` via ``JSONResponse`` versus ``ORJSONResponse``) and, for each
+encoding available to ``CompressionMiddleware``, bytes on the wire and
+compression time.
+
+Usage::
+
+    python -m backend.benchmarks.response_encoding --sizes 100 1000 10000
+"""
+import argparse
+import datetime
+
+from starlette.responses import JSONResponse
+
+from backend.core.compression import available_encoders
+from backend.core.responses import ORJSONResponse, list_payload
+from backend.benchmarks.common import print_table, time_call
+
+
+def task_page(row_count: int) -> dict:
+    now = datetime.datetime(2024, 1, 1).isoformat()
+    rows = [
+        {
+            "title": f"Task {n}",
+            "description": f"Implement feature {n} and cover it with tests.",
+            "status": ("To Do", "In Progress", "Completed")[n % 3],
+            "agent_id": None,
+            "start_date": None,
+            "due_date": None,
+            "project_id": "0b6b0a9c-2f5e-4a7e-9a55-8a3e2f3d1c11",
+            "task_number": n,
+            "created_at": now,
+            "updated_at": now,
+            "is_archived": False,
+        }
+        for n in range(1, row_count + 1)
+    ]
+    return list_payload(rows, row_count, 0, row_count)
+
+
+def compress(encoding: str, body: bytes) -> bytes:
+    encoder = available_encoders()[encoding]()
+    return encoder.compress(body) + encoder.finish()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1000, 10000])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    results = []
+    for size in args.sizes:
+        payload = task_page(size)
+        body = ORJSONResponse(payload).body
+        for name, response_class in (
+            ("json", JSONResponse), ("orjson", ORJSONResponse)
+        ):
+            timing = time_call(lambda: response_class(payload).body, repeat=args.repeat)
+            results.append({
+                "rows": size, "step": f"encode:{name}",
+                "bytes": len(response_class(payload).body),
+                "median_ms": timing["median_ms"],
+            })
+        for encoding in available_encoders():
+            timing = time_call(lambda: compress(encoding, body), repeat=args.repeat)
+            results.append({
+                "rows": size, "step": f"compress:{encoding}",
+                "bytes": len(compress(encoding, body)),
+                "median_ms": timing["median_ms"],
+            })
+    print_table(results)
+
+
+if __name__ == "__main__":
+    main()
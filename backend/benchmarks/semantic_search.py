@@ -0,0 +1,78 @@
+"""
+Vector search benchmark.
+
+Compares exact (brute-force) cosine search against the IVF layer of
+:class:`VectorIndex` at several corpus sizes: query latency and recall@k
+of the IVF results against the exact top k. Also times embedding with the
+hashing embedder.
+
+Usage::
+
+    python -m backend.benchmarks.semantic_search --sizes 1000 10000 50000
+"""
+import argparse
+import random
+
+from backend.benchmarks.common import print_table, time_call
+from backend.core.embeddings import HashingEmbedder, require_numpy
+from backend.core.vector_index import VectorIndex
+
+WORDS = [f"term{n}" for n in range(5000)]
+
+
+def corpus(size: int, seed: int) -> list:
+    rng = random.Random(seed)
+    weights = [1 / (rank + 1) for rank in range(len(WORDS))]
+    return [" ".join(rng.choices(WORDS, weights, k=30)) for _ in range(size)]
+
+
+def run(size: int, k: int, nprobe: int, queries: int, dimensions: int) -> list:
+    embedder = HashingEmbedder(dimensions)
+    texts = corpus(size, size)
+    embed = time_call(lambda: embedder.embed(texts[:1000]), repeat=1, warmup=0)
+    vectors = embedder.embed(texts)
+    probes = embedder.embed(corpus(queries, size + 1))
+
+    exact = VectorIndex(dimensions, train_threshold=size + 1)
+    ivf = VectorIndex(dimensions, nprobe=nprobe, train_threshold=min(size, 4096))
+    for key, vector in enumerate(vectors):
+        exact.add(key, vector)
+        ivf.add(key, vector)
+
+    def keys(index, query):
+        return {key for key, _ in index.search(query, k)}
+
+    recall = sum(
+        len(keys(ivf, query) & keys(exact, query)) / k for query in probes
+    ) / len(probes)
+    results = []
+    for name, index in (("exact", exact), ("ivf", ivf)):
+        timing = time_call(
+            lambda: [index.search(query, k) for query in probes], repeat=3, warmup=1
+        )
+        results.append({
+            "size": size, "index": name,
+            "query_ms": round(timing["median_ms"] / queries, 3),
+            "recall@k": 1.0 if name == "exact" else round(float(recall), 3),
+            "embed_ms_per_1k": round(embed["median_ms"], 1),
+        })
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 50000])
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--nprobe", type=int, default=8)
+    parser.add_argument("--queries", type=int, default=100)
+    parser.add_argument("--dimensions", type=int, default=384)
+    args = parser.parse_args()
+    require_numpy()
+    results = []
+    for size in args.sizes:
+        results.extend(run(size, args.k, args.nprobe, args.queries, args.dimensions))
+    print_table(results)
+
+
+if __name__ == "__main__":
+    main()
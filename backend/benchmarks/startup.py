@@ -0,0 +1,93 @@
+"""
+Startup time benchmark for ``create_app`` profiles.
+
+Each profile is built in a fresh interpreter under ``python -X importtime``.
+Reports wall time to a ready app, route count, per-feature mount time and
+the heaviest top-level imports.
+
+Usage::
+
+    python -m backend.benchmarks.startup --profiles minimal core mcp full
+"""
+import argparse
+import json
+import os
+import re
+import subprocess
+import sys
+import time
+from typing import Dict, List, Tuple
+
+from backend.benchmarks.common import print_table
+
+_IMPORTTIME_LINE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|(\s*)(\S+)")
+
+
+def heaviest_imports(stderr: str, top: int) -> List[Tuple[str, float]]:
+    """Parse ``-X importtime`` output into the ``top`` packages by cumulative ms.
+
+    Only the outermost import of each package tree is counted so nested
+    modules are not double-counted.
+    """
+    totals: Dict[str, float] = {}
+    for match in _IMPORTTIME_LINE.finditer(stderr):
+        cumulative_us = int(match.group(2))
+        indent, module = match.group(3), match.group(4)
+        if len(indent) != 1:
+            continue
+        parts = module.split(".")
+        package = ".".join(parts[:2]) if parts[0] == "backend" else parts[0]
+        totals[package] = totals.get(package, 0.0) + cumulative_us / 1000
+    ranked = sorted(totals.items(), key=lambda item: item[1], reverse=True)
+    return [(name, round(ms, 1)) for name, ms in ranked[:top]]
+
+
+def build(profile: str) -> dict:
+    started = time.perf_counter()
+    from backend.app_factory import create_app
+
+    app = create_app(profile, init_db=False)
+    return {
+        "profile": profile,
+        "wall_ms": round((time.perf_counter() - started) * 1000, 1),
+        "routes": len(app.routes),
+        "features": app.state.import_timings,
+    }
+
+
+def measure(profile: str, top: int) -> dict:
+    root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-m", __spec__.name, "--child", profile],
+        cwd=root, check=True, capture_output=True, text=True,
+    )
+    result = json.loads(completed.stdout.strip().splitlines()[-1])
+    result["top_imports"] = heaviest_imports(completed.stderr, top)
+    return result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument(
+        "--profiles", nargs="+", default=["minimal", "core", "mcp", "full"]
+    )
+    parser.add_argument("--top", type=int, default=5)
+    parser.add_argument("--child", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        print(json.dumps(build(args.child)))
+        return
+
+    results = [measure(profile, args.top) for profile in args.profiles]
+    print_table([
+        {key: result[key] for key in ("profile", "wall_ms", "routes")}
+        for result in results
+    ])
+    for result in results:
+        print(f"\n[{result['profile']}] feature mount ms: {result['features']}")
+        print(f"[{result['profile']}] heaviest imports ms: {result['top_imports']}")
+
+
+if __name__ == "__main__":
+    main()
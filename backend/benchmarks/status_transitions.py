@@ -0,0 +1,149 @@
+"""
+Status transition validation benchmark.
+
+Seeds ``task_status`` with every TaskStatusEnum value and a rule set where a
+third of the rules carry a condition, then validates random transitions:
+looking the rule up with a query per transition, as a naive check in
+``TaskService.update_task`` would, against :data:`status_machines`
+(compiled matrix and conditions), with facts in a dict and read lazily from
+a task object.
+
+Usage::
+
+    python -m backend.benchmarks.status_transitions --validations 200000
+"""
+import argparse
+import asyncio
+import os
+import random
+import tempfile
+import time
+from types import SimpleNamespace
+
+from sqlalchemy import insert, select
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import aliased
+
+from backend.benchmarks.common import print_table
+from backend.database import Base
+from backend.enums import TaskStatusEnum
+from backend.services.status_transition_service import (
+    REGISTRY, RULES, TASK_STATUS_ENUM, VALUES, Facts, ObjectFacts, StatusMachines,
+)
+
+STATUSES = [status.name for status in TaskStatusEnum]
+CONDITIONS = (
+    "agent_id is not None", "priority in ('high', 'critical') or not is_archived"
+)
+
+
+def rule_rows(seed: int = 3) -> list:
+    rng = random.Random(seed)
+    rows = []
+    for i, frm in enumerate(STATUSES):
+        for j, to in enumerate(STATUSES):
+            if i != j and rng.random() < 0.4:
+                rows.append({
+                    "id": f"r{i}-{j}", "enum_registry_id": "e1", "from_status_id": frm,
+                    "to_status_id": to, "condition_expression": (
+                        rng.choice(CONDITIONS) if rng.random() < 1 / 3 else None
+                    ),
+                    "requires_approval": False, "is_active": True,
+                })
+    return rows
+
+
+async def naive_check(db: AsyncSession, frm: str, to: str) -> bool:
+    source, target = aliased(VALUES), aliased(VALUES)
+    rule = (await db.execute(
+        select(RULES.c.id)
+        .join(REGISTRY, REGISTRY.c.id == RULES.c.enum_registry_id)
+        .join(source, source.c.id == RULES.c.from_status_id)
+        .join(target, target.c.id == RULES.c.to_status_id)
+        .where(
+            REGISTRY.c.enum_name == TASK_STATUS_ENUM, source.c.value == frm,
+            target.c.value == to, RULES.c.is_active.is_(True),
+        )
+        .limit(1)
+    )).scalar()
+    return rule is not None
+
+
+def timed(name: str, count: int, started: float, allowed: int) -> dict:
+    elapsed = time.perf_counter() - started
+    return {
+        "case": name, "validations": count, "allowed": allowed,
+        "ms": round(elapsed * 1000, 1), "per_second": round(count / elapsed),
+    }
+
+
+async def run(count: int) -> list:
+    rng = random.Random(11)
+    pairs = [(rng.choice(STATUSES), rng.choice(STATUSES)) for _ in range(count)]
+    results = []
+    with tempfile.TemporaryDirectory() as workdir:
+        engine = create_async_engine(
+            f"sqlite+aiosqlite:///{os.path.join(workdir, 'bench.db')}"
+        )
+        async with engine.begin() as conn:
+            await conn.run_sync(
+                Base.metadata.create_all, tables=[REGISTRY, VALUES, RULES]
+            )
+            await conn.execute(
+                insert(REGISTRY).values(
+                    id="e1", enum_name=TASK_STATUS_ENUM, display_name="Task Status"
+                )
+            )
+            await conn.execute(insert(VALUES), [
+                {
+                    "id": value, "enum_registry_id": "e1", "value": value,
+                    "display_name": value, "sort_order": n,
+                }
+                for n, value in enumerate(STATUSES)
+            ])
+            await conn.execute(insert(RULES), rule_rows())
+        async with AsyncSession(engine) as db:
+            naive = pairs[: max(count // 100, 1)]
+            started = time.perf_counter()
+            allowed = sum([await naive_check(db, frm, to) for frm, to in naive])
+            results.append(timed("query_per_validation", len(naive), started, allowed))
+
+            machines = StatusMachines()
+            started = time.perf_counter()
+            await machines.ensure_loaded(db)
+            results.append(timed("compile_rules", 1, started, "-"))
+
+        check = machines.check
+        facts = Facts(agent_id="a1", priority="medium", is_archived=False)
+        started = time.perf_counter()
+        allowed = sum([
+            check(TASK_STATUS_ENUM, frm, to, facts).allowed for frm, to in pairs
+        ])
+        results.append(timed("compiled_dict_facts", count, started, allowed))
+
+        task = SimpleNamespace(
+            agent_id="a1", priority="medium", is_archived=False,
+            status=TaskStatusEnum.IN_PROGRESS,
+        )
+        started = time.perf_counter()
+        allowed = sum([
+            check(TASK_STATUS_ENUM, frm, to, ObjectFacts(task)).allowed
+            for frm, to in pairs
+        ])
+        results.append(timed("compiled_task_facts", count, started, allowed))
+        await engine.dispose()
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--validations", type=int, default=200000)
+    args = parser.parse_args()
+    print_table(
+        asyncio.run(run(args.validations)),
+        ["case", "validations", "allowed", "ms", "per_second"],
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,175 @@
+"""
+Task flow analytics benchmark.
+
+Computes cycle time percentiles, weekly throughput and cumulative flow for a
+project with N tasks walking To Do -> In Progress -> In Review -> Completed
+over a year, from SQLite: typed rows aggregated in a per-row Python loop,
+against :meth:`TaskAnalyticsService.project_flow` (raw rows aggregated with
+NumPy) with an empty cache and from its cache.
+
+Usage::
+
+    python -m backend.benchmarks.task_analytics --tasks 25000
+"""
+import argparse
+import asyncio
+import os
+import random
+import statistics
+import tempfile
+import time
+from collections import defaultdict
+from datetime import date, datetime, timedelta
+
+from sqlalchemy import insert, select
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+from backend.benchmarks.common import print_table
+from backend.database import Base
+from backend.enums import TaskStatusEnum
+from backend.services import task_analytics_service
+from backend.services.task_analytics_service import (
+    DONE_STATUSES, NOT_STARTED_STATUSES, TASKS, TRANSITIONS, TaskAnalyticsService,
+)
+
+PROJECT = "bench"
+START = datetime(2025, 1, 6)
+TODAY = date(2026, 1, 5)
+PATH = (
+    TaskStatusEnum.TO_DO, TaskStatusEnum.IN_PROGRESS, TaskStatusEnum.IN_REVIEW,
+    TaskStatusEnum.COMPLETED,
+)
+
+
+def generate(count: int, seed: int = 7):
+    rng = random.Random(seed)
+    tasks, transitions = [], []
+    for number in range(1, count + 1):
+        at = created = START + timedelta(hours=rng.uniform(0, 300 * 24))
+        steps = rng.randint(0, len(PATH) - 1)
+        for from_status, to_status in zip(PATH, PATH[1:steps + 1]):
+            at += timedelta(hours=rng.expovariate(1 / 30))
+            transitions.append((number, from_status, to_status, at))
+        tasks.append((number, created, PATH[steps]))
+    transitions.sort(key=lambda row: row[3])
+    return tasks, transitions
+
+
+def python_flow(transitions, tasks, today: date) -> dict:
+    """The same metrics with dicts and a loop over every row and day."""
+    created = {number: at for number, at, _ in tasks}
+    current = {number: status for number, _, status in tasks}
+    started, done, initial = {}, {}, {}
+    moves = defaultdict(lambda: defaultdict(int))
+    for number, from_status, to_status, at in transitions:
+        if number not in created:
+            continue
+        initial.setdefault(number, from_status or to_status)
+        if to_status not in NOT_STARTED_STATUSES and number not in started:
+            started[number] = at
+        if to_status in DONE_STATUSES and number not in done:
+            done[number] = at
+        if from_status is not None:
+            moves[at.date()][from_status] -= 1
+            moves[at.date()][to_status] += 1
+    for number, at in created.items():
+        moves[at.date()][initial.get(number, current[number])] += 1
+    cycle = sorted(
+        (done[n] - started[n]).total_seconds() / 3600
+        for n in done if n in started and started[n] <= done[n]
+    )
+    percentiles = (
+        statistics.quantiles(cycle, n=100, method="inclusive")
+        if len(cycle) > 1 else cycle
+    )
+    weeks = defaultdict(int)
+    for at in done.values():
+        weeks[at.date() - timedelta(days=at.weekday())] += 1
+    flow, counts, day = [], defaultdict(int), min(moves)
+    while day <= today:
+        for status, delta in moves.get(day, {}).items():
+            counts[status] += delta
+        flow.append({
+            "date": day.isoformat(), **{s.value: n for s, n in counts.items()}
+        })
+        day += timedelta(days=1)
+    return {
+        "cycle_p50_hours": percentiles[49], "throughput": dict(weeks),
+        "cumulative_flow": flow,
+    }
+
+
+async def python_case(db: AsyncSession) -> dict:
+    transitions = (await db.execute(
+        select(
+            TRANSITIONS.c.task_task_number, TRANSITIONS.c.from_status,
+            TRANSITIONS.c.to_status, TRANSITIONS.c.transitioned_at,
+        )
+        .where(TRANSITIONS.c.task_project_id == PROJECT)
+        .order_by(TRANSITIONS.c.transitioned_at)
+    )).all()
+    tasks = (await db.execute(
+        select(TASKS.c.task_number, TASKS.c.created_at, TASKS.c.status)
+        .where(TASKS.c.project_id == PROJECT)
+    )).all()
+    return python_flow(transitions, tasks, TODAY)
+
+
+async def run(count: int) -> list:
+    tasks, transitions = generate(count)
+    print(f"{len(tasks)} tasks, {len(transitions)} transitions")
+    results = []
+    with tempfile.TemporaryDirectory() as workdir:
+        engine = create_async_engine(
+            f"sqlite+aiosqlite:///{os.path.join(workdir, 'bench.db')}"
+        )
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all, tables=[TASKS, TRANSITIONS])
+            await conn.execute(insert(TASKS), [
+                {"project_id": PROJECT, "task_number": number,
+                 "title": f"task {number}", "status": status, "priority": "medium",
+                 "created_at": at, "updated_at": at}
+                for number, at, status in tasks
+            ])
+            await conn.execute(insert(TRANSITIONS), [
+                {"id": f"{i:032x}", "task_project_id": PROJECT,
+                 "task_task_number": number, "from_status": from_status,
+                 "to_status": to_status, "transitioned_at": at, "automated": False,
+                 "requires_approval": False, "created_at": at}
+                for i, (number, from_status, to_status, at) in enumerate(transitions)
+            ])
+        async with AsyncSession(engine) as db:
+            service = TaskAnalyticsService(db)
+
+            async def cold():
+                task_analytics_service._cache.clear()
+                return await service.project_flow(PROJECT, today=TODAY)
+
+            cases = [
+                ("python_loop", lambda: python_case(db)),
+                ("numpy", cold),
+                ("numpy_cached", lambda: service.project_flow(PROJECT, today=TODAY)),
+            ]
+            for name, case in cases:
+                await case()
+                samples = []
+                for _ in range(5):
+                    started = time.perf_counter()
+                    await case()
+                    samples.append((time.perf_counter() - started) * 1000)
+                results.append({
+                    "strategy": name, "median_ms": round(statistics.median(samples), 3)
+                })
+        await engine.dispose()
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--tasks", type=int, default=25000)
+    args = parser.parse_args()
+    print_table(asyncio.run(run(args.tasks)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+"""
+Agent work queue benchmark.
+
+On a project of N tasks where most are blocked by an unfinished
+predecessor, compares how agents found work before — list ``To Do`` tasks a
+page at a time, fetch each one's predecessors, pick the first unblocked one
+and set it ``In Progress`` — with :meth:`TaskQueueService.claim`. Each
+strategy takes 50 tasks; the time per task is reported.
+
+Usage::
+
+    python -m backend.benchmarks.task_queue --tasks 10000
+"""
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+from sqlalchemy import insert, select, update
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+from backend.benchmarks.common import print_table
+from backend.crud.task_transitions import TRANSITIONS
+from backend.database import Base
+from backend.enums import TaskStatusEnum
+from backend.services.task_queue_service import (
+    DEPENDENCIES, FINAL_STATUSES, REQUIREMENTS, TASKS, TaskQueueService,
+)
+
+CLAIMS = 50
+PAGE = 100
+
+
+async def seed(engine, tasks: int, project: str) -> None:
+    start = datetime(2025, 1, 1)
+    rows, edges = [], []
+    for n in range(1, tasks + 1):
+        rows.append({
+            "project_id": project, "task_number": n, "title": f"task {n}",
+            "status": TaskStatusEnum.TO_DO, "priority": "medium", "priority_rank": 2,
+            "is_archived": False, "created_at": start + timedelta(seconds=n),
+            "updated_at": start,
+        })
+        if n % 20:  # all but every 20th task wait on the previous one
+            edges.append({
+                "predecessor_project_id": project,
+                "predecessor_task_number": n - 1 or tasks,
+                "successor_project_id": project, "successor_task_number": n,
+            })
+    async with engine.begin() as conn:
+        await conn.execute(insert(TASKS), rows)
+        await conn.execute(insert(DEPENDENCIES), edges)
+
+
+async def poll_and_update(db: AsyncSession, project: str) -> None:
+    skip = 0
+    while True:
+        page = (await db.execute(
+            select(TASKS.c.task_number)
+            .where(
+                TASKS.c.project_id == project, TASKS.c.status == TaskStatusEnum.TO_DO
+            )
+            .order_by(TASKS.c.created_at).offset(skip).limit(PAGE)
+        )).scalars().all()
+        if not page:
+            return
+        for number in page:
+            predecessors = (await db.execute(
+                select(TASKS.c.status).join(DEPENDENCIES, (
+                    (DEPENDENCIES.c.predecessor_project_id == TASKS.c.project_id)
+                    & (DEPENDENCIES.c.predecessor_task_number == TASKS.c.task_number)
+                )).where(DEPENDENCIES.c.successor_project_id == project,
+                         DEPENDENCIES.c.successor_task_number == number)
+            )).scalars().all()
+            if all(status in FINAL_STATUSES for status in predecessors):
+                await db.execute(update(TASKS).where(
+                    TASKS.c.project_id == project, TASKS.c.task_number == number,
+                ).values(status=TaskStatusEnum.IN_PROGRESS))
+                await db.commit()
+                return
+        skip += PAGE
+
+
+async def run(tasks: int) -> list:
+    results = []
+    with tempfile.TemporaryDirectory() as workdir:
+        engine = create_async_engine(
+            f"sqlite+aiosqlite:///{os.path.join(workdir, 'bench.db')}"
+        )
+        async with engine.begin() as conn:
+            await conn.run_sync(
+                Base.metadata.create_all,
+                tables=[TASKS, DEPENDENCIES, REQUIREMENTS, TRANSITIONS],
+            )
+        await seed(engine, tasks, "polled")
+        await seed(engine, tasks, "claimed")
+        async with AsyncSession(engine) as db:
+            started = time.perf_counter()
+            for _ in range(CLAIMS):
+                await poll_and_update(db, "polled")
+            results.append({"strategy": "poll_list_and_check", "ms_per_task": round(
+                (time.perf_counter() - started) * 1000 / CLAIMS, 2)})
+            queue = TaskQueueService(db)
+            started = time.perf_counter()
+            for _ in range(CLAIMS):
+                await queue.claim("bench-agent", project_id="claimed")
+            results.append({"strategy": "claim", "ms_per_task": round(
+                (time.perf_counter() - started) * 1000 / CLAIMS, 2)})
+        await engine.dispose()
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--tasks", type=int, default=10000)
+    args = parser.parse_args()
+    print_table(asyncio.run(run(args.tasks)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,152 @@
+"""
+Project template instantiation benchmark.
+
+Stores a template of N tasks (each depending on the one before it, every
+fifth with a comment) and applies it: the way a client would today, with a
+call per task, dependency and comment (each its own transaction, task
+numbers read with ``max()``), and with
+:meth:`ProjectTemplateService.instantiate_template`, cold (parsing the
+template and loading status rules) and warm.
+
+Usage::
+
+    python -m backend.benchmarks.template_instantiation --tasks 500
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import tempfile
+import time
+from datetime import datetime
+
+from sqlalchemy import func, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from backend.benchmarks.common import print_table
+from backend.crud.task_transitions import TRANSITIONS, record_transitions
+from backend.database import Base
+from backend.enums import TaskStatusEnum
+from backend.models.base import generate_uuid_with_hyphens
+from backend.services.project_template_service import (
+    COMMENTS, DEPENDENCIES, PROJECTS, TASKS, TEMPLATES, ProjectTemplateService,
+    template_definitions,
+)
+from backend.services.status_transition_service import (
+    REGISTRY, RULES, VALUES, status_machines,
+)
+
+WARM_RUNS = 10
+
+
+def template(count: int) -> dict:
+    return {"project": {"description": "bench"}, "tasks": [
+        {"key": f"t{n}", "title": f"task {n}", "depends_on": [f"t{n - 1}"] if n else [],
+         "comments": ["check the previous step"] if n % 5 == 0 else []}
+        for n in range(count)
+    ]}
+
+
+async def row_per_call(sessions, data: dict, name: str) -> int:
+    now = datetime.utcnow()
+    project_id = generate_uuid_with_hyphens()
+    calls = 1
+    async with sessions() as db:
+        await db.execute(
+            insert(PROJECTS).values(
+                id=project_id, name=name, created_at=now, updated_at=now
+            )
+        )
+        await db.commit()
+        for task in data["tasks"]:
+            highest = await db.scalar(
+                select(func.max(TASKS.c.task_number)).where(
+                    TASKS.c.project_id == project_id
+                )
+            )
+            number = (highest or 0) + 1
+            await db.execute(insert(TASKS).values(
+                project_id=project_id, task_number=number, title=task["title"],
+                status=TaskStatusEnum.TO_DO, created_at=now, updated_at=now,
+            ))
+            await record_transitions(
+                db, [(project_id, number, None, TaskStatusEnum.TO_DO)], now=now
+            )
+            await db.commit()
+            calls += 1
+        for number, task in enumerate(data["tasks"], 1):
+            for _ in task["depends_on"]:
+                await db.execute(insert(DEPENDENCIES).values(
+                    predecessor_project_id=project_id,
+                    predecessor_task_number=number - 1, successor_project_id=project_id,
+                    successor_task_number=number, type="finishes_to_start",
+                ))
+                await db.commit()
+                calls += 1
+            for content in task["comments"]:
+                await db.execute(insert(COMMENTS).values(
+                    id=generate_uuid_with_hyphens(), content=content,
+                    task_project_id=project_id, task_task_number=number, created_at=now,
+                    updated_at=now,
+                ))
+                await db.commit()
+                calls += 1
+    return calls
+
+
+async def run(count: int) -> list:
+    data = template(count)
+    results = []
+    with tempfile.TemporaryDirectory() as workdir:
+        engine = create_async_engine(
+            f"sqlite+aiosqlite:///{os.path.join(workdir, 'bench.db')}"
+        )
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all, tables=[
+                TEMPLATES, PROJECTS, TASKS, DEPENDENCIES, COMMENTS, TRANSITIONS,
+                REGISTRY, VALUES, RULES,
+            ])
+            await conn.execute(
+                insert(TEMPLATES).values(id="t1", name="bench", template_data=data)
+            )
+        sessions = async_sessionmaker(
+            engine, class_=AsyncSession, expire_on_commit=False
+        )
+
+        started = time.perf_counter()
+        calls = await row_per_call(sessions, data, "per call")
+        results.append({
+            "case": "call_per_row", "calls": calls,
+            "ms": round((time.perf_counter() - started) * 1000, 1),
+        })
+
+        template_definitions.invalidate()
+        status_machines.invalidate()
+        timings = []
+        for run_number in range(WARM_RUNS + 1):
+            async with sessions() as db:
+                started = time.perf_counter()
+                await ProjectTemplateService(db).instantiate_template(
+                    "t1", project_name=f"bench {run_number}"
+                )
+                timings.append((time.perf_counter() - started) * 1000)
+        results.append({
+            "case": "instantiate_cold", "calls": 1, "ms": round(timings[0], 1)
+        })
+        results.append({
+            "case": "instantiate_warm_median", "calls": 1,
+            "ms": round(statistics.median(timings[1:]), 1),
+        })
+        await engine.dispose()
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--tasks", type=int, default=500)
+    args = parser.parse_args()
+    print_table(asyncio.run(run(args.tasks)), ["case", "calls", "ms"])
+
+
+if __name__ == "__main__":
+    main()
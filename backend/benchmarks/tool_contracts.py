@@ -0,0 +1,110 @@
+"""
+MCP tool contract loading and parameter validation benchmark.
+
+Compares constructing a contract-backed tool the former way — reading and
+parsing its YAML contract on every instantiation — against the per-process
+contract cache, and the former field-by-field ``validate_parameters``
+(patterns compiled per call) against the compiled Pydantic validator.
+
+Usage::
+
+    python -m backend.benchmarks.tool_contracts --repeat 500
+"""
+import argparse
+import re
+
+import yaml
+
+from backend.benchmarks.common import print_table, time_call
+from backend.mcp_tools.contracts.base_contract import (
+    BaseMCPTool, ToolContract, contract_paths,
+)
+
+CONTRACT_PATH = contract_paths("PromptLibraryTool")[0]
+PARAMETERS = {
+    "action": "create", "prompt_id": "plan_release_v2", "name": "Plan a release",
+    "content": "Plan the release of {component} for {date}.",
+    "category": "task_planning", "tags": ["release", "planning"], "limit": 20,
+    "search_query": "release",
+}
+
+
+class PromptLibraryTool(BaseMCPTool):
+    async def execute(self, parameters, context=None):
+        return parameters
+
+
+def parse_contract() -> ToolContract:
+    """What every instantiation used to do."""
+    with open(CONTRACT_PATH) as handle:
+        return ToolContract(**yaml.safe_load(handle))
+
+
+def legacy_validate(contract: ToolContract, parameters: dict) -> dict:
+    """The former field-by-field validation."""
+    validated = {}
+    for param in contract.parameters:
+        if param.required and param.name not in parameters:
+            raise ValueError(param.name)
+        if param.name in parameters:
+            value = parameters[param.name]
+            if param.type == "string" and not isinstance(value, str):
+                raise ValueError(param.name)
+            if param.type == "integer" and not isinstance(value, int):
+                raise ValueError(param.name)
+            if param.type == "string":
+                if param.min_length and len(value) < param.min_length:
+                    raise ValueError(param.name)
+                if param.max_length and len(value) > param.max_length:
+                    raise ValueError(param.name)
+                if param.pattern and not re.match(param.pattern, value):
+                    raise ValueError(param.name)
+            if param.type == "integer":
+                if param.min_value and value < param.min_value:
+                    raise ValueError(param.name)
+                if param.max_value and value > param.max_value:
+                    raise ValueError(param.name)
+            if param.enum and value not in param.enum:
+                raise ValueError(param.name)
+            validated[param.name] = value
+        elif param.default is not None:
+            validated[param.name] = param.default
+    return validated
+
+
+def run(repeat: int) -> list:
+    contract = parse_contract()
+    tool = PromptLibraryTool()
+
+    def per_call(fn):
+        return lambda: [fn() for _ in range(repeat)]
+
+    cases = [
+        ("construct_parse_yaml", per_call(parse_contract)),
+        ("construct_cached", per_call(PromptLibraryTool)),
+        (
+            "validate_field_by_field",
+            per_call(lambda: legacy_validate(contract, PARAMETERS)),
+        ),
+        ("validate_compiled", per_call(lambda: tool.validate_parameters(PARAMETERS))),
+    ]
+    return [
+        {
+            "case": name,
+            "us_per_call": round(
+                time_call(fn, repeat=3)["median_ms"] * 1000 / repeat, 2
+            ),
+        }
+        for name, fn in cases
+    ]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--repeat", type=int, default=500)
+    args = parser.parse_args()
+    print_table(run(args.repeat))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,165 @@
+"""
+Multi-worker throughput benchmark.
+
+Starts ``uvicorn --factory backend.app_factory:create_app`` with 1, 2, 4 and
+8 workers against a seeded temporary SQLite database, drives it from several
+client processes for a fixed duration and reports requests per second and
+p50/p99 latency for a health check and a project list page.
+
+Usage::
+
+    python -m backend.benchmarks.workers --workers 1 2 4 8 --clients 8 --duration 10
+"""
+import argparse
+import datetime
+import multiprocessing
+import os
+import shutil
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import uuid
+from typing import Dict, List
+
+from backend.benchmarks.common import print_table
+
+ENDPOINTS = {
+    "health": "/health",
+    "projects": "/api/v1/projects/?limit=50",
+}
+
+
+def seed(path: str, project_count: int) -> None:
+    from sqlalchemy import create_engine, insert
+
+    from backend.database import Base
+    from backend.models import Project, load_all_models
+
+    load_all_models()
+    engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(engine)
+    now = datetime.datetime.now(datetime.timezone.utc)
+    with engine.begin() as conn:
+        conn.execute(insert(Project.__table__), [
+            {
+                "id": uuid.uuid4().hex, "name": f"Project {n}",
+                "description": f"Benchmark project {n}", "task_count": 0,
+                "is_archived": False, "created_at": now, "updated_at": now,
+            }
+            for n in range(project_count)
+        ])
+    engine.dispose()
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_server(workers: int, port: int, env: Dict[str, str]) -> subprocess.Popen:
+    root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    process = subprocess.Popen(
+        [
+            sys.executable, "-m", "uvicorn", "backend.app_factory:create_app",
+            "--factory", "--workers", str(workers), "--host", "127.0.0.1", "--port",
+            str(port), "--log-level", "warning",
+        ],
+        cwd=root, env=env,
+    )
+    wait_until_ready(port, workers)
+    return process
+
+
+def wait_until_ready(port: int, workers: int, timeout: float = 60.0) -> None:
+    import httpx
+
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            health = httpx.get(f"http://127.0.0.1:{port}/health", timeout=1)
+            if health.status_code == 200:
+                # Give the remaining workers time to finish their startup.
+                time.sleep(0.5 * workers)
+                return
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.2)
+    raise RuntimeError(f"Server on port {port} did not become ready")
+
+
+def client(args) -> List[float]:
+    """Issue requests back to back until ``duration`` elapses; return ms latencies."""
+    import httpx
+
+    url, duration = args
+    latencies = []
+    with httpx.Client(timeout=10) as session:
+        deadline = time.perf_counter() + duration
+        while time.perf_counter() < deadline:
+            start = time.perf_counter()
+            session.get(url).raise_for_status()
+            latencies.append((time.perf_counter() - start) * 1000)
+    return latencies
+
+
+def measure(port: int, path: str, clients: int, duration: float) -> dict:
+    url = f"http://127.0.0.1:{port}{path}"
+    with multiprocessing.Pool(clients) as pool:
+        per_client = pool.map(client, [(url, duration)] * clients)
+    latencies = sorted(sample for samples in per_client for sample in samples)
+    return {
+        "requests": len(latencies),
+        "req_per_s": round(len(latencies) / duration, 1),
+        "p50_ms": round(statistics.median(latencies), 2),
+        "p99_ms": round(latencies[int(len(latencies) * 0.99) - 1], 2),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--clients", type=int, default=8)
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--projects", type=int, default=500)
+    parser.add_argument("--profile", default="core")
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="bench-workers-")
+    db_path = os.path.join(workdir, "bench.db")
+    seed(db_path, args.projects)
+
+    results = []
+    try:
+        for workers in args.workers:
+            metrics_dir = os.path.join(workdir, f"prometheus-{workers}")
+            os.makedirs(metrics_dir)
+            env = dict(
+                os.environ,
+                DATABASE_URL=f"sqlite+aiosqlite:///{db_path}",
+                APP_PROFILE=args.profile,
+                WEB_CONCURRENCY=str(workers),
+                SHARED_STATE_DIR=os.path.join(workdir, "shared_state"),
+                PROMETHEUS_MULTIPROC_DIR=metrics_dir,
+            )
+            port = free_port()
+            server = start_server(workers, port, env)
+            try:
+                for name, path in ENDPOINTS.items():
+                    results.append({
+                        "workers": workers, "endpoint": name,
+                        **measure(port, path, args.clients, args.duration),
+                    })
+            finally:
+                server.terminate()
+                server.wait(timeout=30)
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+    print_table(results)
+
+
+if __name__ == "__main__":
+    main()
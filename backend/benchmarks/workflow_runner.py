@@ -0,0 +1,138 @@
+"""
+Workflow runner benchmark.
+
+Starts N executions of a four-step workflow spread over a set of agents,
+then advances every open execution one step at a time until all complete,
+writing state after every change (one transaction each) against the
+runner's batched flush every ``--batch`` changes. Also times
+:meth:`WorkflowRunner.resume` of N in-flight executions after a restart.
+
+Usage::
+
+    python -m backend.benchmarks.workflow_runner --executions 5000 --agents 50
+"""
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from backend.benchmarks.common import print_table
+from backend.database import Base
+from backend.services.workflow_runner import (
+    AGENTS, COMMANDS, EXECUTIONS, LEASES, STEPS, TASKS, WorkflowRunner,
+)
+
+STEP_TITLES = ("plan", "implement", "review", "ship")
+
+
+async def database(path: str, count: int, agents: int):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+    async with engine.begin() as conn:
+        await conn.run_sync(
+            Base.metadata.create_all,
+            tables=[TASKS, AGENTS, STEPS, EXECUTIONS, COMMANDS, LEASES],
+        )
+        await conn.execute(insert(STEPS), [
+            {"id": f"s{n}", "workflow_id": "w1", "agent_role_id": "r1", "step_order": n,
+             "title": title, "is_active": True}
+            for n, title in enumerate(STEP_TITLES)
+        ])
+        await conn.execute(insert(TASKS), [
+            {"project_id": "bench", "task_number": n + 1, "title": f"task {n + 1}"}
+            for n in range(count)
+        ])
+        await conn.execute(insert(AGENTS), [
+            {"id": f"agent-{n}", "name": f"agent-{n}"} for n in range(agents)
+        ])
+    return engine, async_sessionmaker(
+        engine, class_=AsyncSession, expire_on_commit=False
+    )
+
+
+async def drive(runner: WorkflowRunner, count: int, agents: int, batch: int) -> int:
+    """Run every execution to completion; returns the number of state changes."""
+    changes = 0
+
+    async def changed() -> None:
+        nonlocal changes
+        changes += 1
+        if changes % batch == 0:
+            await runner.flush()
+
+    statuses = {}
+    for n in range(count):
+        started = await runner.start_execution(
+            "w1", "bench", n + 1, agent_id=f"agent-{n % agents}"
+        )
+        statuses[started["id"]] = started["status"]
+        await changed()
+    while True:
+        running = [i for i, status in statuses.items() if status == "in_progress"]
+        if not running:
+            break
+        for execution_id in running:
+            advanced = await runner.advance(execution_id, "completed")
+            statuses[execution_id] = advanced["status"]
+            await changed()
+    await runner.flush()
+    return changes
+
+
+async def run(count: int, agents: int, batch: int) -> list:
+    results = []
+    with tempfile.TemporaryDirectory() as workdir:
+        for name, size in (("write_per_change", 1), (f"batched_every_{batch}", batch)):
+            engine, sessions = await database(
+                os.path.join(workdir, f"{name}.db"), count, agents
+            )
+            runner = WorkflowRunner(sessions, agent_concurrency=count)
+            await runner.tick()
+            started = time.perf_counter()
+            changes = await drive(runner, count, agents, size)
+            elapsed = time.perf_counter() - started
+            results.append({
+                "case": name, "changes": changes, "seconds": round(elapsed, 2),
+                "changes_per_s": round(changes / elapsed),
+            })
+            await engine.dispose()
+
+        engine, sessions = await database(
+            os.path.join(workdir, "resume.db"), count, agents
+        )
+        runner = WorkflowRunner(sessions, agent_concurrency=count)
+        await runner.tick()
+        for n in range(count):
+            await runner.start_execution(
+                "w1", "bench", n + 1, agent_id=f"agent-{n % agents}"
+            )
+        await runner.flush()
+        restarted = WorkflowRunner(sessions, agent_concurrency=count)
+        started = time.perf_counter()
+        resumed = await restarted.resume()
+        elapsed = time.perf_counter() - started
+        results.append({
+            "case": "resume_in_flight", "changes": resumed,
+            "seconds": round(elapsed, 2), "changes_per_s": round(resumed / elapsed),
+        })
+        await engine.dispose()
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--executions", type=int, default=5000)
+    parser.add_argument("--agents", type=int, default=50)
+    parser.add_argument("--batch", type=int, default=1000)
+    args = parser.parse_args()
+    print_table(
+        asyncio.run(run(args.executions, args.agents, args.batch)),
+        ["case", "changes", "seconds", "changes_per_s"],
+    )
+
+
+if __name__ == "__main__":
+    main()
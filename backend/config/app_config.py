@@ -22,6 +22,109 @@ class Settings:
             f"sqlite+aiosqlite:///{backend_dir / 'sql_app.db'}"
         )
         
+        # Multi-worker coordination. With several workers, shared counters
+        # and cache invalidation go through Redis when configured, otherwise
+        # through a SQLite file in shared_state_dir.
+        self.workers = int(os.getenv("WEB_CONCURRENCY", "1"))
+        self.redis_url = os.getenv("REDIS_URL")
+        self.shared_state_backend = os.getenv("SHARED_STATE_BACKEND", "auto")
+        self.shared_state_dir = os.getenv(
+            "SHARED_STATE_DIR", str(backend_dir / ".shared_state")
+        )
+
+        # MCP tool admission control. Per-tool rate limits and deadlines come
+        # from mcp_tools rows; these apply to tools without a row.
+        self.mcp_admission_enabled = (
+            os.getenv("MCP_ADMISSION", "true").lower() == "true"
+        )
+        self.mcp_tool_rate_limit = int(os.getenv("MCP_TOOL_RATE_LIMIT", "600"))
+        self.mcp_tool_timeout = float(os.getenv("MCP_TOOL_TIMEOUT", "30"))
+        self.mcp_agent_rate_limit = int(os.getenv("MCP_AGENT_RATE_LIMIT", "1200"))
+        self.mcp_tool_concurrency = int(os.getenv("MCP_TOOL_CONCURRENCY", "8"))
+        self.mcp_tool_queue = int(os.getenv("MCP_TOOL_QUEUE", "32"))
+
+        # Agent work queue: how long a claimed task stays leased without a
+        # heartbeat before it returns to the queue.
+        self.task_lease_seconds = int(os.getenv("TASK_LEASE_SECONDS", "300"))
+
+        # Agent performance rollups: how often new transitions, handoffs and
+        # tool executions are folded into agent_performance_metrics (0
+        # disables), and how old a row must be before it is folded in, so
+        # rows of still-open transactions are not skipped.
+        self.agent_metrics_rollup_seconds = float(
+            os.getenv("AGENT_METRICS_ROLLUP_SECONDS", "300")
+        )
+        self.agent_metrics_rollup_lag_seconds = float(
+            os.getenv("AGENT_METRICS_ROLLUP_LAG_SECONDS", "60")
+        )
+
+        # Workflow runner: whether this worker competes for the runner lease
+        # (the holder advances workflow executions), how many executions an
+        # agent runs at once, how often execution state is written, and how
+        # long the lease lasts without renewal.
+        self.workflow_runner = os.getenv("WORKFLOW_RUNNER", "true").lower() == "true"
+        self.workflow_agent_concurrency = int(
+            os.getenv("WORKFLOW_AGENT_CONCURRENCY", "4")
+        )
+        self.workflow_flush_seconds = float(os.getenv("WORKFLOW_FLUSH_SECONDS", "1.0"))
+        self.workflow_lease_seconds = float(os.getenv("WORKFLOW_LEASE_SECONDS", "30"))
+
+        # Deadline scheduler: whether this worker competes for the scheduler
+        # lease, how far ahead deadlines are loaded, how often they are
+        # reloaded, and how long the lease lasts without renewal.
+        self.deadline_scheduler = (
+            os.getenv("DEADLINE_SCHEDULER", "true").lower() == "true"
+        )
+        self.scheduler_horizon_seconds = float(
+            os.getenv("SCHEDULER_HORIZON_SECONDS", "3600")
+        )
+        self.scheduler_refill_seconds = float(
+            os.getenv("SCHEDULER_REFILL_SECONDS", "300")
+        )
+        self.scheduler_lease_seconds = float(os.getenv("SCHEDULER_LEASE_SECONDS", "60"))
+
+        # Project cloning copies tasks in task-number ranges of this size,
+        # reporting progress after each range.
+        self.project_clone_batch_size = int(
+            os.getenv("PROJECT_CLONE_BATCH_SIZE", "5000")
+        )
+
+        # Per-request log lines: the fraction of requests logged, plus every
+        # request slower than the threshold and every server error.
+        self.request_log_sample_rate = float(os.getenv("REQUEST_LOG_SAMPLE_RATE", "0"))
+        self.request_log_slow_seconds = float(
+            os.getenv("REQUEST_LOG_SLOW_SECONDS", "1.0")
+        )
+
+        # Logging pipeline (backend.core.structured_logging): records go
+        # through a bounded queue to a listener thread that writes them.
+        self.log_pipeline = os.getenv("LOG_PIPELINE", "true").lower() == "true"
+        self.log_level = os.getenv("LOG_LEVEL")
+        self.log_format = os.getenv("LOG_FORMAT", "json")
+        self.log_file = os.getenv("LOG_FILE")
+        self.log_max_bytes = int(os.getenv("LOG_MAX_BYTES", str(10 * 1024 * 1024)))
+        self.log_backup_count = int(os.getenv("LOG_BACKUP_COUNT", "5"))
+        self.log_sampling = os.getenv("LOG_SAMPLING")
+        self.log_queue_size = int(os.getenv("LOG_QUEUE_SIZE", "10000"))
+
+        # Re-read MCP tool contract YAML files when they change (development).
+        self.mcp_contract_reload = (
+            os.getenv("MCP_CONTRACT_RELOAD", "false").lower() == "true"
+        )
+
+        # Directory holding a build-time OpenAPI artifact written by
+        # ``python -m backend.core.catalogue --out DIR``; unset to generate
+        # the document at startup.
+        self.catalogue_dir = os.getenv("CATALOGUE_DIR")
+
+        # Semantic memory search: a local sentence-transformers model name,
+        # or unset for the built-in hashing embedder.
+        self.embedding_model = os.getenv("EMBEDDING_MODEL")
+        self.embedding_dimensions = int(os.getenv("EMBEDDING_DIMENSIONS", "384"))
+        self.semantic_index_dir = os.getenv(
+            "SEMANTIC_INDEX_DIR", str(backend_dir / ".semantic_index")
+        )
+
         # Security (simplified)
         self.secret_key = os.getenv(
             "SECRET_KEY", 
@@ -43,10 +146,6 @@ settings = get_settings()
 
 
 def configure_logging() -> None:
-    """Configure application logging."""
-    import logging
-    level = logging.INFO if settings.debug else logging.WARNING
-    logging.basicConfig(
-        level=level,
-        format="%(asctime)s - %(name)s - %(levelname)s - %(message)s"
-    )
\ No newline at end of file
+    """Configure application logging through the queue-backed pipeline."""
+    from backend.core.structured_logging import start_logging
+    start_logging()
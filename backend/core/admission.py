@@ -0,0 +1,273 @@
+"""
+Admission control for MCP tool calls.
+
+Every ``/mcp-tools`` endpoint runs through ``track_tool_usage``, which hands
+the call to the process-wide :class:`AdmissionController`:
+
+1. Rate limits. Token buckets that refill continuously: one per (tool,
+   agent) sized from the tool's ``mcp_tools.rate_limit_per_minute``, and one
+   per agent across all tools (``MCP_AGENT_RATE_LIMIT``). An empty bucket
+   rejects the call with the time until its next token.
+2. Load shedding. When every connection in the database pool is checked
+   out, or the tool's wait queue is full, the call is rejected at once
+   instead of queueing behind work that is already late.
+3. Concurrency. At most ``MCP_TOOL_CONCURRENCY`` calls of one tool run at a
+   time in a worker; up to ``MCP_TOOL_QUEUE`` more wait for a slot.
+4. Deadline. The call is cancelled after the tool's ``timeout_seconds``,
+   time spent queued included.
+
+Limits are read from ``mcp_tools`` and cached for ``LIMITS_TTL`` seconds, or
+until a worker invalidates ``TOOL_LIMITS_NAME`` through shared state.
+Buckets live in process memory, or in Redis when shared state uses Redis,
+so that rate limits hold across workers. Concurrency is always per worker.
+"""
+import asyncio
+import logging
+import time
+from collections import defaultdict
+from contextvars import ContextVar
+from typing import Any, Awaitable, Callable, Dict, NamedTuple, Optional, Tuple
+
+from sqlalchemy import select
+
+from .async_utils import async_timeout
+from .shared_state import get_shared_state
+
+try:
+    from backend.config.app_config import settings
+except ImportError:
+    from config.app_config import settings
+
+logger = logging.getLogger(__name__)
+
+LIMITS_TTL = 60.0
+TOOL_LIMITS_NAME = "mcp_tool_limits"
+BUCKET_PRUNE_SIZE = 10000
+ANONYMOUS_AGENT = "anonymous"
+
+# Agent making the current request, bound from the X-Agent-Id header.
+current_agent: ContextVar[Optional[str]] = ContextVar("mcp_agent", default=None)
+
+
+class ToolLimits(NamedTuple):
+    rate_per_minute: int
+    timeout_seconds: float
+
+
+class Overloaded(Exception):
+    """The call was not admitted; retry after ``retry_after`` seconds."""
+
+    def __init__(self, reason: str, retry_after: float):
+        super().__init__(reason)
+        self.reason = reason
+        self.retry_after = retry_after
+
+
+class LocalRateLimiter:
+    """Token buckets in process memory; limits apply per worker."""
+
+    name = "local"
+
+    def __init__(self) -> None:
+        self._buckets: Dict[str, Tuple[float, float]] = {}
+
+    async def take(self, key: str, per_minute: int) -> float:
+        """Take a token from ``key``; return 0, or the seconds until one is due."""
+        now = time.monotonic()
+        tokens, stamp = self._buckets.get(key, (float(per_minute), now))
+        tokens = min(float(per_minute), tokens + (now - stamp) * per_minute / 60)
+        wait = 0.0
+        if tokens >= 1:
+            tokens -= 1
+        else:
+            wait = (1 - tokens) * 60 / per_minute
+        if key not in self._buckets and len(self._buckets) >= BUCKET_PRUNE_SIZE:
+            self._prune(now)
+        self._buckets[key] = (tokens, now)
+        return wait
+
+    def _prune(self, now: float) -> None:
+        # A bucket untouched for a minute has refilled; dropping it is lossless.
+        self._buckets = {
+            key: value for key, value in self._buckets.items() if now - value[1] < 60
+        }
+
+
+class RedisRateLimiter:
+    """Token buckets in Redis hashes, shared by every worker."""
+
+    name = "redis"
+
+    # Refill, take and store in one round trip; atomic per bucket.
+    SCRIPT = """
+local rate = tonumber(ARGV[1])
+local now = tonumber(ARGV[2])
+local bucket = redis.call('HMGET', KEYS[1], 'tokens', 'stamp')
+local tokens = tonumber(bucket[1]) or rate
+local stamp = tonumber(bucket[2]) or now
+tokens = math.min(rate, tokens + math.max(0, now - stamp) * rate / 60)
+local wait = 0
+if tokens >= 1 then tokens = tokens - 1 else wait = (1 - tokens) * 60 / rate end
+redis.call('HSET', KEYS[1], 'tokens', tokens, 'stamp', now)
+redis.call('EXPIRE', KEYS[1], 120)
+return tostring(wait)
+"""
+
+    def __init__(self, manager=None, prefix: str = "taskmanager:bucket:") -> None:
+        if manager is None:
+            from backend.core.async_utils import async_redis
+
+            manager = async_redis
+        self.manager = manager
+        self.prefix = prefix
+
+    async def take(self, key: str, per_minute: int) -> float:
+        client = await self.manager.get_redis()
+        return float(await client.eval(
+            self.SCRIPT, 1, self.prefix + key, per_minute, time.time()
+        ))
+
+
+def create_rate_limiter():
+    """Redis buckets when shared state is on Redis, in-process ones otherwise."""
+    backend = get_shared_state().backend
+    if backend.name == "redis":
+        return RedisRateLimiter(backend.manager)
+    return LocalRateLimiter()
+
+
+class AdmissionController:
+    """Rate limits, load shedding, bounded concurrency and deadlines per tool."""
+
+    def __init__(
+        self, limiter=None, session_factory=None, engine=None,
+        enabled: Optional[bool] = None,
+    ):
+        self.limiter = limiter
+        self.session_factory = session_factory
+        self.engine = engine
+        self.enabled = settings.mcp_admission_enabled if enabled is None else enabled
+        self._limits: Dict[str, ToolLimits] = {}
+        self._loaded_at: Optional[float] = None
+        self._lock = asyncio.Lock()
+        self._listening = False
+        self._slots: Dict[str, asyncio.Semaphore] = {}
+        self._waiting: Dict[str, int] = defaultdict(int)
+
+    def invalidate(self) -> None:
+        """Reload limits from ``mcp_tools`` on next use."""
+        self._loaded_at = None
+
+    async def limits_for(self, tool: str) -> ToolLimits:
+        if self._stale():
+            async with self._lock:
+                if self._stale():
+                    await self._load()
+        return self._limits.get(tool) or ToolLimits(
+            settings.mcp_tool_rate_limit, settings.mcp_tool_timeout
+        )
+
+    def _stale(self) -> bool:
+        return (
+            self._loaded_at is None
+            or time.monotonic() - self._loaded_at > LIMITS_TTL
+        )
+
+    async def _load(self) -> None:
+        from backend import models
+
+        if not self._listening:
+            get_shared_state().on_invalidate(TOOL_LIMITS_NAME, self.invalidate)
+            self._listening = True
+        if self.session_factory is None:
+            from backend.database import async_session_maker
+
+            self.session_factory = async_session_maker
+        table = models.MCPTool.__table__
+        try:
+            async with self.session_factory() as db:
+                rows = (await db.execute(
+                    select(
+                        table.c.name, table.c.rate_limit_per_minute,
+                        table.c.timeout_seconds,
+                    )
+                )).all()
+            self._limits = {
+                row.name: ToolLimits(
+                    row.rate_limit_per_minute, float(row.timeout_seconds)
+                )
+                for row in rows
+            }
+        except Exception as e:
+            logger.warning(f"Could not load MCP tool limits, using defaults: {e}")
+        self._loaded_at = time.monotonic()
+
+    async def run(
+        self, tool: str, agent: Optional[str], func: Callable[..., Awaitable[Any]],
+        *args, **kwargs
+    ):
+        """Admit and run ``func(*args, **kwargs)`` as a call to ``tool`` by ``agent``.
+
+        Raises :class:`Overloaded` when the call is rejected and
+        :class:`asyncio.TimeoutError` when it exceeds the tool's deadline.
+        """
+        if not self.enabled:
+            return await func(*args, **kwargs)
+        limits = await self.limits_for(tool)
+        await self._check_rates(tool, agent or ANONYMOUS_AGENT, limits)
+        self._check_pool()
+        return await async_timeout(limits.timeout_seconds)(self._run_in_slot)(
+            tool, func, args, kwargs
+        )
+
+    async def _check_rates(self, tool: str, agent: str, limits: ToolLimits) -> None:
+        if self.limiter is None:
+            self.limiter = create_rate_limiter()
+        buckets = (
+            (f"agent:{agent}", settings.mcp_agent_rate_limit, f"agent {agent}"),
+            (
+                f"tool:{tool}:{agent}", limits.rate_per_minute,
+                f"{tool} by agent {agent}",
+            ),
+        )
+        for key, per_minute, label in buckets:
+            if per_minute <= 0:
+                continue
+            try:
+                wait = await self.limiter.take(key, per_minute)
+            except Exception as e:
+                logger.warning(f"Rate limiter unavailable, admitting {tool}: {e}")
+                return
+            if wait:
+                raise Overloaded(f"Rate limit exceeded for {label}", wait)
+
+    def _check_pool(self) -> None:
+        if self.engine is None:
+            from backend.database import engine
+
+            self.engine = engine
+        pool = self.engine.pool
+        max_overflow = getattr(pool, "_max_overflow", None)
+        if not hasattr(pool, "checkedout") or max_overflow is None or max_overflow < 0:
+            return  # no fixed ceiling (SQLite StaticPool, unbounded overflow)
+        if pool.checkedout() >= pool.size() + max_overflow:
+            raise Overloaded("Database connection pool is saturated", 1.0)
+
+    async def _run_in_slot(self, tool: str, func, args, kwargs):
+        slots = self._slots.get(tool)
+        if slots is None:
+            slots = self._slots[tool] = asyncio.Semaphore(settings.mcp_tool_concurrency)
+        if slots.locked() and self._waiting[tool] >= settings.mcp_tool_queue:
+            raise Overloaded(f"Too many queued calls to {tool}", 1.0)
+        self._waiting[tool] += 1
+        try:
+            await slots.acquire()
+        finally:
+            self._waiting[tool] -= 1
+        try:
+            return await func(*args, **kwargs)
+        finally:
+            slots.release()
+
+
+admission = AdmissionController()
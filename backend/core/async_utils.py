@@ -5,10 +5,17 @@ from functools import wraps
 from contextlib import asynccontextmanager
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
 from sqlalchemy.pool import QueuePool
-import redis.asyncio as redis
 import time
 
-from config.app_config import settings
+try:  # pragma: no cover - optional dependency
+    import redis.asyncio as redis
+except ImportError:  # pragma: no cover - redis missing
+    redis = None
+
+try:
+    from backend.config.app_config import settings
+except ImportError:
+    from config.app_config import settings
 
 logger = logging.getLogger(__name__)
 
@@ -74,7 +81,8 @@ async_db = AsyncDatabaseManager()
 class AsyncRedisManager:
     """Async Redis connection manager."""
     
-    def __init__(self):
+    def __init__(self, url: Optional[str] = None):
+        self.url = url
         self.redis_pool = None
         self._initialized = False
     
@@ -82,9 +90,11 @@ class AsyncRedisManager:
         """Initialize Redis connection pool."""
         if self._initialized:
             return
+        if redis is None:
+            raise RuntimeError("redis is not installed; install 'redis' to use AsyncRedisManager")
         
         self.redis_pool = redis.ConnectionPool.from_url(
-            f"redis://{settings.REDIS_HOST}:{settings.REDIS_PORT}",
+            self.url or settings.redis_url or "redis://localhost:6379/0",
             max_connections=20,
             retry_on_timeout=True,
             decode_responses=True
@@ -93,7 +103,7 @@ class AsyncRedisManager:
         self._initialized = True
         logger.info("Async Redis manager initialized")
     
-    async def get_redis(self) -> redis.Redis:
+    async def get_redis(self) -> "redis.Redis":
         """Get Redis connection."""
         if not self._initialized:
             await self.initialize()
@@ -0,0 +1,296 @@
+"""
+Precomputed OpenAPI document and MCP tool catalogue.
+
+Generating the OpenAPI document walks every route and model and takes about
+100 ms for the full profile; the tool catalogue used to walk the routes and
+parse docstrings on every call. Both are now built once per process (the
+app lifespan warms them at startup) and kept as serialized bytes with a
+strong ETag and a precompressed copy per supported encoding. A request with
+a matching ``If-None-Match`` gets ``304 Not Modified``; any other gets the
+stored bytes without re-serializing or re-compressing them. A list of just
+some tools is joined from entries serialized at build time and left to the
+compression middleware, so varying selections cost no encoder passes here.
+
+The catalogue has two levels of detail: ``compact`` (name, method, path and
+a one-line description per tool) for discovery, and ``full`` with each
+tool's input schema, ``$ref`` targets inlined. Agents can fetch the compact
+list first and full schemas for just the tools they call.
+
+``python -m backend.core.catalogue --out DIR`` writes the OpenAPI document
+to ``DIR/catalogue-<version>.json`` at build time. With ``CATALOGUE_DIR``
+pointing at that directory the server loads it instead of generating it,
+provided its route fingerprint still matches the running app.
+"""
+import argparse
+import hashlib
+import logging
+import os
+import time
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional
+
+import orjson
+from fastapi import FastAPI
+from fastapi.routing import APIRoute
+from starlette.requests import Request
+from starlette.responses import Response
+from starlette.routing import Route
+
+from .compression import available_encoders, negotiate_encoding
+from .responses import dumps
+
+try:
+    from backend.config.app_config import settings
+except ImportError:
+    from config.app_config import settings
+
+logger = logging.getLogger(__name__)
+
+TOOL_TAG = "mcp-tools"
+SCHEMA_REF_PREFIX = "#/components/schemas/"
+
+
+class Artifact(NamedTuple):
+    """Serialized JSON with its ETag and precompressed variants."""
+    body: bytes
+    etag: str
+    encoded: Dict[str, bytes]
+
+
+def make_etag(body: bytes) -> str:
+    return '"%s"' % hashlib.sha256(body).hexdigest()[:32]
+
+
+def make_artifact(content: Any) -> Artifact:
+    body = dumps(content)
+    encoded = {}
+    for coding, factory in available_encoders().items():
+        encoder = factory()
+        encoded[coding] = encoder.compress(body) + encoder.finish()
+    return Artifact(body, make_etag(body), encoded)
+
+
+def artifact_response(artifact: Artifact, request: Request) -> Response:
+    """Serve ``artifact``: 304 on a matching ETag, else precompressed bytes."""
+    headers = {
+        "ETag": artifact.etag, "Cache-Control": "no-cache", "Vary": "Accept-Encoding"
+    }
+    if_none_match = request.headers.get("if-none-match", "")
+    if if_none_match.strip() == "*" or artifact.etag in (
+        tag.strip().removeprefix("W/") for tag in if_none_match.split(",")
+    ):
+        return Response(status_code=304, headers=headers)
+    coding = negotiate_encoding(
+        request.headers.get("accept-encoding", ""), list(artifact.encoded)
+    )
+    if coding is None:
+        return Response(artifact.body, media_type="application/json", headers=headers)
+    headers["Content-Encoding"] = coding
+    return Response(
+        artifact.encoded[coding], media_type="application/json", headers=headers
+    )
+
+
+def tool_routes(app: FastAPI) -> List[APIRoute]:
+    return [
+        route for route in app.routes
+        if isinstance(route, APIRoute) and route.include_in_schema
+        and route.operation_id and TOOL_TAG in (route.tags or ())
+    ]
+
+
+def route_fingerprint(app: FastAPI) -> str:
+    """Hash of every documented route; changes whenever the API surface does."""
+    lines = sorted(
+        f"{','.join(sorted(route.methods))} {route.path_format} "
+        f"{route.operation_id or route.name}"
+        for route in app.routes
+        if isinstance(route, APIRoute) and route.include_in_schema
+    )
+    return hashlib.sha256(
+        f"{app.version}\n".encode() + "\n".join(lines).encode()
+    ).hexdigest()
+
+
+def _inline(node: Any, components: Dict[str, Any], seen: tuple = ()) -> Any:
+    if isinstance(node, dict):
+        ref = node.get("$ref")
+        if isinstance(ref, str) and ref.startswith(SCHEMA_REF_PREFIX):
+            name = ref[len(SCHEMA_REF_PREFIX):]
+            if name in seen:  # recursive model; stop at one level
+                return {"type": "object", "title": name}
+            return _inline(components.get(name, {}), components, seen + (name,))
+        return {key: _inline(value, components, seen) for key, value in node.items()}
+    if isinstance(node, list):
+        return [_inline(item, components, seen) for item in node]
+    return node
+
+
+def input_schema(
+    operation: Dict[str, Any], components: Dict[str, Any]
+) -> Dict[str, Any]:
+    """One JSON schema object for a tool's query, path and body arguments.
+
+    Body model fields sit at the top level, the same shape the batch
+    endpoint accepts as ``args``.
+    """
+    properties: Dict[str, Any] = {}
+    required: List[str] = []
+    for parameter in operation.get("parameters", ()):
+        if parameter.get("in") not in ("query", "path"):
+            continue
+        schema = dict(parameter.get("schema", {}))
+        if parameter.get("description"):
+            schema.setdefault("description", parameter["description"])
+        properties[parameter["name"]] = schema
+        if parameter.get("required"):
+            required.append(parameter["name"])
+    content = operation.get("requestBody", {}).get("content", {})
+    body = content.get("application/json", {}).get("schema")
+    if body:
+        body = _inline(body, components)
+        if body.get("type") == "object" and "properties" in body:
+            properties.update(body["properties"])
+            required.extend(body.get("required", ()))
+        else:
+            properties["body"] = body
+            required.append("body")
+    return _inline(
+        {"type": "object", "properties": properties, "required": required}, components
+    )
+
+
+class Catalogue:
+    """The OpenAPI document and tool catalogue of one app, serialized once."""
+
+    def __init__(self, app: FastAPI, openapi: Dict[str, Any]):
+        self.openapi = make_artifact(openapi)
+        components = openapi.get("components", {}).get("schemas", {})
+        self.compact: Dict[str, Dict[str, Any]] = {}
+        self.full: Dict[str, Dict[str, Any]] = {}
+        for route in tool_routes(app):
+            method = sorted(route.methods)[0]
+            path_item = openapi.get("paths", {}).get(route.path_format, {})
+            operation = path_item.get(method.lower(), {})
+            description = (
+                operation.get("description") or operation.get("summary") or ""
+            ).strip()
+            entry = {
+                "name": route.operation_id,
+                "method": method,
+                "path": route.path_format,
+                "description": description.split("\n")[0] or "No description",
+            }
+            self.compact[route.operation_id] = entry
+            self.full[route.operation_id] = {
+                **entry, "input_schema": input_schema(operation, components)
+            }
+        self._serialized = {
+            "compact": {name: dumps(entry) for name, entry in self.compact.items()},
+            "full": {name: dumps(entry) for name, entry in self.full.items()},
+        }
+        self._lists = {
+            "compact": make_artifact({
+                "success": True, "tools": list(self.compact.values())
+            }),
+            "full": make_artifact({"success": True, "tools": list(self.full.values())}),
+        }
+
+    def tools(
+        self, detail: str = "compact", names: Optional[Iterable[str]] = None
+    ) -> Artifact:
+        """The catalogue at ``detail``, optionally only the tools in ``names``."""
+        if not names:
+            return self._lists[detail]
+        entries = self._serialized["full" if detail == "full" else "compact"]
+        tools = b",".join(entries[name] for name in names if name in entries)
+        body = b'{"success":true,"tools":[' + tools + b"]}"
+        return Artifact(body, make_etag(body), {})
+
+
+def _artifact_path(app: FastAPI, directory: str) -> str:
+    return os.path.join(directory, f"catalogue-{app.version}.json")
+
+
+def _load_openapi(app: FastAPI) -> Dict[str, Any]:
+    directory = settings.catalogue_dir
+    if directory:
+        path = _artifact_path(app, directory)
+        try:
+            with open(path, "rb") as handle:
+                stored = orjson.loads(handle.read())
+            if stored.get("fingerprint") == route_fingerprint(app):
+                app.openapi_schema = stored["openapi"]
+                return app.openapi_schema
+            logger.warning(
+                f"{path} does not match the running routes; "
+                "regenerating the OpenAPI document"
+            )
+        except FileNotFoundError:
+            logger.warning(
+                f"No catalogue artifact at {path}; generating the OpenAPI document"
+            )
+        except Exception as e:
+            logger.warning(f"Could not load {path}: {e}")
+    return app.openapi()
+
+
+def catalogue_for(app: FastAPI) -> Catalogue:
+    """Return ``app``'s :class:`Catalogue`, building it on first use."""
+    catalogue = getattr(app.state, "catalogue", None)
+    if catalogue is None:
+        started = time.perf_counter()
+        catalogue = app.state.catalogue = Catalogue(app, _load_openapi(app))
+        logger.info(
+            "Built tool catalogue (%d tools, OpenAPI %d KB) in %.1f ms",
+            len(catalogue.compact), len(catalogue.openapi.body) // 1024,
+            (time.perf_counter() - started) * 1000,
+        )
+    return catalogue
+
+
+def serve_openapi(app: FastAPI) -> None:
+    """Serve ``app.openapi_url`` from the precomputed catalogue."""
+    if not app.openapi_url:
+        return
+
+    async def openapi(request: Request) -> Response:
+        return artifact_response(catalogue_for(request.app).openapi, request)
+
+    for index, route in enumerate(app.router.routes):
+        if isinstance(route, Route) and route.path == app.openapi_url:
+            app.router.routes[index] = Route(
+                app.openapi_url, openapi, include_in_schema=False
+            )
+
+
+def write_artifact(app: FastAPI, directory: str) -> str:
+    """Write ``app``'s OpenAPI document for loading through ``CATALOGUE_DIR``."""
+    os.makedirs(directory, exist_ok=True)
+    path = _artifact_path(app, directory)
+    with open(path, "wb") as handle:
+        handle.write(dumps({
+            "version": app.version, "fingerprint": route_fingerprint(app),
+            "openapi": app.openapi(),
+        }))
+    return path
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Write the OpenAPI document as a build artifact."
+    )
+    parser.add_argument(
+        "--out", required=True, help="Directory to write catalogue-<version>.json into"
+    )
+    parser.add_argument(
+        "--profile", default=None,
+        help="App profile to document (default: APP_PROFILE or full)",
+    )
+    args = parser.parse_args()
+    from backend.app_factory import create_app
+
+    print(write_artifact(create_app(args.profile, init_db=False), args.out))
+
+
+if __name__ == "__main__":
+    main()
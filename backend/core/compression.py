@@ -0,0 +1,276 @@
+"""
+Negotiated response compression as a pure ASGI middleware.
+
+Picks the best encoding the client accepts (zstd, brotli, gzip - the first
+two only when ``zstandard``/``brotli`` are installed), skips small bodies and
+content types that are already compressed, and switches to streaming
+compression when a response arrives in several chunks so large bodies are
+never buffered in full. Streamed chunks are flushed as they arrive, so NDJSON
+lines reach the client without waiting for the compressor's buffer to fill.
+"""
+import zlib
+from typing import Callable, Dict, List, Optional, Tuple
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+try:  # pragma: no cover - optional dependency
+    import brotli
+except ImportError:  # pragma: no cover - brotli missing
+    brotli = None
+
+try:  # pragma: no cover - optional dependency
+    import zstandard
+except ImportError:  # pragma: no cover - zstandard missing
+    zstandard = None
+
+
+DEFAULT_MINIMUM_SIZE = 1024
+
+# Content types worth compressing. Anything else (images, archives, PDFs,
+# octet-stream downloads) is passed through untouched.
+COMPRESSIBLE_TYPES = (
+    "text/",
+    "application/json",
+    "application/javascript",
+    "application/xml",
+    "application/x-ndjson",
+    "image/svg+xml",
+)
+COMPRESSIBLE_SUFFIXES = ("+json", "+xml")
+
+# Never buffer or re-chunk server-sent events.
+UNCOMPRESSED_TYPES = ("text/event-stream",)
+
+
+class _GzipEncoder:
+    def __init__(self, level: int = 6):
+        self._obj = zlib.compressobj(level, zlib.DEFLATED, 31)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._obj.compress(data)
+
+    def flush(self) -> bytes:
+        return self._obj.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self) -> bytes:
+        return self._obj.flush()
+
+
+class _BrotliEncoder:
+    def __init__(self, quality: int = 4):
+        self._obj = brotli.Compressor(quality=quality)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._obj.process(data)
+
+    def flush(self) -> bytes:
+        return self._obj.flush()
+
+    def finish(self) -> bytes:
+        return self._obj.finish()
+
+
+class _ZstdEncoder:
+    def __init__(self, level: int = 3):
+        self._obj = zstandard.ZstdCompressor(level=level).compressobj()
+
+    def compress(self, data: bytes) -> bytes:
+        return self._obj.compress(data)
+
+    def flush(self) -> bytes:
+        return self._obj.flush(zstandard.COMPRESSOBJ_FLUSH_BLOCK)
+
+    def finish(self) -> bytes:
+        return self._obj.flush()
+
+
+def available_encoders() -> Dict[str, Callable[[], object]]:
+    """Encoders usable in this environment, in server preference order."""
+    encoders: Dict[str, Callable[[], object]] = {}
+    if zstandard is not None:
+        encoders["zstd"] = _ZstdEncoder
+    if brotli is not None:
+        encoders["br"] = _BrotliEncoder
+    encoders["gzip"] = _GzipEncoder
+    return encoders
+
+
+def parse_accept_encoding(header: str) -> Dict[str, float]:
+    """Parse an Accept-Encoding header into ``{coding: qvalue}``."""
+    accepted: Dict[str, float] = {}
+    for part in header.split(","):
+        coding, _, params = part.strip().partition(";")
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        accepted[coding] = quality
+    return accepted
+
+
+def negotiate_encoding(header: str, supported: List[str]) -> Optional[str]:
+    """Choose the encoding to use for ``header`` from ``supported``.
+
+    Highest client q-value wins; ties go to the earlier entry in
+    ``supported``. Returns ``None`` for identity.
+    """
+    accepted = parse_accept_encoding(header)
+    wildcard = accepted.get("*", 0.0)
+    best: Optional[Tuple[float, int, str]] = None
+    for rank, coding in enumerate(supported):
+        quality = accepted.get(coding, wildcard)
+        if quality <= 0:
+            continue
+        candidate = (quality, -rank, coding)
+        if best is None or candidate > best:
+            best = candidate
+    return best[2] if best else None
+
+
+def is_compressible(content_type: str) -> bool:
+    content_type = content_type.split(";", 1)[0].strip().lower()
+    if not content_type or content_type in UNCOMPRESSED_TYPES:
+        return False
+    return (
+        content_type.startswith(COMPRESSIBLE_TYPES)
+        or content_type.endswith(COMPRESSIBLE_SUFFIXES)
+    )
+
+
+class CompressionMiddleware:
+    """Compress HTTP responses with the best encoding the client accepts.
+
+    Bodies smaller than ``minimum_size`` are sent as-is. Single-chunk bodies
+    are compressed in one shot with an exact ``Content-Length``; multi-chunk
+    (streaming) bodies are compressed incrementally and sent chunked. Every
+    compressible response carries ``Vary: Accept-Encoding``, including the
+    ones sent uncompressed.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        minimum_size: int = DEFAULT_MINIMUM_SIZE,
+        encoders: Optional[Dict[str, Callable[[], object]]] = None,
+    ) -> None:
+        self.app = app
+        self.minimum_size = minimum_size
+        self.encoders = encoders or available_encoders()
+        self.supported = list(self.encoders)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        encoding = negotiate_encoding(
+            Headers(scope=scope).get("accept-encoding", ""), self.supported)
+        if encoding is None:
+            await self.app(scope, receive, _vary_wrapper(send))
+            return
+        responder = _CompressionResponder(
+            self.app, send, encoding, self.encoders[encoding], self.minimum_size)
+        await responder(scope, receive)
+
+
+def _vary_wrapper(send: Send) -> Send:
+    """Add ``Vary: Accept-Encoding`` to compressible responses sent as-is."""
+    async def send_wrapper(message: Message) -> None:
+        if message["type"] == "http.response.start":
+            headers = MutableHeaders(raw=message["headers"])
+            if is_compressible(headers.get("content-type", "")):
+                headers.add_vary_header("Accept-Encoding")
+        await send(message)
+    return send_wrapper
+
+
+class _CompressionResponder:
+    def __init__(self, app: ASGIApp, send: Send, encoding: str,
+                 encoder_factory: Callable[[], object], minimum_size: int) -> None:
+        self.app = app
+        self.send = send
+        self.encoding = encoding
+        self.encoder_factory = encoder_factory
+        self.minimum_size = minimum_size
+        self.start_message: Optional[Message] = None
+        self.passthrough = False
+        self.streaming = False
+        self.encoder = None
+        self.pending: List[bytes] = []
+        self.pending_size = 0
+
+    async def __call__(self, scope: Scope, receive: Receive) -> None:
+        await self.app(scope, receive, self.send_wrapper)
+
+    async def send_wrapper(self, message: Message) -> None:
+        message_type = message["type"]
+        if message_type == "http.response.start":
+            headers = Headers(raw=message["headers"])
+            self.passthrough = (
+                "content-encoding" in headers
+                or not is_compressible(headers.get("content-type", ""))
+            )
+            if self.passthrough:
+                await self.send(message)
+            else:
+                # Delay the start message until we know the body size.
+                self.start_message = message
+            return
+
+        if message_type != "http.response.body" or self.passthrough:
+            await self.send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+
+        if self.streaming:
+            chunk = self.encoder.compress(body)
+            chunk += self.encoder.flush() if more_body else self.encoder.finish()
+            if chunk or not more_body:
+                await self.send({
+                    "type": "http.response.body", "body": chunk, "more_body": more_body
+                })
+            return
+
+        self.pending.append(body)
+        self.pending_size += len(body)
+
+        if not more_body:
+            await self._send_buffered()
+        elif self.pending_size >= self.minimum_size:
+            await self._start_streaming()
+
+    async def _send_buffered(self) -> None:
+        body = b"".join(self.pending)
+        self.pending = []
+        headers = MutableHeaders(raw=self.start_message["headers"])
+        if len(body) >= self.minimum_size:
+            encoder = self.encoder_factory()
+            body = encoder.compress(body) + encoder.finish()
+            headers["Content-Encoding"] = self.encoding
+            headers["Content-Length"] = str(len(body))
+        headers.add_vary_header("Accept-Encoding")
+        await self.send(self.start_message)
+        await self.send({"type": "http.response.body", "body": body})
+
+    async def _start_streaming(self) -> None:
+        self.streaming = True
+        self.encoder = self.encoder_factory()
+        headers = MutableHeaders(raw=self.start_message["headers"])
+        headers["Content-Encoding"] = self.encoding
+        headers.add_vary_header("Accept-Encoding")
+        if "content-length" in headers:
+            del headers["Content-Length"]
+        await self.send(self.start_message)
+        chunk = self.encoder.compress(b"".join(self.pending)) + self.encoder.flush()
+        self.pending = []
+        await self.send({
+            "type": "http.response.body", "body": chunk, "more_body": True
+        })
@@ -0,0 +1,226 @@
+"""
+Write-coalescing counters for access and usage statistics.
+
+Read paths that bump a counter (project views, relation traversals, prompt
+usage) call :meth:`CoalescingCounters.incr`, which only touches an in-memory
+dict. A background task flushes the accumulated deltas every few seconds as
+one batched ``UPDATE ... SET x = x + :delta`` per target. Because each worker
+adds its own deltas rather than writing absolute values, any number of
+workers can flush concurrently without losing increments. Every app entry
+point starts the flush task and flushes once more on shutdown. Counters
+without a table (MCP tool usage) are added to a shared state namespace with
+one ``incr_many`` per flush. JSON counters are updated with ``json_set`` on
+SQLite and MySQL and ``jsonb_set`` on PostgreSQL.
+
+Reads merge pending deltas with the stored value through :meth:`merged`.
+"""
+import asyncio
+import logging
+from collections import defaultdict
+from datetime import datetime
+from typing import Dict, Hashable, Iterable, NamedTuple, Optional, Tuple
+
+from sqlalchemy import Integer, Text, bindparam, cast, func, update
+from sqlalchemy.dialects import postgresql
+
+from backend.core.shared_state import get_shared_state
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_FLUSH_INTERVAL = 5.0
+
+
+class CounterTarget(NamedTuple):
+    """Where a named counter is stored.
+
+    ``model`` is a name in :mod:`backend.models`. ``counter`` is an integer
+    column, or with ``json_path`` a JSON text column holding the count at
+    that path. ``touched`` records the time of the latest increment (a
+    column name, or a JSON path when ``json_path`` is set). With no
+    ``model``, ``counter`` names a shared state namespace instead.
+    """
+    model: Optional[str]
+    counter: str
+    touched: Optional[str] = None
+    key_column: str = "id"
+    json_path: Optional[str] = None
+    where: Tuple[Tuple[str, str], ...] = ()
+
+
+COUNTER_TARGETS: Dict[str, CounterTarget] = {
+    "project_views": CounterTarget("Project", "view_count"),
+    "relation_access": CounterTarget(
+        "MemoryRelation", "access_count", "last_accessed_at"
+    ),
+    "file_access": CounterTarget("FileAsset", "access_count", "last_accessed_at"),
+    "prompt_usage": CounterTarget(
+        "MemoryEntity", "entity_metadata", "$.last_used", key_column="name",
+        json_path="$.usage_count", where=(("entity_type", "prompt_template"),),
+    ),
+    "tool_usage": CounterTarget(None, "tool_usage"),
+}
+
+
+def _json_counter(column, target: CounterTarget, dialect: str):
+    """``column`` (JSON text) with the count at ``json_path`` increased."""
+    delta = bindparam("_delta", type_=Integer)
+    if dialect != "postgresql":
+        # SQLite and MySQL share json_set/json_extract and "$.a.b" paths.
+        current = func.coalesce(func.json_extract(column, target.json_path), 0)
+        arguments = [column, target.json_path, current + delta]
+        if target.touched:
+            arguments += [target.touched, bindparam("_at")]
+        return func.json_set(*arguments)
+
+    def path(json_path: str):
+        return cast(postgresql.array(json_path[2:].split(".")), postgresql.ARRAY(Text))
+
+    document = func.coalesce(
+        cast(column, postgresql.JSONB), cast("{}", postgresql.JSONB)
+    )
+    current = func.coalesce(
+        cast(document.op("#>>")(path(target.json_path)), Integer), 0
+    )
+    document = func.jsonb_set(
+        document, path(target.json_path), func.to_jsonb(current + delta)
+    )
+    if target.touched:
+        at = func.to_jsonb(cast(bindparam("_at"), Text))
+        document = func.jsonb_set(document, path(target.touched), at)
+    return cast(document, Text)
+
+
+def _update_statement(target: CounterTarget, dialect: str = "sqlite"):
+    from backend import models
+
+    table = getattr(models, target.model).__table__
+    statement = update(table).where(table.c[target.key_column] == bindparam("_key"))
+    for column, value in target.where:
+        statement = statement.where(table.c[column] == value)
+    if target.json_path:
+        counter = _json_counter(table.c[target.counter], target, dialect)
+        return statement.values({target.counter: counter})
+    values = {target.counter: table.c[target.counter] + bindparam("_delta")}
+    if target.touched:
+        values[target.touched] = bindparam("_at")
+    return statement.values(values)
+
+
+class CoalescingCounters:
+    """In-memory increment buffer with periodic batched flushes."""
+
+    def __init__(self, targets: Optional[Dict[str, CounterTarget]] = None, engine=None):
+        self.targets = dict(COUNTER_TARGETS if targets is None else targets)
+        self._engine = engine
+        self._pending: Dict[str, Dict[Hashable, int]] = defaultdict(
+            lambda: defaultdict(int)
+        )
+        self._touched: Dict[str, Dict[Hashable, datetime]] = defaultdict(dict)
+        self._flush_lock = asyncio.Lock()
+        self._task: Optional[asyncio.Task] = None
+
+    def incr(
+        self, name: str, key: Hashable, amount: int = 1, at: Optional[datetime] = None
+    ) -> None:
+        """Record ``amount`` more for ``key``; written on the next flush."""
+        if name not in self.targets:
+            raise KeyError(f"Unknown counter '{name}'")
+        self._pending[name][key] += amount
+        self._touched[name][key] = at or datetime.utcnow()
+
+    def incr_many(self, name: str, keys: Iterable[Hashable], amount: int = 1) -> None:
+        at = datetime.utcnow()
+        for key in keys:
+            self.incr(name, key, amount, at)
+
+    def pending(self, name: str, key: Hashable) -> int:
+        """Increments for ``key`` not yet written by this worker."""
+        return self._pending.get(name, {}).get(key, 0)
+
+    def pending_all(self, name: str) -> Dict[Hashable, int]:
+        """All increments for ``name`` not yet written by this worker."""
+        return dict(self._pending.get(name, {}))
+
+    def merged(self, name: str, key: Hashable, stored: Optional[int]) -> int:
+        """Stored value plus this worker's pending increments."""
+        return (stored or 0) + self.pending(name, key)
+
+    def last_touched(self, name: str, key: Hashable) -> Optional[datetime]:
+        return self._touched.get(name, {}).get(key)
+
+    async def flush(self) -> int:
+        """Write all pending deltas; returns the number of rows updated.
+
+        Deltas of a batch that fails are put back so the next flush retries.
+        """
+        async with self._flush_lock:
+            if not self._pending:
+                return 0
+            pending, touched = self._pending, self._touched
+            self._pending = defaultdict(lambda: defaultdict(int))
+            self._touched = defaultdict(dict)
+            written = 0
+            for name, deltas in pending.items():
+                rows = [
+                    {
+                        "_key": key, "_delta": delta,
+                        "_at": self._touched_value(name, touched[name][key]),
+                    }
+                    for key, delta in deltas.items() if delta
+                ]
+                if not rows:
+                    continue
+                target = self.targets[name]
+                try:
+                    if target.model is None:
+                        await get_shared_state().incr_many(
+                            target.counter, {row["_key"]: row["_delta"] for row in rows}
+                        )
+                    else:
+                        async with self._get_engine().begin() as conn:
+                            statement = _update_statement(target, conn.dialect.name)
+                            await conn.execute(statement, rows)
+                    written += len(rows)
+                except Exception as e:
+                    logger.warning(
+                        f"Counter flush for '{name}' failed, will retry: {e}"
+                    )
+                    for key, delta in deltas.items():
+                        self._pending[name][key] += delta
+                        self._touched[name].setdefault(key, touched[name][key])
+            return written
+
+    def start(self, interval: float = DEFAULT_FLUSH_INTERVAL) -> None:
+        """Start the periodic flush task on the running loop."""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run(interval))
+
+    async def stop(self) -> None:
+        """Cancel the flush task and write whatever is still pending."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self.flush()
+
+    async def _run(self, interval: float) -> None:
+        while True:
+            await asyncio.sleep(interval)
+            await self.flush()
+
+    def _touched_value(self, name: str, at: datetime):
+        # JSON paths store ISO strings, like the rest of entity_metadata.
+        return at.isoformat() if self.targets[name].json_path else at
+
+    def _get_engine(self):
+        if self._engine is None:
+            from backend.database import engine
+
+            self._engine = engine
+        return self._engine
+
+
+counters = CoalescingCounters()
@@ -0,0 +1,130 @@
+"""
+Local text embeddings.
+
+Two embedders share one interface, ``embed(texts) -> float32 array`` with
+L2-normalised rows:
+
+* :class:`HashingEmbedder` - signed feature hashing of word unigrams,
+  word bigrams and character trigrams. Pure NumPy, no model download, and
+  robust to inflections ("migrate"/"migration") through shared trigrams.
+* :class:`SentenceTransformerEmbedder` - a local ``sentence-transformers``
+  model, used when ``EMBEDDING_MODEL`` names one and the package is
+  installed.
+
+Neither ever calls the network at query time. NumPy is imported on first
+use, so importing the memory and task services does not pay for it.
+"""
+import importlib.util
+import logging
+import re
+import zlib
+from typing import List, Optional, Sequence
+
+np = None  # numpy, set by require_numpy()
+
+try:
+    from backend.config.app_config import settings
+except ImportError:
+    from config.app_config import settings
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_DIMENSIONS = 384
+_WORD = re.compile(r"[a-z0-9]+")
+
+
+def numpy_available() -> bool:
+    return np is not None or importlib.util.find_spec("numpy") is not None
+
+
+def require_numpy():
+    """Import numpy on first use and return it."""
+    global np
+    if np is None:
+        try:
+            import numpy
+        except ImportError:  # pragma: no cover - optional dependency
+            raise RuntimeError(
+                "numpy is not installed; install 'numpy' to use semantic search"
+            ) from None
+        np = numpy
+    return np
+
+
+class HashingEmbedder:
+    """Signed feature-hashing embedder over words, bigrams and char trigrams."""
+
+    name = "hashing"
+
+    def __init__(self, dimensions: int = DEFAULT_DIMENSIONS):
+        require_numpy()
+        self.dimensions = dimensions
+
+    def features(self, text: str) -> List[str]:
+        words = _WORD.findall(text.lower())
+        features = list(words)
+        features += [f"{a} {b}" for a, b in zip(words, words[1:])]
+        for word in words:
+            padded = f"#{word}#"
+            features += [padded[i:i + 3] for i in range(len(padded) - 2)]
+        return features
+
+    def embed(self, texts: Sequence[str]) -> "np.ndarray":
+        matrix = np.zeros((len(texts), self.dimensions), dtype=np.float32)
+        for row, text in enumerate(texts):
+            for feature in self.features(text or ""):
+                digest = zlib.crc32(feature.encode())
+                sign = 1.0 if digest & 0x80000000 else -1.0
+                matrix[row, digest % self.dimensions] += sign
+        return normalize(matrix)
+
+
+class SentenceTransformerEmbedder:
+    """A locally stored sentence-transformers model."""
+
+    name = "sentence-transformers"
+
+    def __init__(self, model_name: str):
+        require_numpy()
+        from sentence_transformers import SentenceTransformer
+
+        self.model = SentenceTransformer(model_name, device="cpu")
+        self.dimensions = self.model.get_sentence_embedding_dimension()
+        self.name = f"sentence-transformers:{model_name}"
+
+    def embed(self, texts: Sequence[str]) -> "np.ndarray":
+        vectors = self.model.encode(
+            list(texts), convert_to_numpy=True, show_progress_bar=False
+        )
+        return normalize(vectors.astype(np.float32))
+
+
+def normalize(matrix: "np.ndarray") -> "np.ndarray":
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return matrix / norms
+
+
+_embedder = None
+
+
+def get_embedder(model_name: Optional[str] = None):
+    """Return the process-wide embedder.
+
+    Uses ``settings.embedding_model`` when set and loadable, otherwise the
+    hashing embedder.
+    """
+    global _embedder
+    if _embedder is None:
+        model_name = model_name or settings.embedding_model
+        if model_name:
+            try:
+                _embedder = SentenceTransformerEmbedder(model_name)
+            except Exception as e:
+                logger.warning(
+                    f"Embedding model '{model_name}' unavailable, "
+                    f"using hashing embedder: {e}"
+                )
+        if _embedder is None:
+            _embedder = HashingEmbedder(settings.embedding_dimensions)
+    return _embedder
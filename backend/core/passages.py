@@ -0,0 +1,169 @@
+"""
+Split large text into overlapping, heading-aware passages.
+
+Passages follow the document's own structure where it has one: markdown is
+cut at headings (outside fenced code blocks) and source code at top-level
+definitions, with any decorators or comments directly above a definition
+kept with it. A section shorter than a quarter of ``size`` absorbs the
+sections after it, up to ``size`` characters, and sections longer than that
+are cut into windows that overlap by ``overlap`` characters, breaking at line
+ends where possible.
+
+Each passage carries UTF-8 byte offsets into the original text, so callers
+can fetch exactly that range (or its surroundings) later.
+"""
+import os
+import re
+from typing import Iterator, List, NamedTuple, Optional, Tuple
+
+PASSAGE_CHARS = 2000
+PASSAGE_OVERLAP = 200
+MAX_HEADING_CHARS = 200
+
+MARKDOWN_EXTENSIONS = {".md", ".markdown", ".mdx", ".rst"}
+CODE_EXTENSIONS = {
+    ".py", ".pyi", ".js", ".jsx", ".ts", ".tsx", ".mjs", ".go", ".rs", ".java",
+    ".kt", ".scala", ".c", ".h", ".cc", ".cpp", ".hpp", ".cs", ".rb", ".php",
+    ".swift", ".sh",
+}
+
+_MARKDOWN_HEADING = re.compile(r"(#{1,6})[ \t]+(.*?)[ \t#]*$")
+_FENCE = re.compile(r"(```|~~~)")
+_CODE_DEFINITION = re.compile(
+    r"(?:(?:export|default|public|private|protected|internal|static|abstract"
+    r"|final|async|pub|unsafe)\s+)*"
+    r"(?:def|class|function|func|fn|interface|struct|enum|impl|trait|type"
+    r"|module|namespace)\b"
+)
+_CODE_PREAMBLE = re.compile(r"(?:@|#|//|/\*|\*|--)")
+
+
+class Passage(NamedTuple):
+    ordinal: int
+    heading: Optional[str]
+    start: int
+    end: int
+    text: str
+
+
+def passage_kind(name: Optional[str], text: str) -> str:
+    """Classify content as ``markdown``, ``code`` or plain ``text``."""
+    extension = os.path.splitext((name or "").lower())[1]
+    if extension in MARKDOWN_EXTENSIONS:
+        return "markdown"
+    if extension in CODE_EXTENSIONS:
+        return "code"
+    headings = re.finditer(r"^#{1,6}[ \t]+\S", text, re.M)
+    return "markdown" if next(headings, None) and next(headings, None) else "text"
+
+
+def split_passages(
+    text: str,
+    kind: str = "text",
+    size: int = PASSAGE_CHARS,
+    overlap: int = PASSAGE_OVERLAP,
+) -> List[Passage]:
+    """Split ``text`` into passages with byte offsets into ``text.encode()``."""
+    if not text:
+        return []
+    if kind == "markdown":
+        sections = list(_markdown_sections(text))
+    elif kind == "code":
+        sections = list(_code_sections(text))
+    else:
+        sections = [(None, 0, len(text))]
+
+    spans: List[Tuple[Optional[str], int, int]] = []
+    for heading, start, end in _merge(sections, size):
+        spans.extend(
+            (heading, window_start, window_end)
+            for window_start, window_end in _windows(text, start, end, size, overlap)
+        )
+
+    offsets = _byte_offsets(
+        text, {position for _, start, end in spans for position in (start, end)}
+    )
+    return [
+        Passage(ordinal, heading, offsets[start], offsets[end], text[start:end])
+        for ordinal, (heading, start, end) in enumerate(spans)
+    ]
+
+
+def _lines(text: str) -> Iterator[Tuple[int, str]]:
+    position = 0
+    for line in text.splitlines(keepends=True):
+        yield position, line
+        position += len(line)
+
+
+def _markdown_sections(text: str) -> Iterator[Tuple[Optional[str], int, int]]:
+    trail: List[Tuple[int, str]] = []
+    heading, start, in_fence = None, 0, False
+    for position, line in _lines(text):
+        if _FENCE.match(line.lstrip()):
+            in_fence = not in_fence
+            continue
+        match = None if in_fence else _MARKDOWN_HEADING.match(line.rstrip("\r\n"))
+        if not match:
+            continue
+        if position > start:
+            yield heading, start, position
+        level = len(match.group(1))
+        trail = [(depth, title) for depth, title in trail if depth < level]
+        trail.append((level, match.group(2)))
+        heading = " > ".join(title for _, title in trail)[:MAX_HEADING_CHARS]
+        start = position
+    yield heading, start, len(text)
+
+
+def _code_sections(text: str) -> Iterator[Tuple[Optional[str], int, int]]:
+    heading, start, preamble = None, 0, None
+    for position, line in _lines(text):
+        if _CODE_DEFINITION.match(line):
+            boundary = position if preamble is None else preamble
+            if boundary > start:
+                yield heading, start, boundary
+            heading, start = line.strip()[:MAX_HEADING_CHARS], boundary
+            preamble = None
+        elif _CODE_PREAMBLE.match(line):
+            preamble = position if preamble is None else preamble
+        else:
+            preamble = None
+    yield heading, start, len(text)
+
+
+def _merge(sections, size: int) -> List[Tuple[Optional[str], int, int]]:
+    merged: List[Tuple[Optional[str], int, int]] = []
+    for heading, start, end in sections:
+        if merged:
+            last_heading, last_start, last_end = merged[-1]
+            if last_end - last_start < size // 4 and end - last_start <= size:
+                merged[-1] = (last_heading or heading, last_start, end)
+                continue
+        merged.append((heading, start, end))
+    return merged
+
+
+def _windows(
+    text: str, start: int, end: int, size: int, overlap: int
+) -> Iterator[Tuple[int, int]]:
+    while end - start > size:
+        cut = text.rfind("\n", start + size // 2, start + size)
+        if cut < 0:
+            cut = text.rfind(" ", start + size // 2, start + size)
+        cut = start + size if cut < 0 else cut + 1
+        yield start, cut
+        restart = max(cut - overlap, start + 1)
+        line_start = text.find("\n", restart, cut)
+        start = line_start + 1 if 0 <= line_start < cut - 1 else restart
+    yield start, end
+
+
+def _byte_offsets(text: str, positions) -> dict:
+    """Map character positions to UTF-8 byte positions in one pass."""
+    offsets, previous, total = {}, 0, 0
+    for position in sorted(positions):
+        total += len(text[previous:position].encode())
+        offsets[position] = total
+        previous = position
+    return offsets
@@ -0,0 +1,49 @@
+"""
+Sparse fieldset support for list endpoints.
+
+A ``fields=title,status`` query parameter is parsed into a tuple of column
+names which services turn into a column-projected ``select()``; columns that
+were not requested (large ``Text`` bodies in particular) are never read from
+the database.
+"""
+from typing import Iterable, List, Optional, Sequence, Tuple
+
+from sqlalchemy import Table
+
+
+def parse_fields(raw: Optional[str]) -> Optional[Tuple[str, ...]]:
+    """Split a comma-separated ``fields`` value, preserving order.
+
+    Returns ``None`` when nothing was requested so callers fall back to their
+    default field set.
+    """
+    if not raw:
+        return None
+    seen = []
+    for name in raw.split(","):
+        name = name.strip()
+        if name and name not in seen:
+            seen.append(name)
+    return tuple(seen) or None
+
+
+def unknown_fields(fields: Iterable[str], allowed: Iterable[str]) -> List[str]:
+    """Return the names in ``fields`` that are not in ``allowed``."""
+    allowed = set(allowed)
+    return [name for name in fields if name not in allowed]
+
+
+def project_columns(
+    table: Table,
+    fields: Optional[Sequence[str]],
+    default: Sequence[str],
+) -> list:
+    """Resolve ``fields`` (or ``default``) to columns of ``table``.
+
+    Raises ``ValueError`` naming any field that is not a column.
+    """
+    fields = tuple(fields or default)
+    unknown = unknown_fields(fields, table.c.keys())
+    if unknown:
+        raise ValueError(f"Unknown field(s) for {table.name}: {', '.join(unknown)}")
+    return [table.c[name] for name in fields]
@@ -0,0 +1,99 @@
+"""
+Fast JSON response helpers.
+
+List endpoints return thousands of rows; serializing them through Pydantic
+models and the stdlib ``json`` encoder dominates latency and memory. The
+helpers here serialize plain rows (dicts or SQLAlchemy ``Row`` objects)
+straight to bytes with orjson.
+"""
+import datetime
+import decimal
+import enum
+import uuid
+from typing import Any
+
+import orjson
+from starlette.responses import JSONResponse
+
+from .compression import DEFAULT_MINIMUM_SIZE, CompressionMiddleware
+
+ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS
+
+
+def orjson_default(obj: Any) -> Any:
+    """Fallback encoder for types orjson does not handle natively."""
+    if isinstance(obj, enum.Enum):
+        return obj.value
+    # As a string, like Pydantic: floats would drop precision.
+    if isinstance(obj, decimal.Decimal):
+        return str(obj)
+    if isinstance(obj, (set, frozenset)):
+        return list(obj)
+    # SQLAlchemy Row / RowMapping
+    if hasattr(obj, "_asdict"):
+        return obj._asdict()
+    if hasattr(obj, "keys") and hasattr(obj, "__getitem__"):
+        return dict(obj)
+    # Pydantic models
+    if hasattr(obj, "model_dump"):
+        return obj.model_dump(mode="json")
+    if isinstance(obj, (datetime.timedelta,)):
+        return obj.total_seconds()
+    if isinstance(obj, uuid.UUID):
+        return str(obj)
+    raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
+
+
+def dumps(content: Any) -> bytes:
+    """Serialize ``content`` to JSON bytes."""
+    return orjson.dumps(content, default=orjson_default, option=ORJSON_OPTIONS)
+
+
+def loads(data: Any) -> Any:
+    """Deserialize JSON bytes or str."""
+    return orjson.loads(data)
+
+
+class ORJSONResponse(JSONResponse):
+    """JSON response rendered with orjson.
+
+    Accepts rows straight from ``Result.all()`` so list endpoints can skip
+    ORM entity and Pydantic model hydration entirely.
+    """
+
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        if isinstance(content, (bytes, bytearray, memoryview)):
+            return bytes(content)
+        return dumps(content)
+
+
+def list_payload(
+    rows: Any,
+    total: int,
+    skip: int,
+    limit: int,
+    message: str = None,
+) -> dict:
+    """Build the ``ListResponse`` envelope around pre-serializable rows."""
+    count = len(rows)
+    return {
+        "data": rows,
+        "total": total,
+        "page": skip // limit + 1 if limit else 1,
+        "page_size": limit,
+        "has_more": skip + count < total,
+        "message": message,
+    }
+
+
+def setup_response_layer(app, minimum_size: int = DEFAULT_MINIMUM_SIZE) -> None:
+    """Install the shared response layer on a FastAPI ``app``.
+
+    Makes :class:`ORJSONResponse` the default response class and adds
+    negotiated compression. Call before registering routes so they pick up
+    the default response class.
+    """
+    app.router.default_response_class = ORJSONResponse
+    app.add_middleware(CompressionMiddleware, minimum_size=minimum_size)
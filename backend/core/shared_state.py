@@ -0,0 +1,390 @@
+"""
+State shared between worker processes.
+
+A single uvicorn process can keep counters and caches in memory; with
+several workers each process would see only its own slice. This module
+provides one small interface with three backends:
+
+* ``local``  - in-process dicts (single worker, the default).
+* ``sqlite`` - a WAL-mode SQLite file shared by workers on one host.
+* ``redis``  - Redis through :class:`backend.core.async_utils.AsyncRedisManager`.
+
+It offers named counters (``incr``/``counters``), versioned cache
+invalidation (``invalidate``/``on_invalidate``/``poll_invalidations``), with
+the changed keys of each version kept for a while so other workers can
+refresh just those entries (``on_keys_invalidated``), and a
+``startup_lock`` so one-off work such as ``create_all`` is not run by every
+worker at once.
+"""
+import asyncio
+import contextlib
+import logging
+import os
+import sqlite3
+import threading
+from collections import defaultdict
+from typing import Awaitable, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+try:
+    from backend.config.app_config import settings
+except ImportError:
+    from config.app_config import settings
+
+logger = logging.getLogger(__name__)
+
+VERSION_NAMESPACE = "__versions__"
+# Versions whose changed keys are kept; a worker further behind refreshes all.
+KEY_LOG_VERSIONS = 1000
+
+Listener = Callable[[], Optional[Awaitable[None]]]
+KeysListener = Callable[[List[str]], Optional[Awaitable[None]]]
+
+
+class LocalBackend:
+    """In-process counters; correct only with a single worker."""
+
+    name = "local"
+
+    def __init__(self) -> None:
+        self._data: Dict[str, Dict[str, int]] = defaultdict(lambda: defaultdict(int))
+        self._keys: Dict[str, List[Tuple[int, str]]] = defaultdict(list)
+
+    async def incr(self, namespace: str, key: str, amount: int = 1) -> int:
+        self._data[namespace][key] += amount
+        return self._data[namespace][key]
+
+    async def record_keys(self, name: str, version: int, keys: List[str]) -> None:
+        log = self._keys[name]
+        log.extend((version, key) for key in keys)
+        self._keys[name] = [
+            entry for entry in log if entry[0] > version - KEY_LOG_VERSIONS
+        ]
+
+    async def keys_since(self, name: str, version: int) -> List[Tuple[int, str]]:
+        return [entry for entry in self._keys.get(name, ()) if entry[0] > version]
+
+    async def incr_many(self, namespace: str, deltas: Dict[str, int]) -> None:
+        for key, amount in deltas.items():
+            self._data[namespace][key] += amount
+
+    async def counters(self, namespace: str) -> Dict[str, int]:
+        return dict(self._data[namespace])
+
+    async def close(self) -> None:
+        pass
+
+
+class SQLiteBackend:
+    """Counters in a SQLite file shared by all workers on one host."""
+
+    name = "sqlite"
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self._local = threading.local()
+        with self._connect() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS shared_counters ("
+                " namespace TEXT NOT NULL, key TEXT NOT NULL,"
+                " value INTEGER NOT NULL DEFAULT 0,"
+                " PRIMARY KEY (namespace, key))"
+            )
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS shared_keys ("
+                " name TEXT NOT NULL, version INTEGER NOT NULL, key TEXT NOT NULL,"
+                " PRIMARY KEY (name, version, key))"
+            )
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=10, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def _incr_many(self, namespace: str, deltas: Dict[str, int]) -> Dict[str, int]:
+        conn = self._connect()
+        with conn:
+            conn.execute("BEGIN IMMEDIATE")
+            conn.executemany(
+                "INSERT INTO shared_counters (namespace, key, value) VALUES (?, ?, ?)"
+                " ON CONFLICT (namespace, key)"
+                " DO UPDATE SET value = value + excluded.value",
+                [(namespace, key, amount) for key, amount in deltas.items()],
+            )
+            rows = conn.execute(
+                "SELECT key, value FROM shared_counters"
+                " WHERE namespace = ? AND key IN (%s)"
+                % ",".join("?" * len(deltas)),
+                (namespace, *deltas),
+            ).fetchall()
+        return dict(rows)
+
+    def _counters(self, namespace: str) -> Dict[str, int]:
+        rows = self._connect().execute(
+            "SELECT key, value FROM shared_counters WHERE namespace = ?", (namespace,)
+        ).fetchall()
+        return dict(rows)
+
+    def _record_keys(self, name: str, version: int, keys: List[str]) -> None:
+        conn = self._connect()
+        with conn:
+            conn.execute("BEGIN IMMEDIATE")
+            conn.executemany(
+                "INSERT OR IGNORE INTO shared_keys (name, version, key)"
+                " VALUES (?, ?, ?)",
+                [(name, version, key) for key in keys],
+            )
+            conn.execute(
+                "DELETE FROM shared_keys WHERE name = ? AND version <= ?",
+                (name, version - KEY_LOG_VERSIONS),
+            )
+
+    def _keys_since(self, name: str, version: int) -> List[Tuple[int, str]]:
+        rows = self._connect().execute(
+            "SELECT version, key FROM shared_keys WHERE name = ? AND version > ?",
+            (name, version)
+        ).fetchall()
+        return [tuple(row) for row in rows]
+
+    async def incr(self, namespace: str, key: str, amount: int = 1) -> int:
+        values = await asyncio.to_thread(self._incr_many, namespace, {key: amount})
+        return values[key]
+
+    async def incr_many(self, namespace: str, deltas: Dict[str, int]) -> None:
+        if deltas:
+            await asyncio.to_thread(self._incr_many, namespace, deltas)
+
+    async def counters(self, namespace: str) -> Dict[str, int]:
+        return await asyncio.to_thread(self._counters, namespace)
+
+    async def record_keys(self, name: str, version: int, keys: List[str]) -> None:
+        await asyncio.to_thread(self._record_keys, name, version, keys)
+
+    async def keys_since(self, name: str, version: int) -> List[Tuple[int, str]]:
+        return await asyncio.to_thread(self._keys_since, name, version)
+
+    async def close(self) -> None:
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+
+class RedisBackend:
+    """Counters in Redis hashes, one hash per namespace."""
+
+    name = "redis"
+
+    def __init__(self, manager=None, prefix: str = "taskmanager:") -> None:
+        if manager is None:
+            from backend.core.async_utils import async_redis
+
+            manager = async_redis
+        self.manager = manager
+        self.prefix = prefix
+
+    async def incr(self, namespace: str, key: str, amount: int = 1) -> int:
+        client = await self.manager.get_redis()
+        return int(await client.hincrby(self.prefix + namespace, key, amount))
+
+    async def incr_many(self, namespace: str, deltas: Dict[str, int]) -> None:
+        if not deltas:
+            return
+        client = await self.manager.get_redis()
+        async with client.pipeline(transaction=False) as pipe:
+            for key, amount in deltas.items():
+                pipe.hincrby(self.prefix + namespace, key, amount)
+            await pipe.execute()
+
+    async def counters(self, namespace: str) -> Dict[str, int]:
+        client = await self.manager.get_redis()
+        raw = await client.hgetall(self.prefix + namespace)
+        return {key: int(value) for key, value in raw.items()}
+
+    async def record_keys(self, name: str, version: int, keys: List[str]) -> None:
+        client = await self.manager.get_redis()
+        log = f"{self.prefix}keys:{name}"
+        async with client.pipeline(transaction=False) as pipe:
+            pipe.zadd(log, {f"{version}:{key}": version for key in keys})
+            pipe.zremrangebyscore(log, "-inf", version - KEY_LOG_VERSIONS)
+            await pipe.execute()
+
+    async def keys_since(self, name: str, version: int) -> List[Tuple[int, str]]:
+        client = await self.manager.get_redis()
+        members = await client.zrangebyscore(
+            f"{self.prefix}keys:{name}", f"({version}", "+inf"
+        )
+        pairs = [member.split(":", 1) for member in members]
+        return [(int(version), key) for version, key in pairs]
+
+    async def close(self) -> None:
+        await self.manager.close()
+
+
+class SharedState:
+    """Counters and cache-invalidation versions shared across workers."""
+
+    def __init__(self, backend) -> None:
+        self.backend = backend
+        self._known_versions: Dict[str, int] = {}
+        self._listeners: Dict[str, List[Listener]] = defaultdict(list)
+        self._key_listeners: Dict[str, List[KeysListener]] = defaultdict(list)
+
+    async def incr(self, namespace: str, key: str, amount: int = 1) -> int:
+        return await self.backend.incr(namespace, key, amount)
+
+    async def incr_many(self, namespace: str, deltas: Dict[str, int]) -> None:
+        await self.backend.incr_many(namespace, deltas)
+
+    async def counters(self, namespace: str) -> Dict[str, int]:
+        return await self.backend.counters(namespace)
+
+    # -- cache invalidation -------------------------------------------------
+
+    def on_invalidate(self, name: str, callback: Listener) -> None:
+        """Run ``callback`` whenever ``name`` is invalidated by any worker."""
+        self._listeners[name].append(callback)
+
+    def on_keys_invalidated(self, name: str, callback: KeysListener) -> None:
+        """Run ``callback(keys)`` when other workers invalidate just ``keys``.
+
+        When any invalidation since the last poll named no keys, or its keys
+        have been pruned, the :meth:`on_invalidate` callbacks run instead.
+        """
+        self._key_listeners[name].append(callback)
+
+    async def invalidate(
+        self, name: str, notify_local: bool = True, keys: Optional[Iterable[str]] = None
+    ) -> None:
+        """Invalidate ``name`` here now and in other workers on their next poll.
+
+        Pass ``notify_local=False`` when this worker has already updated its
+        own copy in place and only the other workers need to refresh, and
+        ``keys`` when only those entries changed.
+        """
+        version = await self.backend.incr(VERSION_NAMESPACE, name)
+        self._known_versions[name] = version
+        if keys is not None:
+            await self.backend.record_keys(name, version, [str(key) for key in keys])
+        if notify_local:
+            await self._notify(name)
+
+    async def poll_invalidations(self) -> List[str]:
+        """Fire listeners for names whose version changed in another worker."""
+        versions = await self.backend.counters(VERSION_NAMESPACE)
+        changed = [
+            name for name, version in versions.items()
+            if self._known_versions.get(name) != version
+        ]
+        for name in changed:
+            known = self._known_versions.get(name)
+            self._known_versions[name] = versions[name]
+            if known is None:
+                continue
+            keys = await self._keys_between(name, known, versions[name])
+            if keys is None:
+                await self._notify(name)
+            else:
+                for callback in self._key_listeners[name]:
+                    result = callback(keys)
+                    if asyncio.iscoroutine(result):
+                        await result
+        return changed
+
+    async def _keys_between(
+        self, name: str, known: int, current: int
+    ) -> Optional[List[str]]:
+        """Keys changed after version ``known``, if every later version named them."""
+        if not self._key_listeners.get(name) or current <= known:
+            return None
+        logged = await self.backend.keys_since(name, known)
+        seen = {version for version, _ in logged if version <= current}
+        if seen != set(range(known + 1, current + 1)):
+            return None
+        return list(dict.fromkeys(key for version, key in logged if version <= current))
+
+    async def run_invalidation_poller(self, interval: float = 1.0) -> None:
+        """Poll for invalidations until cancelled."""
+        while True:
+            try:
+                await self.poll_invalidations()
+            except Exception as e:
+                logger.warning(f"Shared state poll failed: {e}")
+            await asyncio.sleep(interval)
+
+    async def _notify(self, name: str) -> None:
+        for callback in self._listeners.get(name, ()):
+            result = callback()
+            if asyncio.iscoroutine(result):
+                await result
+
+    async def close(self) -> None:
+        await self.backend.close()
+
+
+def create_backend(kind: Optional[str] = None):
+    """Build the backend named by ``kind`` or ``settings.shared_state_backend``.
+
+    ``auto`` picks Redis when ``REDIS_URL`` is set, SQLite when more than one
+    worker is configured and the in-process backend otherwise.
+    """
+    kind = kind or settings.shared_state_backend
+    if kind == "auto":
+        if settings.redis_url:
+            kind = "redis"
+        elif settings.workers > 1:
+            kind = "sqlite"
+        else:
+            kind = "local"
+    if kind == "redis":
+        return RedisBackend()
+    if kind == "sqlite":
+        return SQLiteBackend(os.path.join(settings.shared_state_dir, "shared_state.db"))
+    if kind == "local":
+        return LocalBackend()
+    raise ValueError(f"Unknown shared state backend '{kind}'")
+
+
+_shared_state: Optional[SharedState] = None
+
+
+def get_shared_state() -> SharedState:
+    """Return the process-wide :class:`SharedState`, creating it on first use."""
+    global _shared_state
+    if _shared_state is None:
+        _shared_state = SharedState(create_backend())
+        logger.info(f"Shared state backend: {_shared_state.backend.name}")
+    return _shared_state
+
+
+def reset_shared_state(state: Optional[SharedState] = None) -> None:
+    """Replace the process-wide instance (tests, or after fork)."""
+    global _shared_state
+    _shared_state = state
+
+
+@contextlib.contextmanager
+def startup_lock(name: str, directory: Optional[str] = None) -> Iterator[None]:
+    """Exclusive cross-process lock for one-off startup work.
+
+    Workers entering with the same ``name`` run the guarded block one at a
+    time. Uses ``fcntl.flock`` where available; elsewhere the block is not
+    serialized.
+    """
+    try:
+        import fcntl
+    except ImportError:  # pragma: no cover - Windows
+        yield
+        return
+    directory = directory or settings.shared_state_dir
+    os.makedirs(directory, exist_ok=True)
+    with open(os.path.join(directory, f"{name}.lock"), "w") as handle:
+        fcntl.flock(handle, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(handle, fcntl.LOCK_UN)
@@ -0,0 +1,235 @@
+"""
+Non-blocking structured logging.
+
+:func:`start_logging` puts a single :class:`QueueingHandler` on the root
+logger. Emitting a record on the event loop only merges its message, tags it
+with the current request ID and puts it on a bounded queue; a
+``QueueListener`` thread formats it and does the stream and file I/O. When
+the queue is full, records are dropped and counted rather than blocking the
+loop.
+
+- Output is one JSON object per line (``LOG_FORMAT=json``, the default) with
+  the request ID and any ``extra=`` fields, or the classic text format.
+- ``LOG_FILE`` adds a size-rotated file (``LOG_MAX_BYTES``,
+  ``LOG_BACKUP_COUNT``). A ``{pid}`` in the name gives every worker its own
+  file, since workers must not rotate a shared one.
+- ``LOG_SAMPLING=backend.crud=0.05,backend.middleware=0.1`` keeps that
+  fraction of a logger's records below WARNING; the longest matching prefix
+  wins.
+- :class:`lazy` defers an expensive argument until a record is actually
+  emitted: ``logger.debug("entity %s", lazy(entity.model_dump_json))``.
+
+The app lifespan starts the pipeline and stops it on shutdown, flushing
+whatever is still queued.
+"""
+import copy
+import logging
+import os
+import queue
+import random
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+from typing import Any, Callable, Dict, List, Optional
+
+import orjson
+
+try:
+    from backend.config.app_config import settings
+except ImportError:
+    from config.app_config import settings
+
+# Bound by RequestMiddleware for the duration of each request.
+request_id_var: ContextVar[Optional[str]] = ContextVar("request_id", default=None)
+
+TEXT_FORMAT = "%(asctime)s - %(name)s - %(levelname)s - [%(request_id)s] %(message)s"
+
+# LogRecord attributes that are not ``extra=`` fields.
+_RECORD_FIELDS = frozenset(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {
+    "message", "asctime", "request_id",
+}
+
+
+class lazy:
+    """A log argument computed only when the record is formatted."""
+
+    __slots__ = ("func", "args")
+
+    def __init__(self, func: Callable[..., Any], *args: Any):
+        self.func = func
+        self.args = args
+
+    def __str__(self) -> str:
+        return str(self.func(*self.args))
+
+    __repr__ = __str__
+
+
+class RequestContextFilter(logging.Filter):
+    """Tag records with the request ID bound in :data:`request_id_var`."""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if not hasattr(record, "request_id"):
+            record.request_id = request_id_var.get() or "-"
+        return True
+
+
+class SamplingFilter(logging.Filter):
+    """Keep a fraction of each logger's records below WARNING."""
+
+    def __init__(self, rates: Dict[str, float]):
+        super().__init__()
+        self.rates = rates
+        self._resolved: Dict[str, float] = {}
+
+    def rate_for(self, name: str) -> float:
+        rate = self._resolved.get(name)
+        if rate is None:
+            matches = [
+                prefix for prefix in self.rates
+                if name == prefix or name.startswith(prefix + ".")
+            ]
+            rate = 1.0 if not matches else self.rates[max(matches, key=len)]
+            self._resolved[name] = rate
+        return rate
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.WARNING:
+            return True
+        rate = self.rate_for(record.name)
+        return rate >= 1 or random.random() < rate
+
+
+def parse_sampling(spec: Optional[str]) -> Dict[str, float]:
+    """Parse ``logger=rate,logger=rate`` into a dict."""
+    rates = {}
+    for item in (spec or "").split(","):
+        if "=" in item:
+            name, rate = item.split("=", 1)
+            rates[name.strip()] = float(rate)
+    return rates
+
+
+class JSONFormatter(logging.Formatter):
+    """One JSON object per record, ``extra=`` fields included."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        payload = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(
+                timespec="milliseconds"
+            ),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+            "request_id": getattr(record, "request_id", "-"),
+        }
+        for key, value in record.__dict__.items():
+            if key not in _RECORD_FIELDS:
+                payload[key] = value
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            payload["exc"] = record.exc_text
+        return orjson.dumps(payload, default=str).decode()
+
+
+class QueueingHandler(QueueHandler):
+    """Enqueue records with their message merged; drop them when the queue is full."""
+
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Merge arguments now: they may be mutated by the time the listener
+        # runs. Formatting is left to the listener's handlers. Work on a
+        # copy, as the stdlib does, so other handlers see the record as logged.
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+_handler: Optional[QueueingHandler] = None
+_listener: Optional[QueueListener] = None
+
+
+def build_handlers(
+    log_format: str = "json",
+    filename: Optional[str] = None,
+    max_bytes: int = 10 * 1024 * 1024,
+    backup_count: int = 5,
+) -> List[logging.Handler]:
+    """The handlers the listener thread writes through."""
+    if log_format == "json":
+        formatter = JSONFormatter()
+    else:
+        formatter = logging.Formatter(TEXT_FORMAT)
+    handlers: List[logging.Handler] = [logging.StreamHandler()]
+    if filename:
+        handlers.append(RotatingFileHandler(
+            filename.format(pid=os.getpid()), maxBytes=max_bytes,
+            backupCount=backup_count, encoding="utf-8", delay=True,
+        ))
+    for handler in handlers:
+        handler.setFormatter(formatter)
+    return handlers
+
+
+def start_logging(
+    handlers: Optional[List[logging.Handler]] = None,
+    level: Optional[int] = None,
+    sampling: Optional[Dict[str, float]] = None,
+    queue_size: Optional[int] = None,
+) -> QueueingHandler:
+    """Route the root logger through a queue to ``handlers``; idempotent."""
+    global _handler, _listener
+    if _handler is not None:
+        return _handler
+    if handlers is None:
+        handlers = build_handlers(
+            settings.log_format, settings.log_file, settings.log_max_bytes,
+            settings.log_backup_count
+        )
+    if level is None:
+        level = logging.getLevelName(settings.log_level) if settings.log_level else (
+            logging.INFO if settings.debug else logging.WARNING
+        )
+    if sampling is None:
+        sampling = parse_sampling(settings.log_sampling)
+    handler = QueueingHandler(queue.Queue(queue_size or settings.log_queue_size))
+    if sampling:
+        handler.addFilter(SamplingFilter(sampling))
+    handler.addFilter(RequestContextFilter())
+    listener = QueueListener(handler.queue, *handlers, respect_handler_level=True)
+    listener.start()
+    root = logging.getLogger()
+    root.addHandler(handler)
+    root.setLevel(level)
+    _handler, _listener = handler, listener
+    return handler
+
+
+def stop_logging() -> None:
+    """Flush queued records, stop the listener thread and detach the handler."""
+    global _handler, _listener
+    if _handler is None:
+        return
+    logging.getLogger().removeHandler(_handler)
+    _listener.stop()
+    for handler in _listener.handlers:
+        handler.close()
+    if _handler.dropped:
+        logging.getLogger(__name__).warning(
+            "Dropped %d log records on a full queue", _handler.dropped
+        )
+    _handler = _listener = None
@@ -0,0 +1,208 @@
+"""
+In-memory inverted index with BM25 ranking.
+
+Documents are indexed once as lowercase token postings per field, so a
+query only touches the postings of its own terms instead of scanning and
+lowercasing every document. Exact-match attributes (tags, roles, category)
+get their own postings sets for filtering. Documents can be added, replaced
+and removed individually, so callers keep the index current incrementally.
+
+Several indexes can be searched as one corpus by scoring each with shared
+:class:`CorpusStats`, so their scores are comparable.
+"""
+import bisect
+import heapq
+import math
+import re
+from collections import Counter, defaultdict
+from typing import (
+    Dict, Hashable, Iterable, List, Mapping, NamedTuple, Optional, Sequence, Set, Tuple,
+)
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9_]+")
+
+# Query terms at least this long also match indexed terms they prefix
+# ("test" matches "testing"), at PREFIX_WEIGHT of an exact match.
+MIN_PREFIX_LENGTH = 3
+PREFIX_WEIGHT = 0.5
+
+
+def tokenize(text: Optional[str]) -> List[str]:
+    """Lowercase ``text`` and split it into word tokens."""
+    return TOKEN_PATTERN.findall(text.lower()) if text else []
+
+
+class CorpusStats(NamedTuple):
+    """BM25 statistics of a query over one or more indexes taken together."""
+    doc_count: int
+    average_length: float
+    term_weights: Dict[str, float]
+    document_frequency: Dict[str, int]
+
+    @classmethod
+    def of(cls, indexes: Sequence["InvertedIndex"], query: str) -> "CorpusStats":
+        terms = set(tokenize(query))
+        doc_count = sum(len(index) for index in indexes)
+        total_length = sum(index._total_length for index in indexes)
+        weights: Dict[str, float] = {}
+        frequency: Dict[str, int] = defaultdict(int)
+        for index in indexes:
+            for term, weight in index._expand(terms).items():
+                weights[term] = max(weights.get(term, 0.0), weight)
+                frequency[term] += len(index._postings.get(term, ()))
+        return cls(
+            doc_count, (total_length / doc_count if doc_count else 0.0) or 1.0, weights,
+            dict(frequency),
+        )
+
+
+class InvertedIndex:
+    """BM25-ranked token postings over weighted fields, plus attribute postings.
+
+    ``field_weights`` maps field names to the weight their term frequencies
+    carry (a simple BM25F): a name match can count for more than a body match.
+    """
+
+    def __init__(
+        self, field_weights: Mapping[str, float], k1: float = 1.2, b: float = 0.75
+    ):
+        self.field_weights = dict(field_weights)
+        self.k1 = k1
+        self.b = b
+        self._postings: Dict[str, Dict[Hashable, float]] = defaultdict(dict)
+        self._doc_lengths: Dict[Hashable, float] = {}
+        self._doc_terms: Dict[Hashable, Tuple[str, ...]] = {}
+        self._attributes: Dict[str, Dict[str, Set[Hashable]]] = defaultdict(
+            lambda: defaultdict(set)
+        )
+        self._doc_attributes: Dict[Hashable, Dict[str, Tuple[str, ...]]] = {}
+        self._total_length = 0.0
+        self._vocabulary: Optional[List[str]] = None
+
+    def __len__(self) -> int:
+        return len(self._doc_lengths)
+
+    def __contains__(self, doc_id: Hashable) -> bool:
+        return doc_id in self._doc_lengths
+
+    @property
+    def doc_ids(self) -> Set[Hashable]:
+        return set(self._doc_lengths)
+
+    def add(
+        self,
+        doc_id: Hashable,
+        fields: Mapping[str, Optional[str]],
+        attributes: Optional[Mapping[str, Iterable[str]]] = None,
+    ) -> None:
+        """Index ``doc_id``, replacing any previous version of it."""
+        if doc_id in self._doc_lengths:
+            self.remove(doc_id)
+
+        weighted: Counter = Counter()
+        length = 0.0
+        for field, text in fields.items():
+            weight = self.field_weights.get(field, 1.0)
+            tokens = tokenize(text)
+            length += weight * len(tokens)
+            for token, count in Counter(tokens).items():
+                weighted[token] += weight * count
+        for token, frequency in weighted.items():
+            self._postings[token][doc_id] = frequency
+        self._doc_terms[doc_id] = tuple(weighted)
+        self._doc_lengths[doc_id] = length
+        self._total_length += length
+        self._vocabulary = None
+
+        normalized = {
+            name: tuple(str(value) for value in values or ())
+            for name, values in (attributes or {}).items()
+        }
+        for name, values in normalized.items():
+            for value in values:
+                self._attributes[name][value].add(doc_id)
+        self._doc_attributes[doc_id] = normalized
+
+    def remove(self, doc_id: Hashable) -> bool:
+        """Drop ``doc_id`` from all postings; return whether it was indexed."""
+        if doc_id not in self._doc_lengths:
+            return False
+        for token in self._doc_terms.pop(doc_id):
+            postings = self._postings[token]
+            postings.pop(doc_id, None)
+            if not postings:
+                del self._postings[token]
+                self._vocabulary = None
+        self._total_length -= self._doc_lengths.pop(doc_id)
+        for name, values in self._doc_attributes.pop(doc_id).items():
+            for value in values:
+                members = self._attributes[name][value]
+                members.discard(doc_id)
+                if not members:
+                    del self._attributes[name][value]
+        return True
+
+    def with_attribute(self, name: str, values: Iterable[str]) -> Set[Hashable]:
+        """Documents carrying any of ``values`` for attribute ``name``."""
+        postings = self._attributes.get(name, {})
+        matched: Set[Hashable] = set()
+        for value in values:
+            matched |= postings.get(str(value), set())
+        return matched
+
+    def without_attribute(self, name: str) -> Set[Hashable]:
+        """Documents that have no values for attribute ``name``."""
+        return {
+            doc_id for doc_id, attributes in self._doc_attributes.items()
+            if not attributes.get(name)
+        }
+
+    def search(
+        self,
+        query: str,
+        k: int = 20,
+        candidates: Optional[Set[Hashable]] = None,
+        stats: Optional[CorpusStats] = None,
+    ) -> List[Tuple[Hashable, float]]:
+        """Return up to ``k`` ``(doc_id, score)`` pairs ranked by BM25.
+
+        Only documents in the postings of the query terms are scored.
+        ``candidates`` restricts results to a pre-filtered set. ``stats``
+        (from :meth:`CorpusStats.of`) scores against a larger corpus than
+        this index alone.
+        """
+        if not self._doc_lengths:
+            return []
+        stats = stats or CorpusStats.of([self], query)
+        scores: Dict[Hashable, float] = defaultdict(float)
+        for term, term_weight in stats.term_weights.items():
+            postings = self._postings.get(term)
+            if not postings:
+                continue
+            df = stats.document_frequency[term]
+            idf = math.log(1 + (stats.doc_count - df + 0.5) / (df + 0.5))
+            for doc_id, frequency in postings.items():
+                if candidates is not None and doc_id not in candidates:
+                    continue
+                length = self._doc_lengths[doc_id] / stats.average_length
+                norm = self.k1 * (1 - self.b + self.b * length)
+                weight = term_weight * idf * frequency * (self.k1 + 1)
+                scores[doc_id] += weight / (frequency + norm)
+        return heapq.nlargest(k, scores.items(), key=lambda item: item[1])
+
+    def _expand(self, terms: Set[str]) -> Dict[str, float]:
+        """Map query terms to indexed terms: exact matches plus prefix matches."""
+        if self._vocabulary is None:
+            self._vocabulary = sorted(self._postings)
+        expanded: Dict[str, float] = {}
+        for term in terms:
+            if term in self._postings:
+                expanded[term] = 1.0
+            if len(term) < MIN_PREFIX_LENGTH:
+                continue
+            start = bisect.bisect_right(self._vocabulary, term)
+            for candidate in self._vocabulary[start:]:
+                if not candidate.startswith(term):
+                    break
+                expanded[candidate] = max(expanded.get(candidate, 0.0), PREFIX_WEIGHT)
+        return expanded
@@ -0,0 +1,231 @@
+"""
+Approximate nearest-neighbour index over embedding vectors.
+
+Vectors live in one contiguous float32 matrix. Below ``train_threshold``
+live rows the index answers queries exactly with a single matrix-vector
+product. Above it, an IVF layer (spherical k-means centroids with one
+inverted list per centroid) is trained, and queries only score the rows in
+the ``nprobe`` closest lists. Adds and removals are incremental: new rows
+are assigned to their nearest centroid and removed rows are tombstoned. The
+lists are retrained once the index has doubled since the last training.
+
+:meth:`VectorIndex.save` writes the matrix as ``.npy`` and
+:meth:`VectorIndex.load` memory-maps it, so workers share the page cache and
+start without re-embedding. The mapping is only copied into memory on the
+first write.
+"""
+import json
+import math
+import os
+from typing import Dict, Hashable, List, Optional, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - optional dependency
+    np = None
+
+from backend.core.embeddings import require_numpy
+
+DEFAULT_NPROBE = 8
+DEFAULT_TRAIN_THRESHOLD = 4096
+KMEANS_ITERATIONS = 8
+
+
+class VectorIndex:
+    """Cosine-similarity search over L2-normalised vectors with an IVF layer."""
+
+    def __init__(
+        self,
+        dimensions: int,
+        nprobe: int = DEFAULT_NPROBE,
+        train_threshold: int = DEFAULT_TRAIN_THRESHOLD,
+    ):
+        require_numpy()
+        self.dimensions = dimensions
+        self.nprobe = nprobe
+        self.train_threshold = train_threshold
+        self._vectors = np.empty((0, dimensions), dtype=np.float32)
+        self._alive = np.empty(0, dtype=bool)
+        self._keys: List[Hashable] = []
+        self._rows: Dict[Hashable, int] = {}
+        self._size = 0
+        self.centroids: Optional["np.ndarray"] = None
+        self._lists: List[List[int]] = []
+        self._trained_at = 0
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._rows
+
+    @property
+    def is_trained(self) -> bool:
+        return self.centroids is not None
+
+    def add(self, key: Hashable, vector: "np.ndarray") -> None:
+        """Insert or replace the vector for ``key``."""
+        self.remove(key)
+        self._reserve(self._size + 1)
+        row = self._size
+        self._vectors[row] = vector
+        self._alive[row] = True
+        self._keys.append(key)
+        self._rows[key] = row
+        self._size += 1
+        if self.centroids is not None:
+            self._lists[int(np.argmax(self.centroids @ vector))].append(row)
+        if len(self._rows) >= max(self.train_threshold, 2 * self._trained_at):
+            self.train()
+
+    def remove(self, key: Hashable) -> bool:
+        row = self._rows.pop(key, None)
+        if row is None:
+            return False
+        self._reserve(self._size)
+        self._alive[row] = False
+        return True
+
+    def score(
+        self, keys: List[Hashable], vector: "np.ndarray"
+    ) -> Dict[Hashable, float]:
+        """Exact cosine similarity of ``vector`` to the stored vectors of ``keys``."""
+        present = [key for key in keys if key in self._rows]
+        if not present:
+            return {}
+        rows = np.fromiter((self._rows[key] for key in present), dtype=np.int64)
+        return dict(zip(present, (self._vectors[rows] @ vector).tolist()))
+
+    def search(self, vector: "np.ndarray", k: int = 10) -> List[Tuple[Hashable, float]]:
+        """Return up to ``k`` ``(key, cosine similarity)`` pairs, best first."""
+        if not self._rows:
+            return []
+        if self.centroids is None:
+            rows = np.flatnonzero(self._alive[:self._size])
+        else:
+            probes = np.argsort(self.centroids @ vector)[::-1][:self.nprobe]
+            rows = np.fromiter(
+                (
+                    row for probe in probes for row in self._lists[probe]
+                    if self._alive[row]
+                ),
+                dtype=np.int64,
+            )
+        if rows.size == 0:
+            return []
+        scores = self._vectors[rows] @ vector
+        if rows.size > k:
+            top = np.argpartition(-scores, k - 1)[:k]
+        else:
+            top = np.arange(rows.size)
+        top = top[np.argsort(-scores[top])]
+        return [(self._keys[rows[i]], float(scores[i])) for i in top]
+
+    def train(self) -> None:
+        """Compact tombstones and (re)build the IVF lists with spherical k-means."""
+        self._compact()
+        count = self._size
+        if count < self.train_threshold:
+            self.centroids, self._lists = None, []
+            return
+        vectors = self._vectors[:count]
+        nlist = max(1, int(math.sqrt(count)))
+        rng = np.random.default_rng(count)
+        centroids = vectors[rng.choice(count, nlist, replace=False)].copy()
+        for _ in range(KMEANS_ITERATIONS):
+            assignment = np.argmax(vectors @ centroids.T, axis=1)
+            sums = np.zeros_like(centroids)
+            np.add.at(sums, assignment, vectors)
+            empty = ~sums.any(axis=1)
+            sums[empty] = centroids[empty]
+            norms = np.linalg.norm(sums, axis=1, keepdims=True)
+            norms[norms == 0] = 1.0
+            centroids = sums / norms
+        assignment = np.argmax(vectors @ centroids.T, axis=1)
+        self.centroids = centroids.astype(np.float32)
+        self._lists = [[] for _ in range(nlist)]
+        for row, cluster in enumerate(assignment.tolist()):
+            self._lists[cluster].append(row)
+        self._trained_at = count
+
+    def save(self, directory: str) -> None:
+        """Write live vectors, keys and centroids under ``directory``."""
+        self._compact()
+        os.makedirs(directory, exist_ok=True)
+        # Write-then-rename so readers that memory-mapped the previous files
+        # keep a consistent view.
+        _replace(
+            os.path.join(directory, "vectors.npy"),
+            lambda f: np.save(f, self._vectors[:self._size]),
+        )
+        _replace(
+            os.path.join(directory, "keys.json"),
+            lambda f: f.write(json.dumps(self._keys).encode()),
+        )
+        centroids_path = os.path.join(directory, "centroids.npy")
+        if self.centroids is not None:
+            _replace(centroids_path, lambda f: np.save(f, self.centroids))
+        elif os.path.exists(centroids_path):
+            os.remove(centroids_path)
+
+    @classmethod
+    def load(cls, directory: str, **kwargs) -> "VectorIndex":
+        """Memory-map an index written by :meth:`save`."""
+        vectors = np.load(os.path.join(directory, "vectors.npy"), mmap_mode="r")
+        with open(os.path.join(directory, "keys.json")) as handle:
+            keys = json.load(handle)
+        index = cls(vectors.shape[1], **kwargs)
+        index._vectors = vectors
+        index._alive = np.ones(len(keys), dtype=bool)
+        index._keys = keys
+        index._rows = {key: row for row, key in enumerate(keys)}
+        index._size = len(keys)
+        centroids_path = os.path.join(directory, "centroids.npy")
+        if os.path.exists(centroids_path):
+            index.centroids = np.load(centroids_path)
+            index._lists = [[] for _ in range(len(index.centroids))]
+            assignment = (
+                np.argmax(vectors @ index.centroids.T, axis=1) if len(keys) else []
+            )
+            for row, cluster in enumerate(np.asarray(assignment).tolist()):
+                index._lists[cluster].append(row)
+            index._trained_at = len(keys)
+        return index
+
+    def _reserve(self, rows: int) -> None:
+        """Make the matrix writable (copying a memory map) with room for ``rows``."""
+        capacity = self._vectors.shape[0]
+        writeable = self._vectors.flags.writeable and self._alive.flags.writeable
+        if rows <= capacity and writeable:
+            return
+        new_capacity = max(rows, 2 * capacity, 64) if rows > capacity else capacity
+        vectors = np.empty((new_capacity, self.dimensions), dtype=np.float32)
+        vectors[:self._size] = self._vectors[:self._size]
+        alive = np.zeros(new_capacity, dtype=bool)
+        alive[:self._size] = self._alive[:self._size]
+        self._vectors, self._alive = vectors, alive
+
+    def _compact(self) -> None:
+        live = np.flatnonzero(self._alive[:self._size])
+        if live.size == self._size:
+            return
+        self._vectors = np.ascontiguousarray(self._vectors[live])
+        self._alive = np.ones(live.size, dtype=bool)
+        self._keys = [self._keys[row] for row in live.tolist()]
+        self._rows = {key: row for row, key in enumerate(self._keys)}
+        self._size = live.size
+        if self.centroids is not None:
+            self._lists = [[] for _ in range(len(self.centroids))]
+            assignment = (
+                np.argmax(self._vectors @ self.centroids.T, axis=1)
+                if self._size else []
+            )
+            for row, cluster in enumerate(np.asarray(assignment).tolist()):
+                self._lists[cluster].append(row)
+
+
+def _replace(path: str, write) -> None:
+    temporary = f"{path}.{os.getpid()}.tmp"
+    with open(temporary, "wb") as handle:
+        write(handle)
+    os.replace(temporary, path)
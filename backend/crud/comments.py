@@ -2,13 +2,19 @@
 Simple CRUD operations for comments in single-user mode.
 """
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
-from typing import List, Optional
+from sqlalchemy import and_, func, select
+from sqlalchemy.engine import Row
+from typing import List, Optional, Sequence, Tuple
 import uuid
 from datetime import datetime
 
 from backend.models.comment import Comment
 from backend.schemas.comment import CommentCreate, CommentUpdate
+from backend.core.projection import project_columns
+from backend.services.exceptions import ValidationError
+
+# Columns exposed by the ``Comment`` response schema.
+COMMENT_ROW_FIELDS = ("content", "id", "created_at", "updated_at")
 
 
 async def get_comment(db: AsyncSession, comment_id: str) -> Optional[Comment]:
@@ -30,6 +36,36 @@ async def get_comments_by_task(db: AsyncSession, task_project_id: str, task_numb
     return list(result.scalars().all())
 
 
+async def get_comment_rows(
+    db: AsyncSession,
+    task_project_id: str,
+    task_number: int,
+    skip: int = 0,
+    limit: int = 100,
+    fields: Optional[Sequence[str]] = None,
+) -> Tuple[List[Row], int]:
+    """Get comments for a task as column-projected rows with a total count."""
+    table = Comment.__table__
+    try:
+        columns = project_columns(table, fields, COMMENT_ROW_FIELDS)
+    except ValueError as e:
+        raise ValidationError(str(e))
+    condition = and_(
+        table.c.task_project_id == task_project_id,
+        table.c.task_task_number == task_number,
+    )
+    result = await db.execute(
+        select(*columns)
+        .where(condition)
+        .order_by(table.c.created_at)
+        .offset(skip)
+        .limit(limit)
+    )
+    rows = result.all()
+    total = await db.scalar(select(func.count()).select_from(table).where(condition))
+    return rows, total
+
+
 async def create_comment(db: AsyncSession, comment: CommentCreate, task_project_id: str, task_number: int) -> Comment:
     """Create a new comment."""
     db_comment = Comment(
@@ -24,6 +24,7 @@ from sqlalchemy import (
     func
 )
 from sqlalchemy.ext.asyncio import AsyncSession  # Import AsyncSession
+from ..core.structured_logging import lazy
 from ..models.memory import MemoryRelation as MemoryRelationshipModel
 
 logger = logging.getLogger(__name__)
@@ -31,12 +32,12 @@ logger = logging.getLogger(__name__)
 
 async def get_entity_by_name(db: AsyncSession, name: str) -> Optional[MemoryEntityModel]:
     """Retrieve a memory entity by its name, searching within entity_metadata."""
-    logger.debug(f"[DEBUG] get_entity_by_name called with name: {name}")
+    logger.debug("[DEBUG] get_entity_by_name called with name: %s", name)
     # Use json_extract for SQLite compatibility
     result = await db.execute(text("SELECT memory_entities.* FROM memory_entities "
         "WHERE json_extract(memory_entities.entity_metadata, '$.name') = :name").params(name=name))
     entity = result.scalar_one_or_none()
-    logger.debug(f"[DEBUG] get_entity_by_name returned: {entity}")
+    logger.debug("[DEBUG] get_entity_by_name returned: %s", entity)
     return entity
 
 
@@ -45,7 +46,7 @@ async def get_entity_by_name(db: AsyncSession, name: str) -> Optional[MemoryEnti
 
 async def create_memory_entity(db: AsyncSession, entity: MemoryEntityCreate) -> MemoryEntityModel:
     """Create a new MemoryEntity."""
-    logger.debug(f"[DEBUG] create_memory_entity called with entity: {entity.model_dump_json()}")  # Debug print
+    logger.debug("[DEBUG] create_memory_entity called with entity: %s", lazy(entity.model_dump_json))  # Debug print
     db_entity = MemoryEntityModel(
     entity_type=entity.entity_type,
     name=entity.name,
@@ -58,7 +59,7 @@ async def create_memory_entity(db: AsyncSession, entity: MemoryEntityCreate) ->
     db.add(db_entity)
     await db.commit()
     await db.refresh(db_entity)
-    logger.debug(f"[DEBUG] create_memory_entity returned: {db_entity}")  # Debug print
+    logger.debug("[DEBUG] create_memory_entity returned: %s", db_entity)  # Debug print
     return db_entity
 
 
@@ -68,7 +69,7 @@ async def add_observation_to_entity(
     observation: MemoryObservationCreate
 ) -> MemoryObservationModel:
     """Add an observation to a memory entity."""
-    logger.debug(f"[DEBUG] add_observation_to_entity called with entity_id: {entity_id}")
+    logger.debug("[DEBUG] add_observation_to_entity called with entity_id: %s", entity_id)
     
     # Check if entity exists
     entity = await get_memory_entity(db, entity_id)
@@ -84,7 +85,7 @@ async def add_observation_to_entity(
     db.add(db_observation)
     await db.commit()
     await db.refresh(db_observation)
-    logger.debug(f"[DEBUG] add_observation_to_entity returned: {db_observation}")
+    logger.debug("[DEBUG] add_observation_to_entity returned: %s", db_observation)
     return db_observation
 
 
@@ -94,7 +95,7 @@ async def search_entities(
     limit: int = 10
 ) -> List[MemoryEntityModel]:
     """Search memory entities by content or metadata."""
-    logger.debug(f"[DEBUG] search_entities called with query: {query}, limit: {limit}")
+    logger.debug("[DEBUG] search_entities called with query: %s, limit: %s", query, limit)
     
     # Search in content and entity_metadata
     result = await db.execute(
@@ -109,31 +110,31 @@ async def search_entities(
         .limit(limit)
     )
     entities = result.scalars().all()
-    logger.debug(f"[DEBUG] search_entities returned {len(entities)} entities")
+    logger.debug("[DEBUG] search_entities returned %s entities", len(entities))
     return entities
 
 
 async def get_memory_entity(db: AsyncSession, entity_id: int) -> Optional[MemoryEntityModel]:
     """Retrieve a single MemoryEntity by its ID."""
-    logger.debug(f"[DEBUG] get_memory_entity called with entity_id: {entity_id}")  # Debug print
+    logger.debug("[DEBUG] get_memory_entity called with entity_id: %s", entity_id)  # Debug print
     result = await db.execute(select(MemoryEntityModel).filter(MemoryEntityModel.id == entity_id))
     entity = result.scalar_one_or_none()
-    logger.debug(f"[DEBUG] get_memory_entity returned: {entity}")  # Debug print
+    logger.debug("[DEBUG] get_memory_entity returned: %s", entity)  # Debug print
     return entity
 
 
 async def get_memory_entities(db: AsyncSession, skip: int = 0, limit: int = 100) -> List[MemoryEntityModel]:
     """Retrieve multiple MemoryEntities with pagination."""
-    logger.debug(f"[DEBUG] get_memory_entities called with skip: {skip}, limit: {limit}")  # Debug print
+    logger.debug("[DEBUG] get_memory_entities called with skip: %s, limit: %s", skip, limit)  # Debug print
     result = await db.execute(select(MemoryEntityModel).offset(skip).limit(limit))
     entities = result.scalars().all()
-    logger.debug(f"[DEBUG] get_memory_entities returned {len(entities)} entities")  # Debug print
+    logger.debug("[DEBUG] get_memory_entities returned %s entities", len(entities))  # Debug print
     return entities
 
 
 async def update_memory_entity(db: AsyncSession, entity_id: int, entity_update: MemoryEntityUpdate) -> Optional[MemoryEntityModel]:
     """Update a MemoryEntity by ID."""
-    logger.debug(f"[DEBUG] update_memory_entity called with entity_id: {entity_id}, update_data: {entity_update.model_dump_json()}")  # Debug print  # Fetch the entity asynchronously
+    logger.debug("[DEBUG] update_memory_entity called with entity_id: %s, update_data: %s", entity_id, lazy(entity_update.model_dump_json))  # Debug print  # Fetch the entity asynchronously
     db_entity = await get_memory_entity(db, entity_id)
     if db_entity:
         update_data = entity_update.model_dump(exclude_unset=True)
@@ -141,37 +142,37 @@ async def update_memory_entity(db: AsyncSession, entity_id: int, entity_update:
             setattr(db_entity, key, value)
             await db.commit()
             await db.refresh(db_entity)
-            logger.debug(f"[DEBUG] update_memory_entity returned updated entity: {db_entity}")  # Debug print
+            logger.debug("[DEBUG] update_memory_entity returned updated entity: %s", db_entity)  # Debug print
         else:
-            logger.debug(f"[DEBUG] update_memory_entity did not find entity with id {entity_id}")  # Debug print
+            logger.debug("[DEBUG] update_memory_entity did not find entity with id %s", entity_id)  # Debug print
             return db_entity
 
 
 async def delete_memory_entity(db: AsyncSession, entity_id: int) -> bool:
             """Delete a MemoryEntity by ID."""
-            logger.debug(f"[DEBUG] delete_memory_entity called with entity_id: {entity_id}")  # Debug print  # Fetch the entity asynchronously
+            logger.debug("[DEBUG] delete_memory_entity called with entity_id: %s", entity_id)  # Debug print  # Fetch the entity asynchronously
             db_entity = await get_memory_entity(db, entity_id)
             if db_entity:
                 await db.delete(db_entity)  # Await delete
                 await db.commit()  # Await commit
-                logger.debug(f"[DEBUG] delete_memory_entity successfully deleted entity with id {entity_id}")  # Debug print
+                logger.debug("[DEBUG] delete_memory_entity successfully deleted entity with id %s", entity_id)  # Debug print
                 return True
-            logger.debug(f"[DEBUG] delete_memory_entity did not find entity with id {entity_id}")  # Debug print
+            logger.debug("[DEBUG] delete_memory_entity did not find entity with id %s", entity_id)  # Debug print
             return False  # Add more specific retrieval functions if needed (e.g., by type, source, metadata content)
 
 
 async def get_memory_entities_by_source_type(db: AsyncSession, source_type: str, skip: int = 0, limit: int = 100) -> List[MemoryEntityModel]:
             """Retrieve MemoryEntities filtered by source type."""
-            logger.debug(f"[DEBUG] get_memory_entities_by_source_type called with source_type: {source_type}")  # Debug print
+            logger.debug("[DEBUG] get_memory_entities_by_source_type called with source_type: %s", source_type)  # Debug print
             result = await db.execute(select(MemoryEntityModel).filter(MemoryEntityModel.source == source_type).offset(skip).limit(limit))
             entities = result.scalars().all()
-            logger.debug(f"[DEBUG] get_memory_entities_by_source_type returned {len(entities)} entities")  # Debug print
+            logger.debug("[DEBUG] get_memory_entities_by_source_type returned %s entities", len(entities))  # Debug print
             return entities
 
 
 async def get_memory_relations_between_entities(db: AsyncSession, from_entity_id: int, to_entity_id: int, relation_type: str):
             """Retrieve relationships between two entities."""  # This function was implicitly used, converting to async and adding debug
-            logger.debug(f"[DEBUG] get_memory_relations_between_entities called with from: {from_entity_id}, to: {to_entity_id}, type: {relation_type}")  # Debug print  # from models.memory import MemoryRelationship as MemoryRelationshipModel  # Import inside function to avoid circular dep if needed - REMOVED
+            logger.debug("[DEBUG] get_memory_relations_between_entities called with from: %s, to: %s, type: %s", from_entity_id, to_entity_id, relation_type)  # Debug print  # from models.memory import MemoryRelationship as MemoryRelationshipModel  # Import inside function to avoid circular dep if needed - REMOVED
             result = await db.execute(
             select(MemoryRelationshipModel).filter(
             and_(
@@ -182,13 +183,13 @@ async def get_memory_relations_between_entities(db: AsyncSession, from_entity_id
             )
             )
             relations = result.scalars().all()
-            logger.debug(f"[DEBUG] get_memory_relations_between_entities returned {len(relations)} relations")  # Debug print
+            logger.debug("[DEBUG] get_memory_relations_between_entities returned %s relations", len(relations))  # Debug print
             return relations
 
 
 async def create_memory_relation(db: AsyncSession, relation: MemoryRelationCreate):
             """Create a memory relationship."""  # This function was implicitly used, converting to async and adding debug
-            logger.debug(f"[DEBUG] create_memory_relation called with relation: {relation.model_dump_json()}")  # Debug print  # from models.memory import MemoryRelationship as MemoryRelationshipModel  # Import inside function - REMOVED
+            logger.debug("[DEBUG] create_memory_relation called with relation: %s", lazy(relation.model_dump_json))  # Debug print  # from models.memory import MemoryRelationship as MemoryRelationshipModel  # Import inside function - REMOVED
             db_relationship = MemoryRelationshipModel(
             from_entity_id=relation.from_entity_id,
             to_entity_id=relation.to_entity_id,
@@ -197,15 +198,15 @@ async def create_memory_relation(db: AsyncSession, relation: MemoryRelationCreat
             db.add(db_relationship)
             await db.commit()
             await db.refresh(db_relationship)
-            logger.debug(f"[DEBUG] create_memory_relation returned: {db_relationship}")  # Debug print
+            logger.debug("[DEBUG] create_memory_relation returned: %s", db_relationship)  # Debug print
             return db_relationship
 
 
 async def delete_memory_relation(db: AsyncSession, relation_id: int):
             """Delete a memory relationship by ID."""  # This function was implicitly used, converting to async and adding debug
-            logger.debug(f"[DEBUG] delete_memory_relation called with relation_id: {relation_id}")  # Debug print  # from models.memory import MemoryRelationship as MemoryRelationshipModel  # Import inside function - REMOVED
+            logger.debug("[DEBUG] delete_memory_relation called with relation_id: %s", relation_id)  # Debug print  # from models.memory import MemoryRelationship as MemoryRelationshipModel  # Import inside function - REMOVED
             stmt = delete(MemoryRelationshipModel).where(MemoryRelationshipModel.id == relation_id)
             result = await db.execute(stmt)  # No commit needed here if caller handles it, but adding for completeness
             await db.commit()
-            logger.debug(f"[DEBUG] delete_memory_relation result: {result.rowcount} rows affected")  # Debug print
+            logger.debug("[DEBUG] delete_memory_relation result: %s rows affected", result.rowcount)  # Debug print
             return result.rowcount > 0
@@ -14,6 +14,7 @@ from ..schemas.memory import (
 )
 from sqlalchemy.ext.asyncio import AsyncSession  # Import AsyncSession
 from sqlalchemy import select, delete  # Import select and delete for async
+from ..core.structured_logging import lazy
 import logging
 
 logger = logging.getLogger(__name__)  # Import memory_crud
@@ -115,7 +116,7 @@ async def associate_file_with_project(db: AsyncSession, project_id: str, file_me
     project_id=project_id,
     file_memory_entity_id=file_memory_entity_id  # Use file_memory_entity_id
     )
-    logger.debug(f"[DEBUG] associate_file_with_project - created schema: {project_file.model_dump_json()}")  # Debug print  # Await the async create function
+    logger.debug("[DEBUG] associate_file_with_project - created schema: %s", lazy(project_file.model_dump_json))  # Debug print  # Await the async create function
     created_association = await create_project_file_association(db, project_file)
     logger.debug(f"[DEBUG] associate_file_with_project - created_association: {created_association}")  # Debug print
     return created_association  # async def get_files_for_project is already converted
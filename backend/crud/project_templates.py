@@ -1,6 +1,7 @@
 """CRUD operations for Project Templates."""
 
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List, Optional
 from backend import models
 from backend.schemas.project_template import (
@@ -9,47 +10,52 @@ from backend.schemas.project_template import (
 )
 
 
-def create_project_template(db: Session, template: ProjectTemplateCreate) -> models.ProjectTemplate:
+async def create_project_template(db: AsyncSession, template: ProjectTemplateCreate) -> models.ProjectTemplate:
     """Create a new project template."""
     db_template = models.ProjectTemplate(**template.model_dump())
     db.add(db_template)
-    db.commit()
-    db.refresh(db_template)
+    await db.commit()
+    await db.refresh(db_template)
     return db_template
 
 
-def get_project_template(db: Session, template_id: str) -> Optional[models.ProjectTemplate]:
+async def get_project_template(db: AsyncSession, template_id: str) -> Optional[models.ProjectTemplate]:
     """Retrieve a single project template by ID."""
-    return db.query(models.ProjectTemplate).filter(models.ProjectTemplate.id == template_id).first()
+    result = await db.execute(select(models.ProjectTemplate).where(models.ProjectTemplate.id == template_id))
+    return result.scalar_one_or_none()
 
 
-def get_project_template_by_name(db: Session, name: str) -> Optional[models.ProjectTemplate]:
+async def get_project_template_by_name(db: AsyncSession, name: str) -> Optional[models.ProjectTemplate]:
     """Retrieve a single project template by name."""
-    return db.query(models.ProjectTemplate).filter(models.ProjectTemplate.name == name).first()
+    result = await db.execute(select(models.ProjectTemplate).where(models.ProjectTemplate.name == name))
+    return result.scalar_one_or_none()
 
 
-def get_project_templates(db: Session, skip: int = 0, limit: int = 100) -> List[models.ProjectTemplate]:
+async def get_project_templates(db: AsyncSession, skip: int = 0, limit: int = 100) -> List[models.ProjectTemplate]:
     """Retrieve multiple project templates."""
-    return db.query(models.ProjectTemplate).offset(skip).limit(limit).all()
+    result = await db.execute(select(models.ProjectTemplate).offset(skip).limit(limit))
+    return list(result.scalars().all())
 
 
-def update_project_template(db: Session, template_id: str, template_update: ProjectTemplateUpdate) -> Optional[models.ProjectTemplate]:
+async def update_project_template(
+    db: AsyncSession, template_id: str, template_update: ProjectTemplateUpdate
+) -> Optional[models.ProjectTemplate]:
     """Update a project template by ID."""
-    db_template = get_project_template(db, template_id)
+    db_template = await get_project_template(db, template_id)
     if db_template:
         update_data = template_update.model_dump(exclude_unset=True)
         for key, value in update_data.items():
             setattr(db_template, key, value)
-            db.commit()
-            db.refresh(db_template)
-            return db_template
-
-
-def delete_project_template(db: Session, template_id: str) -> bool:
-            """Delete a project template by ID."""
-            db_template = get_project_template(db, template_id)
-            if db_template:
-                db.delete(db_template)
-                db.commit()
-                return True
-            return False
+        await db.commit()
+        await db.refresh(db_template)
+    return db_template
+
+
+async def delete_project_template(db: AsyncSession, template_id: str) -> bool:
+    """Delete a project template by ID."""
+    db_template = await get_project_template(db, template_id)
+    if db_template:
+        await db.delete(db_template)
+        await db.commit()
+        return True
+    return False
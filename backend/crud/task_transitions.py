@@ -0,0 +1,102 @@
+"""
+Task status transition history.
+
+Every status change is recorded as a ``task_status_transitions`` row in the
+caller's transaction, so the history commits or rolls back with the change
+itself. ``duration_seconds`` is the time the task spent in its previous
+status: since its last recorded transition, or since it was created.
+"""
+from datetime import datetime
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+from sqlalchemy import and_, false, func, insert, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from .. import models
+from ..enums import TaskStatusEnum
+
+TASKS = models.Task.__table__
+TRANSITIONS = models.TaskStatusTransition.__table__
+
+# (project_id, task_number, from_status, to_status); from_status is None
+# for a task's initial status.
+StatusChange = Tuple[str, int, Optional[TaskStatusEnum], TaskStatusEnum]
+
+
+def task_keys_clause(project_column, number_column, keys: Iterable[Tuple[str, int]]):
+    """``(project, number) IN keys`` as per-project ``IN`` lists, which SQLite
+    can answer from the task index (a row-value ``IN`` scans the table).
+    No keys match nothing."""
+    numbers: Dict[str, list] = {}
+    for project_id, number in keys:
+        numbers.setdefault(project_id, []).append(number)
+    if not numbers:
+        return false()
+    return or_(*(
+        and_(project_column == project_id, number_column.in_(project_numbers))
+        for project_id, project_numbers in numbers.items()
+    ))
+
+
+async def _entered_at(db: AsyncSession, keys: list) -> Dict[Tuple[str, int], datetime]:
+    """When each task entered its current status."""
+    if not keys:
+        return {}
+    task = (TRANSITIONS.c.task_project_id, TRANSITIONS.c.task_task_number)
+    rows = (await db.execute(
+        select(*task, func.max(TRANSITIONS.c.transitioned_at))
+        .where(task_keys_clause(*task, keys))
+        .group_by(*task)
+    )).all()
+    entered = {(project_id, number): at for project_id, number, at in rows}
+    missing = [key for key in keys if key not in entered]
+    if missing:
+        rows = (await db.execute(
+            select(TASKS.c.project_id, TASKS.c.task_number, TASKS.c.created_at)
+            .where(task_keys_clause(TASKS.c.project_id, TASKS.c.task_number, missing))
+        )).all()
+        entered.update({(project_id, number): at for project_id, number, at in rows})
+    return entered
+
+
+async def record_transitions(
+    db: AsyncSession,
+    changes: Iterable[StatusChange],
+    agent_id: Optional[str] = None,
+    trigger_type: str = "manual",
+    reason: Optional[str] = None,
+    context: Optional[Dict[str, Any]] = None,
+    now: Optional[datetime] = None,
+    requires_approval: bool = False,
+) -> int:
+    """Record status changes in the current transaction; does not commit.
+
+    Changes whose status did not actually change are skipped. Returns the
+    number of rows written.
+    """
+    changes = [change for change in changes if change[2] != change[3]]
+    if not changes:
+        return 0
+    now = now or datetime.utcnow()
+    entered = await _entered_at(
+        db, [(project_id, number) for project_id, number, frm, _ in changes if frm]
+    )
+    rows = []
+    for project_id, number, from_status, to_status in changes:
+        since = entered.get((project_id, number)) if from_status else None
+        rows.append({
+            "task_project_id": project_id,
+            "task_task_number": number,
+            "from_status": from_status,
+            "to_status": to_status,
+            "agent_id": agent_id,
+            "automated": trigger_type != "manual",
+            "trigger_type": trigger_type,
+            "requires_approval": requires_approval,
+            "reason": reason,
+            "transition_context": context,
+            "transitioned_at": now,
+            "duration_seconds": int((now - since).total_seconds()) if since else None,
+        })
+    await db.execute(insert(TRANSITIONS), rows)
+    return len(rows)
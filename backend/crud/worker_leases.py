@@ -0,0 +1,54 @@
+"""Leases in ``worker_leases``: which worker runs a once-per-deployment job."""
+from datetime import datetime, timedelta
+from typing import Optional
+
+from sqlalchemy import insert, or_, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend import models
+
+LEASES = models.WorkerLease.__table__
+
+
+async def acquire_lease(
+    db: AsyncSession, name: str, owner: str, seconds: float,
+    now: Optional[datetime] = None
+) -> Optional[datetime]:
+    """Take or renew lease ``name`` for ``owner``; commits.
+
+    Returns when the lease now expires, or ``None`` while another owner
+    holds it.
+    """
+    now = now or datetime.utcnow()
+    expires_at = now + timedelta(seconds=seconds)
+    held = (await db.execute(
+        update(LEASES)
+        .where(
+            LEASES.c.name == name,
+            or_(LEASES.c.owner == owner, LEASES.c.expires_at < now),
+        )
+        .values(owner=owner, expires_at=expires_at, updated_at=now)
+    )).rowcount == 1
+    if not held:
+        try:
+            await db.execute(
+                insert(LEASES).values(
+                    name=name, owner=owner, expires_at=expires_at, updated_at=now
+                )
+            )
+        except IntegrityError:
+            await db.rollback()
+            return None
+    await db.commit()
+    return expires_at
+
+
+async def release_lease(db: AsyncSession, name: str, owner: str) -> None:
+    """Let lease ``name`` lapse now if ``owner`` holds it; commits."""
+    now = datetime.utcnow()
+    await db.execute(
+        update(LEASES).where(LEASES.c.name == name, LEASES.c.owner == owner)
+        .values(expires_at=now, updated_at=now)
+    )
+    await db.commit()
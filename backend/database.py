@@ -104,7 +104,8 @@ async def init_db() -> None:
     """
     async with engine.begin() as conn:
         # Import all models to register them with Base
-        import backend.models  # noqa: F401
+        import backend.models
+        backend.models.load_all_models()
         
         # Create all tables
         await conn.run_sync(Base.metadata.create_all)
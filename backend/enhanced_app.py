@@ -26,6 +26,9 @@ from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sess
 from pydantic import BaseModel
 import uvicorn
 
+from backend.core.counters import counters
+from backend.core.responses import setup_response_layer
+
 # Database setup
 DATABASE_URL = "sqlite+aiosqlite:///./task_manager.db"
 SYNC_DATABASE_URL = "sqlite:///./task_manager.db"
@@ -187,9 +190,12 @@ async def lifespan(app: FastAPI):
     print(f"🔧 Features: Full CRUD, Real-time data, MCP integration")
     print("="*70 + "\n")
     
+    # Buffered access counters are flushed periodically and on shutdown
+    counters.start()
     yield
     
     logging.info("🛑 Shutting down Enhanced Task Manager API...")
+    await counters.stop()
 
 async def seed_initial_data():
     """Seed the database with initial data if empty"""
@@ -258,6 +264,9 @@ def create_app() -> FastAPI:
         lifespan=lifespan,
     )
     
+    # orjson responses and negotiated compression
+    setup_response_layer(app)
+    
     # Add CORS middleware
     app.add_middleware(
         CORSMiddleware,
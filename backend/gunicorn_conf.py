@@ -0,0 +1,38 @@
+"""
+Gunicorn settings for multi-worker deployments.
+
+    gunicorn "backend.app_factory:create_app()" -c backend/gunicorn_conf.py
+
+Tables are created once in the master before workers fork, and Prometheus
+samples of exited workers are cleaned up from ``PROMETHEUS_MULTIPROC_DIR``.
+"""
+import asyncio
+import multiprocessing
+import os
+
+bind = os.getenv("BIND", "0.0.0.0:8000")
+workers = int(os.getenv("WEB_CONCURRENCY", multiprocessing.cpu_count()))
+worker_class = "uvicorn.workers.UvicornWorker"
+graceful_timeout = 30
+keepalive = 5
+
+
+def on_starting(server):
+    os.environ.setdefault("WEB_CONCURRENCY", str(server.cfg.workers))
+    from backend.core.shared_state import startup_lock
+    from backend.database import engine, init_db
+
+    async def create_tables():
+        try:
+            await init_db()
+        finally:
+            await engine.dispose()
+
+    with startup_lock("init_db"):
+        asyncio.run(create_tables())
+
+
+def child_exit(server, worker):
+    from backend.metrics import mark_worker_dead
+
+    mark_worker_dead(worker.pid)
@@ -21,6 +21,8 @@ from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
 import uvicorn
 import sqlite3
+from backend.core.counters import counters
+from backend.core.responses import setup_response_layer
 from contextlib import contextmanager
 
 # Database setup
@@ -305,6 +307,9 @@ app = FastAPI(
     version="3.0.0",
 )
 
+# orjson responses and negotiated compression
+setup_response_layer(app)
+
 # Add CORS middleware
 app.add_middleware(
     CORSMiddleware,
@@ -314,10 +319,11 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Initialize database on startup
+# Initialize database and start flushing buffered counters on startup
 @app.on_event("startup")
 async def startup_event():
     init_database()
+    counters.start()
     print("\n" + "="*70)
     print(" " * 25 + "TASK MANAGER API v3.0")
     print("="*70)
@@ -328,6 +334,11 @@ async def startup_event():
     print(f"🎯 Frontend: http://localhost:3001")
     print("="*70 + "\n")
 
+# Write buffered access counters on shutdown
+@app.on_event("shutdown")
+async def shutdown_event():
+    await counters.stop()
+
 # Basic routes
 @app.get("/")
 async def root():
@@ -5,11 +5,13 @@ This module contains standardized MCP configuration following best practices
 from the FastAPI-MCP documentation.
 """
 
-from typing import List, Optional
+from typing import TYPE_CHECKING, List, Optional
 from fastapi import FastAPI
-from fastapi_mcp import FastApiMCP
 
-def create_mcp_server(app: FastAPI) -> Optional[FastApiMCP]:
+if TYPE_CHECKING:  # fastapi_mcp is heavy; import it only when mounting
+    from fastapi_mcp import FastApiMCP
+
+def create_mcp_server(app: FastAPI) -> Optional["FastApiMCP"]:
     """
     Create and configure the MCP server following FastAPI-MCP best practices.
     
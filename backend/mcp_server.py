@@ -1,9 +1,11 @@
+import os
+
 from .app_factory import create_app
 import uvicorn
 
 
 def main() -> None:
-    app = create_app()
+    app = create_app(profile=os.getenv("APP_PROFILE", "mcp"))
     uvicorn.run(app, host="0.0.0.0", port=8000)
 
 
@@ -1,76 +1,65 @@
-"""MCP Tools package initialization."""
+"""MCP Tools package initialization.
 
-# Import all tool functions from their respective modules
-from .memory_tools import (
-    add_memory_entity_tool,
-    add_memory_relation_tool,
-    search_memory_tool,
-    search_graph_tool,
-    get_memory_content_tool,
-    get_memory_metadata_tool,
-)
-from .project_tools import (
-    create_project_tool,
-    list_projects_tool,
-    get_project_tool,
-)
-from .task_tools import (
-    create_task_tool,
-    list_tasks_tool,
-)
-from .capability_tools import (
-    create_capability_tool,
-    list_capabilities_tool,
-    delete_capability_tool,
-)
-from .project_file_tools import (
-    add_project_file_tool,
-    list_project_files_tool,
-    remove_project_file_tool,
-)
-from .forbidden_action_tools import (
-    create_forbidden_action_tool,
-    list_forbidden_actions_tool,
-)
-from .agent_handoff_tools import (
-    create_handoff_criteria_tool,
-    list_handoff_criteria_tool,
-    delete_handoff_criteria_tool,
-)
-from .project_template_tools import (
-    create_project_template_tool,
-    list_project_templates_tool,
-    delete_project_template_tool,
-)
-from .error_protocol_tools import (
-    add_error_protocol_tool,
-    list_error_protocols_tool,
-    remove_error_protocol_tool,
-)
-from .verification_requirement_tools import (
-    create_verification_requirement_tool,
-    list_verification_requirements_tool,
-    delete_verification_requirement_tool,
-)
-from .template_tools import (
-    create_template_tool,
-    list_templates_tool,
-    delete_template_tool,
-)
-from .mandate_tools import (
-    create_mandate_tool,
-    list_mandates_tool,
-    delete_mandate_tool,
-)
-from .workflow_tools import (
-    create_workflow_tool,
-    list_workflows_tool,
-    delete_workflow_tool,
-)
-from .rule_tools import (
-    create_universal_mandate_tool,
-    create_agent_rule_tool,
-)
+Tool functions are imported from their modules on first access so that
+importing one tool does not pull in every service the package depends on.
+"""
+
+import importlib
+
+# Map each exported tool function to the module that defines it.
+_TOOL_MODULES = {
+    'add_memory_entity_tool': '.memory_tools',
+    'add_memory_relation_tool': '.memory_tools',
+    'search_memory_tool': '.memory_tools',
+    'search_graph_tool': '.memory_tools',
+    'get_memory_content_tool': '.memory_tools',
+    'get_memory_metadata_tool': '.memory_tools',
+    'create_project_tool': '.project_tools',
+    'list_projects_tool': '.project_tools',
+    'get_project_tool': '.project_tools',
+    'create_task_tool': '.task_tools',
+    'list_tasks_tool': '.task_tools',
+    'create_capability_tool': '.capability_tools',
+    'list_capabilities_tool': '.capability_tools',
+    'delete_capability_tool': '.capability_tools',
+    'add_project_file_tool': '.project_file_tools',
+    'list_project_files_tool': '.project_file_tools',
+    'remove_project_file_tool': '.project_file_tools',
+    'create_forbidden_action_tool': '.forbidden_action_tools',
+    'list_forbidden_actions_tool': '.forbidden_action_tools',
+    'create_handoff_criteria_tool': '.agent_handoff_tools',
+    'list_handoff_criteria_tool': '.agent_handoff_tools',
+    'delete_handoff_criteria_tool': '.agent_handoff_tools',
+    'create_project_template_tool': '.project_template_tools',
+    'list_project_templates_tool': '.project_template_tools',
+    'delete_project_template_tool': '.project_template_tools',
+    'add_error_protocol_tool': '.error_protocol_tools',
+    'list_error_protocols_tool': '.error_protocol_tools',
+    'remove_error_protocol_tool': '.error_protocol_tools',
+    'create_verification_requirement_tool': '.verification_requirement_tools',
+    'list_verification_requirements_tool': '.verification_requirement_tools',
+    'delete_verification_requirement_tool': '.verification_requirement_tools',
+    'create_template_tool': '.template_tools',
+    'list_templates_tool': '.template_tools',
+    'delete_template_tool': '.template_tools',
+    'create_mandate_tool': '.mandate_tools',
+    'list_mandates_tool': '.mandate_tools',
+    'delete_mandate_tool': '.mandate_tools',
+    'create_workflow_tool': '.workflow_tools',
+    'list_workflows_tool': '.workflow_tools',
+    'delete_workflow_tool': '.workflow_tools',
+    'create_universal_mandate_tool': '.rule_tools',
+    'create_agent_rule_tool': '.rule_tools',
+}
+
+
+def __getattr__(name):
+    module_name = _TOOL_MODULES.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
 
 __all__ = [
     # Memory tools
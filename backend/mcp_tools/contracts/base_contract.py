@@ -3,16 +3,30 @@ MCP Tool Contract System for Auto-Registration and Validation.
 Provides YAML-based contracts for all MCP tools.
 """
 
-import yaml
+import importlib
+import importlib.util
+import inspect
 import json
-from typing import Dict, Any, List, Optional, Type
+import os
+import re
+from typing import Annotated, Callable, Dict, Any, List, NamedTuple, Optional, Tuple, Type
 from pathlib import Path
-from pydantic import BaseModel, validator
+from pydantic import AfterValidator, BaseModel, Field, Strict, TypeAdapter, validator
+from pydantic import ValidationError as PydanticValidationError
+from typing_extensions import NotRequired, Required, TypedDict
 from abc import ABC, abstractmethod
 import logging
 
+try:
+    from backend.config.app_config import settings
+except ImportError:
+    from config.app_config import settings
+
 logger = logging.getLogger(__name__)
 
+CONTRACT_DIR = Path(__file__).parent
+TOOL_CLASS_PATTERN = re.compile(r"^class\s+(\w+)\s*\(\s*BaseMCPTool\s*\)", re.MULTILINE)
+
 
 class ToolParameter(BaseModel):
     """Definition of a tool parameter."""
@@ -93,41 +107,176 @@ class ToolContract(BaseModel):
         return v
 
 
+PARAMETER_TYPES = {
+    'string': Annotated[str, Strict()],
+    'integer': Annotated[int, Strict()],
+    'boolean': Annotated[bool, Strict()],
+    'number': float,
+    'object': Dict[str, Any],
+    'array': List[Any],
+}
+
+
+def _check_pattern(name: str, pattern: str):
+    match = re.compile(pattern).match
+
+    def check(value):
+        if isinstance(value, str) and not match(value):
+            raise ValueError(f"Parameter {name} does not match required pattern")
+        return value
+    return check
+
+
+def _check_enum(name: str, allowed: List[Any]):
+    def check(value):
+        if value is not None and value not in allowed:
+            raise ValueError(f"Parameter {name} must be one of: {allowed}")
+        return value
+    return check
+
+
+def _describe(error: Dict[str, Any]) -> str:
+    if error['type'] == 'missing':
+        return f"Missing required parameter: {error['loc'][0]}"
+    if error['type'] == 'value_error':
+        return str(error['ctx']['error'])
+    return f"Parameter {'.'.join(map(str, error['loc']))}: {error['msg']}"
+
+
+class ContractValidator:
+    """A contract's parameter list compiled into one Pydantic validator.
+
+    The parameters become a ``TypedDict`` schema, so types, lengths, bounds,
+    enums and precompiled ``pattern`` regexes are checked in one
+    ``validate_python`` call that returns a plain dict of the parameters
+    given.
+    """
+
+    def __init__(self, contract: "ToolContract"):
+        self.tool_name = contract.name
+        self.names = frozenset(param.name for param in contract.parameters)
+        self.defaults = {
+            param.name: param.default for param in contract.parameters if param.default is not None
+        }
+        fields = {}
+        for param in contract.parameters:
+            annotation = PARAMETER_TYPES.get(param.type, Any)
+            constraints = {}
+            if param.type == 'string':
+                constraints = {'min_length': param.min_length, 'max_length': param.max_length}
+            elif param.type in ('integer', 'number'):
+                constraints = {'ge': param.min_value, 'le': param.max_value}
+            checks = []
+            if param.type == 'string' and param.pattern:
+                checks.append(AfterValidator(_check_pattern(param.name, param.pattern)))
+            if param.enum:
+                checks.append(AfterValidator(_check_enum(param.name, param.enum)))
+            if checks:
+                annotation = Annotated[(annotation, *checks)]
+            constraints = {key: value for key, value in constraints.items() if value is not None}
+            annotation = Annotated[annotation, Field(**constraints)]
+            fields[param.name] = Required[annotation] if param.required else NotRequired[Optional[annotation]]
+        # Keys outside the contract are ignored, as with any TypedDict.
+        self.adapter = TypeAdapter(TypedDict(f"{contract.name.title().replace('_', '')}Parameters", fields))
+
+    def validate(self, parameters: Dict[str, Any]) -> Dict[str, Any]:
+        try:
+            validated = self.adapter.validate_python(parameters)
+        except PydanticValidationError as e:
+            raise ValueError("; ".join(_describe(error) for error in e.errors(include_url=False)))
+        for name, value in self.defaults.items():
+            validated.setdefault(name, value)
+        unexpected = parameters.keys() - self.names
+        if unexpected:
+            logger.warning(f"Unexpected parameters {sorted(unexpected)} for tool {self.tool_name}")
+        return validated
+
+
+class CompiledContract(NamedTuple):
+    contract: "ToolContract"
+    validator: ContractValidator
+    mtime_ns: Optional[int]
+
+
+# Contracts by resolved file path, parsed once per process. With
+# MCP_CONTRACT_RELOAD set, a changed file is re-parsed on next use.
+_contract_cache: Dict[str, CompiledContract] = {}
+_class_paths: Dict[str, Path] = {}
+
+
+def contract_paths(class_name: str) -> Tuple[Path, ...]:
+    """Contract files tried for a tool class, e.g. ``prompt_library.yaml``
+    then the older ``promptlibrary.yaml`` for ``PromptLibraryTool``."""
+    snake = re.sub(r"(?<!^)(?=[A-Z])", "_", re.sub(r"Tool$", "", class_name)).lower()
+    legacy = class_name.lower().replace('tool', '')
+    return tuple(dict.fromkeys(CONTRACT_DIR / f"{name}.yaml" for name in (snake, legacy)))
+
+
+def _mtime_ns(path: Path) -> Optional[int]:
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+
+
+def load_contract(path: Path, default: Callable[[], "ToolContract"]) -> CompiledContract:
+    """Parse and compile the contract at ``path``, or compile ``default()`` if
+    the file is missing or invalid. Results are cached per path."""
+    key = str(path)
+    cached = _contract_cache.get(key)
+    if cached is not None and not (settings.mcp_contract_reload and _mtime_ns(path) != cached.mtime_ns):
+        return cached
+    mtime_ns = _mtime_ns(path)
+    try:
+        import yaml  # deferred: only needed when a contract file is read
+
+        with open(path, 'r') as f:
+            contract = ToolContract(**yaml.safe_load(f))
+    except FileNotFoundError:
+        logger.warning(f"Contract file not found: {path}")
+        contract = default()
+    except Exception as e:
+        logger.error(f"Error loading contract from {path}: {e}")
+        contract = default()
+    compiled = _contract_cache[key] = CompiledContract(contract, ContractValidator(contract), mtime_ns)
+    return compiled
+
+
+def default_contract(class_name: str) -> "ToolContract":
+    """Contract for tools without a YAML file."""
+    return ToolContract(
+        name=class_name.lower().replace('tool', ''),
+        display_name=class_name,
+        description="Auto-generated contract",
+        category="agent",
+        response=ToolResponse(type="object", description="Tool response")
+    )
+
+
+def contract_for_class(class_name: str) -> CompiledContract:
+    """The compiled contract of a tool class, found by naming convention."""
+    path = _class_paths.get(class_name)
+    if path is None:
+        paths = contract_paths(class_name)
+        path = _class_paths[class_name] = next((path for path in paths if path.exists()), paths[0])
+    return load_contract(path, lambda: default_contract(class_name))
+
+
 class BaseMCPTool(ABC):
     """Base class for all MCP tools with contract enforcement."""
     
     def __init__(self, contract_path: Optional[str] = None):
-        self.contract = self._load_contract(contract_path)
-        self._validate_implementation()
-    
-    def _load_contract(self, contract_path: Optional[str] = None) -> ToolContract:
-        """Load tool contract from YAML file."""
         if contract_path is None:
-            # Auto-discover contract file based on class name
-            class_name = self.__class__.__name__
-            contract_filename = f"{class_name.lower().replace('tool', '')}.yaml"
-            contract_path = Path(__file__).parent / contract_filename
-        
-        try:
-            with open(contract_path, 'r') as f:
-                contract_data = yaml.safe_load(f)
-            return ToolContract(**contract_data)
-        except FileNotFoundError:
-            logger.warning(f"Contract file not found: {contract_path}")
-            return self._create_default_contract()
-        except Exception as e:
-            logger.error(f"Error loading contract from {contract_path}: {e}")
-            return self._create_default_contract()
+            compiled = contract_for_class(self.__class__.__name__)
+        else:
+            compiled = load_contract(Path(contract_path), self._create_default_contract)
+        self.contract = compiled.contract
+        self._validator = compiled.validator
+        self._validate_implementation()
     
     def _create_default_contract(self) -> ToolContract:
         """Create a default contract for tools without YAML files."""
-        return ToolContract(
-            name=self.__class__.__name__.lower().replace('tool', ''),
-            display_name=self.__class__.__name__,
-            description="Auto-generated contract",
-            category="agent",
-            response=ToolResponse(type="object", description="Tool response")
-        )
+        return default_contract(self.__class__.__name__)
     
     def _validate_implementation(self):
         """Validate that the implementation matches the contract."""
@@ -136,61 +285,12 @@ class BaseMCPTool(ABC):
             raise ValueError(f"Tool {self.contract.name} must implement execute() method")
     
     def validate_parameters(self, parameters: Dict[str, Any]) -> Dict[str, Any]:
-        """Validate input parameters against contract."""
-        validated = {}
-        
-        # Check required parameters
-        for param in self.contract.parameters:
-            if param.required and param.name not in parameters:
-                raise ValueError(f"Missing required parameter: {param.name}")
-            
-            if param.name in parameters:
-                value = parameters[param.name]
-                validated[param.name] = self._validate_parameter_value(param, value)
-            elif param.default is not None:
-                validated[param.name] = param.default
-        
-        # Check for unexpected parameters
-        contract_param_names = {p.name for p in self.contract.parameters}
-        for param_name in parameters:
-            if param_name not in contract_param_names:
-                logger.warning(f"Unexpected parameter {param_name} for tool {self.contract.name}")
-        
-        return validated
-    
-    def _validate_parameter_value(self, param: ToolParameter, value: Any) -> Any:
-        """Validate a single parameter value."""
-        # Type validation
-        if param.type == 'string' and not isinstance(value, str):
-            raise ValueError(f"Parameter {param.name} must be a string")
-        elif param.type == 'integer' and not isinstance(value, int):
-            raise ValueError(f"Parameter {param.name} must be an integer")
-        elif param.type == 'boolean' and not isinstance(value, bool):
-            raise ValueError(f"Parameter {param.name} must be a boolean")
-        
-        # String validations
-        if param.type == 'string' and isinstance(value, str):
-            if param.min_length and len(value) < param.min_length:
-                raise ValueError(f"Parameter {param.name} must be at least {param.min_length} characters")
-            if param.max_length and len(value) > param.max_length:
-                raise ValueError(f"Parameter {param.name} must be at most {param.max_length} characters")
-            if param.pattern:
-                import re
-                if not re.match(param.pattern, value):
-                    raise ValueError(f"Parameter {param.name} does not match required pattern")
-        
-        # Numeric validations
-        if param.type in ['integer', 'number'] and isinstance(value, (int, float)):
-            if param.min_value and value < param.min_value:
-                raise ValueError(f"Parameter {param.name} must be at least {param.min_value}")
-            if param.max_value and value > param.max_value:
-                raise ValueError(f"Parameter {param.name} must be at most {param.max_value}")
-        
-        # Enum validation
-        if param.enum and value not in param.enum:
-            raise ValueError(f"Parameter {param.name} must be one of: {param.enum}")
-        
-        return value
+        """Validate input parameters against contract.
+
+        Raises ``ValueError`` naming each missing or invalid parameter;
+        unknown parameters are dropped with a warning.
+        """
+        return self._validator.validate(parameters)
     
     @abstractmethod
     async def execute(self, parameters: Dict[str, Any], context: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
@@ -238,12 +338,31 @@ class BaseMCPTool(ABC):
         return spec
 
 
+def _requires_arguments(cls: type) -> bool:
+    """Whether constructing ``cls`` needs an argument without a default."""
+    try:
+        parameters = inspect.signature(cls).parameters.values()
+    except (TypeError, ValueError):
+        return False
+    return any(
+        parameter.default is inspect.Parameter.empty
+        and parameter.kind in (inspect.Parameter.POSITIONAL_ONLY, inspect.Parameter.POSITIONAL_OR_KEYWORD,
+                               inspect.Parameter.KEYWORD_ONLY)
+        for parameter in parameters
+    )
+
+
 class ToolRegistry:
-    """Registry for all MCP tools with auto-discovery."""
+    """Registry for all MCP tools with lazy auto-discovery.
+
+    Discovery reads tool module sources and contract files without importing
+    the modules; a tool's module is imported when the tool is first fetched.
+    """
     
     def __init__(self):
         self.tools: Dict[str, BaseMCPTool] = {}
         self.contracts: Dict[str, ToolContract] = {}
+        self._discovered: Dict[str, Tuple[str, str]] = {}
     
     def register_tool(self, tool: BaseMCPTool):
         """Register a tool instance."""
@@ -251,9 +370,35 @@ class ToolRegistry:
         self.contracts[tool.contract.name] = tool.contract
         logger.info(f"Registered MCP tool: {tool.contract.name}")
     
+    def get_tool_class(self, tool_name: str) -> Optional[Type[BaseMCPTool]]:
+        """Get a tool's class by name, importing its module on first use."""
+        if tool_name in self.tools:
+            return type(self.tools[tool_name])
+        location = self._discovered.get(tool_name)
+        if location is None:
+            return None
+        module_name, class_name = location
+        return getattr(importlib.import_module(module_name), class_name)
+    
     def get_tool(self, tool_name: str) -> Optional[BaseMCPTool]:
-        """Get a tool by name."""
-        return self.tools.get(tool_name)
+        """Get a tool by name.
+
+        Discovered tools are imported and instantiated on first access;
+        tools whose constructor needs arguments (such as a database session)
+        are available through :meth:`get_tool_class` instead.
+        """
+        tool = self.tools.get(tool_name)
+        if tool is None and tool_name in self._discovered:
+            try:
+                tool_class = self.get_tool_class(tool_name)
+                if _requires_arguments(tool_class):
+                    return None
+                tool = tool_class()
+            except Exception as e:
+                logger.error(f"Failed to load tool {tool_name}: {e}")
+                return None
+            self.register_tool(tool)
+        return tool
     
     def get_contract(self, tool_name: str) -> Optional[ToolContract]:
         """Get a tool contract by name."""
@@ -261,7 +406,7 @@ class ToolRegistry:
     
     def list_tools(self) -> List[str]:
         """List all registered tool names."""
-        return list(self.tools.keys())
+        return list(dict.fromkeys([*self.tools, *self._discovered]))
     
     def list_tools_by_category(self, category: str) -> List[str]:
         """List tools by category."""
@@ -272,27 +417,16 @@ class ToolRegistry:
         return {name: contract.dict() for name, contract in self.contracts.items()}
     
     def auto_discover_tools(self, tools_package: str = "backend.mcp_tools"):
-        """Auto-discover and register tools from a package."""
-        import importlib
-        import pkgutil
-        
+        """Find tool classes in a package's ``*_tools`` modules without importing them."""
         try:
-            package = importlib.import_module(tools_package)
-            for _, module_name, _ in pkgutil.iter_modules(package.__path__):
-                if module_name.endswith('_tools'):
-                    module = importlib.import_module(f"{tools_package}.{module_name}")
-                    
-                    # Look for classes that inherit from BaseMCPTool
-                    for attr_name in dir(module):
-                        attr = getattr(module, attr_name)
-                        if (isinstance(attr, type) and 
-                            issubclass(attr, BaseMCPTool) and 
-                            attr != BaseMCPTool):
-                            try:
-                                tool_instance = attr()
-                                self.register_tool(tool_instance)
-                            except Exception as e:
-                                logger.error(f"Failed to register tool {attr_name}: {e}")
+            spec = importlib.util.find_spec(tools_package)
+            for directory in spec.submodule_search_locations or ():
+                for path in sorted(Path(directory).glob("*_tools.py")):
+                    source = path.read_text(encoding="utf-8")
+                    for class_name in TOOL_CLASS_PATTERN.findall(source):
+                        contract = contract_for_class(class_name).contract
+                        self._discovered[contract.name] = (f"{tools_package}.{path.stem}", class_name)
+                        self.contracts.setdefault(contract.name, contract)
         except Exception as e:
             logger.error(f"Failed to auto-discover tools: {e}")
 
@@ -4,7 +4,7 @@ MCP Tools for Memory/Knowledge Graph Management.
 
 from fastapi import HTTPException
 from sqlalchemy.orm import Session
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 import logging
 
 from backend.crud.memory import (
@@ -167,14 +167,16 @@ async def search_graph_tool(
 
 
 async def get_memory_content_tool(
-    entity_id: int,
+    entity_id: str,
     db: Session,
+    start: int = 0,
+    end: Optional[int] = None,
 ) -> dict:
-    """MCP Tool: Get memory entity content."""
+    """MCP Tool: Get memory entity content, or a byte range of it."""
     try:
         service = MemoryService(db)
-        content = service.get_file_content(entity_id)
-        return {"success": True, "content": content}
+        content = await service.get_content_range(entity_id, start, end)
+        return {"success": True, **content}
     except HTTPException as e:
         logger.error(
             f"MCP get memory content failed with HTTP exception: {e.detail}"
@@ -21,13 +21,13 @@ async def create_project_template_tool(
     """MCP Tool: Create a new project template."""
     try:
         service = _get_service(db)
-        existing = service.get_template_by_name(template_data.name)
+        existing = await service.get_template_by_name(template_data.name)
         if existing:
             raise HTTPException(
                 status_code=400,
                 detail="Project template already exists",
             )
-        template = service.create_template(template_data)
+        template = await service.create_template(template_data)
         AuditLogService(db).log_action(
             action="project_template_created",
             entity_type="project_template",
@@ -53,7 +53,7 @@ async def list_project_templates_tool(
     """MCP Tool: List project templates."""
     try:
         service = _get_service(db)
-        templates = service.get_templates(skip=skip, limit=limit)
+        templates = await service.get_templates(skip=skip, limit=limit)
         return {
             "success": True,
             "templates": [
@@ -83,7 +83,7 @@ async def delete_project_template_tool(
     """MCP Tool: Delete a project template."""
     try:
         service = _get_service(db)
-        success = service.delete_template(template_id)
+        success = await service.delete_template(template_id)
         if not success:
             raise HTTPException(status_code=404, detail="Project template not found")
         AuditLogService(db).log_action(
@@ -4,19 +4,144 @@ Prompt Library MCP Tool for managing reusable prompts with context awareness.
 
 import re
 import json
-from typing import Dict, Any, List, Optional
+import asyncio
+import heapq
+from typing import Dict, Any, List, Optional, Tuple
 from datetime import datetime
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, and_, or_, func
 import logging
 
 from .contracts.base_contract import BaseMCPTool
+from ..core.counters import counters
+from ..core.shared_state import get_shared_state
+from ..core.text_index import InvertedIndex
 from ..models.memory import MemoryEntity, MemoryObservation
 from ..services.memory_service import MemoryService
 from ..services.exceptions import EntityNotFoundError, ValidationError, DuplicateEntityError
 
 logger = logging.getLogger(__name__)
 
+PROMPT_ENTITY_TYPE = "prompt_template"
+PROMPT_INDEX_NAME = "prompt_library"
+# Same relative weights as the old substring scorer: name > tags > content.
+PROMPT_FIELD_WEIGHTS = {"name": 2.0, "tags": 1.4, "content": 1.0}
+# Attribute value for prompts without agent_roles, which every role may use.
+ANY_ROLE = "*"
+
+
+class PromptIndex:
+    """Process-wide search index over prompt_template memory entities.
+
+    Built from the database on first use and then kept current by the
+    prompt library's create, update and delete actions. Other workers are
+    told to rebuild through shared-state invalidation.
+    """
+
+    def __init__(self):
+        self.index = InvertedIndex(PROMPT_FIELD_WEIGHTS)
+        self.prompts: Dict[str, Dict[str, Any]] = {}
+        self._loaded = False
+        self._lock = asyncio.Lock()
+        self._listening = False
+
+    def invalidate(self) -> None:
+        """Force a rebuild from the database on next use."""
+        self._loaded = False
+
+    async def ensure_loaded(self, db: AsyncSession) -> "PromptIndex":
+        if self._loaded:
+            return self
+        async with self._lock:
+            if self._loaded:
+                return self
+            if not self._listening:
+                get_shared_state().on_invalidate(PROMPT_INDEX_NAME, self.invalidate)
+                self._listening = True
+            table = MemoryEntity.__table__
+            result = await db.execute(
+                select(table.c.content, table.c.entity_metadata)
+                .where(table.c.entity_type == PROMPT_ENTITY_TYPE)
+            )
+            self.index = InvertedIndex(PROMPT_FIELD_WEIGHTS)
+            self.prompts = {}
+            for content, metadata in result:
+                if metadata and metadata.get('prompt_id'):
+                    self.upsert(content, metadata)
+            self._loaded = True
+            logger.debug(f"Prompt index built with {len(self.prompts)} prompts")
+        return self
+
+    def upsert(self, content: Optional[str], metadata: Dict[str, Any]) -> None:
+        """Index (or re-index) one prompt from its content and metadata."""
+        prompt_id = metadata['prompt_id']
+        tags = metadata.get('tags') or []
+        category = metadata.get('category')
+        self.prompts[prompt_id] = {
+            "prompt_id": prompt_id,
+            "name": metadata['name'],
+            "category": category,
+            "tags": tags,
+            "usage_count": counters.merged("prompt_usage", prompt_id, metadata.get('usage_count', 0)),
+            "last_used": self._last_used(prompt_id, metadata),
+            "created_at": metadata.get('created_at'),
+            "content": content or "",
+        }
+        self.index.add(
+            prompt_id,
+            {"name": metadata['name'], "tags": " ".join(tags), "content": content},
+            {
+                "category": [category] if category else [],
+                "tags": tags,
+                "agent_roles": metadata.get('agent_roles') or [ANY_ROLE],
+            },
+        )
+
+    def record_use(self, prompt_id: str) -> None:
+        """Reflect a use counted in :data:`counters` without re-indexing."""
+        entry = self.prompts.get(prompt_id)
+        if entry is not None:
+            entry["usage_count"] += 1
+            entry["last_used"] = self._last_used(prompt_id, {})
+
+    @staticmethod
+    def _last_used(prompt_id: str, metadata: Dict[str, Any]) -> Optional[str]:
+        touched = counters.last_touched("prompt_usage", prompt_id)
+        return touched.isoformat() if touched else metadata.get('last_used')
+
+    def remove(self, prompt_id: str) -> None:
+        self.prompts.pop(prompt_id, None)
+        self.index.remove(prompt_id)
+
+    def search(self, query: str, limit: int) -> List[Tuple[Dict[str, Any], float]]:
+        """Top ``limit`` prompts for ``query`` with their BM25 scores."""
+        return [(self.prompts[prompt_id], score) for prompt_id, score in self.index.search(query, limit)]
+
+    def filter(
+        self,
+        category: Optional[str] = None,
+        tags: Optional[List[str]] = None,
+        agent_role: Optional[str] = None,
+        limit: int = 50,
+    ) -> Tuple[List[Dict[str, Any]], int]:
+        """Most-used prompts matching the filters, and the total match count."""
+        candidates = None
+        if category:
+            candidates = self.index.with_attribute("category", [category])
+        if tags:
+            tagged = self.index.with_attribute("tags", tags)
+            candidates = tagged if candidates is None else candidates & tagged
+        if agent_role:
+            allowed = self.index.with_attribute("agent_roles", [agent_role, ANY_ROLE])
+            candidates = allowed if candidates is None else candidates & allowed
+        if candidates is None:
+            candidates = self.prompts.keys()
+        top = heapq.nlargest(limit, candidates, key=lambda prompt_id: self.prompts[prompt_id]['usage_count'])
+        return [self.prompts[prompt_id] for prompt_id in top], len(candidates)
+
+
+prompt_index = PromptIndex()
+
 
 class PromptLibraryTool(BaseMCPTool):
     """MCP tool for managing a library of reusable prompts with template variables."""
@@ -31,6 +156,8 @@ class PromptLibraryTool(BaseMCPTool):
         try:
             # Validate parameters
             validated_params = self.validate_parameters(parameters)
+            if '_agent_role' in parameters:
+                validated_params['_agent_role'] = parameters['_agent_role']
             action = validated_params['action']
             
             # Route to appropriate action
@@ -98,6 +225,7 @@ class PromptLibraryTool(BaseMCPTool):
         }
         
         prompt_entity = await self.memory_service.create_memory_entity(entity_data)
+        await self._sync_index(prompt_id, content, entity_data["entity_metadata"])
         
         # Add categorization observation
         await self.memory_service.add_observation_to_entity(
@@ -167,8 +295,8 @@ class PromptLibraryTool(BaseMCPTool):
                 "category": metadata.get('category'),
                 "tags": metadata.get('tags', []),
                 "context_requirements": metadata.get('context_requirements', {}),
-                "usage_count": metadata.get('usage_count', 0),
-                "last_used": metadata.get('last_used')
+                "usage_count": counters.merged("prompt_usage", prompt_id, metadata.get('usage_count', 0)),
+                "last_used": PromptIndex._last_used(prompt_id, metadata)
             }
         }
         
@@ -189,113 +317,75 @@ class PromptLibraryTool(BaseMCPTool):
         }
     
     async def _list_prompts(self, params: Dict[str, Any]) -> Dict[str, Any]:
-        """List all prompts with optional filtering."""
+        """List the most used prompts with optional filtering."""
         category = params.get('category')
         tags = params.get('tags', [])
         agent_role = params.get('_agent_role')
-        
-        # Build query for prompt entities
-        query = select(MemoryEntity).where(MemoryEntity.entity_type == "prompt_template")
-        
-        # Apply filters
-        filters = []
-        if category:
-            filters.append(func.json_extract(MemoryEntity.entity_metadata, '$.category') == category)
-        
-        if filters:
-            query = query.where(and_(*filters))
-        
-        result = await self.db.execute(query)
-        prompt_entities = result.scalars().all()
-        
-        # Filter by tags and agent role in Python (more complex JSON filtering)
-        filtered_prompts = []
-        for entity in prompt_entities:
-            metadata = entity.entity_metadata
-            
-            # Tag filtering
-            if tags:
-                entity_tags = metadata.get('tags', [])
-                if not any(tag in entity_tags for tag in tags):
-                    continue
-            
-            # Agent role filtering
-            if agent_role and metadata.get('agent_roles'):
-                if agent_role not in metadata['agent_roles']:
-                    continue
-            
-            filtered_prompts.append({
-                "prompt_id": metadata['prompt_id'],
-                "name": metadata['name'],
-                "category": metadata.get('category'),
-                "tags": metadata.get('tags', []),
-                "usage_count": metadata.get('usage_count', 0),
-                "last_used": metadata.get('last_used'),
-                "created_at": metadata.get('created_at')
-            })
-        
-        # Sort by usage count (most used first)
-        filtered_prompts.sort(key=lambda x: x['usage_count'], reverse=True)
+        limit = params.get('limit', 50)
+        
+        # Filters are resolved from the index's category/tag/role postings
+        index = await prompt_index.ensure_loaded(self.db)
+        matches, total_count = index.filter(category, tags, agent_role, limit)
+        
+        filtered_prompts = [
+            {
+                "prompt_id": prompt["prompt_id"],
+                "name": prompt["name"],
+                "category": prompt["category"],
+                "tags": prompt["tags"],
+                "usage_count": prompt["usage_count"],
+                "last_used": prompt["last_used"],
+                "created_at": prompt["created_at"]
+            }
+            for prompt in matches
+        ]
         
         return {
             "success": True,
             "action": "list",
             "data": {
                 "prompts": filtered_prompts,
-                "total_count": len(filtered_prompts),
+                "total_count": total_count,
                 "filters_applied": {
                     "category": category,
                     "tags": tags,
                     "agent_role": agent_role
                 }
             },
-            "message": f"Found {len(filtered_prompts)} prompts"
+            "message": f"Found {total_count} prompts"
         }
     
     async def _search_prompts(self, params: Dict[str, Any]) -> Dict[str, Any]:
         """Search prompts by content, name, or tags."""
         search_query = params['search_query'].lower()
         include_examples = params.get('include_examples', False)
+        limit = params.get('limit', 20)
         
-        # Get all prompt entities
-        query = select(MemoryEntity).where(MemoryEntity.entity_type == "prompt_template")
-        result = await self.db.execute(query)
-        prompt_entities = result.scalars().all()
-        
-        # Score and filter prompts based on relevance
+        # BM25 over the index postings; only prompts sharing a term are scored
+        index = await prompt_index.ensure_loaded(self.db)
         scored_prompts = []
-        for entity in prompt_entities:
-            metadata = entity.entity_metadata
-            score = self._calculate_relevance_score(
-                search_query, 
-                entity.content, 
-                metadata['name'], 
-                metadata.get('tags', [])
-            )
+        for prompt, score in index.search(search_query, limit):
+            prompt_data = {
+                "prompt_id": prompt["prompt_id"],
+                "name": prompt["name"],
+                "category": prompt["category"],
+                "tags": prompt["tags"],
+                "relevance_score": round(score, 2),
+                "snippet": self._create_snippet(prompt["content"], search_query)
+            }
             
-            if score > 0:
-                prompt_data = {
-                    "prompt_id": metadata['prompt_id'],
-                    "name": metadata['name'],
-                    "category": metadata.get('category'),
-                    "tags": metadata.get('tags', []),
-                    "relevance_score": score,
-                    "snippet": self._create_snippet(entity.content, search_query)
-                }
-                
-                if include_examples:
-                    prompt_data["examples"] = await self._get_prompt_examples(entity)
-                
-                scored_prompts.append(prompt_data)
-        
-        # Sort by relevance score
-        scored_prompts.sort(key=lambda x: x['relevance_score'], reverse=True)
+            if include_examples:
+                prompt_entity = await self._find_prompt_by_id(prompt["prompt_id"])
+                if prompt_entity:
+                    prompt_data["examples"] = await self._get_prompt_examples(prompt_entity)
+            
+            scored_prompts.append(prompt_data)
         
         return {
             "success": True,
             "action": "search",
             "data": {
-                "prompts": scored_prompts[:20],  # Limit to top 20 results
+                "prompts": scored_prompts,
                 "search_query": search_query,
                 "total_matches": len(scored_prompts)
             },
@@ -338,6 +428,11 @@ class PromptLibraryTool(BaseMCPTool):
         
         # Perform update
         updated_entity = await self.memory_service.update_memory_entity(prompt_entity.id, update_data)
+        await self._sync_index(
+            prompt_id,
+            update_data.get('content', prompt_entity.content),
+            update_data.get('entity_metadata', prompt_entity.entity_metadata)
+        )
         
         return {
             "success": True,
@@ -361,6 +456,7 @@ class PromptLibraryTool(BaseMCPTool):
         
         # Delete the entity
         await self.memory_service.delete_memory_entity(prompt_entity.id)
+        await self._sync_index(prompt_id)
         
         return {
             "success": True,
@@ -374,6 +470,20 @@ class PromptLibraryTool(BaseMCPTool):
     
     # Helper methods
     
+    async def _sync_index(
+        self, prompt_id: str, content: Optional[str] = None, metadata: Optional[Dict[str, Any]] = None
+    ):
+        """Apply a prompt change to this worker's index and invalidate the others'.
+
+        ``metadata=None`` means the prompt was deleted.
+        """
+        index = await prompt_index.ensure_loaded(self.db)
+        if metadata is None:
+            index.remove(prompt_id)
+        else:
+            index.upsert(content, metadata)
+        await get_shared_state().invalidate(PROMPT_INDEX_NAME, notify_local=False)
+    
     def _generate_prompt_id(self, name: str) -> str:
         """Generate a unique prompt ID from name."""
         # Convert to snake_case and add timestamp
@@ -433,41 +543,14 @@ class PromptLibraryTool(BaseMCPTool):
         return result.scalar_one_or_none()
     
     async def _update_usage_stats(self, prompt_entity: MemoryEntity):
-        """Update usage statistics for a prompt."""
-        metadata = prompt_entity.entity_metadata.copy()
-        metadata['usage_count'] = metadata.get('usage_count', 0) + 1
-        metadata['last_used'] = datetime.utcnow().isoformat()
-        
-        await self.memory_service.update_memory_entity(
-            prompt_entity.id, 
-            {"entity_metadata": metadata}
-        )
-    
-    def _calculate_relevance_score(self, query: str, content: str, name: str, tags: List[str]) -> float:
-        """Calculate relevance score for search results."""
-        score = 0.0
-        query_words = query.lower().split()
-        
-        # Name matching (highest weight)
-        name_lower = name.lower()
-        for word in query_words:
-            if word in name_lower:
-                score += 1.0
-        
-        # Content matching (medium weight)
-        content_lower = content.lower()
-        for word in query_words:
-            if word in content_lower:
-                score += 0.5
-        
-        # Tag matching (medium weight)
-        for tag in tags:
-            tag_lower = tag.lower()
-            for word in query_words:
-                if word in tag_lower:
-                    score += 0.7
-        
-        return round(score, 2)
+        """Count a use of the prompt.
+
+        The increment is buffered and flushed in batches by the shared
+        counters, so using a prompt no longer rewrites its metadata.
+        """
+        prompt_id = prompt_entity.entity_metadata['prompt_id']
+        counters.incr("prompt_usage", prompt_id)
+        prompt_index.record_use(prompt_id)
     
     def _create_snippet(self, content: str, query: str, max_length: int = 150) -> str:
         """Create a snippet showing query context."""
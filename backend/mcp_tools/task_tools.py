@@ -4,14 +4,21 @@ MCP Tools for Task Management.
 
 from fastapi import HTTPException
 from sqlalchemy.orm import Session
-from typing import Optional
+from typing import Optional, Sequence
 import logging
 
 from backend.services.task_service import TaskService
+from backend.services.exceptions import ValidationError
 from backend import schemas
 
 logger = logging.getLogger(__name__)
 
+# Default task fields returned by list_tasks_tool.
+MCP_TASK_FIELDS = (
+    "project_id", "task_number", "title", "description", "status", "agent_id",
+    "created_at",
+)
+
 
 async def create_task_tool(
     task_data: schemas.TaskCreate,
@@ -43,17 +50,33 @@ async def list_tasks_tool(
     status: Optional[str] = None,
     skip: int = 0,
     limit: int = 100,
-    db: Session = None
+    db: Session = None,
+    agent_id: Optional[str] = None,
+    fields: Optional[Sequence[str]] = None
 ) -> dict:
-    """MCP Tool: List tasks with filtering."""
+    """MCP Tool: List tasks with filtering.
+
+    ``fields`` selects which task columns are read and returned, so large
+    descriptions are only loaded when asked for.
+    """
     try:
         task_service = TaskService(db)
-        # Simplified version - returning empty list for now
-        
+        rows, total = await task_service.get_task_rows(
+            project_id=project_id,
+            status=status,
+            agent_id=agent_id,
+            skip=skip,
+            limit=limit,
+            fields=fields or MCP_TASK_FIELDS,
+        )
+
         return {
             "success": True,
-            "tasks": []
+            "tasks": rows,
+            "total": total
         }
+    except ValidationError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         logger.error(f"MCP list tasks failed: {e}")
         raise HTTPException(status_code=500, detail=str(e))
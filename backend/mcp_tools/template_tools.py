@@ -17,11 +17,11 @@ async def create_template_tool(
     """MCP Tool: Create a new project template."""
     try:
         service = ProjectTemplateService(db)
-        existing = service.get_template_by_name(template_data.name)
+        existing = await service.get_template_by_name(template_data.name)
         if existing:
             raise HTTPException(status_code=400, detail="Template already exists")
 
-        template = service.create_template(template_data)
+        template = await service.create_template(template_data)
         return {
             "success": True,
             "template": {
@@ -46,7 +46,7 @@ async def list_templates_tool(
     """MCP Tool: List project templates."""
     try:
         service = ProjectTemplateService(db)
-        templates = service.get_templates(skip=skip, limit=limit)
+        templates = await service.get_templates(skip=skip, limit=limit)
         return {
             "success": True,
             "templates": [
@@ -71,7 +71,7 @@ async def delete_template_tool(
     """MCP Tool: Delete a project template."""
     try:
         service = ProjectTemplateService(db)
-        success = service.delete_template(template_id)
+        success = await service.delete_template(template_id)
         if not success:
             raise HTTPException(status_code=404, detail="Template not found")
         return {"success": True, "template_id": template_id}
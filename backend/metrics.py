@@ -1,7 +1,13 @@
-import time
-from fastapi import FastAPI, Request, Response
-from prometheus_client import Counter, Histogram, generate_latest, CONTENT_TYPE_LATEST
-from starlette.middleware.base import BaseHTTPMiddleware
+import os
+from fastapi import FastAPI, Response
+from prometheus_client import (
+    CollectorRegistry,
+    Counter,
+    Histogram,
+    generate_latest,
+    multiprocess,
+    CONTENT_TYPE_LATEST,
+)
 
 REQUEST_COUNT = Counter(
     "http_requests_total",
@@ -22,23 +28,38 @@ ERROR_COUNT = Counter(
 )
 
 
-class PrometheusMiddleware(BaseHTTPMiddleware):
-    async def dispatch(self, request: Request, call_next):
-        method = request.method
-        endpoint = request.url.path
-        start = time.perf_counter()
-        response = await call_next(request)
-        latency = time.perf_counter() - start
-        REQUEST_LATENCY.labels(method, endpoint).observe(latency)
-        REQUEST_COUNT.labels(method, endpoint, str(response.status_code)).inc()
-        if response.status_code >= 400:
-            ERROR_COUNT.labels(method, endpoint, str(response.status_code)).inc()
-        return response
+def observe_request(method: str, endpoint: str, status: int, latency: float) -> None:
+    """Record one request; called by :class:`backend.middleware.request_middleware.RequestMiddleware`.
 
+    ``endpoint`` is the route template, not the raw path.
+    """
+    REQUEST_LATENCY.labels(method, endpoint).observe(latency)
+    REQUEST_COUNT.labels(method, endpoint, str(status)).inc()
+    if status >= 400:
+        ERROR_COUNT.labels(method, endpoint, str(status)).inc()
 
-def setup_metrics(app: FastAPI) -> None:
-    app.add_middleware(PrometheusMiddleware)
 
+def collect_metrics() -> bytes:
+    """Render metrics for this process, or for all workers in multiprocess mode.
+
+    When ``PROMETHEUS_MULTIPROC_DIR`` is set each worker writes its samples
+    to that directory and any worker can aggregate them on scrape.
+    """
+    if os.getenv("PROMETHEUS_MULTIPROC_DIR"):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return generate_latest(registry)
+    return generate_latest()
+
+
+def mark_worker_dead(pid: int) -> None:
+    """Drop live-gauge files of an exited worker (gunicorn ``child_exit`` hook)."""
+    if os.getenv("PROMETHEUS_MULTIPROC_DIR"):
+        multiprocess.mark_process_dead(pid)
+
+
+def setup_metrics(app: FastAPI) -> None:
+    """Serve ``/metrics``. Requests are recorded by ``RequestMiddleware(metrics=True)``."""
     @app.get("/metrics", include_in_schema=False)
     async def metrics() -> Response:
-        return Response(generate_latest(), media_type=CONTENT_TYPE_LATEST)
+        return Response(collect_metrics(), media_type=CONTENT_TYPE_LATEST)
@@ -14,22 +14,10 @@ try:  # pragma: no cover - optional dependency
 except Exception:  # pragma: no cover - slowapi missing
     SLOWAPI_AVAILABLE = False
 
-from starlette.middleware.base import BaseHTTPMiddleware
-from config.app_config import settings
-
-
-class SecurityHeadersMiddleware(BaseHTTPMiddleware):
-    """Add security headers to responses."""
-
-    async def dispatch(self, request, call_next):
-        response = await call_next(request)
-        response.headers["X-Content-Type-Options"] = "nosniff"
-        response.headers["X-Frame-Options"] = "DENY"
-        response.headers["X-XSS-Protection"] = "1; mode=block"
-        response.headers["Strict-Transport-Security"] = (
-            "max-age=31536000; includeSubDomains"
-        )
-        return response
+try:
+    from backend.config.app_config import settings
+except ImportError:
+    from config.app_config import settings
 
 
 def init_middleware(app):
@@ -48,5 +36,3 @@ def init_middleware(app):
         )
         app.add_middleware(SlowAPIMiddleware)
 
-    if SecurityHeadersMiddleware:
-        app.add_middleware(SecurityHeadersMiddleware)
@@ -5,7 +5,7 @@ This module provides middleware for handling exceptions in FastAPI routes.
 
 from fastapi import Request, status
 from fastapi.responses import JSONResponse
-from schemas.api_responses import ErrorResponse
+from backend.schemas.api_responses import ErrorResponse
 from fastapi.exceptions import RequestValidationError
 from starlette.exceptions import HTTPException as StarletteHTTPException
 import logging
@@ -74,7 +74,9 @@ async def http_exception_handler(request: Request, exc: StarletteHTTPException):
         error_code=f"HTTP{exc.status_code}",
         error_details={"error_id": error_id}
     )
-    return JSONResponse(status_code=exc.status_code, content=err.model_dump())
+    return JSONResponse(
+        status_code=exc.status_code, content=err.model_dump(), headers=getattr(exc, "headers", None)
+    )
 
 async def general_exception_handler(request: Request, exc: Exception):
     """Handle unhandled exceptions."""
@@ -1,64 +1,131 @@
 """
-Authentication middleware for API routes.
-This module provides middleware for handling authentication in FastAPI routes.
-"""
+Request middleware: request IDs, timing, security headers and metrics.
+
+One pure-ASGI middleware does all of it in a single pass. It only edits the
+``http.response.start`` message and forwards body chunks untouched, so
+streaming responses (SSE) are never buffered and there is no extra task
+per request as with ``BaseHTTPMiddleware``.
 
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.requests import Request
+Metrics are labelled with the matched route template (``/projects/{id}``)
+rather than the raw path, which keeps label cardinality bounded; requests
+that match no route share the ``unmatched`` label.
+
+Per-request log lines are sampled (``REQUEST_LOG_SAMPLE_RATE``); server
+errors and requests slower than ``REQUEST_LOG_SLOW_SECONDS`` are always
+logged. The request ID is bound to
+:data:`~backend.core.structured_logging.request_id_var` so every record
+logged while handling the request carries it.
+"""
 import logging
+import random
 import time
 import uuid
+from typing import Callable, Optional
+
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from backend.core.structured_logging import request_id_var
+
+try:
+    from backend.config.app_config import settings
+except ImportError:
+    from config.app_config import settings
 
 logger = logging.getLogger(__name__)
 
+UNMATCHED_ROUTE = "unmatched"
+
+SECURITY_HEADERS = (
+    ("X-Content-Type-Options", "nosniff"),
+    ("X-Frame-Options", "DENY"),
+    ("X-XSS-Protection", "1; mode=block"),
+    ("Strict-Transport-Security", "max-age=31536000; includeSubDomains"),
+    # Custom docs routes set their own CSP; it is only added when missing.
+    (
+        "Content-Security-Policy",
+        "default-src 'self'; script-src 'self' 'unsafe-inline' https://cdn.jsdelivr.net; "
+        "style-src 'self' 'unsafe-inline' https://cdn.jsdelivr.net; img-src 'self' https://fastapi.tiangolo.com",
+    ),
+)
 
-class RequestMiddleware(BaseHTTPMiddleware):
-    """
-    Middleware for request logging, timing, and request ID generation.
-    """
 
-    async def dispatch(self, request: Request, call_next):
-        """Process a request and add metadata."""  # Generate a unique request ID
-        request_id = str(uuid.uuid4())  # Add request ID to the request state
-        request.state.request_id = request_id  # Log the request
-        logger.info(
-            f"Request {request_id}: {request.method} {request.url.path}"
-        )  # Time the request
-        start_time = time.time()  # Process the request
+def route_template(scope: Scope) -> str:
+    """The matched route's path template, or ``unmatched``."""
+    route = scope.get("route")
+    return getattr(route, "path_format", None) or getattr(route, "path", None) or UNMATCHED_ROUTE
+
+
+class RequestMiddleware:
+    """Request ID, timing headers, security headers, metrics and sampled logs."""
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        security_headers: bool = True,
+        metrics: bool = False,
+        log_sample_rate: Optional[float] = None,
+        slow_request_seconds: Optional[float] = None,
+    ) -> None:
+        self.app = app
+        self.security_headers = security_headers
+        self.log_sample_rate = settings.request_log_sample_rate if log_sample_rate is None else log_sample_rate
+        self.slow_request_seconds = (
+            settings.request_log_slow_seconds if slow_request_seconds is None else slow_request_seconds
+        )
+        self.observe: Optional[Callable[[str, str, int, float], None]] = None
+        if metrics:
+            from backend.metrics import observe_request
+
+            self.observe = observe_request
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        request_id = str(uuid.uuid4())
+        scope.setdefault("state", {})["request_id"] = request_id
+        token = request_id_var.set(request_id)
+        start = time.perf_counter()
+        status = 500
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                headers = MutableHeaders(scope=message)
+                headers["X-Request-ID"] = request_id
+                headers["X-Request-Duration"] = f"{time.perf_counter() - start:.6f}"
+                if self.security_headers:
+                    for name, value in SECURITY_HEADERS:
+                        if name not in headers:
+                            headers[name] = value
+            await send(message)
+
         try:
-            response = await call_next(request)  # Calculate request duration
-            duration = time.time() - start_time  # Add custom headers to the response
-            response.headers["X-Request-ID"] = request_id
-            response.headers["X-Request-Duration"] = f"{duration:.6f}"  # Log the response
-            logger.info(
-                f"Response {request_id}: {response.status_code} in {duration:.6f}s"
-            )
-
-            return response
-        except Exception as e:  # Log the error
-            logger.error(
-                f"Request {request_id} failed: {str(e)}"
-            )  # Re-raise the exception to be handled by the exception handlers
+            await self.app(scope, receive, send_wrapper)
+        except Exception as e:
+            logger.error("Request failed: %s %s: %s", scope["method"], scope["path"], e)
             raise
+        finally:
+            duration = time.perf_counter() - start
+            route = route_template(scope)
+            if self.observe is not None:
+                self.observe(scope["method"], route, status, duration)
+            if status >= 500 or duration >= self.slow_request_seconds:
+                self._log(logging.WARNING, scope, route, status, duration)
+            elif self.log_sample_rate and random.random() < self.log_sample_rate:
+                self._log(logging.INFO, scope, route, status, duration)
+            request_id_var.reset(token)
 
-class SecurityMiddleware(BaseHTTPMiddleware):
-    """
-    Middleware for adding security headers to responses.
-    """
-
-    async def dispatch(self, request: Request, call_next):
-        """Add security headers to the response."""
-        response = await call_next(request)  # Add security headers
-        response.headers["X-Content-Type-Options"] = "nosniff"
-        response.headers["X-Frame-Options"] = "DENY"
-        response.headers["X-XSS-Protection"] = "1; mode=block"
-        response.headers["Strict-Transport-Security"] = "max-age=31536000; includeSubDomains"  # Only add CSP header if not already set (custom docs routes set their own)
-        if "Content-Security-Policy" not in response.headers:
-            response.headers["Content-Security-Policy"] = "default-src 'self'; script-src 'self' 'unsafe-inline' https://cdn.jsdelivr.net; style-src 'self' 'unsafe-inline' https://cdn.jsdelivr.net; img-src 'self' https://fastapi.tiangolo.com"
+    @staticmethod
+    def _log(level: int, scope: Scope, route: str, status: int, duration: float) -> None:
+        logger.log(
+            level, "%s %s -> %d in %.6fs", scope["method"], scope["path"], status, duration,
+            extra={"method": scope["method"], "route": route, "status": status, "duration_ms": round(duration * 1000, 3)},
+        )
 
-        return response
 
-def register_middleware(app):
+def register_middleware(app, metrics: bool = False):
     """Register all middleware."""
-    app.add_middleware(RequestMiddleware)
-    app.add_middleware(SecurityMiddleware)
+    app.add_middleware(RequestMiddleware, metrics=metrics)
@@ -2,6 +2,8 @@
 Models package for the task manager application - Simplified.
 """
 
+import importlib
+
 from backend.database import Base
 from .base import (
     BaseModel,
@@ -13,7 +15,7 @@ from .base import (
 
 # Core models
 from .project import Project, ProjectFileAssociation
-from .task import Task, TaskStatus
+from .task import Task, TaskCapabilityRequirement, TaskStatus
 from .comment import Comment
 from .agent import Agent, AgentRule
 from .agent_role import AgentRole
@@ -26,21 +28,54 @@ from .agent_prompt_template import AgentPromptTemplate
 from .universal_mandate import UniversalMandate
 from .workflow import Workflow, WorkflowStep
 from .project_template import ProjectTemplate
-from .memory import MemoryEntity, MemoryObservation, MemoryRelation
+from .memory import MemoryEntity, MemoryObservation, MemoryPassage, MemoryRelation
+
+# Enhanced models for Phase 1 and the audit model are imported on first
+# attribute access. No core model holds a relationship to them, so mapper
+# configuration does not depend on them being loaded; call load_all_models()
+# when the complete metadata is needed (create_all, Alembic).
+_LAZY_MODELS = {
+    'FileAsset': '.file_asset',
+    'FileAssetTag': '.file_asset',
+    'FileAssetTagAssociation': '.file_asset',
+    'FileProcessingJob': '.file_asset',
+    'TaskWorkflowExecution': '.agent_execution',
+    'TaskStatusTransition': '.agent_execution',
+    'AgentHandoffEvent': '.agent_execution',
+    'AgentPerformanceMetric': '.agent_execution',
+    'MetricRollupWatermark': '.agent_execution',
+    'WorkerLease': '.agent_execution',
+    'WorkflowExecutionCommand': '.agent_execution',
+    'MCPTool': '.mcp_integration',
+    'MCPToolExecution': '.mcp_integration',
+    'MCPToolMetric': '.mcp_integration',
+    'MCPToolDependency': '.mcp_integration',
+    'EnumRegistry': '.enums_tables',
+    'EnumValue': '.enums_tables',
+    'StatusTransitionRule': '.enums_tables',
+    'AuditLog': '.audit',
+}
+
+
+def __getattr__(name):
+    module_name = _LAZY_MODELS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
 
-# Enhanced models for Phase 1
-from .file_asset import FileAsset, FileAssetTag, FileAssetTagAssociation, FileProcessingJob
-from .agent_execution import TaskWorkflowExecution, TaskStatusTransition, AgentHandoffEvent, AgentPerformanceMetric
-from .mcp_integration import MCPTool, MCPToolExecution, MCPToolMetric, MCPToolDependency
-from .enums_tables import EnumRegistry, EnumValue, StatusTransitionRule
 
-# Simple audit model
-from .audit import AuditLog
+def load_all_models() -> None:
+    """Import every lazily loaded model so ``Base.metadata`` is complete."""
+    for module_name in set(_LAZY_MODELS.values()):
+        importlib.import_module(module_name, __name__)
 
 # Export essential models only
 __all__ = [
     # Base classes
     'Base',
+    'load_all_models',
     'BaseModel',
     'JSONText',
     'generate_uuid',
@@ -51,6 +86,7 @@ __all__ = [
     'Project',
     'ProjectFileAssociation',
     'Task',
+    'TaskCapabilityRequirement',
     'TaskStatus',
     'Agent',
     'AgentRule',
@@ -75,6 +111,7 @@ __all__ = [
     # Memory system
     'MemoryEntity',
     'MemoryObservation',
+    'MemoryPassage',
     'MemoryRelation',
     
     # Enhanced models (Phase 1)
@@ -86,6 +123,9 @@ __all__ = [
     'TaskStatusTransition',
     'AgentHandoffEvent',
     'AgentPerformanceMetric',
+    'MetricRollupWatermark',
+    'WorkerLease',
+    'WorkflowExecutionCommand',
     'MCPTool',
     'MCPToolExecution',
     'MCPToolMetric',
@@ -68,6 +68,7 @@ class TaskStatusTransition(Base, BaseModel):
         Index('idx_task_status_agent', 'agent_id'),
         Index('idx_task_status_from_to', 'from_status', 'to_status'),
         Index('idx_task_status_timestamp', 'transitioned_at'),
+        Index('idx_task_status_project_time', 'task_project_id', 'transitioned_at'),
     )
 
     # Task reference
@@ -155,6 +156,10 @@ class AgentPerformanceMetric(Base, BaseModel):
         Index('idx_agent_performance_agent', 'agent_id'),
         Index('idx_agent_performance_period', 'metric_period_start', 'metric_period_end'),
         Index('idx_agent_performance_type', 'metric_type'),
+        Index(
+            'uq_agent_performance_window', 'agent_id', 'metric_period', 'metric_type', 'metric_period_start',
+            unique=True,
+        ),
     )
 
     agent_id = Column(String(32), ForeignKey("agents.id"), nullable=False)
@@ -165,11 +170,15 @@ class AgentPerformanceMetric(Base, BaseModel):
     metric_unit = Column(String(20), nullable=True)  # 'count', 'seconds', 'percentage', 'rate'
     
     # Time period
+    metric_period = Column(String(10), nullable=True)  # 'hourly', 'daily', 'weekly'
     metric_period_start = Column(DateTime, nullable=False)
     metric_period_end = Column(DateTime, nullable=False)
     
     # Context
     task_count = Column(Integer, default=0, nullable=False)
+    # Sum behind an average or rate (metric_value = metric_total / task_count),
+    # so rollups can add new samples without rereading old ones.
+    metric_total = Column(Numeric(20, 4), default=0, nullable=False)
     context_filters = Column(JSONText, nullable=True)  # Filters applied to calculate metric
     
     # Comparative analysis
@@ -180,4 +189,47 @@ class AgentPerformanceMetric(Base, BaseModel):
     agent = relationship("Agent")
     
     def __repr__(self):
-        return f"<AgentPerformanceMetric(id={self.id}, agent={self.agent_id}, type='{self.metric_type}', value={self.metric_value})>"
\ No newline at end of file
+        return f"<AgentPerformanceMetric(id={self.id}, agent={self.agent_id}, type='{self.metric_type}', value={self.metric_value})>"
+
+
+class WorkflowExecutionCommand(Base):
+    """A step outcome reported on a worker that does not run the workflow runner.
+
+    The worker holding the ``workflow_runner`` lease applies and deletes these.
+    """
+    __tablename__ = "workflow_execution_commands"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    execution_id = Column(String(36), nullable=False)
+    outcome = Column(String(20), nullable=False)
+    output = Column(JSONText, nullable=True)
+    error = Column(Text, nullable=True)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+    def __repr__(self):
+        return f"<WorkflowExecutionCommand(id={self.id}, execution={self.execution_id}, outcome='{self.outcome}')>"
+
+
+class MetricRollupWatermark(Base):
+    """How far a periodic rollup has processed its source rows."""
+    __tablename__ = "metric_rollup_watermarks"
+
+    name = Column(String(50), primary_key=True)
+    processed_until = Column(DateTime, nullable=False)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
+
+    def __repr__(self):
+        return f"<MetricRollupWatermark(name='{self.name}', processed_until={self.processed_until})>"
+
+
+class WorkerLease(Base):
+    """Which worker runs a once-per-deployment background job, and until when."""
+    __tablename__ = "worker_leases"
+
+    name = Column(String(50), primary_key=True)
+    owner = Column(String(255), nullable=False)
+    expires_at = Column(DateTime, nullable=False)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
+
+    def __repr__(self):
+        return f"<WorkerLease(name='{self.name}', owner='{self.owner}', expires_at={self.expires_at})>"
@@ -21,6 +21,7 @@ class FileAsset(Base, BaseModel):
         Index('idx_file_assets_filename', 'filename'),
         Index('idx_file_assets_mime_type', 'mime_type'),
         Index('idx_file_assets_storage_path', 'storage_path'),
+        Index('idx_file_assets_expires_at', 'expires_at'),
     )
 
     # File identification
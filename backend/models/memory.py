@@ -30,6 +30,10 @@ class MemoryEntity(Base, BaseModel):
     # Relationships
     observations = relationship(
         "MemoryObservation", back_populates="entity", cascade="all, delete-orphan")
+    # Passages are written and deleted in bulk by MemoryService.
+    passages = relationship(
+        "MemoryPassage", back_populates="entity", passive_deletes=True,
+        order_by="MemoryPassage.ordinal")
     relations_as_from = relationship(
         "MemoryRelation", foreign_keys="[MemoryRelation.from_entity_id]",
         back_populates="from_entity", cascade="all, delete-orphan")
@@ -63,6 +67,31 @@ class MemoryObservation(Base, BaseModel):
         return f"<MemoryObservation(id={self.id}, entity_id={self.entity_id})>"
 
 
+class MemoryPassage(Base, BaseModel):
+    """A retrievable slice of a memory entity's content.
+
+    ``start_offset`` and ``end_offset`` are UTF-8 byte offsets into the
+    entity content; neighbouring passages overlap.
+    """
+    __tablename__ = "memory_passages"
+    __table_args__ = (
+        Index('idx_memory_passages_entity_ordinal', 'entity_id', 'ordinal'),
+    )
+
+    entity_id = Column(String(36), ForeignKey("memory_entities.id", ondelete="CASCADE"), nullable=False)
+    ordinal = Column(Integer, nullable=False)
+    heading = Column(String(255), nullable=True)
+    start_offset = Column(Integer, nullable=False)
+    end_offset = Column(Integer, nullable=False)
+    content = Column(Text, nullable=False)
+
+    # Relationships
+    entity = relationship("MemoryEntity", back_populates="passages")
+
+    def __repr__(self):
+        return f"<MemoryPassage(entity_id={self.entity_id}, ordinal={self.ordinal})>"
+
+
 class MemoryRelation(Base, BaseModel):
     """Enhanced directed relationship between memory entities with confidence and temporal tracking."""
     __tablename__ = "memory_relations"
@@ -2,11 +2,11 @@
 Project Template Model
 """
 from sqlalchemy import Column, String, Text
-from .base import BaseModel, Base
+from .base import BaseModel, Base, JSONText
 
 class ProjectTemplate(Base, BaseModel):
     __tablename__ = 'project_templates'
 
     name = Column(String(255), nullable=False, unique=True)
     description = Column(Text, nullable=True)
-    template_data = Column(Text, nullable=False)
+    template_data = Column(JSONText, nullable=False)
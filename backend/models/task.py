@@ -3,8 +3,8 @@ Task Model - Simplified for single-user mode
 """
 
 from sqlalchemy import (
-    String, Integer, Boolean, ForeignKey, Text, 
-    PrimaryKeyConstraint, DateTime, Enum, Index, Column
+    String, Integer, SmallInteger, Boolean, ForeignKey, ForeignKeyConstraint, Text,
+    PrimaryKeyConstraint, DateTime, Enum, Index, Column, event
 )
 from sqlalchemy.orm import relationship
 from datetime import datetime
@@ -12,6 +12,20 @@ from datetime import datetime
 from .base import Base, BaseModel, ArchivedMixin
 from backend.enums import TaskStatusEnum
 
+# Claim order for the work queue; lower ranks are claimed first.
+PRIORITY_RANKS = {"critical": 0, "high": 1, "medium": 2, "low": 3}
+DEFAULT_PRIORITY_RANK = PRIORITY_RANKS["medium"]
+
+
+def priority_rank(priority) -> int:
+    """Claim rank of a priority; unknown priorities rank as ``medium``."""
+    return PRIORITY_RANKS.get(str(priority or "medium").lower(), DEFAULT_PRIORITY_RANK)
+
+
+def default_priority_rank(context) -> int:
+    """Column default: the rank of the priority being inserted."""
+    return priority_rank(context.get_current_parameters().get("priority"))
+
 
 class Task(Base, BaseModel, ArchivedMixin):
     """Simplified Task model for single-user mode."""
@@ -20,6 +34,11 @@ class Task(Base, BaseModel, ArchivedMixin):
         PrimaryKeyConstraint('project_id', 'task_number', name='pk_tasks'),
         Index('ix_tasks_created_at', 'created_at'),
         Index('ix_tasks_status', 'status'),
+        # Work queue: walk ready tasks in claim order, find expired leases.
+        Index('ix_tasks_claim', 'status', 'priority_rank', 'created_at'),
+        Index('ix_tasks_lease_expires_at', 'lease_expires_at'),
+        # Deadline scheduler: tasks coming due.
+        Index('ix_tasks_due_date', 'due_date'),
         {"sqlite_autoincrement": True},
     )
 
@@ -29,6 +48,7 @@ class Task(Base, BaseModel, ArchivedMixin):
     description = Column(Text, nullable=True)
     status = Column(Enum(TaskStatusEnum), default=TaskStatusEnum.TO_DO, nullable=False)
     priority = Column(String(20), default="medium", nullable=False)
+    priority_rank = Column(SmallInteger, default=default_priority_rank, nullable=False)
     
     # Dates
     start_date = Column(DateTime, nullable=True)
@@ -37,6 +57,10 @@ class Task(Base, BaseModel, ArchivedMixin):
     
     # Agent assignment (optional)
     agent_id = Column(String(36), ForeignKey("agents.id"), nullable=True, index=True)
+
+    # Lease held by the agent that claimed the task (TaskQueueService)
+    lease_owner = Column(String(255), nullable=True)
+    lease_expires_at = Column(DateTime, nullable=True)
     
     # Relationships (simplified)
     project = relationship("Project", back_populates="tasks")
@@ -52,6 +76,30 @@ class Task(Base, BaseModel, ArchivedMixin):
         return f"<Task(project_id={self.project_id}, task_number={self.task_number}, title='{self.title}')>"
 
 
+@event.listens_for(Task.priority, "set")
+def sync_priority_rank(target, value, oldvalue, initiator):
+    """Keep the claim rank in step when a task's priority is changed."""
+    target.priority_rank = priority_rank(value)
+
+
+class TaskCapabilityRequirement(Base):
+    """A capability an agent must declare to claim a task."""
+    __tablename__ = "task_capability_requirements"
+    __table_args__ = (
+        PrimaryKeyConstraint('project_id', 'task_number', 'capability', name='pk_task_capability_requirements'),
+        ForeignKeyConstraint(
+            ['project_id', 'task_number'], ['tasks.project_id', 'tasks.task_number'], ondelete='CASCADE'
+        ),
+    )
+
+    project_id = Column(String(36), nullable=False)
+    task_number = Column(Integer, nullable=False)
+    capability = Column(String(255), nullable=False)
+
+    def __repr__(self):
+        return f"<TaskCapabilityRequirement(task={self.project_id}:{self.task_number}, capability='{self.capability}')>"
+
+
 class TaskStatus(Base):
     """Status definitions for tasks."""
     __tablename__ = "task_statuses"
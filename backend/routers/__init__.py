@@ -1,7 +1,20 @@
 # Router package initialization
 
-"""Expose router modules used by :mod:`backend.app_factory`."""
+"""Router packages mounted per feature profile by :mod:`backend.app_factory`.
+
+Sub-packages are imported on demand by the factory; nothing is imported here
+so that enabling one feature does not load the others.
+"""
 
 __all__ = [
-    "system",
+    "agents",
+    "audit_logs",
+    "comments",
+    "mcp",
+    "memory",
+    "project_templates",
+    "projects",
+    "rules",
+    "tasks",
+    "workflows",
 ]
@@ -1,5 +1,8 @@
 from fastapi import APIRouter
 from .core import router as core_router
+from .metrics import router as metrics_router
 
 router = APIRouter()
+# Metric routes go first so "/agents/metrics" is not taken for an agent name.
+router.include_router(metrics_router)
 router.include_router(core_router)
@@ -0,0 +1,96 @@
+"""
+Agent performance metric routes: reads of the rolled-up
+``agent_performance_metrics`` windows and an on-demand rollup.
+"""
+from datetime import datetime
+from typing import Annotated, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.database import get_db
+from backend.schemas.api_responses import DataResponse
+from backend.services.agent_metrics_service import AgentMetricsService, rollup
+from backend.services.exceptions import ValidationError
+from backend.core.responses import ORJSONResponse
+
+router = APIRouter(prefix="/agents", tags=["Agents"])
+
+
+async def get_agent_metrics_service(
+    db: Annotated[AsyncSession, Depends(get_db)]
+) -> AgentMetricsService:
+    return AgentMetricsService(db)
+
+
+def _error(e: Exception) -> HTTPException:
+    if isinstance(e, ValidationError):
+        return HTTPException(status_code=400, detail=str(e))
+    return HTTPException(status_code=500, detail=f"Internal server error: {e}")
+
+
+@router.get(
+    "/metrics",
+    response_model=DataResponse[list],
+    summary="Get Top Agents by Metric",
+    operation_id="get_top_agents_by_metric",
+)
+async def get_top_agents_by_metric(
+    metrics: Annotated[AgentMetricsService, Depends(get_agent_metrics_service)],
+    metric_type: Annotated[
+        str,
+        Query(description="task_completion, avg_duration, error_rate or handoff_rate"),
+    ],
+    period: Annotated[str, Query(description="hourly, daily or weekly")] = "daily",
+    at: Annotated[Optional[datetime], Query(
+        description="A time inside the window; defaults to now (UTC)."
+    )] = None,
+    limit: Annotated[int, Query(gt=0, le=500)] = 20,
+):
+    """Every agent's value for one metric in one window, highest first."""
+    try:
+        rows = await metrics.top_agents(metric_type, period, at, limit)
+    except Exception as e:
+        raise _error(e)
+    return ORJSONResponse({"data": rows, "message": f"{len(rows)} agents"})
+
+
+@router.post(
+    "/metrics/rollup",
+    response_model=DataResponse[dict],
+    summary="Roll Up Agent Metrics",
+    operation_id="rollup_agent_metrics",
+)
+async def rollup_agent_metrics(db: Annotated[AsyncSession, Depends(get_db)]):
+    """Fold transitions, handoffs and tool runs since the last rollup into metrics."""
+    try:
+        result = await rollup(db)
+    except Exception as e:
+        raise _error(e)
+    return ORJSONResponse({
+        "data": result, "message": f"{result['windows']} metric windows updated"
+    })
+
+
+@router.get(
+    "/{agent_id}/metrics",
+    response_model=DataResponse[list],
+    summary="Get Agent Metrics",
+    operation_id="get_agent_metrics",
+)
+async def get_agent_metrics(
+    agent_id: str,
+    metrics: Annotated[AgentMetricsService, Depends(get_agent_metrics_service)],
+    period: Annotated[str, Query(description="hourly, daily or weekly")] = "daily",
+    metric_type: Annotated[Optional[str], Query(description="Only this metric")] = None,
+    since: Annotated[Optional[datetime], Query(
+        description="Only windows starting at or after this time"
+    )] = None,
+    limit: Annotated[int, Query(gt=0, le=1000)] = 100,
+):
+    """An agent's rolled-up metric windows, newest first."""
+    try:
+        rows = await metrics.agent_metrics(agent_id, period, metric_type, since, limit)
+    except Exception as e:
+        raise _error(e)
+    return ORJSONResponse({"data": rows, "message": f"{len(rows)} metric windows"})
@@ -6,9 +6,13 @@ import uuid
 from backend.database import get_db
 from backend.schemas.comment import Comment, CommentCreate, CommentUpdate
 from backend.schemas.api_responses import DataResponse, ListResponse
+from backend.core.projection import parse_fields
+from backend.core.responses import ORJSONResponse, list_payload
+from backend.services.exceptions import ValidationError
 from backend.crud.comments import (
     get_comment,
     get_comments_by_task,
+    get_comment_rows,
     create_comment,
     update_comment,
     delete_comment
@@ -81,28 +85,29 @@ async def get_comments_by_task_endpoint(
     task_project_id: Annotated[uuid.UUID, Path(description="Project ID of the task")],
     task_task_number: Annotated[int, Path(description="Task number within the project")],
     skip: Annotated[int, Query(description="Skip the first N comments")] = 0,
-    limit: Annotated[int, Query(description="Limit the number of comments returned")] = 100
+    limit: Annotated[int, Query(description="Limit the number of comments returned")] = 100,
+    fields: Annotated[Optional[str], Query(description="Comma-separated fields to return, e.g. 'id,created_at'")] = None
 ):
     """
     Retrieves comments for a specific task.
     
     Returns a paginated list of comments for the specified task.
     """
-    comments = await get_comments_by_task(
-        db, 
-        task_project_id=task_project_id, 
-        task_task_number=task_task_number, 
-        skip=skip, 
-        limit=limit
-    )
-    return ListResponse(
-        data=[Comment.model_validate(comment) for comment in comments],
-        total=len(comments),  # This is incorrect for pagination, but a placeholder
-        page=int(skip/limit) + 1 if limit > 0 else 1,  # Placeholder
-        page_size=limit,
-        has_more=len(comments) == limit,  # Placeholder
-        message=f"Retrieved {len(comments)} comments for task {task_project_id}/{task_task_number}"
-    )
+    try:
+        rows, total = await get_comment_rows(
+            db,
+            task_project_id=str(task_project_id),
+            task_number=task_task_number,
+            skip=skip,
+            limit=limit,
+            fields=parse_fields(fields)
+        )
+    except ValidationError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    return ORJSONResponse(list_payload(
+        rows, total, skip, limit,
+        message=f"Retrieved {len(rows)} comments for task {task_project_id}/{task_task_number}"
+    ))
 
 @router.put(
     "/{comment_id}", 
@@ -1,5 +1,7 @@
-from fastapi import APIRouter
-from .core import router as core_router
+from fastapi import APIRouter, Depends
+from .core import bind_agent, router as core_router
+from .batch import router as batch_router
 
-router = APIRouter()
+router = APIRouter(dependencies=[Depends(bind_agent)])
 router.include_router(core_router)
+router.include_router(batch_router)
@@ -0,0 +1,372 @@
+"""
+Batch endpoint: many ``/mcp-tools`` calls in one request and one transaction.
+
+Each step names a tool by its ``operation_id`` and is dispatched straight to
+that route's endpoint function. Body models and query parameters are
+validated from the step's ``args`` with the route's own types and
+constraints, and every database dependency resolves to one session joined
+to a single outer transaction. Each step runs inside its own savepoint, so
+a tool that commits part-way and then fails is still rolled back whole.
+
+A string argument of the form ``${step_id.path}`` is replaced by that value
+from an earlier step's result, e.g. ``${t1.task.task_number}``.
+
+Read-only (GET) steps that do not reference each other run concurrently,
+each on its own session, until the batch performs its first write; after
+that, reads run in order on the shared session so they see the batch's
+uncommitted writes.
+
+Rolling back only undoes SQL, so tools that also change in-process state
+(workflow executions, the semantic memory index) are rejected in batches.
+"""
+import asyncio
+import inspect
+import logging
+import re
+from typing import Annotated, Any, Dict, List, NamedTuple, Optional, Set
+
+import orjson
+from fastapi import APIRouter, HTTPException, Request
+from fastapi.encoders import jsonable_encoder
+from fastapi.params import Depends as DependsParam
+from fastapi.routing import APIRoute
+from pydantic import BaseModel, TypeAdapter
+from pydantic import ValidationError as PydanticValidationError
+from pydantic.fields import FieldInfo
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+from starlette.responses import Response
+
+from ...core.responses import ORJSONResponse
+from ...database import engine, get_db
+from ...schemas.batch import BatchRequest, BatchResponse
+from ...services.exceptions import ValidationError
+from .core import get_db_session, router as tools_router, track_tool_usage
+
+logger = logging.getLogger(__name__)
+router = APIRouter(tags=["mcp-tools"])
+
+REFERENCE = re.compile(r"\$\{([^}]+)\}")
+SESSION_DEPENDENCIES = (get_db_session, get_db)
+# Tools whose effects outside the database a rolled-back batch could not undo:
+# workflow steps are scheduled in this process's runner, and memory writes
+# update the semantic index in place.
+UNBATCHABLE_TOOLS = frozenset({
+    "start_workflow_tool", "advance_workflow_tool", "add_memory_entity_tool",
+    "update_memory_entity_tool", "add_memory_observation_tool",
+})
+
+
+class StepError(Exception):
+    def __init__(self, status_code: int, detail: Any):
+        super().__init__(detail)
+        self.status_code = status_code
+        self.detail = detail
+
+
+class PlannedStep(NamedTuple):
+    id: str
+    tool: str
+    route: APIRoute
+    args: Dict[str, Any]
+    refs: Set[str]
+
+    @property
+    def read_only(self) -> bool:
+        return self.route.methods <= {"GET", "HEAD"}
+
+
+_tool_routes: Optional[Dict[str, APIRoute]] = None
+
+
+def tool_routes() -> Dict[str, APIRoute]:
+    """``operation_id`` -> route for every ``/mcp-tools`` endpoint."""
+    global _tool_routes
+    if _tool_routes is None:
+        _tool_routes = {
+            route.operation_id: route
+            for route in tools_router.routes
+            if isinstance(route, APIRoute) and route.operation_id
+            and route.path.startswith("/mcp-tools/")
+            and route.operation_id not in UNBATCHABLE_TOOLS
+        }
+    return _tool_routes
+
+
+class BatchRunner:
+    """Run a :class:`BatchRequest` against ``routes`` on ``engine``."""
+
+    def __init__(self, routes: Dict[str, APIRoute], engine: AsyncEngine):
+        self.routes = routes
+        self.engine = engine
+
+    async def run(self, batch: BatchRequest) -> Dict[str, Any]:
+        steps = self._plan(batch)
+        outputs: Dict[str, Any] = {}
+        outcomes: Dict[str, Dict[str, Any]] = {}
+        failed: Set[str] = set()
+        wrote = aborted = False
+
+        async with self.engine.connect() as conn:
+            await conn.begin()
+            if conn.dialect.name == "sqlite":
+                # pysqlite defers BEGIN to the first write; without it the
+                # first SAVEPOINT opens, and its RELEASE commits, the transaction.
+                await conn.exec_driver_sql("BEGIN")
+            session = AsyncSession(
+                bind=conn, join_transaction_mode="create_savepoint",
+                expire_on_commit=False,
+            )
+            index = 0
+            while index < len(steps) and not aborted:
+                group = self._next_group(steps, index, concurrent=not wrote)
+                index += len(group)
+                if len(group) > 1:
+                    results = await asyncio.gather(*(
+                        self._run_alone(step, outputs, failed) for step in group
+                    ))
+                else:
+                    results = [await self._run_in_transaction(
+                        group[0], session, conn, outputs, failed
+                    )]
+                for step, outcome in zip(group, results):
+                    outcomes[step.id] = outcome
+                    if outcome["status"] == "ok":
+                        outputs[step.id] = outcome["result"]
+                        wrote = wrote or not step.read_only
+                    else:
+                        failed.add(step.id)
+                        aborted = aborted or (
+                            batch.mode == "atomic" and outcome["status"] == "error"
+                        )
+            await session.close()
+            committed = not aborted
+            if committed:
+                await conn.commit()
+            else:
+                await conn.rollback()
+
+        results = []
+        for step in steps:
+            outcome = outcomes.get(step.id) or _skipped(
+                step, "an earlier step failed and the batch was rolled back"
+            )
+            if aborted and outcome["status"] == "ok" and not step.read_only:
+                outcome = {**outcome, "status": "skipped", "error": "rolled back"}
+            results.append(outcome)
+        return {
+            "success": all(result["status"] == "ok" for result in results),
+            "committed": committed,
+            "mode": batch.mode,
+            "results": results,
+        }
+
+    def _plan(self, batch: BatchRequest) -> List[PlannedStep]:
+        steps: List[PlannedStep] = []
+        seen: Set[str] = set()
+        for position, step in enumerate(batch.steps):
+            step_id = step.id or str(position)
+            if step_id in seen:
+                raise ValidationError(f"Duplicate step id '{step_id}'")
+            if step.tool in UNBATCHABLE_TOOLS:
+                raise ValidationError(
+                    f"Step '{step_id}': tool '{step.tool}' changes state a rollback "
+                    "cannot undo; call it outside a batch"
+                )
+            route = self.routes.get(step.tool)
+            if route is None:
+                raise ValidationError(f"Step '{step_id}': unknown tool '{step.tool}'")
+            refs = _references(step.args)
+            unknown = refs - seen
+            if unknown:
+                raise ValidationError(
+                    f"Step '{step_id}' references {', '.join(sorted(unknown))}, "
+                    "which is not an earlier step"
+                )
+            seen.add(step_id)
+            steps.append(PlannedStep(step_id, step.tool, route, step.args, refs))
+        return steps
+
+    @staticmethod
+    def _next_group(
+        steps: List[PlannedStep], start: int, concurrent: bool
+    ) -> List[PlannedStep]:
+        group = [steps[start]]
+        if not (concurrent and steps[start].read_only):
+            return group
+        for step in steps[start + 1:]:
+            if not step.read_only or step.refs & {member.id for member in group}:
+                break
+            group.append(step)
+        return group
+
+    async def _run_in_transaction(
+        self, step, session, conn, outputs, failed
+    ) -> Dict[str, Any]:
+        if step.refs & failed:
+            return _skipped(
+                step,
+                f"depends on failed step(s) {', '.join(sorted(step.refs & failed))}",
+            )
+        savepoint = await conn.begin_nested()
+        try:
+            result = await self._call(step, session, outputs)
+            await session.commit()
+            await savepoint.commit()
+            return _ok(step, result)
+        except Exception as e:
+            await session.rollback()
+            await savepoint.rollback()
+            return _error(step, e)
+
+    async def _run_alone(self, step, outputs, failed) -> Dict[str, Any]:
+        if step.refs & failed:
+            return _skipped(
+                step,
+                f"depends on failed step(s) {', '.join(sorted(step.refs & failed))}",
+            )
+        try:
+            async with AsyncSession(self.engine, expire_on_commit=False) as session:
+                return _ok(step, await self._call(step, session, outputs))
+        except Exception as e:
+            return _error(step, e)
+
+    async def _call(
+        self, step: PlannedStep, session: AsyncSession, outputs: Dict[str, Any]
+    ) -> Any:
+        args = _substitute(step.args, outputs)
+        endpoint = step.route.endpoint
+        result = await endpoint(**await self._bind(endpoint, args, session))
+        if isinstance(result, Response):
+            return orjson.loads(result.body) if result.body else None
+        return jsonable_encoder(result)
+
+    async def _bind(
+        self, endpoint, args: Dict[str, Any], session: AsyncSession
+    ) -> Dict[str, Any]:
+        """Build endpoint keyword arguments from ``args`` the way FastAPI would."""
+        parameters = inspect.signature(endpoint, eval_str=True).parameters
+        bodies = [
+            name for name, parameter in parameters.items()
+            if _is_model(parameter.annotation)
+        ]
+        kwargs = {}
+        try:
+            for name, parameter in parameters.items():
+                default = parameter.default
+                if isinstance(default, DependsParam):
+                    kwargs[name] = await _resolve(default.dependency, session)
+                elif parameter.annotation is Request:
+                    raise StepError(
+                        400, "This tool reads the raw request and cannot run in a batch"
+                    )
+                elif name in bodies:
+                    data = args.get(name, args) if len(bodies) == 1 else args.get(name)
+                    kwargs[name] = parameter.annotation.model_validate(data)
+                elif name in args:
+                    annotation = parameter.annotation
+                    if isinstance(default, FieldInfo):
+                        annotation = Annotated[annotation, default]
+                    kwargs[name] = TypeAdapter(annotation).validate_python(args[name])
+                elif isinstance(default, FieldInfo):
+                    if default.is_required():
+                        raise StepError(422, f"Missing argument '{name}'")
+                    kwargs[name] = default.get_default(call_default_factory=True)
+                elif default is inspect.Parameter.empty:
+                    raise StepError(422, f"Missing argument '{name}'")
+        except PydanticValidationError as e:
+            raise StepError(422, e.errors(include_url=False, include_context=False))
+        return kwargs
+
+
+async def _resolve(dependency, session: AsyncSession):
+    if dependency in SESSION_DEPENDENCIES:
+        return session
+    values = {}
+    for name, parameter in inspect.signature(dependency).parameters.items():
+        default = parameter.default
+        if not (
+            isinstance(default, DependsParam)
+            and default.dependency in SESSION_DEPENDENCIES
+        ):
+            raise StepError(
+                400, f"Dependency '{dependency.__name__}' cannot run in a batch"
+            )
+        values[name] = session
+    result = dependency(**values)
+    return await result if inspect.isawaitable(result) else result
+
+
+def _is_model(annotation) -> bool:
+    return inspect.isclass(annotation) and issubclass(annotation, BaseModel)
+
+
+def _references(value) -> Set[str]:
+    if isinstance(value, str):
+        return {match.group(1).split(".", 1)[0] for match in REFERENCE.finditer(value)}
+    if isinstance(value, dict):
+        return set().union(*(_references(item) for item in value.values()))
+    if isinstance(value, list):
+        return set().union(*(_references(item) for item in value))
+    return set()
+
+
+def _substitute(value, outputs: Dict[str, Any]):
+    if isinstance(value, str):
+        whole = REFERENCE.fullmatch(value)
+        if whole:
+            return _lookup(whole.group(1), outputs)
+        return REFERENCE.sub(lambda match: str(_lookup(match.group(1), outputs)), value)
+    if isinstance(value, dict):
+        return {key: _substitute(item, outputs) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_substitute(item, outputs) for item in value]
+    return value
+
+
+def _lookup(expression: str, outputs: Dict[str, Any]) -> Any:
+    step_id, *path = expression.split(".")
+    value = outputs[step_id]
+    try:
+        for key in path:
+            value = value[int(key)] if isinstance(value, list) else value[key]
+    except (KeyError, IndexError, ValueError, TypeError):
+        raise StepError(400, f"Reference '${{{expression}}}' does not resolve")
+    return value
+
+
+def _ok(step: PlannedStep, result: Any) -> Dict[str, Any]:
+    return {"id": step.id, "tool": step.tool, "status": "ok", "result": result}
+
+
+def _error(step: PlannedStep, error: Exception) -> Dict[str, Any]:
+    if isinstance(error, (HTTPException, StepError)):
+        status_code, detail = error.status_code, error.detail
+    else:
+        logger.error(f"Batch step '{step.id}' ({step.tool}) failed: {error}")
+        status_code, detail = 500, str(error)
+    return {
+        "id": step.id, "tool": step.tool, "status": "error", "error": detail,
+        "status_code": status_code,
+    }
+
+
+def _skipped(step: PlannedStep, reason: str) -> Dict[str, Any]:
+    return {"id": step.id, "tool": step.tool, "status": "skipped", "error": reason}
+
+
+@router.post(
+    "/mcp-tools/batch",
+    tags=["mcp-tools"],
+    operation_id="batch_tools",
+    response_model=BatchResponse,
+)
+@track_tool_usage("batch_tools")
+async def mcp_batch(batch: BatchRequest):
+    """MCP Tool: Run tool calls in order in one transaction, passing results along."""
+    try:
+        return ORJSONResponse(await BatchRunner(tool_routes(), engine).run(batch))
+    except ValidationError as ve:
+        raise HTTPException(status_code=400, detail=str(ve))
+    except Exception as e:
+        logger.error(f"MCP batch failed: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
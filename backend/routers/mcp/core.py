@@ -3,7 +3,7 @@ MCP Core Tools Router - Functionality for Project and Task MCP integration.
 Provides MCP tool definitions.
 """
 
-from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request
 from fastapi.responses import StreamingResponse
 import json
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -13,22 +13,34 @@ import logging
 from functools import wraps
 from collections import defaultdict
 import asyncio
+import math
 
-from ...database import get_db
+from ...database import async_session_maker, get_db
 from ...services.project_service import ProjectService
 from ...services.task_service import TaskService
+from ...services.task_queue_service import TaskQueueService
+from ...services.task_analytics_service import TaskAnalyticsService
+from ...services.agent_metrics_service import AgentMetricsService
+from ...services.workflow_runner import workflow_runner
 from ...services.audit_log_service import AuditLogService
-from ...services.memory_service import MemoryService
+from ...services.memory_service import MemoryService, MEMORY_SEARCH_FIELDS
+from ...services.context_service import ContextService
 from ...services.project_file_association_service import ProjectFileAssociationService
 from ...services.project_template_service import ProjectTemplateService
 from ...services.rules_service import RulesService
 from ...services.agent_handoff_service import AgentHandoffService
 from ...services.error_protocol_service import ErrorProtocolService
 from ...services.verification_requirement_service import VerificationRequirementService
-from ...services.exceptions import EntityNotFoundError
-from ...schemas.project import ProjectCreate
-from ...schemas.task import TaskCreate, TaskUpdate
-from ...schemas.project_template import ProjectTemplateCreate
+from ...services.exceptions import ConflictError, DuplicateEntityError, EntityNotFoundError, ValidationError
+from ...core.projection import parse_fields
+from ...core.shared_state import get_shared_state
+from ...core.catalogue import artifact_response, catalogue_for
+from ...core.counters import COUNTER_TARGETS, counters
+from ...core.admission import Overloaded, admission, current_agent
+from ...core.responses import ORJSONResponse
+from ...schemas.project import ProjectClone, ProjectCreate
+from ...schemas.task import TaskClaimRequest, TaskCreate, TaskLeaseRequest, TaskUpdate
+from ...schemas.project_template import ProjectTemplateCreate, ProjectTemplateInstantiate
 from ...schemas import AgentRuleCreate
 from ...schemas.universal_mandate import UniversalMandateCreate
 from ...schemas.memory import (
@@ -37,12 +49,13 @@ from ...schemas.memory import (
     MemoryObservationCreate,
     MemoryRelationCreate
 )
-from ...schemas.workflow import WorkflowCreate
-from ...schemas.api_responses import MetricsResponse, DataResponse
+from ...schemas.workflow import WorkflowCreate, WorkflowExecutionAdvance, WorkflowExecutionStart
+from ...schemas.api_responses import DataResponse
 from ...schemas.agent_handoff_criteria import AgentHandoffCriteriaCreate
 from ...schemas.error_protocol import ErrorProtocolCreate
 from ...schemas.agent_verification_requirement import AgentVerificationRequirementCreate
 
+from ...mcp_tools.task_tools import list_tasks_tool
 from ...mcp_tools.forbidden_action_tools import (
     add_forbidden_action_tool,
     list_forbidden_actions_tool,
@@ -62,18 +75,30 @@ from ... import models
 logger = logging.getLogger(__name__)
 router = APIRouter(tags=["mcp-tools"])
 
-# In-memory counters for tool usage
+# Per-process counters for tool usage; the totals across workers live in
+# shared state under TOOL_USAGE_NAMESPACE, added to on each counters flush.
+TOOL_USAGE_NAMESPACE = COUNTER_TARGETS["tool_usage"].counter
 tool_counters: Dict[str, int] = defaultdict(int)
 
 
 def track_tool_usage(name: str):
-    """Decorator to increment tool usage counters."""
+    """Decorator to count tool usage and admit the call through admission control."""
 
     def decorator(func):
         @wraps(func)
         async def wrapper(*args, **kwargs):
             tool_counters[name] += 1
-            result = await func(*args, **kwargs)
+            counters.incr("tool_usage", name)
+            agent = kwargs.get("agent_id") or kwargs.get("agent_name") or current_agent.get()
+            try:
+                result = await admission.run(name, agent, func, *args, **kwargs)
+            except Overloaded as e:
+                raise HTTPException(
+                    status_code=429, detail=e.reason,
+                    headers={"Retry-After": str(max(1, math.ceil(e.retry_after)))},
+                )
+            except asyncio.TimeoutError:
+                raise HTTPException(status_code=504, detail=f"{name} exceeded its deadline")
             # TODO: Re-enable event publishing when publisher service is available
             logger.debug(f"Tool usage tracked: {name}")
             return result
@@ -83,6 +108,11 @@ def track_tool_usage(name: str):
     return decorator
 
 
+async def bind_agent(x_agent_id: Optional[str] = Header(None, description="Calling agent, for per-agent rate limits.")):
+    """Record the calling agent for admission control."""
+    current_agent.set(x_agent_id)
+
+
 @router.get("/mcp-tools/stream", tags=["mcp-tools"], include_in_schema=False)
 async def mcp_tools_stream(request: Request):
     """Stream server events via Server-Sent Events."""
@@ -173,6 +203,33 @@ async def mcp_create_project(
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.post(
+    "/mcp-tools/project/clone",
+    tags=["mcp-tools"],
+    operation_id="clone_project_tool",
+)
+@track_tool_usage("clone_project_tool")
+async def mcp_clone_project(
+    project_id: str,
+    clone: ProjectClone,
+    db: AsyncSession = Depends(get_db_session)
+):
+    """MCP Tool: Copy a project with its tasks, task numbers, dependencies and, optionally, comments and file links."""
+    try:
+        cloned = await ProjectService(db).clone_project(
+            project_id, clone.name, include_comments=clone.include_comments,
+            include_memory_links=clone.include_memory_links,
+        )
+        return ORJSONResponse({"success": True, **cloned})
+    except EntityNotFoundError as nfe:
+        raise HTTPException(status_code=404, detail=str(nfe))
+    except DuplicateEntityError as de:
+        raise HTTPException(status_code=409, detail=str(de))
+    except Exception as e:
+        logger.error(f"MCP clone project failed: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
 @router.post(
     "/mcp-tools/task/create",
     tags=["mcp-tools"],
@@ -271,33 +328,23 @@ async def mcp_list_tasks(
     agent_id: Optional[str] = None,
     skip: int = Query(0, ge=0, description="Number of records to skip."),
     limit: int = Query(100, gt=0, description="Maximum records to return."),
+    fields: Optional[str] = Query(
+        None, description="Comma-separated task fields to return."),
     db: AsyncSession = Depends(get_db_session)
 ):
     """MCP Tool: List tasks with filtering."""
     try:
-        task_service = TaskService(db)
-        tasks, _ = await task_service.get_tasks(
-            project_id=uuid.UUID(project_id) if project_id else None,
+        return ORJSONResponse(await list_tasks_tool(
+            project_id=project_id,
             status=status,
             agent_id=agent_id,
             skip=skip,
             limit=limit,
-        )
-        return {
-            "success": True,
-            "tasks": [
-                {
-                    "project_id": t.project_id,
-                    "task_number": t.task_number,
-                    "title": t.title,
-                    "description": t.description,
-                    "status": t.status,
-                    "agent_id": t.agent_id,
-                    "created_at": t.created_at.isoformat()
-                }
-                for t in tasks
-            ]
-        }
+            fields=parse_fields(fields),
+            db=db,
+        ))
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"MCP list tasks failed: {e}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -383,6 +430,228 @@ async def mcp_delete_task(
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.get(
+    "/mcp-tools/task/context",
+    tags=["mcp-tools"],
+    operation_id="get_task_context_tool",
+)
+@track_tool_usage("get_task_context_tool")
+async def mcp_get_task_context(
+    project_id: str,
+    task_number: int,
+    budget_tokens: int = Query(4000, description="Approximate token budget for the whole context."),
+    agent_name: Optional[str] = Query(
+        None, description="Agent whose rules to include; defaults to the task's agent."),
+):
+    """MCP Tool: Get a task with its dependencies, comments, memory, rules and mandates, fitted to a token budget."""
+    try:
+        context = await ContextService(async_session_maker).assemble(
+            project_id, task_number, budget_tokens, agent_name
+        )
+        return ORJSONResponse({"success": True, **context})
+    except EntityNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except ValidationError as ve:
+        raise HTTPException(status_code=400, detail=str(ve))
+    except Exception as e:
+        logger.error(f"MCP get task context failed: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.get(
+    "/mcp-tools/task/ready",
+    tags=["mcp-tools"],
+    operation_id="list_ready_tasks_tool",
+)
+@track_tool_usage("list_ready_tasks_tool")
+async def mcp_list_ready_tasks(
+    project_id: str,
+    unclaimed_only: bool = Query(False, description="Only To Do tasks that can be claimed now."),
+    skip: int = Query(0, ge=0, description="Number of records to skip."),
+    limit: int = Query(100, gt=0, le=1000, description="Maximum records to return."),
+    db: AsyncSession = Depends(get_db_session),
+):
+    """MCP Tool: List a project's unblocked open tasks (all predecessors final), highest priority first."""
+    try:
+        ready = await TaskQueueService(db).ready_tasks(project_id, unclaimed_only, skip, limit)
+        return ORJSONResponse({"success": True, **ready})
+    except Exception as e:
+        logger.error(f"MCP list ready tasks failed: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.get(
+    "/mcp-tools/task/analytics",
+    tags=["mcp-tools"],
+    operation_id="get_task_flow_analytics_tool",
+)
+@track_tool_usage("get_task_flow_analytics_tool")
+async def mcp_get_task_flow_analytics(
+    project_id: str,
+    days: int = Query(90, gt=0, le=3660, description="Days of cumulative flow to return."),
+    db: AsyncSession = Depends(get_db_session),
+):
+    """MCP Tool: Cycle/lead time percentiles, weekly throughput and cumulative flow of a project's tasks."""
+    try:
+        flow = await TaskAnalyticsService(db).project_flow(project_id, days)
+        return ORJSONResponse({"success": True, **flow})
+    except Exception as e:
+        logger.error(f"MCP task flow analytics failed: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.get(
+    "/mcp-tools/agent/metrics",
+    tags=["mcp-tools"],
+    operation_id="get_agent_metrics_tool",
+)
+@track_tool_usage("get_agent_metrics_tool")
+async def mcp_get_agent_metrics(
+    agent_id: str,
+    period: str = Query("daily", description="hourly, daily or weekly."),
+    metric_type: Optional[str] = Query(None, description="task_completion, avg_duration, error_rate or handoff_rate."),
+    limit: int = Query(100, gt=0, le=1000, description="Maximum windows to return."),
+    db: AsyncSession = Depends(get_db_session),
+):
+    """MCP Tool: An agent's rolled-up completion, duration, error and handoff metrics, newest window first."""
+    try:
+        metrics = await AgentMetricsService(db).agent_metrics(agent_id, period, metric_type, limit=limit)
+        return ORJSONResponse({"success": True, "agent_id": agent_id, "metrics": metrics})
+    except ValidationError as ve:
+        raise HTTPException(status_code=400, detail=str(ve))
+    except Exception as e:
+        logger.error(f"MCP get agent metrics failed: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.post(
+    "/mcp-tools/workflow/start",
+    tags=["mcp-tools"],
+    operation_id="start_workflow_tool",
+)
+@track_tool_usage("start_workflow_tool")
+async def mcp_start_workflow(
+    workflow_id: str,
+    execution: WorkflowExecutionStart,
+    db: AsyncSession = Depends(get_db_session),
+):
+    """MCP Tool: Run a workflow for a task; it waits as initialized while the agent has no free slot."""
+    try:
+        started = await workflow_runner.start_execution(
+            workflow_id, execution.project_id, execution.task_number, execution.agent_id, execution.context, db=db
+        )
+        return ORJSONResponse({"success": True, "execution": started})
+    except EntityNotFoundError as nfe:
+        raise HTTPException(status_code=404, detail=str(nfe))
+    except ValidationError as ve:
+        raise HTTPException(status_code=400, detail=str(ve))
+    except Exception as e:
+        logger.error(f"MCP start workflow failed: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.post(
+    "/mcp-tools/workflow/advance",
+    tags=["mcp-tools"],
+    operation_id="advance_workflow_tool",
+)
+@track_tool_usage("advance_workflow_tool")
+async def mcp_advance_workflow(
+    execution_id: str,
+    advance: WorkflowExecutionAdvance,
+    db: AsyncSession = Depends(get_db_session),
+):
+    """MCP Tool: Report the outcome of a workflow execution's current step."""
+    try:
+        execution = await workflow_runner.advance(
+            execution_id, advance.outcome, advance.output, advance.error, db=db
+        )
+        return ORJSONResponse({"success": True, "execution": execution})
+    except EntityNotFoundError as nfe:
+        raise HTTPException(status_code=404, detail=str(nfe))
+    except ConflictError as ce:
+        raise HTTPException(status_code=409, detail=str(ce))
+    except ValidationError as ve:
+        raise HTTPException(status_code=400, detail=str(ve))
+    except Exception as e:
+        logger.error(f"MCP advance workflow failed: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.post(
+    "/mcp-tools/task/claim",
+    tags=["mcp-tools"],
+    operation_id="claim_task_tool",
+)
+@track_tool_usage("claim_task_tool")
+async def mcp_claim_task(claim: TaskClaimRequest, db: AsyncSession = Depends(get_db_session)):
+    """MCP Tool: Lease the next ready task matching the agent's capabilities; task is null when none is ready."""
+    try:
+        task = await TaskQueueService(db).claim(
+            claim.agent_id, claim.capabilities, claim.project_id, claim.lease_seconds
+        )
+        return ORJSONResponse({"success": True, "task": task})
+    except ValidationError as ve:
+        raise HTTPException(status_code=400, detail=str(ve))
+    except Exception as e:
+        logger.error(f"MCP claim task failed: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.post(
+    "/mcp-tools/task/lease/renew",
+    tags=["mcp-tools"],
+    operation_id="renew_task_lease_tool",
+)
+@track_tool_usage("renew_task_lease_tool")
+async def mcp_renew_task_lease(
+    project_id: str,
+    task_number: int,
+    lease: TaskLeaseRequest,
+    db: AsyncSession = Depends(get_db_session),
+):
+    """MCP Tool: Heartbeat; extend the agent's lease on a claimed task."""
+    try:
+        task = await TaskQueueService(db).renew(project_id, task_number, lease.agent_id, lease.lease_seconds)
+        return ORJSONResponse({"success": True, "task": task})
+    except EntityNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except ConflictError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    except ValidationError as ve:
+        raise HTTPException(status_code=400, detail=str(ve))
+    except Exception as e:
+        logger.error(f"MCP renew task lease failed: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.post(
+    "/mcp-tools/task/lease/release",
+    tags=["mcp-tools"],
+    operation_id="release_task_lease_tool",
+)
+@track_tool_usage("release_task_lease_tool")
+async def mcp_release_task_lease(
+    project_id: str,
+    task_number: int,
+    lease: TaskLeaseRequest,
+    db: AsyncSession = Depends(get_db_session),
+):
+    """MCP Tool: Release a claimed task, completing it or returning it to the queue."""
+    try:
+        task = await TaskQueueService(db).release(project_id, task_number, lease.agent_id, lease.status)
+        return ORJSONResponse({"success": True, "task": task})
+    except EntityNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except ConflictError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    except ValidationError as ve:
+        raise HTTPException(status_code=400, detail=str(ve))
+    except Exception as e:
+        logger.error(f"MCP release task lease failed: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
 @router.post(
     "/mcp-tools/project/add-file",
     tags=["mcp-tools"],
@@ -492,10 +761,10 @@ async def mcp_create_template(
     """MCP Tool: Create a new project template."""
     try:
         service = ProjectTemplateService(db)
-        existing = service.get_template_by_name(template_data.name)
+        existing = await service.get_template_by_name(template_data.name)
         if existing:
             raise HTTPException(status_code=400, detail="Template already exists")
-        template = service.create_template(template_data)
+        template = await service.create_template(template_data)
         return {
             "success": True,
             "template": {
@@ -523,7 +792,7 @@ async def mcp_list_templates(
     """MCP Tool: List project templates."""
     try:
         service = ProjectTemplateService(db)
-        templates = service.get_templates(skip=skip, limit=limit)
+        templates = await service.get_templates(skip=skip, limit=limit)
         return {
             "success": True,
             "templates": [
@@ -553,7 +822,7 @@ async def mcp_delete_template(
     """MCP Tool: Delete a project template."""
     try:
         service = ProjectTemplateService(db)
-        success = service.delete_template(template_id)
+        success = await service.delete_template(template_id)
         if not success:
             raise HTTPException(status_code=404, detail="Template not found")
         return {"success": True, "template_id": template_id}
@@ -562,6 +831,34 @@ async def mcp_delete_template(
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.post(
+    "/mcp-tools/template/instantiate",
+    tags=["mcp-tools"],
+    operation_id="instantiate_template_tool",
+)
+@track_tool_usage("instantiate_template_tool")
+async def mcp_instantiate_template(
+    template_id: str,
+    target: ProjectTemplateInstantiate,
+    db: AsyncSession = Depends(get_db_session),
+):
+    """MCP Tool: Create a project (or extend one) from a template in a single transaction."""
+    try:
+        created = await ProjectTemplateService(db).instantiate_template(
+            template_id, project_name=target.project_name, project_id=target.project_id
+        )
+        return ORJSONResponse({"success": True, **created})
+    except EntityNotFoundError as nfe:
+        raise HTTPException(status_code=404, detail=str(nfe))
+    except ConflictError as ce:
+        raise HTTPException(status_code=409, detail=str(ce))
+    except ValidationError as ve:
+        raise HTTPException(status_code=400, detail=str(ve))
+    except Exception as e:
+        logger.error(f"MCP instantiate template failed: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
 @router.post(
     "/mcp-tools/memory/add-entity",
     tags=["mcp-tools"],
@@ -697,24 +994,32 @@ async def mcp_add_memory_relation(
 async def mcp_search_memory(
     query: str,
     limit: int = 10,
+    fields: Optional[str] = Query(
+        None, description="Comma-separated entity fields to return. "
+        "Content is only included when requested."),
+    mode: str = Query(
+        "lexical", description="'lexical' (substring match), 'semantic' "
+        "(embedding similarity) or 'hybrid' (both, ranked by a blended score)."),
     memory_service: MemoryService = Depends(get_memory_service)
 ):
     """MCP Tool: Search memory for entities matching a query."""
     try:
-        results = memory_service.search_entities(query, limit)
-        return {
-            "success": True,
-            "results": [
-                {
-                    "id": entity.id,
-                    "name": entity.name,
-                    "type": entity.type,
-                    "metadata": entity.metadata,
-                    "score": score
-                }
-                for entity, score in results
-            ]
-        }
+        if mode == "lexical":
+            rows, _ = await memory_service.get_entity_rows(
+                limit=limit,
+                search=query,
+                fields=parse_fields(fields) or MEMORY_SEARCH_FIELDS,
+            )
+        else:
+            rows = await memory_service.semantic_search(
+                query,
+                limit=limit,
+                mode=mode,
+                fields=parse_fields(fields) or MEMORY_SEARCH_FIELDS,
+            )
+        return ORJSONResponse({"success": True, "results": rows})
+    except ValidationError as ve:
+        raise HTTPException(status_code=400, detail=str(ve))
     except Exception as e:
         logger.error(f"MCP search memory failed: {e}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -732,24 +1037,54 @@ async def mcp_search_graph(
 ):
     """MCP Tool: Search memory graph."""
     try:
-        results = memory_service.search_memory_entities(query, limit=limit)
+        results = await memory_service.semantic_search(
+            query, limit=limit, mode="hybrid", fields=["id", "entity_type", "name"]
+        )
         return {
             "success": True,
             "results": [
                 {
-                    "id": r.id,
-                    "type": r.type,
-                    "name": r.name,
-                    "description": r.description,
+                    "id": r["id"],
+                    "type": r["entity_type"],
+                    "name": r["name"],
+                    "score": r["score"],
                 }
                 for r in results
             ],
         }
+    except ValidationError as ve:
+        raise HTTPException(status_code=400, detail=str(ve))
     except Exception as e:
         logger.error(f"MCP search graph failed: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.get(
+    "/mcp-tools/memory/passages",
+    tags=["mcp-tools"],
+    operation_id="search_memory_passages_tool",
+)
+@track_tool_usage("search_memory_passages_tool")
+async def mcp_search_memory_passages(
+    query: str,
+    entity_id: Optional[str] = Query(
+        None, description="Only search this entity's passages."),
+    limit: int = Query(5, ge=1, le=50),
+    memory_service: MemoryService = Depends(get_memory_service),
+):
+    """MCP Tool: Find the passages of large memory entities that match a query."""
+    try:
+        passages = await memory_service.search_passages(query, entity_id=entity_id, limit=limit)
+        return ORJSONResponse({"success": True, "results": passages})
+    except EntityNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except ValidationError as ve:
+        raise HTTPException(status_code=400, detail=str(ve))
+    except Exception as e:
+        logger.error(f"MCP search memory passages failed: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
 @router.get(
     "/mcp-tools/memory/get-content",
     tags=["mcp-tools"],
@@ -757,20 +1092,21 @@ async def mcp_search_graph(
 )
 @track_tool_usage("get_memory_content_tool")
 async def mcp_get_memory_content(
-    entity_id: int,
+    entity_id: str,
+    start: int = Query(0, ge=0, description="First byte of the UTF-8 content to return."),
+    end: Optional[int] = Query(
+        None, ge=0, description="Byte after the last one to return; "
+        "passage search results carry matching offsets."),
     memory_service: MemoryService = Depends(get_memory_service),
 ):
-    """MCP Tool: Get the content of a memory entity."""
+    """MCP Tool: Get the content of a memory entity, or a byte range of it."""
     try:
-        content = memory_service.get_memory_entity_content(entity_id)
-        if content is None:
-            raise HTTPException(
-                status_code=404,
-                detail="Memory entity content not found",
-            )
-        return {"success": True, "content": content}
-    except ValueError as ve:
-        raise HTTPException(status_code=404, detail=str(ve))
+        content = await memory_service.get_content_range(entity_id, start, end)
+        return ORJSONResponse({"success": True, **content})
+    except EntityNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except ValidationError as ve:
+        raise HTTPException(status_code=400, detail=str(ve))
     except Exception as e:
         logger.error(f"MCP get memory content failed: {e}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -808,22 +1144,16 @@ async def mcp_get_memory_metadata(
     operation_id="list_mcp_tools_tool",
 )
 @track_tool_usage("list_mcp_tools_tool")
-async def mcp_list_tools():
-    """MCP Tool: List all available MCP tools."""
-    tools = []
-    for route in router.routes:
-        if hasattr(route, "name") and route.name.startswith("mcp_"):
-            description = (
-                route.description.split('\n')[0]
-                if route.description
-                else "No description"
-            )
-            tools.append({
-                "name": route.name,
-                "path": route.path,
-                "description": description,
-            })
-    return {"success": True, "tools": tools}
+async def mcp_list_tools(
+    request: Request,
+    detail: str = Query(
+        "compact", pattern="^(compact|full)$",
+        description="'compact': names and descriptions; 'full': adds each tool's input schema."),
+    names: Optional[str] = Query(
+        None, description="Comma-separated tool names to return, e.g. to fetch full schemas on demand."),
+):
+    """MCP Tool: List available MCP tools, with full input schemas on request."""
+    return artifact_response(catalogue_for(request.app).tools(detail, parse_fields(names)), request)
 
 
 @router.post(
@@ -1250,6 +1580,16 @@ async def mcp_delete_verification_requirement(
 
 
 @router.get("/mcp-tools/metrics", tags=["mcp-tools"], operation_id="mcp_tools_metrics")
-async def mcp_tools_metrics() -> MetricsResponse:
-    """Return usage metrics for MCP tools."""
-    return MetricsResponse(metrics=dict(tool_counters))
+async def mcp_tools_metrics() -> Dict[str, Dict[str, int]]:
+    """Return usage metrics for MCP tools, summed across all workers.
+
+    Other workers' calls since their last counters flush are not included yet.
+    """
+    try:
+        counts = await get_shared_state().counters(TOOL_USAGE_NAMESPACE)
+    except Exception as e:
+        logger.warning(f"Shared tool usage unavailable, using local counters: {e}")
+        return {"metrics": dict(tool_counters)}
+    for name, pending in counters.pending_all("tool_usage").items():
+        counts[name] = counts.get(name, 0) + pending
+    return {"metrics": counts}
@@ -12,7 +12,9 @@ from ....schemas.memory import (
 )
 from ....schemas.file_ingest import FileIngestInput
 from ....schemas.api_responses import DataResponse, ListResponse
-from ....services.exceptions import EntityNotFoundError
+from ....services.exceptions import EntityNotFoundError, ValidationError
+from ....core.projection import parse_fields
+from ....core.responses import ORJSONResponse, list_payload
 
 router = APIRouter(
     prefix="/entities",
@@ -59,27 +61,26 @@ async def get_memory_entities(
     limit: int = Query(100, ge=1, le=100, description="Maximum number of entities to return"),
     source_type: Optional[str] = Query(None, description="Filter by source type"),
     search: Optional[str] = Query(None, description="Search entities by content"),
+    fields: Optional[str] = Query(
+        None, description="Comma-separated fields to return, e.g. 'id,name'. "
+        "Defaults to all MemoryEntity fields."),
     memory_service: MemoryService = Depends(get_memory_service)
 ):
     """Get all memory entities with optional filtering."""
     try:
-        if search:
-            entities = await memory_service.search_entities(search, limit=limit)
-            total = len(entities)
-        elif source_type:
-            entities = await memory_service.get_entities_by_source_type(
-                source_type=source_type, skip=skip, limit=limit
-            )
-            total = len(entities)
-        else:
-            entities = await memory_service.get_entities(skip=skip, limit=limit)
-            total = len(entities)
-        
-        return ListResponse(
-            data=entities,
-            total=total,
-            message="Memory entities retrieved successfully"
+        rows, total = await memory_service.get_entity_rows(
+            skip=skip,
+            limit=limit,
+            fields=parse_fields(fields),
+            search=search,
+            source=source_type,
         )
+        return ORJSONResponse(list_payload(
+            rows, total, skip, limit,
+            message="Memory entities retrieved successfully"
+        ))
+    except ValidationError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -2,13 +2,19 @@
 
 from fastapi import APIRouter, Depends, HTTPException, Query, Path, status
 from sqlalchemy.ext.asyncio import AsyncSession
-from typing import Annotated, List, Optional
+from typing import Annotated
 
 from backend.database import get_db
+from backend.services.exceptions import (
+    ConflictError,
+    EntityNotFoundError,
+    ValidationError,
+)
 from backend.services.project_template_service import ProjectTemplateService
 from backend.schemas.project_template import (
     ProjectTemplate,
     ProjectTemplateCreate,
+    ProjectTemplateInstantiate,
     ProjectTemplateUpdate
 )
 from backend.schemas.api_responses import DataResponse, ListResponse
@@ -18,11 +24,13 @@ router = APIRouter(
     tags=["Project Templates"],
 )
 
+
 async def get_project_template_service(
     db: Annotated[AsyncSession, Depends(get_db)]
 ) -> ProjectTemplateService:
     return ProjectTemplateService(db)
 
+
 @router.get(
     "/",
     response_model=ListResponse[ProjectTemplate],
@@ -30,13 +38,17 @@ async def get_project_template_service(
     operation_id="get_project_templates"
 )
 async def get_project_templates(
-    template_service: Annotated[ProjectTemplateService, Depends(get_project_template_service)],
+    template_service: Annotated[
+        ProjectTemplateService, Depends(get_project_template_service)
+    ],
     skip: Annotated[int, Query(description="Number of templates to skip")] = 0,
-    limit: Annotated[int, Query(description="Maximum number of templates to return")] = 100,
+    limit: Annotated[
+        int, Query(description="Maximum number of templates to return")
+    ] = 100,
 ):
     """Get a list of project templates."""
     try:
-        templates = template_service.get_templates(skip=skip, limit=limit)
+        templates = await template_service.get_templates(skip=skip, limit=limit)
         return ListResponse(
             data=templates,
             total=len(templates),
@@ -48,6 +60,7 @@ async def get_project_templates(
             detail=f"Error retrieving project templates: {str(e)}"
         )
 
+
 @router.get(
     "/{template_id}",
     response_model=DataResponse[ProjectTemplate],
@@ -56,11 +69,13 @@ async def get_project_templates(
 )
 async def get_template(
     template_id: Annotated[str, Path(description="Template ID")],
-    template_service: Annotated[ProjectTemplateService, Depends(get_project_template_service)]
+    template_service: Annotated[
+        ProjectTemplateService, Depends(get_project_template_service)
+    ]
 ):
     """Get a specific project template by ID."""
     try:
-        template = template_service.get_template(template_id)
+        template = await template_service.get_template(template_id)
         if not template:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -78,6 +93,7 @@ async def get_template(
             detail=f"Error retrieving project template: {str(e)}"
         )
 
+
 @router.post(
     "/",
     response_model=DataResponse[ProjectTemplate],
@@ -87,11 +103,13 @@ async def get_template(
 )
 async def create_template(
     template: ProjectTemplateCreate,
-    template_service: Annotated[ProjectTemplateService, Depends(get_project_template_service)],
+    template_service: Annotated[
+        ProjectTemplateService, Depends(get_project_template_service)
+    ],
 ):
     """Create a new project template."""
     try:
-        new_template = template_service.create_template(template)
+        new_template = await template_service.create_template(template)
         return DataResponse(
             data=new_template,
             message="Project template created successfully"
@@ -102,6 +120,7 @@ async def create_template(
             detail=f"Error creating project template: {str(e)}"
         )
 
+
 @router.put(
     "/{template_id}",
     response_model=DataResponse[ProjectTemplate],
@@ -111,11 +130,15 @@ async def create_template(
 async def update_template(
     template_id: Annotated[str, Path(description="Template ID")],
     template_update: ProjectTemplateUpdate,
-    template_service: Annotated[ProjectTemplateService, Depends(get_project_template_service)],
+    template_service: Annotated[
+        ProjectTemplateService, Depends(get_project_template_service)
+    ],
 ):
     """Update an existing project template."""
     try:
-        updated_template = template_service.update_template(template_id, template_update)
+        updated_template = await template_service.update_template(
+            template_id, template_update
+        )
         if not updated_template:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -133,6 +156,7 @@ async def update_template(
             detail=f"Error updating project template: {str(e)}"
         )
 
+
 @router.delete(
     "/{template_id}",
     status_code=status.HTTP_204_NO_CONTENT,
@@ -141,11 +165,13 @@ async def update_template(
 )
 async def delete_template(
     template_id: Annotated[str, Path(description="Template ID")],
-    template_service: Annotated[ProjectTemplateService, Depends(get_project_template_service)],
+    template_service: Annotated[
+        ProjectTemplateService, Depends(get_project_template_service)
+    ],
 ):
     """Delete a project template."""
     try:
-        success = template_service.delete_template(template_id)
+        success = await template_service.delete_template(template_id)
         if not success:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -158,3 +184,40 @@ async def delete_template(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Error deleting project template: {str(e)}"
         )
+
+
+@router.post(
+    "/{template_id}/instantiate",
+    response_model=DataResponse[dict],
+    status_code=status.HTTP_201_CREATED,
+    summary="Instantiate Project Template",
+    operation_id="instantiate_project_template"
+)
+async def instantiate_template(
+    template_id: Annotated[str, Path(description="Template ID")],
+    target: ProjectTemplateInstantiate,
+    template_service: Annotated[
+        ProjectTemplateService, Depends(get_project_template_service)
+    ],
+):
+    """Create a project with the template's tasks, dependencies and comments
+    in one transaction."""
+    try:
+        created = await template_service.instantiate_template(
+            template_id, project_name=target.project_name, project_id=target.project_id
+        )
+    except EntityNotFoundError as e:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
+    except ConflictError as e:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(e))
+    except ValidationError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error instantiating project template: {str(e)}"
+        )
+    return DataResponse(
+        data=created,
+        message=f"Project template instantiated with {created['tasks']} tasks"
+    )
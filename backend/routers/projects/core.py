@@ -1,18 +1,25 @@
+import asyncio
+
 from fastapi import APIRouter, Depends, HTTPException, Query, Path, status
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
-from typing import Annotated, List, Optional
+from typing import Annotated, AsyncIterator, List, Optional
 
-from backend.database import get_db
+from backend.database import async_session_maker, get_db
 from backend.services.project_service import ProjectService
 from backend.services.audit_log_service import AuditLogService
 from backend.schemas.project import (
     Project as ProjectSchema,
+    ProjectClone,
     ProjectCreate,
     ProjectUpdate
 )
 from backend.schemas.api_responses import DataResponse, ListResponse, PaginationParams
 from backend.services.exceptions import EntityNotFoundError, DuplicateEntityError, ValidationError
 from backend.enums import ProjectStatus, ProjectPriority, ProjectVisibility
+from backend.core.counters import counters
+from backend.core.projection import parse_fields
+from backend.core.responses import ORJSONResponse, dumps, list_payload
 
 router = APIRouter(
     prefix="",
@@ -79,17 +86,19 @@ async def get_projects_endpoint(
     is_archived: Annotated[Optional[bool], Query(description="Filter by archived status")] = None,
     owner_id: Annotated[Optional[str], Query(description="Filter by owner ID")] = None,
     sort_by: Annotated[Optional[str], Query(description="Field to sort by")] = "created_at",
-    sort_direction: Annotated[Optional[str], Query(description="Sort direction: asc or desc")] = "desc"
+    sort_direction: Annotated[Optional[str], Query(description="Sort direction: asc or desc")] = "desc",
+    fields: Annotated[Optional[str], Query(description="Comma-separated fields to return, e.g. 'id,name,status'")] = None
 ):
     """
     Get a list of projects with filtering support.
     
-    Supports pagination, search, filtering by status/priority/visibility, and sorting.
+    Supports pagination, search, filtering by status/priority/visibility, sorting
+    and sparse fieldsets via ``fields``.
     """
     try:
-        projects, total_count = await project_service.get_projects(
-            skip=pagination.offset, 
-            limit=pagination.page_size,
+        rows, total_count = await project_service.get_project_rows(
+            skip=pagination.skip, 
+            limit=pagination.limit,
             status=status_filter,
             priority=priority_filter,
             visibility=visibility_filter,
@@ -97,17 +106,16 @@ async def get_projects_endpoint(
             is_archived=is_archived,
             owner_id=owner_id,
             sort_by=sort_by,
-            sort_direction=sort_direction
+            sort_direction=sort_direction,
+            fields=parse_fields(fields)
         )
         
-        return ListResponse(
-            data=[ProjectSchema.model_validate(p) for p in projects],
-            total=total_count,
-            page=pagination.page,
-            page_size=pagination.page_size,
-            has_more=(pagination.offset + len(projects)) < total_count,
+        return ORJSONResponse(list_payload(
+            rows, total_count, pagination.skip, pagination.limit,
             message="Projects retrieved successfully"
-        )
+        ))
+    except ValidationError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=f"Error retrieving projects: {e}")
 
@@ -129,7 +137,10 @@ async def get_project_endpoint(
     """
     try:
         project = await project_service.get_project(project_id)
-        return DataResponse(data=ProjectSchema.model_validate(project), message="Project retrieved successfully")
+        counters.incr("project_views", project_id)
+        data = ProjectSchema.model_validate(project)
+        data.view_count = counters.merged("project_views", project_id, data.view_count)
+        return DataResponse(data=data, message="Project retrieved successfully")
     except EntityNotFoundError:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Project not found")
 
@@ -171,6 +182,84 @@ async def update_project_endpoint(
     except ValidationError as e:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
 
+@router.post(
+    "/{project_id}/clone",
+    response_model=DataResponse,
+    status_code=status.HTTP_201_CREATED,
+    summary="Clone Project",
+    operation_id="clone_project"
+)
+async def clone_project_endpoint(
+    project_id: Annotated[str, Path(description="ID of the project to clone")],
+    clone: ProjectClone,
+    project_service: Annotated[ProjectService, Depends(get_project_service)],
+    audit_log_service: Annotated[AuditLogService, Depends(get_audit_log_service)],
+    stream: bool = Query(False, description="Stream progress as NDJSON lines while copying."),
+):
+    """
+    Copy a project with its tasks, task numbers and dependencies.
+
+    - **include_comments**: Also copy task comments
+    - **include_memory_links**: Also copy the project's file links
+    - **stream**: Respond with ``application/x-ndjson``: a
+      ``{"tasks_copied", "tasks_total"}`` line per copied batch, then
+      ``{"data", "message"}`` or ``{"error", "status_code"}``
+    """
+    if stream:
+        return StreamingResponse(_clone_progress(project_id, clone), media_type="application/x-ndjson")
+    try:
+        cloned = await project_service.clone_project(
+            project_id, clone.name, include_comments=clone.include_comments,
+            include_memory_links=clone.include_memory_links,
+        )
+        await audit_log_service.create_log(
+            action="clone_project",
+            details=cloned,
+            user_id="00000000-0000-0000-0000-000000000000"  # Placeholder
+        )
+        return DataResponse(data=cloned, message=f"Project cloned with {cloned['tasks']} tasks")
+    except EntityNotFoundError:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Project not found")
+    except DuplicateEntityError as e:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=f"Error cloning project: {e}")
+
+async def _clone_progress(project_id: str, clone: ProjectClone) -> AsyncIterator[bytes]:
+    # Request-scoped sessions close before a streamed body is sent.
+    events: asyncio.Queue = asyncio.Queue()
+
+    async def run() -> dict:
+        async with async_session_maker() as db:
+            cloned = await ProjectService(db).clone_project(
+                project_id, clone.name, include_comments=clone.include_comments,
+                include_memory_links=clone.include_memory_links,
+                on_progress=lambda done, total: events.put_nowait({"tasks_copied": done, "tasks_total": total}),
+            )
+            await AuditLogService(db).create_log(
+                action="clone_project",
+                details=cloned,
+                user_id="00000000-0000-0000-0000-000000000000"  # Placeholder
+            )
+            return cloned
+
+    task = asyncio.create_task(run())
+    task.add_done_callback(lambda _: events.put_nowait(None))
+    while (event := await events.get()) is not None:
+        yield dumps(event) + b"\n"
+    try:
+        cloned = task.result()
+    except EntityNotFoundError:
+        outcome = {"error": "Project not found", "status_code": status.HTTP_404_NOT_FOUND}
+    except DuplicateEntityError as e:
+        outcome = {"error": str(e), "status_code": status.HTTP_409_CONFLICT}
+    except Exception as e:
+        outcome = {"error": f"Error cloning project: {e}", "status_code": status.HTTP_500_INTERNAL_SERVER_ERROR}
+    else:
+        outcome = {"data": cloned, "message": f"Project cloned with {cloned['tasks']} tasks"}
+    yield dumps(outcome) + b"\n"
+
+
 @router.post(
     "/{project_id}/archive", 
     response_model=DataResponse,
@@ -5,7 +5,13 @@ Combines all task-related routers.
 
 from fastapi import APIRouter
 from .core.core import router as core_router
+from .queue import router as queue_router
+from .analytics import router as analytics_router
 
 # Create main router and include sub-routers
 router = APIRouter()
+# Queue and analytics routes go first so "/{project_id}/tasks/ready" and
+# ".../analytics" are not taken for a task number.
+router.include_router(queue_router, prefix="", tags=["tasks-queue"])
+router.include_router(analytics_router, prefix="", tags=["tasks-analytics"])
 router.include_router(core_router, prefix="", tags=["tasks-core"])
@@ -0,0 +1,42 @@
+"""
+Task flow analytics routes: cycle and lead time, throughput and cumulative
+flow of a project, computed from its status transitions.
+"""
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.database import get_db
+from backend.schemas.api_responses import DataResponse
+from backend.services.task_analytics_service import TaskAnalyticsService
+from backend.core.responses import ORJSONResponse
+
+router = APIRouter()
+
+
+async def get_task_analytics_service(
+    db: AsyncSession = Depends(get_db),
+) -> TaskAnalyticsService:
+    return TaskAnalyticsService(db)
+
+
+@router.get(
+    "/{project_id}/tasks/analytics",
+    response_model=DataResponse[dict],
+    summary="Get Task Flow Analytics",
+    operation_id="get_task_flow_analytics",
+)
+async def get_task_flow_analytics(
+    project_id: str,
+    days: int = Query(
+        90, gt=0, le=3660, description="Days of cumulative flow to return."
+    ),
+    analytics: TaskAnalyticsService = Depends(get_task_analytics_service),
+):
+    """Cycle/lead time percentiles (hours), weekly throughput and cumulative flow."""
+    try:
+        flow = await analytics.project_flow(project_id, days)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Internal server error: {e}")
+    return ORJSONResponse({
+        "data": flow, "message": f"Flow analytics for {flow['tasks']} tasks"
+    })
@@ -3,9 +3,10 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List, Optional
 import uuid
 
-from backend.database import get_db
+from backend.database import async_session_maker, get_db
 from backend.services.task_service import TaskService
 from backend.services.agent_service import AgentService
+from backend.services.context_service import ContextService
 
 from backend.schemas.task import Task, TaskCreate, TaskUpdate
 from backend.schemas.api_responses import DataResponse, ListResponse, PaginationParams
@@ -17,6 +18,8 @@ from backend.services.exceptions import (
 )
 from backend.enums import TaskStatusEnum
 from backend.services.audit_log_service import AuditLogService
+from backend.core.projection import parse_fields
+from backend.core.responses import ORJSONResponse, list_payload
 
 
 router = APIRouter()
@@ -110,6 +113,9 @@ async def get_tasks_list(
     "created_at", description="Field to sort by. Supported: \'created_at\', \'updated_at\', \'title\', \'status\', \'task_number\', \'agent_id\'"),
     sort_direction: Optional[str] = Query(
     "desc", description="Sort direction: \'asc\' or \'desc\'"),
+    fields: Optional[str] = Query(
+    None, description="Comma-separated fields to return, e.g. \'task_number,title,status\'. "
+        "Also accepts \'project_name\' and \'agent_name\'. Defaults to all Task fields."),
     task_service: TaskService = Depends(get_task_service),
     agent_service: AgentService = Depends(get_agent_service)
 ):
@@ -123,40 +129,35 @@ async def get_tasks_list(
             if agent:
                 agent_id_val = agent.id
             else:
-                return ListResponse[Task](
-                    data=[],
-                    total=0,
-                    page=pagination.page,
-                    page_size=pagination.page_size,
-                    has_more=False,
+                return ORJSONResponse(list_payload(
+                    [], 0, pagination.skip, pagination.limit,
                     message=f"No tasks found for agent \'{agent_name}\'"
-                )
+                ))
 
-        tasks, total = await task_service.get_tasks(
+        # Project rows straight from SQL; skipping ORM entity and Pydantic
+        # hydration keeps large pages cheap in both latency and memory.
+        rows, total = await task_service.get_task_rows(
             project_id=uuid.UUID(project_id),
-            skip=pagination.offset,
-            limit=pagination.page_size,
+            skip=pagination.skip,
+            limit=pagination.limit,
             agent_id=agent_id_val or agent_id,
             search=search,
             status=status,
             is_archived=is_archived,
             sort_by=sort_by,
-            sort_direction=sort_direction
+            sort_direction=sort_direction,
+            fields=parse_fields(fields)
         )
 
-        pydantic_tasks = [Task.model_validate(task) for task in tasks]
-
-        return ListResponse[Task](
-            data=pydantic_tasks,
-            total=total,
-            page=pagination.page,
-            page_size=pagination.page_size,
-            has_more=pagination.offset + len(pydantic_tasks) < total,
-            message=f"Retrieved {len(pydantic_tasks)} tasks" +
+        return ORJSONResponse(list_payload(
+            rows, total, pagination.skip, pagination.limit,
+            message=f"Retrieved {len(rows)} tasks" +
             (f" for agent '{agent_name}' ({agent_id_val})" if agent_name and agent_id_val else "")
-        )
+        ))
     except EntityNotFoundError as e:
         raise HTTPException(status_code=404, detail=str(e))
+    except ValidationError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(
             status_code=500,
@@ -198,6 +199,46 @@ async def read_task(
             detail=f"Internal server error: {e}"
         )
 
+@router.get(
+    "/{project_id}/tasks/{task_number}/context",
+    response_model=DataResponse[dict],
+    summary="Get Task Working Context",
+    tags=["mcp-tools"],
+    operation_id="get_task_context"
+)
+
+
+async def read_task_context(
+    project_id: str,
+    task_number: int = Path(...,
+    description="Task number unique within the project."),
+    budget_tokens: int = Query(
+    4000, description="Approximate token budget for the whole context."),
+    agent_name: Optional[str] = Query(
+    None, description="Agent whose rules to include; defaults to the task's agent."),
+):
+    """Retrieve a task with its dependencies, recent comments, relevant memory
+    passages, agent rules and active mandates, fitted to a token budget.
+    """
+    try:
+        context = await ContextService(async_session_maker).assemble(
+            project_id, task_number, budget_tokens, agent_name
+        )
+        return ORJSONResponse({
+            "data": context,
+            "message": f"Context for task #{task_number} uses {context['used_tokens']} of {budget_tokens} tokens",
+        })
+    except EntityNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except ValidationError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"Internal server error: {e}"
+        )
+
+
 @router.post(
     "/{project_id}/tasks/{task_number}/archive",
     response_model=DataResponse[Task],
@@ -0,0 +1,129 @@
+"""
+Agent work queue routes: the ready set of a project, claiming the next ready
+task, renewing and releasing leases.
+"""
+from fastapi import APIRouter, Depends, HTTPException, Path, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.database import get_db
+from backend.schemas.api_responses import DataResponse
+from backend.schemas.task import TaskClaimRequest, TaskLease, TaskLeaseRequest
+from backend.services.exceptions import (
+    ConflictError, EntityNotFoundError, ValidationError,
+)
+from backend.services.task_queue_service import TaskQueueService
+from backend.core.responses import ORJSONResponse
+
+router = APIRouter()
+
+
+async def get_task_queue_service(
+    db: AsyncSession = Depends(get_db),
+) -> TaskQueueService:
+    return TaskQueueService(db)
+
+
+def _error(e: Exception) -> HTTPException:
+    if isinstance(e, EntityNotFoundError):
+        return HTTPException(status_code=404, detail=str(e))
+    if isinstance(e, ConflictError):
+        return HTTPException(status_code=409, detail=str(e))
+    if isinstance(e, ValidationError):
+        return HTTPException(status_code=400, detail=str(e))
+    return HTTPException(status_code=500, detail=f"Internal server error: {e}")
+
+
+@router.get(
+    "/{project_id}/tasks/ready",
+    response_model=DataResponse[dict],
+    summary="Get Ready Tasks",
+    operation_id="get_ready_tasks",
+)
+async def get_ready_tasks(
+    project_id: str,
+    unclaimed_only: bool = Query(
+        False, description="Only To Do tasks that can be claimed now."
+    ),
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, gt=0, le=1000),
+    queue: TaskQueueService = Depends(get_task_queue_service),
+):
+    """List open tasks whose predecessors are all final, highest priority first."""
+    try:
+        ready = await queue.ready_tasks(project_id, unclaimed_only, skip, limit)
+    except Exception as e:
+        raise _error(e)
+    return ORJSONResponse({"data": ready, "message": f"{ready['total']} ready tasks"})
+
+
+@router.post(
+    "/tasks/claim",
+    response_model=DataResponse[TaskLease],
+    summary="Claim Next Ready Task",
+    operation_id="claim_task",
+)
+async def claim_task(
+    claim: TaskClaimRequest,
+    queue: TaskQueueService = Depends(get_task_queue_service),
+):
+    """Lease the highest-priority unblocked task the agent is capable of.
+
+    Returns ``data: null`` when no task is ready.
+    """
+    try:
+        lease = await queue.claim(
+            claim.agent_id, claim.capabilities, claim.project_id, claim.lease_seconds
+        )
+    except Exception as e:
+        raise _error(e)
+    message = f"Claimed task #{lease['task_number']}" if lease else "No ready task"
+    return ORJSONResponse({"data": lease, "message": message})
+
+
+@router.post(
+    "/{project_id}/tasks/{task_number}/lease/renew",
+    response_model=DataResponse[TaskLease],
+    summary="Renew Task Lease",
+    operation_id="renew_task_lease",
+)
+async def renew_task_lease(
+    lease: TaskLeaseRequest,
+    project_id: str,
+    task_number: int = Path(..., description="Task number unique within the project."),
+    queue: TaskQueueService = Depends(get_task_queue_service),
+):
+    """Extend the calling agent's lease; 409 if it expired or another agent holds it."""
+    try:
+        renewed = await queue.renew(
+            project_id, task_number, lease.agent_id, lease.lease_seconds
+        )
+    except Exception as e:
+        raise _error(e)
+    return ORJSONResponse({"data": renewed, "message": "Lease renewed"})
+
+
+@router.post(
+    "/{project_id}/tasks/{task_number}/lease/release",
+    response_model=DataResponse[TaskLease],
+    summary="Release Task Lease",
+    operation_id="release_task_lease",
+)
+async def release_task_lease(
+    lease: TaskLeaseRequest,
+    project_id: str,
+    task_number: int = Path(..., description="Task number unique within the project."),
+    queue: TaskQueueService = Depends(get_task_queue_service),
+):
+    """End the calling agent's lease, leaving the task in ``status``.
+
+    ``To Do`` returns the task to the queue.
+    """
+    try:
+        released = await queue.release(
+            project_id, task_number, lease.agent_id, lease.status
+        )
+    except Exception as e:
+        raise _error(e)
+    return ORJSONResponse({
+        "data": released, "message": f"Task left in {released['status']}"
+    })
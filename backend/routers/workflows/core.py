@@ -4,7 +4,11 @@ from typing import Annotated, List, Optional
 
 from ...database import get_db
 from ...services.workflow_service import WorkflowService
-from ...schemas.workflow import Workflow, WorkflowCreate, WorkflowUpdate
+from ...services.workflow_runner import workflow_runner
+from ...services.exceptions import ConflictError, EntityNotFoundError, ValidationError
+from ...schemas.workflow import (
+    Workflow, WorkflowCreate, WorkflowExecutionAdvance, WorkflowExecutionStart, WorkflowUpdate,
+)
 from ...schemas.api_responses import DataResponse, ListResponse
 
 router = APIRouter(
@@ -17,6 +21,19 @@ async def get_workflow_service(db: Annotated[AsyncSession, Depends(get_db)]) ->
     return WorkflowService(db)
 
 
+def _execution_error(e: Exception) -> HTTPException:
+    if isinstance(e, EntityNotFoundError):
+        return HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
+    if isinstance(e, ConflictError):
+        return HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(e))
+    if isinstance(e, ValidationError):
+        return HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    return HTTPException(
+        status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+        detail=f"Error running workflow execution: {str(e)}"
+    )
+
+
 @router.post(
     "/",
     response_model=DataResponse[Workflow],
@@ -156,3 +173,66 @@ async def delete_workflow(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Error deleting workflow: {str(e)}"
         )
+
+
+@router.post(
+    "/{workflow_id}/executions",
+    response_model=DataResponse[dict],
+    status_code=status.HTTP_201_CREATED,
+    summary="Start Workflow Execution",
+    operation_id="start_workflow_execution"
+)
+async def start_workflow_execution(
+    workflow_id: Annotated[str, Path(description="Workflow ID")],
+    execution: WorkflowExecutionStart,
+    db: Annotated[AsyncSession, Depends(get_db)],
+):
+    """Run a workflow for a task; it waits as initialized while the agent has no free slot."""
+    try:
+        started = await workflow_runner.start_execution(
+            workflow_id, execution.project_id, execution.task_number, execution.agent_id, execution.context, db=db
+        )
+    except Exception as e:
+        raise _execution_error(e)
+    return DataResponse(data=started, message=f"Workflow execution {started['status']}")
+
+
+@router.post(
+    "/executions/{execution_id}/advance",
+    response_model=DataResponse[dict],
+    summary="Advance Workflow Execution",
+    operation_id="advance_workflow_execution"
+)
+async def advance_workflow_execution(
+    execution_id: Annotated[str, Path(description="Workflow execution ID")],
+    advance: WorkflowExecutionAdvance,
+    db: Annotated[AsyncSession, Depends(get_db)],
+):
+    """Report the outcome of the execution's current step."""
+    try:
+        execution = await workflow_runner.advance(
+            execution_id, advance.outcome, advance.output, advance.error, db=db
+        )
+    except Exception as e:
+        raise _execution_error(e)
+    return DataResponse(data=execution, message=f"Workflow execution {execution['status']}")
+
+
+@router.get(
+    "/executions/{execution_id}",
+    response_model=DataResponse[dict],
+    summary="Get Workflow Execution",
+    operation_id="get_workflow_execution"
+)
+async def get_workflow_execution(
+    execution_id: Annotated[str, Path(description="Workflow execution ID")],
+    db: Annotated[AsyncSession, Depends(get_db)],
+):
+    """A workflow execution, as held by the runner or else as last written."""
+    execution = await workflow_runner.get(execution_id, db=db)
+    if execution is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Workflow execution not found"
+        )
+    return DataResponse(data=execution, message="Workflow execution retrieved successfully")
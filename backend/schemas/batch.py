@@ -0,0 +1,55 @@
+"""
+Schemas for running several MCP tool calls in one request.
+"""
+from pydantic import BaseModel, Field
+from typing import Any, Dict, List, Literal, Optional
+
+MAX_BATCH_STEPS = 100
+
+
+class BatchStep(BaseModel):
+    """One tool invocation inside a batch."""
+    id: Optional[str] = Field(
+        None,
+        description="Name later steps use to reference this step's result; "
+                    "defaults to its index.",
+    )
+    tool: str = Field(
+        ...,
+        description="operation_id of an /mcp-tools endpoint, e.g. 'create_task_tool'.",
+    )
+    args: Dict[str, Any] = Field(
+        default_factory=dict,
+        description="Tool arguments. A string '${step_id.path.to.value}' is "
+                    "replaced by that value from an earlier step's result; "
+                    "'${...}' inside a longer string is interpolated.",
+    )
+
+
+class BatchRequest(BaseModel):
+    """An ordered list of tool invocations run in one transaction."""
+    steps: List[BatchStep] = Field(..., min_length=1, max_length=MAX_BATCH_STEPS)
+    mode: Literal["atomic", "savepoint"] = Field(
+        "atomic",
+        description="'atomic': the first failing step rolls back the whole batch. "
+                    "'savepoint': a failing step rolls back only itself; steps "
+                    "that reference it are skipped.",
+    )
+
+
+class BatchStepResult(BaseModel):
+    """Outcome of one step."""
+    id: str
+    tool: str
+    status: Literal["ok", "error", "skipped"]
+    result: Optional[Any] = None
+    error: Optional[Any] = None
+    status_code: Optional[int] = None
+
+
+class BatchResponse(BaseModel):
+    """Per-step results and whether the batch was committed."""
+    success: bool
+    committed: bool
+    mode: str
+    results: List[BatchStepResult]
@@ -23,6 +23,12 @@ class ProjectCreate(ProjectBase):
     # Note: owner_id is set automatically from current user in service layer
     pass
 
+class ProjectClone(BaseModel):
+    """Schema for cloning a project."""
+    name: str = Field(..., max_length=255, description="Name of the new project.")
+    include_comments: bool = Field(True, description="Copy task comments.")
+    include_memory_links: bool = Field(True, description="Copy the project's file (memory entity) links.")
+
 class ProjectUpdate(BaseModel):
     """Schema for updating an existing project. All fields are optional."""
     name: Optional[str] = Field(None, max_length=255)
@@ -17,6 +17,8 @@ class TaskBase(BaseModel):
 class TaskCreate(TaskBase):
     """Schema for creating a new task."""
     project_id: str = Field(..., description="ID of the project this task belongs to.")
+    required_capabilities: List[str] = Field(
+        default_factory=list, description="Capabilities an agent must declare to claim this task.")
     # task_number is auto-generated in the service layer
 
 class TaskUpdate(BaseModel):
@@ -40,3 +42,32 @@ class Task(TaskBase):
 
     model_config = ConfigDict(from_attributes=True)
 
+
+
+class TaskClaimRequest(BaseModel):
+    """Schema for claiming the next ready task from the work queue."""
+    agent_id: str = Field(..., min_length=1, description="Agent claiming the task; holds the lease.")
+    capabilities: List[str] = Field(
+        default_factory=list, description="Capabilities the agent has; only tasks requiring a subset are claimed.")
+    project_id: Optional[str] = Field(None, description="Only claim tasks in this project.")
+    lease_seconds: Optional[int] = Field(
+        None, gt=0, description="Lease length; defaults to TASK_LEASE_SECONDS.")
+
+
+class TaskLeaseRequest(BaseModel):
+    """Schema for renewing or releasing a task lease."""
+    agent_id: str = Field(..., min_length=1, description="Agent holding the lease.")
+    lease_seconds: Optional[int] = Field(None, gt=0, description="New lease length when renewing.")
+    status: TaskStatusEnum = Field(
+        default=TaskStatusEnum.TO_DO, description="Status to leave the task in when releasing.")
+
+
+class TaskLease(BaseModel):
+    """A task leased to an agent."""
+    project_id: str
+    task_number: int
+    title: str
+    priority: str
+    status: str
+    lease_owner: Optional[str] = None
+    lease_expires_at: Optional[datetime] = None
@@ -1,7 +1,7 @@
 # Task ID: <taskId>  # Agent Role: CodeStructureSpecialist  # Request ID: <requestId>  # Project: task-manager  # Timestamp: <timestamp>
 
 from pydantic import BaseModel, ConfigDict, Field
-from typing import Optional
+from typing import Any, Dict, Literal, Optional
 from datetime import datetime  # --- Workflow Schemas ---
 
 
@@ -34,3 +34,19 @@ class Workflow(WorkflowBase):
     updated_at: datetime = Field(..., description="Timestamp when the workflow was last updated.")
 
     model_config = ConfigDict(from_attributes=True)
+
+
+class WorkflowExecutionStart(BaseModel):
+    """Schema for starting a workflow execution for a task."""
+    project_id: str = Field(..., description="Project of the task the workflow runs for.")
+    task_number: int = Field(..., gt=0, description="Number of the task within the project.")
+    agent_id: Optional[str] = Field(
+        None, description="Agent running the execution; counts against its WORKFLOW_AGENT_CONCURRENCY slots.")
+    context: Dict[str, Any] = Field(default_factory=dict, description="Input available to every step.")
+
+class WorkflowExecutionAdvance(BaseModel):
+    """Schema for reporting the outcome of an execution's current step."""
+    outcome: Literal["completed", "failed", "blocked", "cancelled"] = Field(
+        "completed", description="completed moves to the next step; blocked pauses; failed and cancelled end it.")
+    output: Optional[Dict[str, Any]] = Field(None, description="Step output, kept in the execution context.")
+    error: Optional[str] = Field(None, description="Error message for a failed step.")
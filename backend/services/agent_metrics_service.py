@@ -0,0 +1,345 @@
+"""
+Agent performance rollups.
+
+:func:`rollup` folds the rows written since its watermark into
+``agent_performance_metrics``, per agent, for hourly, daily and weekly
+(Monday) windows:
+
+- ``task_completion``: transitions into ``Completed`` or ``Completed
+  Handoff`` attributed to the agent;
+- ``avg_duration``: mean ``duration_seconds`` of those transitions, the time
+  the task spent in its last status before completion;
+- ``error_rate``: share of the agent's ``mcp_tool_executions`` that did not
+  succeed;
+- ``handoff_rate``: handoffs away from the agent over its completions plus
+  handoffs.
+
+Each metric row keeps the sample count and the sum behind it
+(``task_count``, ``metric_total``), so new samples are added with one
+upsert per touched window and history is never reread. The watermark
+advances in the same transaction, conditionally on its previous value: when
+several workers run the rollup, only one processes each range.
+
+:class:`AgentMetricsRollup` runs it periodically from the app lifespan
+(``AGENT_METRICS_ROLLUP_SECONDS``); :class:`AgentMetricsService` serves the
+stored rows.
+"""
+import asyncio
+import logging
+from collections import defaultdict
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import case, insert, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend import models
+from backend.enums import TaskStatusEnum
+from .exceptions import ValidationError
+
+try:
+    from backend.config.app_config import settings
+except ImportError:
+    from config.app_config import settings
+
+logger = logging.getLogger(__name__)
+
+METRICS_TABLE = models.AgentPerformanceMetric.__table__
+WATERMARKS = models.MetricRollupWatermark.__table__
+TRANSITIONS = models.TaskStatusTransition.__table__
+HANDOFFS = models.AgentHandoffEvent.__table__
+EXECUTIONS = models.MCPToolExecution.__table__
+
+WATERMARK = "agent_performance"
+DONE_STATUSES = (TaskStatusEnum.COMPLETED, TaskStatusEnum.COMPLETED_HANDOFF)
+
+# metric type -> (unit, averaged); averaged metrics are metric_total / task_count
+# and counts are metric_total.
+METRICS: Dict[str, Tuple[str, bool]] = {
+    "task_completion": ("count", False),
+    "avg_duration": ("seconds", True),
+    "error_rate": ("rate", True),
+    "handoff_rate": ("rate", True),
+}
+
+
+def _hour(at: datetime) -> datetime:
+    return at.replace(minute=0, second=0, microsecond=0)
+
+
+def _day(at: datetime) -> datetime:
+    return at.replace(hour=0, minute=0, second=0, microsecond=0)
+
+
+# period -> (window start for a timestamp, window length)
+PERIODS = {
+    "hourly": (_hour, timedelta(hours=1)),
+    "daily": (_day, timedelta(days=1)),
+    "weekly": (lambda at: _day(at) - timedelta(days=at.weekday()), timedelta(days=7)),
+}
+
+# (agent_id, metric_type, period, window start) -> [samples, total]
+Samples = Dict[Tuple[str, str, str, datetime], List[float]]
+
+
+def _window(column, since: Optional[datetime], until: datetime) -> list:
+    clauses = [column < until]
+    if since is not None:
+        clauses.append(column >= since)
+    return clauses
+
+
+async def collect(
+    db: AsyncSession, since: Optional[datetime], until: datetime
+) -> Samples:
+    """Metric samples from source rows in ``[since, until)``."""
+    samples: Samples = defaultdict(lambda: [0, 0])
+
+    def add(agent_id: str, at: datetime, metric: str, total: float) -> None:
+        for period, (floor, _) in PERIODS.items():
+            sample = samples[(agent_id, metric, period, floor(at))]
+            sample[0] += 1
+            sample[1] += total
+
+    completions = await db.execute(
+        select(
+            TRANSITIONS.c.agent_id, TRANSITIONS.c.transitioned_at,
+            TRANSITIONS.c.duration_seconds,
+        )
+        .where(
+            TRANSITIONS.c.agent_id.isnot(None),
+            TRANSITIONS.c.to_status.in_(DONE_STATUSES),
+            *_window(TRANSITIONS.c.transitioned_at, since, until),
+        )
+    )
+    for agent_id, at, duration in completions:
+        add(agent_id, at, "task_completion", 1)
+        add(agent_id, at, "handoff_rate", 0)
+        if duration is not None:
+            add(agent_id, at, "avg_duration", duration)
+    handoffs = await db.execute(
+        select(HANDOFFS.c.from_agent_id, HANDOFFS.c.handoff_at)
+        .where(
+            HANDOFFS.c.from_agent_id.isnot(None),
+            *_window(HANDOFFS.c.handoff_at, since, until)
+        )
+    )
+    for agent_id, at in handoffs:
+        add(agent_id, at, "handoff_rate", 1)
+    executions = await db.execute(
+        select(
+            EXECUTIONS.c.agent_id, EXECUTIONS.c.executed_at,
+            EXECUTIONS.c.execution_status,
+        )
+        .where(
+            EXECUTIONS.c.agent_id.isnot(None),
+            *_window(EXECUTIONS.c.executed_at, since, until)
+        )
+    )
+    for agent_id, at, status in executions:
+        add(agent_id, at, "error_rate", status != "success")
+    return samples
+
+
+def _upsert(dialect: str):
+    if dialect == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert as dialect_insert
+    else:
+        from sqlalchemy.dialects.sqlite import insert as dialect_insert
+    statement = dialect_insert(METRICS_TABLE)
+    count = METRICS_TABLE.c.task_count + statement.excluded.task_count
+    total = METRICS_TABLE.c.metric_total + statement.excluded.metric_total
+    return statement.on_conflict_do_update(
+        index_elements=[
+            "agent_id", "metric_period", "metric_type", "metric_period_start"
+        ],
+        set_={
+            "task_count": count,
+            "metric_total": total,
+            # Only counts are not averaged (executemany cannot bind an IN list).
+            "metric_value": case(
+                (METRICS_TABLE.c.metric_unit == "count", total),
+                else_=total * 1.0 / count,
+            ),
+            "updated_at": statement.excluded.updated_at,
+        },
+    )
+
+
+async def rollup(
+    db: AsyncSession, now: Optional[datetime] = None,
+    lag_seconds: Optional[float] = None,
+) -> Dict[str, Any]:
+    """Fold rows written since the watermark into the metric windows; commits.
+
+    Rows newer than ``lag_seconds`` are left for the next run. Returns the
+    processed range and the number of windows touched (0 with ``until:
+    None`` when another worker got there first).
+    """
+    if lag_seconds is None:
+        lag_seconds = settings.agent_metrics_rollup_lag_seconds
+    now = now or datetime.utcnow()
+    until = now - timedelta(seconds=lag_seconds)
+    since = (await db.execute(
+        select(WATERMARKS.c.processed_until).where(WATERMARKS.c.name == WATERMARK)
+    )).scalar()
+    if since is not None and since >= until:
+        return {"since": since, "until": since, "windows": 0}
+    # Advancing the watermark first locks it: a concurrent run of the same
+    # range waits here, then finds it moved and backs off.
+    try:
+        if since is None:
+            await db.execute(
+                insert(WATERMARKS).values(
+                    name=WATERMARK, processed_until=until, updated_at=now
+                )
+            )
+            advanced = True
+        else:
+            advanced = (await db.execute(
+                update(WATERMARKS)
+                .where(
+                    WATERMARKS.c.name == WATERMARK,
+                    WATERMARKS.c.processed_until == since,
+                )
+                .values(processed_until=until, updated_at=now)
+            )).rowcount == 1
+    except IntegrityError:
+        advanced = False
+    if not advanced:
+        await db.rollback()
+        return {"since": since, "until": None, "windows": 0}
+    samples = await collect(db, since, until)
+    if samples:
+        await db.execute(_upsert(db.get_bind().dialect.name), [
+            {
+                "agent_id": agent_id, "metric_type": metric,
+                "metric_unit": METRICS[metric][0], "metric_period": period,
+                "metric_period_start": start,
+                "metric_period_end": start + PERIODS[period][1], "task_count": count,
+                "metric_total": total,
+                "metric_value": total / count if METRICS[metric][1] else total,
+                "created_at": now, "updated_at": now,
+            }
+            for (agent_id, metric, period, start), (count, total) in samples.items()
+        ])
+    await db.commit()
+    return {"since": since, "until": until, "windows": len(samples)}
+
+
+def metric_dict(row) -> Dict[str, Any]:
+    return {
+        "agent_id": row.agent_id,
+        "metric_type": row.metric_type,
+        "period": row.metric_period,
+        "period_start": row.metric_period_start.isoformat(),
+        "period_end": row.metric_period_end.isoformat(),
+        "value": float(row.metric_value),
+        "unit": row.metric_unit,
+        "samples": row.task_count,
+    }
+
+
+class AgentMetricsService:
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    @staticmethod
+    def _check(period: str, metric_type: Optional[str]) -> None:
+        if period not in PERIODS:
+            raise ValidationError(f"period must be one of: {', '.join(PERIODS)}")
+        if metric_type is not None and metric_type not in METRICS:
+            raise ValidationError(f"metric_type must be one of: {', '.join(METRICS)}")
+
+    async def agent_metrics(
+        self,
+        agent_id: str,
+        period: str = "daily",
+        metric_type: Optional[str] = None,
+        since: Optional[datetime] = None,
+        limit: int = 100,
+    ) -> List[Dict[str, Any]]:
+        """An agent's rolled-up windows, newest first."""
+        self._check(period, metric_type)
+        query = (
+            select(METRICS_TABLE)
+            .where(
+                METRICS_TABLE.c.agent_id == agent_id,
+                METRICS_TABLE.c.metric_period == period,
+            )
+            .order_by(
+                METRICS_TABLE.c.metric_period_start.desc(), METRICS_TABLE.c.metric_type
+            )
+            .limit(limit)
+        )
+        if metric_type is not None:
+            query = query.where(METRICS_TABLE.c.metric_type == metric_type)
+        if since is not None:
+            query = query.where(METRICS_TABLE.c.metric_period_start >= since)
+        return [metric_dict(row) for row in await self.db.execute(query)]
+
+    async def top_agents(
+        self, metric_type: str, period: str = "daily", at: Optional[datetime] = None,
+        limit: int = 20
+    ) -> List[Dict[str, Any]]:
+        """Every agent's value for one metric in the window containing ``at``.
+
+        ``at`` defaults to now; the highest values come first.
+        """
+        self._check(period, metric_type)
+        start = PERIODS[period][0](at or datetime.utcnow())
+        rows = await self.db.execute(
+            select(METRICS_TABLE)
+            .where(
+                METRICS_TABLE.c.metric_period_start == start,
+                METRICS_TABLE.c.metric_period == period,
+                METRICS_TABLE.c.metric_type == metric_type,
+            )
+            .order_by(METRICS_TABLE.c.metric_value.desc())
+            .limit(limit)
+        )
+        return [metric_dict(row) for row in rows]
+
+
+class AgentMetricsRollup:
+    """Runs :func:`rollup` every few minutes on the app's event loop."""
+
+    def __init__(self, session_maker=None):
+        self._session_maker = session_maker
+        self._task: Optional[asyncio.Task] = None
+
+    async def run_once(self) -> Dict[str, Any]:
+        if self._session_maker is None:
+            from backend.database import async_session_maker
+
+            self._session_maker = async_session_maker
+        async with self._session_maker() as db:
+            return await rollup(db)
+
+    def start(self, interval: Optional[float] = None) -> None:
+        if interval is None:
+            interval = settings.agent_metrics_rollup_seconds
+        if interval > 0 and (self._task is None or self._task.done()):
+            self._task = asyncio.create_task(self._run(interval))
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self, interval: float) -> None:
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                result = await self.run_once()
+                logger.debug("Agent metrics rollup: %s", result)
+            except Exception as e:
+                logger.warning(f"Agent metrics rollup failed, will retry: {e}")
+
+
+agent_metrics_rollup = AgentMetricsRollup()
@@ -0,0 +1,366 @@
+"""
+Token-budgeted working context for a task.
+
+One call replaces the get-task / list-comments / search-memory / get-rules
+round trips an agent makes before starting work. After the task row is
+read, its dependency neighbourhood, recent comments, matching memory
+passages, the agent's compiled rules (``crud.rules``), active universal
+mandates and the project's files are gathered concurrently, each on its own
+session. Items are ranked by section priority and relevance and packed
+greedily into ``budget_tokens``; an item that no longer fits whole is
+truncated or dropped, and dropped items are counted in ``omitted``.
+
+Assembled contexts are cached per task version: the task's ``updated_at``
+plus its comment and dependency counts. Memory, rules and mandates are not
+part of that stamp, so cached entries also expire after
+``CONTEXT_CACHE_TTL`` seconds.
+"""
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, List, NamedTuple, Optional, Tuple
+
+from sqlalchemy import and_, func, or_, select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend import models
+from backend.models.task_dependency import TaskDependency
+from backend.crud import rules as rules_crud
+from backend.services.exceptions import EntityNotFoundError, ValidationError
+from backend.services.memory_service import MemoryService
+
+logger = logging.getLogger(__name__)
+
+# Rough token estimate: one token per four characters of English text/code.
+CHARS_PER_TOKEN = 4
+MIN_BUDGET_TOKENS = 64
+MAX_BUDGET_TOKENS = 200_000
+# A text item is truncated rather than dropped when at least this many
+# tokens of budget remain.
+MIN_TRUNCATED_TOKENS = 48
+
+RECENT_COMMENTS = 10
+CONTEXT_PASSAGES = 8
+CONTEXT_FILES = 50
+CONTEXT_CACHE_TTL = 60.0
+CONTEXT_CACHE_SIZE = 256
+
+# Section order when packing; lower sorts first. Items within a section are
+# ordered by their own relevance.
+SECTION_PRIORITY = {
+    "task": 0,
+    "mandates": 1,
+    "rules": 2,
+    "dependencies": 3,
+    "comments": 4,
+    "passages": 5,
+    "files": 6,
+}
+
+
+class ContextItem(NamedTuple):
+    section: str
+    relevance: float
+    text: str
+    data: Dict[str, Any]
+
+
+def estimate_tokens(text: str) -> int:
+    return -(-len(text) // CHARS_PER_TOKEN)
+
+
+def pack(
+    items: List[ContextItem], budget_tokens: int
+) -> Tuple[Dict[str, List[Dict[str, Any]]], int, Dict[str, int]]:
+    """Greedily fit ranked ``items`` into ``budget_tokens``.
+
+    Returns the included items' data by section, the tokens used and the
+    number of items omitted per section.
+    """
+    ranked = sorted(
+        items, key=lambda item: (SECTION_PRIORITY[item.section], -item.relevance)
+    )
+    sections: Dict[str, List[Dict[str, Any]]] = {}
+    omitted: Dict[str, int] = {}
+    used = 0
+    for item in ranked:
+        tokens = estimate_tokens(item.text)
+        remaining = budget_tokens - used
+        data = dict(item.data)
+        if tokens > remaining:
+            if remaining < MIN_TRUNCATED_TOKENS or "text" not in data:
+                omitted[item.section] = omitted.get(item.section, 0) + 1
+                continue
+            overflow = (tokens - remaining) * CHARS_PER_TOKEN
+            data["text"] = data["text"][:max(len(data["text"]) - overflow, 0)]
+            data["truncated"] = True
+            tokens = remaining
+        sections.setdefault(item.section, []).append(data)
+        used += tokens
+    return sections, used, omitted
+
+
+# (project_id, task_number, budget, agent) -> (task stamp, expiry, context)
+_cache: "OrderedDict[tuple, Tuple[tuple, float, Dict[str, Any]]]" = OrderedDict()
+
+
+class ContextService:
+    """Assemble a task's working context within a token budget."""
+
+    def __init__(self, session_factory: Callable[[], AsyncSession]):
+        self._sessions = session_factory
+
+    async def assemble(
+        self,
+        project_id: str,
+        task_number: int,
+        budget_tokens: int = 4000,
+        agent_name: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        if not MIN_BUDGET_TOKENS <= budget_tokens <= MAX_BUDGET_TOKENS:
+            raise ValidationError(
+                f"budget_tokens must be between {MIN_BUDGET_TOKENS} "
+                f"and {MAX_BUDGET_TOKENS}"
+            )
+        async with self._sessions() as db:
+            task = await self._task(db, project_id, task_number)
+            stamp = (task.pop("updated_at"),) + await self._stamp(db, task)
+        agent_name = agent_name or task["agent_name"]
+
+        key = (project_id, task_number, budget_tokens, agent_name)
+        entry = _cache.get(key)
+        if entry is not None and entry[0] == stamp and entry[1] > time.monotonic():
+            _cache.move_to_end(key)
+            return {**entry[2], "cached": True}
+
+        query = " ".join(filter(None, [task["title"], task["description"]]))
+        gathered = await asyncio.gather(
+            self._gather("dependencies", lambda db: self._dependencies(db, task)),
+            self._gather("comments", lambda db: self._comments(db, task)),
+            self._gather("passages", lambda db: self._passages(db, query)),
+            self._gather("rules", lambda db: self._rules(db, agent_name)),
+            self._gather("mandates", self._mandates),
+            self._gather("files", lambda db: self._files(db, task)),
+        )
+        details = {name: value for name, value in task.items() if name != "description"}
+        items = [ContextItem(
+            "task", 1.0, _render(task), {**details, "text": task["description"] or ""}
+        )]
+        for section_items in gathered:
+            items.extend(section_items)
+        sections, used, omitted = pack(items, budget_tokens)
+
+        result = {
+            "project_id": project_id,
+            "task_number": task_number,
+            "agent_name": agent_name,
+            "budget_tokens": budget_tokens,
+            "used_tokens": used,
+            "sections": sections,
+            "omitted": omitted,
+        }
+        _cache[key] = (stamp, time.monotonic() + CONTEXT_CACHE_TTL, result)
+        _cache.move_to_end(key)
+        while len(_cache) > CONTEXT_CACHE_SIZE:
+            _cache.popitem(last=False)
+        return {**result, "cached": False}
+
+    async def _gather(
+        self, section: str,
+        fetch: Callable[[AsyncSession], Awaitable[List[ContextItem]]],
+    ):
+        """Run one source on its own session; a failing source is left out."""
+        try:
+            async with self._sessions() as db:
+                return await fetch(db)
+        except Exception as e:
+            logger.warning(f"Context source '{section}' failed: {e}")
+            return []
+
+    async def _task(
+        self, db: AsyncSession, project_id: str, task_number: int
+    ) -> Dict[str, Any]:
+        tasks = models.Task.__table__
+        agents = models.Agent.__table__
+        result = await db.execute(
+            select(
+                tasks.c.project_id, tasks.c.task_number, tasks.c.title,
+                tasks.c.description, tasks.c.status, tasks.c.priority, tasks.c.due_date,
+                tasks.c.updated_at, agents.c.name.label("agent_name"),
+            )
+            .select_from(tasks.outerjoin(agents, agents.c.id == tasks.c.agent_id))
+            .where(tasks.c.project_id == project_id, tasks.c.task_number == task_number)
+        )
+        row = result.first()
+        if row is None:
+            raise EntityNotFoundError("Task", f"{project_id}:{task_number}")
+        task = row._asdict()
+        task["status"] = getattr(task["status"], "value", task["status"])
+        task["due_date"] = task["due_date"].isoformat() if task["due_date"] else None
+        return task
+
+    async def _stamp(self, db: AsyncSession, task: Dict[str, Any]) -> tuple:
+        comments = models.Comment.__table__
+        dependencies = TaskDependency.__table__
+        comment_stamp = select(func.count(), func.max(comments.c.created_at)).where(
+            comments.c.task_project_id == task["project_id"],
+            comments.c.task_task_number == task["task_number"],
+        )
+        dependency_count = select(func.count()).select_from(dependencies).where(
+            _touches(dependencies, task)
+        )
+        count, newest = (await db.execute(comment_stamp)).one()
+        return count, newest, (await db.execute(dependency_count)).scalar()
+
+    async def _dependencies(
+        self, db: AsyncSession, task: Dict[str, Any]
+    ) -> List[ContextItem]:
+        dependencies = TaskDependency.__table__
+        result = await db.execute(
+            select(dependencies).where(_touches(dependencies, task))
+        )
+        edges = []
+        for row in result.all():
+            if (row.predecessor_project_id, row.predecessor_task_number) == (
+                task["project_id"], task["task_number"]
+            ):
+                edges.append((
+                    "blocks", row.successor_project_id, row.successor_task_number,
+                    row.type,
+                ))
+            else:
+                edges.append((
+                    "blocked_by", row.predecessor_project_id,
+                    row.predecessor_task_number, row.type,
+                ))
+        if not edges:
+            return []
+        tasks = models.Task.__table__
+        result = await db.execute(
+            select(
+                tasks.c.project_id, tasks.c.task_number, tasks.c.title, tasks.c.status
+            ).where(tuple_(tasks.c.project_id, tasks.c.task_number).in_([
+                (p, n) for _, p, n, _ in edges
+            ]))
+        )
+        neighbours = {(row.project_id, row.task_number): row for row in result.all()}
+        items = []
+        for relation, project_id, task_number, dependency_type in edges:
+            neighbour = neighbours.get((project_id, task_number))
+            if neighbour is None:
+                continue
+            status = getattr(neighbour.status, "value", neighbour.status)
+            text = f"{relation} #{task_number} {neighbour.title} [{status}]"
+            # Unfinished predecessors are what the agent most needs to know about.
+            unfinished = relation == "blocked_by" and status != "Completed"
+            relevance = 1.0 if unfinished else 0.5
+            items.append(ContextItem("dependencies", relevance, text, {
+                "relation": relation, "project_id": project_id,
+                "task_number": task_number, "title": neighbour.title, "status": status,
+                "type": dependency_type,
+            }))
+        return items
+
+    async def _comments(
+        self, db: AsyncSession, task: Dict[str, Any]
+    ) -> List[ContextItem]:
+        comments = models.Comment.__table__
+        result = await db.execute(
+            select(comments.c.id, comments.c.content, comments.c.created_at)
+            .where(
+                comments.c.task_project_id == task["project_id"],
+                comments.c.task_task_number == task["task_number"],
+            )
+            .order_by(comments.c.created_at.desc())
+            .limit(RECENT_COMMENTS)
+        )
+        return [
+            ContextItem("comments", 1.0 / (rank + 1), row.content, {
+                "id": row.id, "created_at": row.created_at.isoformat(),
+                "text": row.content,
+            })
+            for rank, row in enumerate(result.all())
+        ]
+
+    async def _passages(self, db: AsyncSession, query: str) -> List[ContextItem]:
+        if not query:
+            return []
+        passages = await MemoryService(db).search_passages(
+            query, limit=CONTEXT_PASSAGES
+        )
+        return [
+            ContextItem("passages", passage["score"], passage["content"], {
+                "entity_id": passage["entity_id"], "heading": passage["heading"],
+                "start": passage["start"], "end": passage["end"],
+                "text": passage["content"],
+            })
+            for passage in passages
+        ]
+
+    async def _rules(
+        self, db: AsyncSession, agent_name: Optional[str]
+    ) -> List[ContextItem]:
+        if not agent_name:
+            return []
+        roles = models.AgentRole.__table__
+        found = await db.execute(select(roles.c.id).where(roles.c.name == agent_name))
+        if found.first() is None:
+            return []
+        prompt = await rules_crud.generate_agent_prompt_from_rules(db, agent_name)
+        return [ContextItem(
+            "rules", 1.0, prompt, {"agent_name": agent_name, "text": prompt}
+        )]
+
+    async def _mandates(self, db: AsyncSession) -> List[ContextItem]:
+        mandates = models.UniversalMandate.__table__
+        result = await db.execute(
+            select(mandates.c.id, mandates.c.mandate)
+            .where(mandates.c.is_active.is_(True))
+            .order_by(mandates.c.created_at)
+        )
+        return [
+            ContextItem(
+                "mandates", 1.0, row.mandate, {"id": row.id, "text": row.mandate}
+            )
+            for row in result.all()
+        ]
+
+    async def _files(self, db: AsyncSession, task: Dict[str, Any]) -> List[ContextItem]:
+        associations = models.ProjectFileAssociation.__table__
+        entities = models.MemoryEntity.__table__
+        result = await db.execute(
+            select(entities.c.id, entities.c.name)
+            .select_from(associations.join(
+                entities, entities.c.id == associations.c.file_memory_entity_id
+            ))
+            .where(associations.c.project_id == task["project_id"])
+            .order_by(entities.c.name)
+            .limit(CONTEXT_FILES)
+        )
+        return [
+            ContextItem("files", 0.0, row.name, {"entity_id": row.id, "name": row.name})
+            for row in result.all()
+        ]
+
+
+def _touches(dependencies, task: Dict[str, Any]):
+    return or_(
+        and_(
+            dependencies.c.predecessor_project_id == task["project_id"],
+            dependencies.c.predecessor_task_number == task["task_number"],
+        ),
+        and_(
+            dependencies.c.successor_project_id == task["project_id"],
+            dependencies.c.successor_task_number == task["task_number"],
+        ),
+    )
+
+
+def _render(task: Dict[str, Any]) -> str:
+    lines = [
+        f"#{task['task_number']} {task['title']} [{task['status']}, {task['priority']}]"
+    ]
+    if task.get("description"):
+        lines.append(task["description"])
+    return "\n".join(lines)
@@ -0,0 +1,461 @@
+"""
+Deadline scheduler.
+
+:class:`DeadlineScheduler` fires time-driven actions in batches:
+
+- ``transition``: a task that has stayed in a status for a
+  ``task_status`` rule's ``auto_transition_after_hours`` moves to the rule's
+  target status, when its ``auto_transition_condition`` (if any) holds. The
+  move is recorded as a ``timeout`` transition.
+- ``overdue``: an open task passing its ``due_date`` gets a
+  ``task_overdue`` audit log entry, once. A watermark records the latest
+  due date notified; the first run starts from now.
+- ``cleanup``: an expired temporary ``FileAsset`` is deleted with its tag
+  links and processing jobs, and its file removed.
+
+Deadlines falling within ``SCHEDULER_HORIZON_SECONDS`` are loaded into a
+heap keyed by fire time, using range queries on indexed columns, every
+``SCHEDULER_REFILL_SECONDS`` and after transition rules change. The loop
+sleeps until the earliest deadline. Each batch is checked against the
+database before acting, so deadlines that moved or no longer apply are
+dropped. Changes made after a refill are picked up by the next one.
+
+Only the worker holding the ``deadline_scheduler`` row in
+``worker_leases`` runs it; the others take over once the lease lapses.
+"""
+import asyncio
+import heapq
+import logging
+import os
+import socket
+import uuid
+from collections import defaultdict
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, NamedTuple, Optional, Set, Tuple
+
+from sqlalchemy import delete, func, insert, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend import models
+from backend.core.shared_state import get_shared_state
+from backend.crud.task_transitions import (
+    TRANSITIONS, record_transitions, task_keys_clause,
+)
+from backend.crud.worker_leases import (  # noqa: F401
+    LEASES, acquire_lease, release_lease,
+)
+from backend.enums import TaskStatusEnum
+from .status_transition_service import (
+    REGISTRY, RULES, TASK_STATUS_ENUM, TRANSITION_RULES_NAME, VALUES, ObjectFacts,
+    compile_condition,
+)
+from .exceptions import ValidationError
+from .task_queue_service import FINAL_STATUSES
+
+try:
+    from backend.config.app_config import settings
+except ImportError:
+    from config.app_config import settings
+
+logger = logging.getLogger(__name__)
+
+TASKS = models.Task.__table__
+FILES = models.FileAsset.__table__
+FILE_TAGS = models.FileAssetTagAssociation.__table__
+FILE_JOBS = models.FileProcessingJob.__table__
+AUDIT = models.AuditLog.__table__
+WATERMARKS = models.MetricRollupWatermark.__table__
+
+LEASE_NAME = "deadline_scheduler"
+OVERDUE_WATERMARK = "task_overdue"
+BATCH_SIZE = 500
+
+# (fire at, kind, key)
+Deadline = Tuple[datetime, str, tuple]
+
+
+class AutoRule(NamedTuple):
+    id: str
+    from_status: TaskStatusEnum
+    to_status: TaskStatusEnum
+    after: timedelta
+    condition: Any  # code object, or None
+    name: Optional[str]
+
+
+def _chunks(items: list, size: int = BATCH_SIZE):
+    for offset in range(0, len(items), size):
+        yield items[offset:offset + size]
+
+
+def _task_keys(keys: list):
+    return task_keys_clause(TASKS.c.project_id, TASKS.c.task_number, keys)
+
+
+def _entered_at():
+    """When each task entered its current status."""
+    last = (
+        select(func.max(TRANSITIONS.c.transitioned_at))
+        .where(
+            TRANSITIONS.c.task_project_id == TASKS.c.project_id,
+            TRANSITIONS.c.task_task_number == TASKS.c.task_number,
+        )
+        .scalar_subquery()
+    )
+    return func.coalesce(last, TASKS.c.created_at, type_=TASKS.c.created_at.type)
+
+
+def _remove_files(paths: List[str]) -> None:
+    for path in paths:
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            logger.warning(f"Could not remove expired file {path}: {e}")
+
+
+class DeadlineScheduler:
+    """Fires due auto-transitions, overdue notices and temp-file cleanup.
+
+    See the module docstring.
+    """
+
+    def __init__(self, session_maker=None, owner: Optional[str] = None):
+        self._session_maker = session_maker
+        self.owner = owner or (
+            f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        )
+        self._heap: List[Deadline] = []
+        self._scheduled: Set[Tuple[str, tuple]] = set()
+        self._rules: Dict[str, AutoRule] = {}
+        self._next_refill: Optional[datetime] = None
+        self._lease_until: Optional[datetime] = None
+        self._listening = False
+        self._wake = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+
+    def _sessions(self):
+        if self._session_maker is None:
+            from backend.database import async_session_maker
+
+            self._session_maker = async_session_maker
+        return self._session_maker
+
+    def _rules_changed(self) -> None:
+        self._next_refill = None
+        self._wake.set()
+
+    def pending(self) -> int:
+        return len(self._heap)
+
+    # -- lease -----------------------------------------------------------------
+
+    async def acquire_lease(
+        self, db: AsyncSession, now: Optional[datetime] = None
+    ) -> bool:
+        """Take or renew the scheduler lease; commits."""
+        self._lease_until = await acquire_lease(
+            db, LEASE_NAME, self.owner, settings.scheduler_lease_seconds, now
+        )
+        return self._lease_until is not None
+
+    async def release_lease(self, db: AsyncSession) -> None:
+        await release_lease(db, LEASE_NAME, self.owner)
+        self._lease_until = None
+
+    # -- loading ---------------------------------------------------------------
+
+    async def _load_rules(self, db: AsyncSession) -> Dict[str, AutoRule]:
+        source, target = VALUES.alias("source"), VALUES.alias("target")
+        rows = await db.execute(
+            select(
+                RULES.c.id, source.c.value, target.c.value,
+                RULES.c.auto_transition_after_hours, RULES.c.auto_transition_condition,
+                RULES.c.transition_name,
+            )
+            .join(REGISTRY, REGISTRY.c.id == RULES.c.enum_registry_id)
+            .join(source, source.c.id == RULES.c.from_status_id)
+            .join(target, target.c.id == RULES.c.to_status_id)
+            .where(
+                REGISTRY.c.enum_name == TASK_STATUS_ENUM, RULES.c.is_active.is_(True),
+                RULES.c.auto_transition_after_hours.isnot(None),
+            )
+        )
+        rules = {}
+        for rule_id, from_value, to_value, hours, condition, name in rows:
+            try:
+                rules[rule_id] = AutoRule(
+                    rule_id, TaskStatusEnum[from_value], TaskStatusEnum[to_value],
+                    timedelta(hours=hours),
+                    compile_condition(condition) if condition else None, name,
+                )
+            except (KeyError, ValidationError) as e:
+                logger.warning(f"Skipping auto-transition rule {rule_id}: {e}")
+        return rules
+
+    async def _watermark(self, db: AsyncSession, now: datetime) -> datetime:
+        since = (await db.execute(
+            select(WATERMARKS.c.processed_until).where(
+                WATERMARKS.c.name == OVERDUE_WATERMARK
+            )
+        )).scalar()
+        if since is None:
+            await db.execute(
+                insert(WATERMARKS).values(
+                    name=OVERDUE_WATERMARK, processed_until=now, updated_at=now
+                )
+            )
+            since = now
+        return since
+
+    def _push(self, fire_at: datetime, kind: str, key: tuple) -> None:
+        if (kind, key) not in self._scheduled:
+            self._scheduled.add((kind, key))
+            heapq.heappush(self._heap, (fire_at, kind, key))
+
+    async def refill(self, db: AsyncSession, now: Optional[datetime] = None) -> int:
+        """Load deadlines up to the horizon; returns how many are pending."""
+        now = now or datetime.utcnow()
+        if not self._listening:
+            get_shared_state().on_invalidate(TRANSITION_RULES_NAME, self._rules_changed)
+            self._listening = True
+        horizon = now + timedelta(seconds=settings.scheduler_horizon_seconds)
+        self._rules = await self._load_rules(db)
+        entered = _entered_at()
+        for rule in self._rules.values():
+            rows = await db.execute(
+                select(TASKS.c.project_id, TASKS.c.task_number, entered)
+                .where(
+                    TASKS.c.status == rule.from_status, TASKS.c.is_archived.is_(False),
+                    entered < horizon - rule.after,
+                )
+            )
+            for project_id, number, at in rows:
+                self._push(at + rule.after, "transition", (project_id, number, rule.id))
+        since = await self._watermark(db, now)
+        rows = await db.execute(
+            select(TASKS.c.project_id, TASKS.c.task_number, TASKS.c.due_date)
+            .where(
+                TASKS.c.due_date > since, TASKS.c.due_date < horizon,
+                TASKS.c.status.notin_(FINAL_STATUSES), TASKS.c.is_archived.is_(False),
+            )
+        )
+        for project_id, number, due in rows:
+            self._push(due, "overdue", (project_id, number, due))
+        rows = await db.execute(
+            select(FILES.c.id, FILES.c.expires_at).where(
+                FILES.c.is_temp.is_(True), FILES.c.expires_at < horizon
+            )
+        )
+        for file_id, expires_at in rows:
+            self._push(expires_at, "cleanup", (file_id,))
+        await db.commit()
+        self._next_refill = now + timedelta(seconds=settings.scheduler_refill_seconds)
+        return len(self._heap)
+
+    # -- firing ----------------------------------------------------------------
+
+    async def fire_due(
+        self, db: AsyncSession, now: Optional[datetime] = None
+    ) -> Dict[str, int]:
+        """Act on every deadline up to ``now``, one batch per kind.
+
+        Returns how many took effect per kind.
+        """
+        now = now or datetime.utcnow()
+        due: Dict[str, List[tuple]] = defaultdict(list)
+        while self._heap and self._heap[0][0] <= now:
+            _, kind, key = heapq.heappop(self._heap)
+            self._scheduled.discard((kind, key))
+            due[kind].append(key)
+        handlers = (
+            ("transition", self._fire_transitions), ("overdue", self._fire_overdue),
+            ("cleanup", self._fire_cleanup),
+        )
+        fired = {}
+        for kind, handler in handlers:
+            if due[kind]:
+                count = await handler(db, due[kind], now)
+                if count:
+                    fired[kind] = count
+        return fired
+
+    async def _fire_transitions(
+        self, db: AsyncSession, keys: List[tuple], now: datetime
+    ) -> int:
+        by_rule: Dict[str, list] = defaultdict(list)
+        for project_id, number, rule_id in keys:
+            by_rule[rule_id].append((project_id, number))
+        entered = _entered_at().label("entered_at")
+        moved_count = 0
+        for rule_id, tasks in by_rule.items():
+            rule = self._rules.get(rule_id)
+            if rule is None:
+                continue
+            for chunk in _chunks(tasks):
+                rows = await db.execute(
+                    select(TASKS, entered)
+                    .where(_task_keys(chunk), TASKS.c.status == rule.from_status)
+                )
+                ready = [
+                    (row.project_id, row.task_number) for row in rows
+                    if row.entered_at + rule.after <= now and (
+                        rule.condition is None or eval(
+                            rule.condition, {"__builtins__": {}}, ObjectFacts(row)
+                        )
+                    )
+                ]
+                if not ready:
+                    continue
+                moved = (await db.execute(
+                    update(TASKS)
+                    .where(_task_keys(ready), TASKS.c.status == rule.from_status)
+                    .values(status=rule.to_status, updated_at=now)
+                    .returning(TASKS.c.project_id, TASKS.c.task_number)
+                )).all()
+                moved_count += await record_transitions(
+                    db, [
+                        (project_id, number, rule.from_status, rule.to_status)
+                        for project_id, number in moved
+                    ],
+                    trigger_type="timeout",
+                    reason=rule.name or f"No change for {rule.after}",
+                    context={"rule_id": rule.id}, now=now,
+                )
+        await db.commit()
+        return moved_count
+
+    async def _fire_overdue(
+        self, db: AsyncSession, keys: List[tuple], now: datetime
+    ) -> int:
+        expected = {(project_id, number): due for project_id, number, due in keys}
+        entries = []
+        for chunk in _chunks(list(expected)):
+            rows = await db.execute(
+                select(
+                    TASKS.c.project_id, TASKS.c.task_number, TASKS.c.due_date,
+                    TASKS.c.status, TASKS.c.agent_id,
+                )
+                .where(
+                    _task_keys(chunk), TASKS.c.status.notin_(FINAL_STATUSES),
+                    TASKS.c.is_archived.is_(False),
+                )
+            )
+            for project_id, number, due, status, agent_id in rows:
+                if due == expected[(project_id, number)]:
+                    entries.append({
+                        "action": "task_overdue", "entity_type": "task",
+                        "entity_id": f"{project_id}:{number}",
+                        "changes": {
+                            "due_date": due.isoformat(), "status": status.name,
+                            "agent_id": agent_id,
+                        },
+                        "timestamp": now,
+                    })
+        if entries:
+            await db.execute(insert(AUDIT), entries)
+        await db.execute(
+            update(WATERMARKS).where(WATERMARKS.c.name == OVERDUE_WATERMARK)
+            .values(processed_until=max(expected.values()), updated_at=now)
+        )
+        await db.commit()
+        return len(entries)
+
+    async def _fire_cleanup(
+        self, db: AsyncSession, keys: List[tuple], now: datetime
+    ) -> int:
+        paths, count = [], 0
+        for chunk in _chunks([file_id for file_id, in keys]):
+            rows = (await db.execute(
+                select(FILES.c.id, FILES.c.storage_path)
+                .where(
+                    FILES.c.id.in_(chunk), FILES.c.is_temp.is_(True),
+                    FILES.c.expires_at <= now,
+                )
+            )).all()
+            if not rows:
+                continue
+            ids = [file_id for file_id, _ in rows]
+            await db.execute(
+                delete(FILE_TAGS).where(FILE_TAGS.c.file_asset_id.in_(ids))
+            )
+            await db.execute(
+                delete(FILE_JOBS).where(FILE_JOBS.c.file_asset_id.in_(ids))
+            )
+            await db.execute(delete(FILES).where(FILES.c.id.in_(ids)))
+            paths.extend(path for _, path in rows)
+            count += len(ids)
+        await db.commit()
+        if paths:
+            await asyncio.to_thread(_remove_files, paths)
+        return count
+
+    # -- lifecycle -------------------------------------------------------------
+
+    async def run_once(self, now: Optional[datetime] = None) -> Dict[str, int]:
+        """Renew the lease, refill when due, and fire what is due.
+
+        Does nothing while another worker holds the lease.
+        """
+        now = now or datetime.utcnow()
+        lease = timedelta(seconds=settings.scheduler_lease_seconds)
+        async with self._sessions()() as db:
+            # Renew at most every third of the lease, however often deadlines fire.
+            renewed = (
+                self._lease_until is not None
+                and now < self._lease_until - lease * 2 / 3
+            )
+            if not renewed and not await self.acquire_lease(db, now):
+                self._heap, self._next_refill = [], None
+                self._scheduled.clear()
+                return {}
+            if self._next_refill is None or now >= self._next_refill:
+                await self.refill(db, now)
+            return await self.fire_due(db, now)
+
+    def _sleep_seconds(self, now: datetime) -> float:
+        wake = now + timedelta(seconds=settings.scheduler_lease_seconds / 3)
+        if self._next_refill is not None:
+            wake = min(wake, self._next_refill)
+        if self._heap:
+            wake = min(wake, self._heap[0][0])
+        return max((wake - now).total_seconds(), 0.05)
+
+    def start(self) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+        try:
+            async with self._sessions()() as db:
+                await self.release_lease(db)
+        except Exception as e:
+            logger.warning(f"Could not release the deadline scheduler lease: {e}")
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                fired = await self.run_once()
+                if fired:
+                    logger.info("Deadline scheduler fired: %s", fired)
+            except Exception as e:
+                logger.warning(f"Deadline scheduler run failed, will retry: {e}")
+            self._wake.clear()
+            try:
+                await asyncio.wait_for(
+                    self._wake.wait(), self._sleep_seconds(datetime.utcnow())
+                )
+            except asyncio.TimeoutError:
+                pass
+
+
+deadline_scheduler = DeadlineScheduler()
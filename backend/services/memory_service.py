@@ -1,14 +1,17 @@
-from typing import List, Optional, Dict, Any, Union
+from typing import List, Optional, Dict, Any, Sequence, Tuple, Union
 import logging
 import os
-import httpx
 import aiofiles
 
 from sqlalchemy.ext.asyncio import AsyncSession
 from fastapi import HTTPException, status, UploadFile
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import IntegrityError
-from sqlalchemy import or_, select, and_
+from sqlalchemy import LargeBinary, or_, select, and_, func, delete, insert
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.expression import FunctionElement
+from sqlalchemy.engine import Row
+from sqlalchemy.orm.attributes import set_committed_value
 
 from backend import models
 from backend.schemas.memory import (
@@ -25,10 +28,47 @@ from backend.crud.memory import (
     update_memory_entity,
     delete_memory_entity,
 )
-from backend.services.exceptions import ServiceError, EntityNotFoundError, DuplicateEntityError
+from backend.services.exceptions import ServiceError, EntityNotFoundError, DuplicateEntityError, ValidationError
+from backend.core.counters import counters
+from backend.core.passages import passage_kind, split_passages
+from backend.core.projection import project_columns
+from backend.services.semantic_search_service import passage_indexes, semantic_index
 
 logger = logging.getLogger(__name__)
 
+# Columns exposed by the ``MemoryEntity`` response schema.
+MEMORY_ENTITY_ROW_FIELDS = (
+    "id", "entity_type", "name", "content", "entity_metadata", "source",
+    "source_metadata", "created_at", "updated_at",
+)
+
+# Lightweight default for search results: never ships entity content.
+MEMORY_SEARCH_FIELDS = ("id", "entity_type", "name", "entity_metadata")
+
+# Entities whose passages are ranked when a passage search names none.
+PASSAGE_CANDIDATE_ENTITIES = 10
+
+
+class utf8_bytes(FunctionElement):
+    """A text expression as its UTF-8 bytes, so ``substr``/``length`` count bytes."""
+    type = LargeBinary()
+    inherit_cache = True
+
+
+@compiles(utf8_bytes)
+def _utf8_bytes(element, compiler, **kw):
+    return "CAST(%s AS BINARY)" % compiler.process(list(element.clauses)[0], **kw)
+
+
+@compiles(utf8_bytes, "postgresql")
+def _utf8_bytes_postgresql(element, compiler, **kw):
+    return "convert_to(%s, 'UTF8')" % compiler.process(list(element.clauses)[0], **kw)
+
+
+@compiles(utf8_bytes, "sqlite")
+def _utf8_bytes_sqlite(element, compiler, **kw):
+    return "CAST(%s AS BLOB)" % compiler.process(list(element.clauses)[0], **kw)
+
 
 class MemoryService:
     def __init__(self, db: AsyncSession):
@@ -47,9 +87,12 @@ class MemoryService:
                 created_by_user_id=entity_data.created_by_user_id,
             )
             self.db.add(db_entity)
+            await self.db.flush()
+            await self._store_passages(db_entity.id, db_entity.name, db_entity.content)
             await self.db.commit()
             await self.db.refresh(db_entity)
             logger.info(f"Created new memory entity: {db_entity.name} ({db_entity.id})")
+            await self._semantic_changed(db_entity.id)
             return db_entity
         except IntegrityError:
             await self.db.rollback()
@@ -75,6 +118,47 @@ class MemoryService:
         result = await self.db.execute(select(models.MemoryEntity).offset(skip).limit(limit))
         return list(result.scalars().all())
 
+    async def get_entity_rows(
+        self,
+        skip: int = 0,
+        limit: int = 100,
+        fields: Optional[Sequence[str]] = None,
+        search: Optional[str] = None,
+        source: Optional[str] = None,
+    ) -> Tuple[List[Row], int]:
+        """Get memory entities as column-projected rows with a total count.
+
+        Avoids ORM hydration for list endpoints. ``fields`` defaults to the
+        columns of the ``MemoryEntity`` response schema; ``content`` is only
+        read when it is part of the field set.
+        """
+        table = models.MemoryEntity.__table__
+        try:
+            columns = project_columns(table, fields, MEMORY_ENTITY_ROW_FIELDS)
+        except ValueError as e:
+            raise ValidationError(str(e))
+
+        filters = []
+        if search:
+            filters.append(or_(
+                table.c.name.ilike(f"%{search}%"),
+                table.c.content.ilike(f"%{search}%")
+            ))
+        if source:
+            filters.append(table.c.source == source)
+
+        query = select(*columns).order_by(table.c.id).offset(skip).limit(limit)
+        count_query = select(func.count()).select_from(table)
+        if filters:
+            query = query.where(and_(*filters))
+            count_query = count_query.where(and_(*filters))
+
+        result = await self.db.execute(query)
+        rows = result.all()
+
+        count_result = await self.db.execute(count_query)
+        return rows, count_result.scalar()
+
     async def update_entity(
         self, entity_id: int, entity_update: MemoryEntityUpdate
     ) -> Optional[models.MemoryEntity]:
@@ -89,9 +173,12 @@ class MemoryService:
             setattr(db_entity, field, value)
 
         try:
+            if "content" in update_data or "name" in update_data:
+                await self._store_passages(entity_id, db_entity.name, db_entity.content)
             await self.db.commit()
             await self.db.refresh(db_entity)
             logger.info(f"Updated memory entity: {entity_id}")
+            await self._semantic_changed(entity_id)
             return db_entity
         except Exception as e:
             await self.db.rollback()
@@ -104,8 +191,10 @@ class MemoryService:
         db_entity = result.scalar_one_or_none()
         if not db_entity:
             return False
+        await self._delete_passages(entity_id)
         await self.db.delete(db_entity)
         await self.db.commit()
+        await self._semantic_changed(entity_id)
         return True
 
     async def ingest_file(
@@ -218,6 +307,8 @@ class MemoryService:
     ) -> models.MemoryEntity:
         """Ingest content from a URL."""
         try:
+            import httpx  # deferred: only URL ingestion needs an HTTP client
+
             async with httpx.AsyncClient() as client:
                 response = await client.get(url)
             response.raise_for_status()
@@ -264,6 +355,122 @@ class MemoryService:
             raise EntityNotFoundError("MemoryEntity", entity_id)
         return entity.content or ""
 
+    async def get_content_range(
+        self, entity_id: str, start: int = 0, end: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """Return bytes ``start:end`` of an entity's UTF-8 content.
+
+        Offsets are those stored on passages, so a passage hit can be widened
+        to its surroundings without shipping the whole entity. The range is
+        cut in SQL; only its bytes are read.
+        """
+        if start < 0 or (end is not None and end < start):
+            raise ValidationError("Byte range must satisfy 0 <= start <= end")
+        table = models.MemoryEntity.__table__
+        data = utf8_bytes(table.c.content)
+        piece = func.substr(data, start + 1) if end is None else func.substr(data, start + 1, end - start)
+        result = await self.db.execute(
+            select(func.coalesce(func.length(data), 0).label("total"), piece.label("piece"))
+            .where(table.c.id == entity_id)
+        )
+        row = result.first()
+        if row is None:
+            raise EntityNotFoundError("MemoryEntity", entity_id)
+        end = row.total if end is None else min(end, row.total)
+        return {
+            "entity_id": entity_id,
+            "start": start,
+            "end": end,
+            "total_bytes": row.total,
+            "content": bytes(row.piece or b"").decode("utf-8", errors="ignore"),
+        }
+
+    async def search_passages(
+        self, query: str, entity_id: Optional[str] = None, limit: int = 5
+    ) -> List[Dict[str, Any]]:
+        """Return the passages that best match ``query``, best first.
+
+        Without ``entity_id``, passages are drawn from the entities the
+        semantic index ranks highest for the query.
+        """
+        if entity_id is not None:
+            entities = models.MemoryEntity.__table__
+            found = await self.db.execute(select(entities.c.id).where(entities.c.id == entity_id))
+            if found.first() is None:
+                raise EntityNotFoundError("MemoryEntity", entity_id)
+            entity_ids = [entity_id]
+        else:
+            index = await semantic_index.ensure_loaded(self.db)
+            mode = "hybrid" if index.available else "lexical"
+            entity_ids = [key for key, _ in index.search(query, PASSAGE_CANDIDATE_ENTITIES, mode)]
+        if not entity_ids:
+            return []
+        await self._ensure_passages(entity_ids)
+
+        ranked = await passage_indexes.search(self.db, query, entity_ids, limit)
+        if not ranked:
+            return []
+        table = models.MemoryPassage.__table__
+        result = await self.db.execute(
+            select(
+                table.c.id, table.c.entity_id, table.c.ordinal, table.c.heading,
+                table.c.start_offset, table.c.end_offset, table.c.content,
+            ).where(table.c.id.in_([key for key, _ in ranked]))
+        )
+        passages = {row.id: row for row in result.all()}
+        return [
+            {
+                "entity_id": passages[key].entity_id,
+                "ordinal": passages[key].ordinal,
+                "heading": passages[key].heading,
+                "start": passages[key].start_offset,
+                "end": passages[key].end_offset,
+                "content": passages[key].content,
+                "score": round(score, 4),
+            }
+            for key, score in ranked
+            if key in passages
+        ]
+
+    async def _store_passages(self, entity_id: str, name: Optional[str], content: Optional[str]) -> int:
+        """Replace an entity's passages with a fresh split of ``content``."""
+        await self._delete_passages(entity_id)
+        passages = split_passages(content or "", passage_kind(name, content or ""))
+        if passages:
+            await self.db.execute(insert(models.MemoryPassage.__table__), [
+                {
+                    "entity_id": entity_id,
+                    "ordinal": passage.ordinal,
+                    "heading": passage.heading,
+                    "start_offset": passage.start,
+                    "end_offset": passage.end,
+                    "content": passage.text,
+                }
+                for passage in passages
+            ])
+        return len(passages)
+
+    async def _delete_passages(self, entity_id: str) -> None:
+        table = models.MemoryPassage.__table__
+        await self.db.execute(delete(table).where(table.c.entity_id == entity_id))
+
+    async def _ensure_passages(self, entity_ids: Sequence[str]) -> None:
+        """Split entities stored before passages existed, on first use."""
+        passages = models.MemoryPassage.__table__
+        entities = models.MemoryEntity.__table__
+        result = await self.db.execute(
+            select(entities.c.id, entities.c.name, entities.c.content).where(
+                entities.c.id.in_(entity_ids),
+                entities.c.content.is_not(None),
+                ~select(passages.c.id).where(passages.c.entity_id == entities.c.id).exists(),
+            )
+        )
+        missing = result.all()
+        for row in missing:
+            await self._store_passages(row.id, row.name, row.content)
+        if missing:
+            await self.db.commit()
+
     async def get_file_metadata(self, entity_id: int) -> Dict[str, Any]:
         """Get file metadata by entity ID."""
         entity = await self.get_entity(entity_id)
@@ -335,8 +542,10 @@ class MemoryService:
         db_entity = await self.get_memory_entity_by_id(entity_id)
         if not db_entity:
             return False
+        await self._delete_passages(entity_id)
         await self.db.delete(db_entity)
         await self.db.commit()
+        await self._semantic_changed(entity_id)
         return True
 
     async def add_observation_to_entity(
@@ -354,6 +563,7 @@ class MemoryService:
             await self.db.commit()
             await self.db.refresh(db_observation)
             logger.info(f"Added observation {db_observation.id} to entity {entity_id}")
+            await self._semantic_changed(entity_id)
             return db_observation
         except Exception as e:
             await self.db.rollback()
@@ -399,6 +609,7 @@ class MemoryService:
             await self.db.commit()
             await self.db.refresh(db_observation)
             logger.info(f"Updated memory observation: {observation_id}")
+            await self._semantic_changed(db_observation.entity_id)
             return db_observation
         except Exception as e:
             await self.db.rollback()
@@ -411,9 +622,11 @@ class MemoryService:
         if not db_observation:
             return False
         try:
+            entity_id = db_observation.entity_id
             await self.db.delete(db_observation)
             await self.db.commit()
             logger.info(f"Deleted memory observation: {observation_id}")
+            await self._semantic_changed(entity_id)
             return True
         except Exception as e:
             await self.db.rollback()
@@ -492,7 +705,25 @@ class MemoryService:
         
         query = query.offset(skip).limit(limit)
         result = await self.db.execute(query)
-        return list(result.scalars().all())
+        relations = list(result.scalars().all())
+        self._record_relation_access(relations)
+        return relations
+
+    def _record_relation_access(self, relations: Sequence[models.MemoryRelation]) -> None:
+        """Count a traversal of each relation and show the merged counts.
+
+        Values are set as committed so the session never writes the merged
+        number back over increments flushed by other workers.
+        """
+        counters.incr_many("relation_access", [relation.id for relation in relations])
+        for relation in relations:
+            set_committed_value(
+                relation, "access_count",
+                counters.merged("relation_access", relation.id, relation.access_count),
+            )
+            set_committed_value(
+                relation, "last_accessed_at", counters.last_touched("relation_access", relation.id)
+            )
 
     async def delete_memory_relation(
         self, relation_id: int
@@ -534,6 +765,42 @@ class MemoryService:
         result = await self.db.execute(query)
         return list(result.scalars().all())
 
+    async def semantic_search(
+        self,
+        query: str,
+        limit: int = 10,
+        mode: str = "hybrid",
+        fields: Optional[Sequence[str]] = None,
+    ) -> List[Dict[str, Any]]:
+        """Rank entities for ``query`` by BM25, embedding similarity or both.
+
+        Returns projected entity rows (``fields`` as in ``get_entity_rows``)
+        in rank order, each with its ``score``.
+        """
+        index = await semantic_index.ensure_loaded(self.db)
+        ranked = index.search(query, limit, mode)
+        if not ranked:
+            return []
+        table = models.MemoryEntity.__table__
+        try:
+            columns = project_columns(table, fields, MEMORY_ENTITY_ROW_FIELDS)
+        except ValueError as e:
+            raise ValidationError(str(e))
+        if not any(column is table.c.id for column in columns):
+            columns = [table.c.id, *columns]
+        scores = dict(ranked)
+        result = await self.db.execute(select(*columns).where(table.c.id.in_(scores)))
+        rows = [{**row._asdict(), "score": round(scores[row.id], 4)} for row in result.all()]
+        rows.sort(key=lambda row: row["score"], reverse=True)
+        return rows
+
+    async def _semantic_changed(self, entity_id: str) -> None:
+        """Keep the semantic index in step with a committed write."""
+        try:
+            await semantic_index.entity_changed(self.db, entity_id)
+        except Exception as e:
+            logger.warning(f"Semantic index update failed for entity {entity_id}: {e}")
+
     async def search(
         self, query: str, limit: int = 10
     ) -> List[models.MemoryEntity]:
@@ -1,17 +1,90 @@
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.ext.compiler import compiles
 from sqlalchemy.future import select
 from sqlalchemy.orm import selectinload
-from sqlalchemy import func, and_, or_
-from typing import List, Optional, Tuple
+from sqlalchemy.sql.expression import ClauseElement, FunctionElement
+from sqlalchemy import String, case, false, func, and_, insert, literal, null, or_
+from sqlalchemy.engine import Row
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+import logging
 import uuid
 from datetime import datetime
 from uuid import UUID
 
 from backend import models
+from backend.crud.task_transitions import TRANSITIONS
+from backend.models.task_dependency import TaskDependency
 from backend.schemas.project import ProjectCreate, ProjectUpdate
 from backend.enums import ProjectStatus, ProjectPriority, ProjectVisibility
 from .exceptions import EntityNotFoundError, DuplicateEntityError, ValidationError
 from .utils import service_transaction
+from backend.core.projection import project_columns
+
+try:
+    from backend.config.app_config import settings
+except ImportError:
+    from config.app_config import settings
+
+logger = logging.getLogger(__name__)
+
+# Columns exposed by the ``Project`` response schema.
+PROJECT_ROW_FIELDS = (
+    "name", "description", "status", "priority", "metadata_json", "tags",
+    "settings", "id", "created_at", "updated_at", "archived_at", "view_count",
+    "activity_score", "completion_percentage", "task_count",
+    "completed_task_count", "is_archived",
+)
+
+PROJECTS = models.Project.__table__
+TASKS = models.Task.__table__
+CAPABILITIES = models.TaskCapabilityRequirement.__table__
+DEPENDENCIES = TaskDependency.__table__
+COMMENTS = models.Comment.__table__
+PROJECT_FILES = models.ProjectFileAssociation.__table__
+
+# (tasks copied so far, tasks in the source project)
+CloneProgress = Callable[[int, int], Any]
+
+
+class new_uuid(FunctionElement):
+    """A random hyphenated UUID generated by the database for each row."""
+    type = String(36)
+    inherit_cache = True
+
+
+@compiles(new_uuid)
+def _new_uuid(element, compiler, **kw):
+    return "UUID()"
+
+
+@compiles(new_uuid, "postgresql")
+def _new_uuid_postgresql(element, compiler, **kw):
+    return "CAST(gen_random_uuid() AS VARCHAR)"
+
+
+@compiles(new_uuid, "sqlite")
+def _new_uuid_sqlite(element, compiler, **kw):
+    return (
+        "lower(hex(randomblob(4)) || '-' || hex(randomblob(2)) || '-4' || substr(hex(randomblob(2)), 2) || '-'"
+        " || substr('89ab', 1 + abs(random()) % 4, 1) || substr(hex(randomblob(2)), 2) || '-' || hex(randomblob(6)))"
+    )
+
+
+def copy_rows(table, *where, **values):
+    """``INSERT INTO table SELECT ... FROM table`` for the rows matching
+    ``where``, with the columns named in ``values`` replaced."""
+    columns = []
+    for column in table.c:
+        value = values.get(column.name, column)
+        if not isinstance(value, ClauseElement):
+            value = null() if value is None else literal(value, column.type)
+        columns.append(value)
+    return insert(table).from_select([column.name for column in table.c], select(*columns).where(*where))
+
+
+def _after(column, after: Optional[int]) -> tuple:
+    return () if after is None else (column > after,)
+
 
 class ProjectService:
     def __init__(self, db: AsyncSession):
@@ -104,6 +177,65 @@ class ProjectService:
         
         return projects, total_count
 
+    async def get_project_rows(
+        self,
+        skip: int = 0,
+        limit: int = 100,
+        status: Optional[ProjectStatus] = None,
+        priority: Optional[ProjectPriority] = None,
+        visibility: Optional[ProjectVisibility] = None,
+        search: Optional[str] = None,
+        is_archived: Optional[bool] = None,
+        owner_id: Optional[str] = None,
+        sort_by: Optional[str] = "created_at",
+        sort_direction: Optional[str] = "desc",
+        fields: Optional[Sequence[str]] = None
+    ) -> Tuple[List[Row], int]:
+        """Get projects as column-projected rows with a total count.
+
+        Only the requested ``fields`` are selected (defaults to the columns of
+        the ``Project`` response schema).
+        """
+        table = models.Project.__table__
+        try:
+            columns = project_columns(table, fields, PROJECT_ROW_FIELDS)
+        except ValueError as e:
+            raise ValidationError(str(e))
+
+        conditions = []
+        for column_name, value in (
+            ("status", status),
+            ("priority", priority),
+            ("visibility", visibility),
+            ("is_archived", is_archived),
+            ("owner_id", owner_id),
+        ):
+            if value is None:
+                continue
+            if column_name not in table.c:
+                raise ValidationError(f"Filtering projects by {column_name} is not supported")
+            conditions.append(table.c[column_name] == value)
+        if search:
+            conditions.append(or_(
+                table.c.name.ilike(f"%{search}%"),
+                table.c.description.ilike(f"%{search}%")
+            ))
+
+        sort_column = table.c.get(sort_by or "created_at", table.c.created_at)
+        order = sort_column.desc() if (sort_direction or "desc").lower() == "desc" else sort_column.asc()
+
+        query = select(*columns).order_by(order).offset(skip).limit(limit)
+        count_query = select(func.count()).select_from(table)
+        if conditions:
+            query = query.where(and_(*conditions))
+            count_query = count_query.where(and_(*conditions))
+
+        result = await self.db.execute(query)
+        rows = result.all()
+
+        count_result = await self.db.execute(count_query)
+        return rows, count_result.scalar()
+
     async def get_project_by_name(self, name: str) -> Optional[models.Project]:
         result = await self.db.execute(
             select(models.Project).filter(models.Project.name == name)
@@ -172,3 +304,105 @@ class ProjectService:
         await self.db.delete(db_project)
         await self.db.commit()
         return True
+
+    async def clone_project(
+        self,
+        project_id: str,
+        name: str,
+        include_comments: bool = True,
+        include_memory_links: bool = True,
+        on_progress: Optional[CloneProgress] = None,
+        now: Optional[datetime] = None,
+    ) -> Dict[str, Any]:
+        """Copy a project, its tasks (keeping their numbers), capability
+        requirements and dependency edges, and optionally task comments and
+        project file links, into a new project called ``name``.
+
+        Rows are copied with ``INSERT ... SELECT`` in pages of
+        ``PROJECT_CLONE_BATCH_SIZE`` existing task numbers (keyset pages, so
+        gaps in the numbering cost nothing), nothing is loaded into memory,
+        and ``on_progress(tasks_copied, tasks_total)`` is called after each
+        page. Edges from tasks in other
+        projects are kept; edges to them are not copied. Cloned tasks start
+        a fresh status history and drop any lease. Everything is written in
+        one transaction. Returns the new project ID and the rows copied per
+        table.
+        """
+        db = self.db
+        if not (await db.execute(select(PROJECTS.c.id).where(PROJECTS.c.id == project_id))).first():
+            raise EntityNotFoundError("Project", project_id)
+        if (await db.execute(select(PROJECTS.c.id).where(PROJECTS.c.name == name))).first():
+            raise DuplicateEntityError("Project", name)
+        high, total = (await db.execute(
+            select(func.max(TASKS.c.task_number), func.count()).where(TASKS.c.project_id == project_id)
+        )).one()
+        clone_id = str(uuid.uuid4())
+        now = now or datetime.utcnow()
+        batch = max(settings.project_clone_batch_size, 1)
+        copied = dict.fromkeys(("tasks", "capabilities", "dependencies", "comments", "memory_links"), 0)
+        context = literal({"source_project_id": project_id}, TRANSITIONS.c.transition_context.type)
+        try:
+            await db.execute(copy_rows(
+                PROJECTS, PROJECTS.c.id == project_id,
+                id=clone_id, name=name, view_count=0, is_archived=False, archived_at=None,
+                created_at=now, updated_at=now,
+            ))
+            after = None
+            while high is not None and (after is None or after < high):
+                # The page ends at the batch-th task number after the last page.
+                upper = await db.scalar(
+                    select(TASKS.c.task_number)
+                    .where(TASKS.c.project_id == project_id, *_after(TASKS.c.task_number, after))
+                    .order_by(TASKS.c.task_number).offset(batch - 1).limit(1)
+                )
+                upper = high if upper is None else upper
+
+                def page(column):
+                    return (*_after(column, after), column <= upper)
+
+                numbers = page(TASKS.c.task_number)
+                copied["tasks"] += (await db.execute(copy_rows(
+                    TASKS, TASKS.c.project_id == project_id, *numbers,
+                    project_id=clone_id, lease_owner=None, lease_expires_at=None, created_at=now, updated_at=now,
+                ))).rowcount
+                await db.execute(insert(TRANSITIONS).from_select(
+                    ["id", "task_project_id", "task_task_number", "to_status", "automated", "trigger_type",
+                     "requires_approval", "transition_context", "transitioned_at", "created_at", "updated_at"],
+                    select(
+                        new_uuid(), literal(clone_id), TASKS.c.task_number, TASKS.c.status, literal(True),
+                        literal("clone"), false(), context,
+                        literal(now), literal(now), literal(now),
+                    ).where(TASKS.c.project_id == project_id, *numbers),
+                ))
+                copied["capabilities"] += (await db.execute(copy_rows(
+                    CAPABILITIES, CAPABILITIES.c.project_id == project_id,
+                    *page(CAPABILITIES.c.task_number),
+                    project_id=clone_id,
+                ))).rowcount
+                internal = DEPENDENCIES.c.predecessor_project_id == project_id
+                copied["dependencies"] += (await db.execute(copy_rows(
+                    DEPENDENCIES, DEPENDENCIES.c.successor_project_id == project_id,
+                    *page(DEPENDENCIES.c.successor_task_number),
+                    successor_project_id=clone_id,
+                    predecessor_project_id=case((internal, clone_id), else_=DEPENDENCIES.c.predecessor_project_id),
+                ))).rowcount
+                if include_comments:
+                    copied["comments"] += (await db.execute(copy_rows(
+                        COMMENTS, COMMENTS.c.task_project_id == project_id,
+                        *page(COMMENTS.c.task_task_number),
+                        id=new_uuid(), task_project_id=clone_id,
+                    ))).rowcount
+                after = upper
+                logger.debug(f"Cloning project {project_id}: {copied['tasks']}/{total} tasks copied")
+                if on_progress is not None:
+                    on_progress(copied["tasks"], total)
+            if include_memory_links:
+                copied["memory_links"] = (await db.execute(copy_rows(
+                    PROJECT_FILES, PROJECT_FILES.c.project_id == project_id,
+                    id=new_uuid(), project_id=clone_id, created_at=now, updated_at=now,
+                ))).rowcount
+            await db.commit()
+        except Exception:
+            await db.rollback()
+            raise
+        return {"project_id": clone_id, "source_project_id": project_id, **copied}
@@ -1,11 +1,44 @@
 """
 Project template service for managing project templates.
+
+:meth:`ProjectTemplateService.instantiate_template` applies a template in
+one transaction: the project, every task (numbered from a block reserved
+after the project's highest task number), their dependencies, initial
+comments and status transitions are written with one bulk insert per
+table. ``template_data`` has the form::
+
+    {
+        "project": {"description": "...", "priority": "high", "tags": [],
+                    "settings": {}},
+        "tasks": [
+            {"key": "spec", "title": "Write spec", "priority": "high"},
+            {"key": "build", "title": "Build", "status": "TO_DO", "agent_id": null,
+             "depends_on": ["spec"], "comments": ["Start from the spec"]},
+        ],
+    }
+
+``depends_on`` entries name another task by ``key`` or position, or are
+``{"task": <key or position>, "type": "..."}``. Parsed definitions are
+cached per template until a template changes in any worker.
 """
 
-from typing import List, Optional
+from datetime import datetime
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+from sqlalchemy import func, insert, select
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 from backend import models
-from backend.schemas.project_template import ProjectTemplateCreate, ProjectTemplateUpdate
+from backend.core.shared_state import get_shared_state
+from backend.crud.task_transitions import record_transitions
+from backend.enums import ProjectPriority, ProjectStatus, TaskStatusEnum
+from backend.models.base import generate_uuid_with_hyphens
+from backend.models.task import priority_rank
+from backend.models.task_dependency import TaskDependency
+from backend.schemas.project_template import (
+    ProjectTemplateCreate,
+    ProjectTemplateUpdate,
+)
 from backend.crud.project_templates import (
     create_project_template,
     get_project_template,
@@ -14,7 +47,149 @@ from backend.crud.project_templates import (
     update_project_template,
     delete_project_template,
 )
-from .exceptions import EntityNotFoundError, ValidationError
+from .exceptions import ConflictError, EntityNotFoundError, ValidationError
+from .status_transition_service import (
+    TASK_STATUS_ENUM,
+    Facts,
+    StatusMachines,
+    status_machines,
+)
+
+TEMPLATES = models.ProjectTemplate.__table__
+PROJECTS = models.Project.__table__
+TASKS = models.Task.__table__
+DEPENDENCIES = TaskDependency.__table__
+COMMENTS = models.Comment.__table__
+
+TEMPLATE_DEFINITIONS_NAME = "project_template_definitions"
+
+DEFAULT_DEPENDENCY_TYPE = "finishes_to_start"
+# Tries at reserving a block of task numbers in an existing project.
+TASK_NUMBER_ATTEMPTS = 3
+
+
+class TaskDefinition(NamedTuple):
+    title: str
+    description: Optional[str]
+    priority: str
+    status: TaskStatusEnum
+    agent_id: Optional[str]
+    comments: Tuple[str, ...]
+
+
+class TemplateDefinition(NamedTuple):
+    project: Dict[str, Any]
+    tasks: Tuple[TaskDefinition, ...]
+    # (predecessor position, successor position, type)
+    dependencies: Tuple[Tuple[int, int, str], ...]
+
+
+def _status(value: Any, where: str) -> TaskStatusEnum:
+    if value is None:
+        return TaskStatusEnum.TO_DO
+    for status in TaskStatusEnum:
+        if value in (status.name, status.value):
+            return status
+    raise ValidationError(f"{where}: unknown status {value!r}")
+
+
+def parse_template(data: Any) -> TemplateDefinition:
+    """Validate ``template_data`` and resolve task references to positions."""
+    if not isinstance(data, dict):
+        raise ValidationError("Template data must be an object")
+    project = data.get("project") or {}
+    tasks = data.get("tasks") or []
+    if not isinstance(project, dict) or not isinstance(tasks, list):
+        raise ValidationError("Template 'project' must be an object and 'tasks' a list")
+    if "priority" in project:
+        try:
+            ProjectPriority(project["priority"])
+        except ValueError:
+            raise ValidationError(f"Unknown project priority {project['priority']!r}")
+
+    keys: Dict[Any, int] = {}
+    for position, task in enumerate(tasks):
+        if not isinstance(task, dict) or not task.get("title"):
+            raise ValidationError(f"Template task {position} needs a title")
+        if task.get("key") is not None:
+            if task["key"] in keys:
+                raise ValidationError(f"Duplicate template task key {task['key']!r}")
+            keys[task["key"]] = position
+
+    definitions, edges = [], {}
+    for position, task in enumerate(tasks):
+        where = f"Template task {task.get('key', position)!r}"
+        for ref in task.get("depends_on") or ():
+            kind = DEFAULT_DEPENDENCY_TYPE
+            if isinstance(ref, dict):
+                ref, kind = ref.get("task"), ref.get("type") or kind
+            predecessor = keys.get(ref) if isinstance(ref, str) else ref
+            if not isinstance(predecessor, int) or not 0 <= predecessor < len(tasks):
+                raise ValidationError(f"{where} depends on unknown task {ref!r}")
+            if predecessor == position:
+                raise ValidationError(f"{where} cannot depend on itself")
+            edges.setdefault((predecessor, position), kind)
+        comments = task.get("comments") or ()
+        definitions.append(TaskDefinition(
+            title=task["title"], description=task.get("description"),
+            priority=str(task.get("priority") or "medium").lower(),
+            status=_status(task.get("status"), where), agent_id=task.get("agent_id"),
+            comments=tuple(str(comment) for comment in comments),
+        ))
+
+    # Kahn's algorithm: whatever cannot be ordered sits on a cycle.
+    successors: Dict[int, List[int]] = {}
+    waiting = [0] * len(tasks)
+    for predecessor, successor in edges:
+        successors.setdefault(predecessor, []).append(successor)
+        waiting[successor] += 1
+    ready = [position for position, count in enumerate(waiting) if not count]
+    ordered = 0
+    while ready:
+        ordered += 1
+        for successor in successors.get(ready.pop(), ()):
+            waiting[successor] -= 1
+            if not waiting[successor]:
+                ready.append(successor)
+    if ordered != len(tasks):
+        raise ValidationError("Template task dependencies contain a cycle")
+
+    dependencies = tuple(
+        (predecessor, successor, kind)
+        for (predecessor, successor), kind in edges.items()
+    )
+    return TemplateDefinition(
+        project=project, tasks=tuple(definitions), dependencies=dependencies
+    )
+
+
+class TemplateDefinitions:
+    """Parsed template definitions, cached until a template changes."""
+
+    def __init__(self):
+        self._definitions: Dict[str, TemplateDefinition] = {}
+        self._listening = False
+
+    def invalidate(self) -> None:
+        self._definitions.clear()
+
+    async def get(self, db: AsyncSession, template_id: str) -> TemplateDefinition:
+        definition = self._definitions.get(template_id)
+        if definition is not None:
+            return definition
+        if not self._listening:
+            get_shared_state().on_invalidate(TEMPLATE_DEFINITIONS_NAME, self.invalidate)
+            self._listening = True
+        data = (await db.execute(
+            select(TEMPLATES.c.template_data).where(TEMPLATES.c.id == template_id)
+        )).first()
+        if data is None:
+            raise EntityNotFoundError("ProjectTemplate", template_id)
+        definition = self._definitions[template_id] = parse_template(data[0])
+        return definition
+
+
+template_definitions = TemplateDefinitions()
 
 
 class ProjectTemplateService:
@@ -22,34 +197,188 @@ class ProjectTemplateService:
     def __init__(self, db: AsyncSession):
         self.db = db
 
-    def create_template(self, template: ProjectTemplateCreate) -> models.ProjectTemplate:
+    async def create_template(
+        self, template: ProjectTemplateCreate
+    ) -> models.ProjectTemplate:
         """Create a new project template."""
-        return create_project_template(self.db, template)
+        parse_template(template.template_data)
+        return await create_project_template(self.db, template)
 
-    def get_template(self, template_id: str) -> Optional[models.ProjectTemplate]:
+    async def get_template(self, template_id: str) -> Optional[models.ProjectTemplate]:
         """Retrieve a single project template by ID."""
-        return get_project_template(self.db, template_id)
+        return await get_project_template(self.db, template_id)
 
-    def get_template_by_name(self, name: str) -> Optional[models.ProjectTemplate]:
+    async def get_template_by_name(self, name: str) -> Optional[models.ProjectTemplate]:
         """Retrieve a single project template by name."""
-        return get_project_template_by_name(self.db, name)
+        return await get_project_template_by_name(self.db, name)
 
-    def get_templates(
+    async def get_templates(
         self, skip: int = 0, limit: int = 100
     ) -> List[models.ProjectTemplate]:
         """Retrieve multiple project templates."""
-        return get_project_templates(
+        return await get_project_templates(
             self.db, skip, limit
         )
 
-    def update_template(
+    async def update_template(
         self, template_id: str, template_update: ProjectTemplateUpdate
     ) -> Optional[models.ProjectTemplate]:
         """Update a project template by ID."""
-        return update_project_template(
+        if template_update.template_data is not None:
+            parse_template(template_update.template_data)
+        template = await update_project_template(
             self.db, template_id, template_update
         )
+        await get_shared_state().invalidate(TEMPLATE_DEFINITIONS_NAME)
+        return template
 
-    def delete_template(self, template_id: str) -> bool:
+    async def delete_template(self, template_id: str) -> bool:
         """Delete a project template by ID."""
-        return delete_project_template(self.db, template_id)
+        deleted = await delete_project_template(self.db, template_id)
+        await get_shared_state().invalidate(TEMPLATE_DEFINITIONS_NAME)
+        return deleted
+
+    async def instantiate_template(
+        self,
+        template_id: str,
+        project_name: Optional[str] = None,
+        project_id: Optional[str] = None,
+        now: Optional[datetime] = None,
+    ) -> Dict[str, Any]:
+        """Create a project named ``project_name`` from a template, or add the
+        template's tasks to the existing project ``project_id``.
+
+        Everything is written in one transaction. If another writer takes
+        the next task numbers of ``project_id`` first, the block is reserved
+        again a few times before giving up with a conflict. Returns the
+        project ID, the task-number range and the number of rows written per
+        table.
+        """
+        if (project_name is None) == (project_id is None):
+            raise ValidationError(
+                "Give either a new project name or an existing project ID"
+            )
+        definition = await template_definitions.get(self.db, template_id)
+        machines = await status_machines.ensure_loaded(self.db)
+        now = now or datetime.utcnow()
+        db = self.db
+        for attempt in range(1, TASK_NUMBER_ATTEMPTS + 1):
+            try:
+                return await self._write_instance(
+                    definition, machines, template_id, project_name, project_id, now
+                )
+            except IntegrityError:
+                await db.rollback()
+                # Only an existing project can have its numbers taken meanwhile.
+                if project_id is None:
+                    raise
+                if attempt == TASK_NUMBER_ATTEMPTS:
+                    raise ConflictError(
+                        f"Task numbers in project '{project_id}' kept changing; "
+                        "try again"
+                    )
+            except Exception:
+                await db.rollback()
+                raise
+
+    async def _write_instance(
+        self,
+        definition: TemplateDefinition,
+        machines: StatusMachines,
+        template_id: str,
+        project_name: Optional[str],
+        project_id: Optional[str],
+        now: datetime,
+    ) -> Dict[str, Any]:
+        """Write one application of ``definition`` and commit; the caller
+        rolls back on errors."""
+        db = self.db
+        if project_id is None:
+            if (await db.execute(
+                select(PROJECTS.c.id).where(PROJECTS.c.name == project_name)
+            )).first():
+                raise ConflictError(
+                    f"Project with name '{project_name}' already exists"
+                )
+            project_id = generate_uuid_with_hyphens()
+            settings = definition.project
+            await db.execute(insert(PROJECTS).values(
+                id=project_id, name=project_name,
+                description=settings.get("description"), status=ProjectStatus.ACTIVE,
+                priority=ProjectPriority(settings.get("priority", "medium")),
+                metadata_json={
+                    **settings.get("metadata_json", {}), "template_id": template_id
+                },
+                tags=settings.get("tags", []), settings=settings.get("settings", {}),
+                is_archived=False, created_at=now, updated_at=now,
+            ))
+            first = 1
+        else:
+            # Locking the project row serializes concurrent blocks where the
+            # database supports it; elsewhere the caller retries on a clash.
+            locked = (
+                select(PROJECTS.c.id)
+                .where(PROJECTS.c.id == project_id)
+                .with_for_update()
+            )
+            if (await db.execute(locked)).first() is None:
+                raise EntityNotFoundError("Project", project_id)
+            highest = await db.scalar(
+                select(func.max(TASKS.c.task_number))
+                .where(TASKS.c.project_id == project_id)
+            )
+            first = (highest or 0) + 1
+
+        tasks, comments, changes = [], [], {False: [], True: []}
+        for number, task in enumerate(definition.tasks, first):
+            row = {
+                "project_id": project_id, "task_number": number, "title": task.title,
+                "description": task.description, "status": task.status,
+                "priority": task.priority,
+                "priority_rank": priority_rank(task.priority),
+                "agent_id": task.agent_id, "is_archived": False,
+                "created_at": now, "updated_at": now,
+            }
+            decision = machines.validate(
+                TASK_STATUS_ENUM, None, task.status.name,
+                Facts(row, status=task.status.name),
+            )
+            tasks.append(row)
+            changes[decision.requires_approval].append(
+                (project_id, number, None, task.status)
+            )
+            comments.extend(
+                {"id": generate_uuid_with_hyphens(), "content": content,
+                 "task_project_id": project_id, "task_task_number": number,
+                 "created_at": now, "updated_at": now}
+                for content in task.comments
+            )
+        dependencies = [
+            {"predecessor_project_id": project_id,
+             "predecessor_task_number": first + predecessor,
+             "successor_project_id": project_id,
+             "successor_task_number": first + successor, "type": kind}
+            for predecessor, successor, kind in definition.dependencies
+        ]
+
+        if tasks:
+            await db.execute(insert(TASKS), tasks)
+        if dependencies:
+            await db.execute(insert(DEPENDENCIES), dependencies)
+        if comments:
+            await db.execute(insert(COMMENTS), comments)
+        transitions = 0
+        for requires_approval, batch in changes.items():
+            transitions += await record_transitions(
+                db, batch, now=now, requires_approval=requires_approval
+            )
+        await db.commit()
+        return {
+            "project_id": project_id,
+            "first_task_number": first,
+            "last_task_number": first + len(tasks) - 1,
+            "tasks": len(tasks),
+            "dependencies": len(dependencies),
+            "comments": len(comments),
+            "transitions": transitions,
+        }
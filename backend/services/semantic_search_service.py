@@ -0,0 +1,338 @@
+"""
+Semantic and hybrid retrieval over memory entities.
+
+Each entity is indexed twice from the same text (name, type, content and
+its observations): in a BM25 :class:`~backend.core.text_index.InvertedIndex`
+for lexical matches and, as an embedding, in a
+:class:`~backend.core.vector_index.VectorIndex` for matches in different
+wording. Hybrid ranking blends the two scores.
+
+:class:`PassageIndexCache` keeps BM25 indexes over the passages of
+recently searched entities, so repeated passage queries against a large
+file do not re-tokenize it.
+
+The entity index is built on first use. Entity and observation writes in
+:class:`MemoryService` update it incrementally, and other workers re-index
+just the written entity. Embeddings are saved under
+``settings.semantic_index_dir`` with a checksum per entity, so a restart or
+another worker only re-embeds entities whose text changed.
+"""
+import asyncio
+import heapq
+import json
+import logging
+import os
+import zlib
+from collections import OrderedDict, defaultdict
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend import models
+from backend.core.embeddings import get_embedder, numpy_available
+from backend.core.shared_state import get_shared_state, startup_lock
+from backend.core.text_index import CorpusStats, InvertedIndex
+from backend.services.exceptions import ValidationError
+
+try:
+    from backend.config.app_config import settings
+except ImportError:
+    from config.app_config import settings
+
+logger = logging.getLogger(__name__)
+
+SEARCH_MODES = ("lexical", "semantic", "hybrid")
+SEMANTIC_INDEX_NAME = "semantic_memory"
+# Weight of the vector score in hybrid ranking; the rest is normalised BM25.
+HYBRID_VECTOR_WEIGHT = 0.6
+# Content beyond this many characters is not embedded.
+MAX_EMBED_CHARS = 20000
+LEXICAL_FIELD_WEIGHTS = {"name": 2.0, "content": 1.0, "observations": 1.0}
+PASSAGE_FIELD_WEIGHTS = {"heading": 2.0, "content": 1.0}
+# Entities whose passage indexes stay in memory between queries.
+PASSAGE_INDEX_CACHE_SIZE = 16
+
+
+def entity_text(
+    name: str, entity_type: str, content: Optional[str], observations: List[str]
+) -> str:
+    parts = [name or "", entity_type or "", (content or "")[:MAX_EMBED_CHARS]]
+    return "\n".join(parts + observations)
+
+
+def _checksum(text: str) -> int:
+    return zlib.crc32(text.encode())
+
+
+class SemanticMemoryIndex:
+    """Process-wide lexical + vector index over memory entities."""
+
+    def __init__(self, directory: Optional[str] = None):
+        self.directory = directory
+        self.lexical = InvertedIndex(LEXICAL_FIELD_WEIGHTS)
+        self.vectors = None
+        self.checksums: Dict[str, int] = {}
+        self._loaded = False
+        self._lock = asyncio.Lock()
+        self._listening = False
+        self._session_maker = None
+
+    @property
+    def available(self) -> bool:
+        return numpy_available()
+
+    def invalidate(self) -> None:
+        self._loaded = False
+
+    async def ensure_loaded(self, db: AsyncSession) -> "SemanticMemoryIndex":
+        """Build or refresh the index, re-embedding only changed entities."""
+        if self._loaded:
+            return self
+        async with self._lock:
+            if self._loaded:
+                return self
+            if not self._listening:
+                get_shared_state().on_invalidate(SEMANTIC_INDEX_NAME, self.invalidate)
+                get_shared_state().on_keys_invalidated(
+                    SEMANTIC_INDEX_NAME, self.entities_changed_elsewhere
+                )
+                self._listening = True
+            texts = await self._load_texts(db)
+            self.lexical = InvertedIndex(LEXICAL_FIELD_WEIGHTS)
+            for entity_id, (fields, _) in texts.items():
+                self.lexical.add(entity_id, fields)
+            if self.available:
+                # Embedding is CPU-bound; keep the event loop responsive.
+                await asyncio.to_thread(
+                    self._sync_vectors,
+                    {entity_id: text for entity_id, (_, text) in texts.items()}
+                )
+            self._loaded = True
+        return self
+
+    async def entity_changed(self, db: AsyncSession, entity_id: str) -> None:
+        """Re-index one entity after a write, and tell other workers which."""
+        await self._reindex(db, [entity_id])
+        await get_shared_state().invalidate(
+            SEMANTIC_INDEX_NAME, notify_local=False, keys=[entity_id]
+        )
+
+    async def entities_changed_elsewhere(self, entity_ids: List[str]) -> None:
+        """Re-index entities another worker wrote."""
+        if not self._loaded:
+            return
+        async with self._sessions()() as db:
+            await self._reindex(db, entity_ids)
+
+    def search(
+        self, query: str, limit: int = 10, mode: str = "hybrid"
+    ) -> List[Tuple[str, float]]:
+        """Return ``(entity_id, score)`` pairs, best first."""
+        if mode not in SEARCH_MODES:
+            raise ValidationError(
+                f"Unknown search mode '{mode}'. Choose from: {', '.join(SEARCH_MODES)}"
+            )
+        if mode == "lexical":
+            return self.lexical.search(query, limit)
+        if not self.available or self.vectors is None:
+            raise ValidationError("Semantic search requires numpy")
+        query_vector = get_embedder().embed([query])[0]
+        if mode == "semantic":
+            return self.vectors.search(query_vector, limit)
+
+        pool = max(limit * 4, 50)
+        lexical = dict(self.lexical.search(query, pool))
+        vector = dict(self.vectors.search(query_vector, pool))
+        vector.update(self.vectors.score(
+            [key for key in lexical if key not in vector], query_vector
+        ))
+        top_lexical = max(lexical.values(), default=0.0) or 1.0
+        blended = {
+            entity_id: HYBRID_VECTOR_WEIGHT * max(vector.get(entity_id, 0.0), 0.0)
+            + (1 - HYBRID_VECTOR_WEIGHT) * lexical.get(entity_id, 0.0) / top_lexical
+            for entity_id in set(lexical) | set(vector)
+        }
+        return sorted(blended.items(), key=lambda item: item[1], reverse=True)[:limit]
+
+    def save(self) -> None:
+        """Persist embeddings and checksums for the next start."""
+        if self.vectors is None:
+            return
+        directory = self._directory()
+        with startup_lock("semantic_index"):
+            self.vectors.save(directory)
+            with open(os.path.join(directory, "state.json"), "w") as handle:
+                json.dump({
+                    "embedder": get_embedder().name,
+                    "checksums": self.checksums,
+                }, handle)
+
+    # -- internals ------------------------------------------------------------
+
+    async def _load_texts(
+        self, db: AsyncSession, entity_id: Optional[str] = None
+    ) -> Dict[str, Tuple[Dict[str, str], str]]:
+        entities = models.MemoryEntity.__table__
+        observations = models.MemoryObservation.__table__
+        entity_query = select(
+            entities.c.id, entities.c.name, entities.c.entity_type, entities.c.content
+        )
+        observation_query = select(observations.c.entity_id, observations.c.content)
+        if entity_id is not None:
+            entity_query = entity_query.where(entities.c.id == entity_id)
+            observation_query = observation_query.where(
+                observations.c.entity_id == entity_id
+            )
+        notes: Dict[str, List[str]] = defaultdict(list)
+        for owner, content in (await db.execute(observation_query)).all():
+            notes[owner].append(content or "")
+        texts = {}
+        for key, name, entity_type, content in (await db.execute(entity_query)).all():
+            fields = {
+                "name": name, "content": content, "observations": " ".join(notes[key])
+            }
+            texts[key] = (fields, entity_text(name, entity_type, content, notes[key]))
+        return texts
+
+    def _sync_vectors(self, texts: Dict[str, str]) -> None:
+        """Bring the vector index in line with ``texts``, embedding only changes."""
+        if self.vectors is None:
+            self.vectors, self.checksums = self._load_saved()
+        for stale in [key for key in self.checksums if key not in texts]:
+            self.vectors.remove(stale)
+            del self.checksums[stale]
+        changed = [
+            key for key, text in texts.items()
+            if self.checksums.get(key) != _checksum(text)
+        ]
+        if not changed:
+            return
+        for start in range(0, len(changed), 256):
+            batch = changed[start:start + 256]
+            for key, vector in zip(
+                batch, get_embedder().embed([texts[key] for key in batch])
+            ):
+                self.vectors.add(key, vector)
+                self.checksums[key] = _checksum(texts[key])
+        logger.info(f"Embedded {len(changed)} memory entities")
+        try:
+            self.save()
+        except OSError as e:
+            logger.warning(f"Could not save semantic index: {e}")
+
+    def _load_saved(self):
+        from backend.core.vector_index import VectorIndex
+
+        embedder = get_embedder()
+        directory = self._directory()
+        try:
+            with open(os.path.join(directory, "state.json")) as handle:
+                state = json.load(handle)
+            if state.get("embedder") == embedder.name:
+                vectors = VectorIndex.load(directory)
+                if vectors.dimensions == embedder.dimensions:
+                    return vectors, dict(state["checksums"])
+        except (OSError, ValueError, KeyError):
+            pass
+        return VectorIndex(embedder.dimensions), {}
+
+    async def _reindex(self, db: AsyncSession, entity_ids: List[str]) -> None:
+        if not self._loaded:
+            return
+        for entity_id in entity_ids:
+            texts = await self._load_texts(db, entity_id)
+            if entity_id in texts:
+                fields, text = texts[entity_id]
+                await self._index_one(entity_id, fields, text)
+            else:
+                self._remove_one(entity_id)
+
+    async def _index_one(
+        self, entity_id: str, fields: Dict[str, str], text: str
+    ) -> None:
+        self.lexical.add(entity_id, fields)
+        checksum = _checksum(text)
+        if self.vectors is not None and self.checksums.get(entity_id) != checksum:
+            # Embedding is CPU-bound; keep the event loop responsive.
+            vector = (await asyncio.to_thread(get_embedder().embed, [text]))[0]
+            self.vectors.add(entity_id, vector)
+            self.checksums[entity_id] = checksum
+
+    def _remove_one(self, entity_id: str) -> None:
+        self.lexical.remove(entity_id)
+        if self.vectors is not None:
+            self.vectors.remove(entity_id)
+            self.checksums.pop(entity_id, None)
+
+    def _directory(self) -> str:
+        return self.directory or settings.semantic_index_dir
+
+    def _sessions(self):
+        if self._session_maker is None:
+            from backend.database import async_session_maker
+
+            self._session_maker = async_session_maker
+        return self._session_maker
+
+
+class PassageIndexCache:
+    """LRU of per-entity BM25 indexes over ``memory_passages``.
+
+    A search scores the passages of all requested entities with shared
+    corpus statistics, as if they were one index.
+
+    Each entry is stamped with its entity's passage count and newest
+    ``created_at``; passages are rewritten wholesale, so a changed stamp
+    (from this worker or another) means the entry is rebuilt.
+    """
+
+    def __init__(self, capacity: int = PASSAGE_INDEX_CACHE_SIZE):
+        self.capacity = capacity
+        self._entries: "OrderedDict[str, Tuple[tuple, InvertedIndex]]" = OrderedDict()
+
+    async def search(
+        self, db: AsyncSession, query: str, entity_ids: Sequence[str], limit: int
+    ) -> List[Tuple[str, float]]:
+        """Return ``(passage_id, score)`` pairs across ``entity_ids``, best first."""
+        passages = models.MemoryPassage.__table__
+        result = await db.execute(
+            select(passages.c.entity_id, func.count(), func.max(passages.c.created_at))
+            .where(passages.c.entity_id.in_(entity_ids))
+            .group_by(passages.c.entity_id)
+        )
+        indexes = [
+            await self._index(db, entity_id, (count, newest))
+            for entity_id, count, newest in result.all()
+        ]
+        # Score every entity's passages against the same corpus statistics.
+        stats = CorpusStats.of(indexes, query)
+        ranked: List[Tuple[str, float]] = []
+        for index in indexes:
+            ranked.extend(index.search(query, limit, stats=stats))
+        return heapq.nlargest(limit, ranked, key=lambda item: item[1])
+
+    async def _index(
+        self, db: AsyncSession, entity_id: str, stamp: tuple
+    ) -> InvertedIndex:
+        entry = self._entries.get(entity_id)
+        if entry is not None and entry[0] == stamp:
+            self._entries.move_to_end(entity_id)
+            return entry[1]
+        passages = models.MemoryPassage.__table__
+        result = await db.execute(
+            select(passages.c.id, passages.c.heading, passages.c.content)
+            .where(passages.c.entity_id == entity_id)
+        )
+        index = InvertedIndex(PASSAGE_FIELD_WEIGHTS)
+        for passage_id, heading, content in result.all():
+            index.add(passage_id, {"heading": heading, "content": content})
+        self._entries[entity_id] = (stamp, index)
+        self._entries.move_to_end(entity_id)
+        while len(self._entries) > self.capacity:
+            self._entries.popitem(last=False)
+        return index
+
+
+semantic_index = SemanticMemoryIndex()
+passage_indexes = PassageIndexCache()
@@ -0,0 +1,356 @@
+"""
+Status transition rules.
+
+``status_transition_rules`` rows are compiled, per enum in
+``enum_registry``, into a :class:`StatusMachine`: an adjacency matrix over
+the enum's values, indexed by value, whose cells hold the rules allowing
+that move. Row ``None`` holds initial transitions (``from_status_id`` null);
+initial statuses are only restricted once an enum has such rules.
+``condition_expression`` is parsed once into a code object, restricted to
+comparisons and boolean logic over names, and evaluated against the facts
+of the object being moved (e.g. ``priority == 'high' and agent_id is not
+None``; unknown names are ``None``).
+
+:data:`status_machines` holds the compiled machines for every enum. It loads
+all rules on first use and again after rules change, in this worker or any
+other; in between, validating a transition reads no rows. An enum without
+active rules is unrestricted, and moving to the current status is always
+allowed.
+"""
+import ast
+import enum
+import logging
+from datetime import datetime
+from typing import (
+    Any, Dict, Iterable, List, Mapping, NamedTuple, Optional, Sequence, Tuple,
+)
+
+from sqlalchemy import delete, insert, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend import models
+from backend.core.shared_state import get_shared_state
+from backend.models.base import generate_uuid_with_hyphens
+from .exceptions import EntityNotFoundError, ValidationError
+
+logger = logging.getLogger(__name__)
+
+REGISTRY = models.EnumRegistry.__table__
+VALUES = models.EnumValue.__table__
+RULES = models.StatusTransitionRule.__table__
+
+TRANSITION_RULES_NAME = "status_transition_rules"
+TASK_STATUS_ENUM = "task_status"
+
+RULE_FIELDS = (
+    "requires_approval", "required_agent_role", "condition_expression",
+    "auto_transition_after_hours", "auto_transition_condition", "transition_name",
+    "description", "is_active", "is_reversible",
+)
+
+_CONDITION_NODES = (
+    ast.Expression, ast.BoolOp, ast.And, ast.Or, ast.UnaryOp, ast.Not, ast.Compare,
+    ast.Eq, ast.NotEq, ast.Lt, ast.LtE, ast.Gt, ast.GtE, ast.In, ast.NotIn, ast.Is,
+    ast.IsNot, ast.Name, ast.Load, ast.Constant, ast.Tuple, ast.List,
+)
+
+
+def compile_condition(expression: str):
+    """Parse a condition into a code object.
+
+    Raises ValidationError for anything but plain logic.
+    """
+    try:
+        tree = ast.parse(expression, mode="eval")
+    except SyntaxError as e:
+        raise ValidationError(f"Invalid condition expression {expression!r}: {e.msg}")
+    for node in ast.walk(tree):
+        if not isinstance(node, _CONDITION_NODES):
+            raise ValidationError(
+                f"Invalid condition expression {expression!r}: "
+                f"{type(node).__name__} is not allowed"
+            )
+    return compile(tree, "<condition>", "eval")
+
+
+class Facts(dict):
+    """Names a condition can read; missing names are ``None``."""
+
+    def __missing__(self, key):
+        return None
+
+
+class ObjectFacts(Facts):
+    """Facts read lazily from an object's attributes, enums by name."""
+
+    def __init__(self, obj: Any):
+        super().__init__()
+        self._obj = obj
+
+    def __missing__(self, key):
+        value = getattr(self._obj, key, None)
+        return value.name if isinstance(value, enum.Enum) else value
+
+
+class CompiledRule(NamedTuple):
+    id: str
+    condition: Any  # code object, or None
+    requires_approval: bool
+    required_agent_role: Optional[str]
+    transition_name: Optional[str]
+
+
+class Decision(NamedTuple):
+    allowed: bool
+    rule: Optional[CompiledRule] = None
+    reason: Optional[str] = None
+
+    @property
+    def requires_approval(self) -> bool:
+        return self.rule is not None and self.rule.requires_approval
+
+
+ALLOWED = Decision(True)
+_NO_FACTS = Facts()
+
+
+class StatusMachine:
+    """Allowed moves between the values of one enum."""
+
+    def __init__(
+        self, name: str, values: Sequence[str],
+        rules: Iterable[Tuple[Optional[str], str, CompiledRule]], version: int
+    ):
+        self.name = name
+        self.version = version
+        self.index: Dict[Optional[str], int] = {
+            value: i for i, value in enumerate(values)
+        }
+        self.index[None] = len(values)
+        width = len(values)
+        self.matrix: List[List[Tuple[CompiledRule, ...]]] = [
+            [()] * width for _ in range(width + 1)
+        ]
+        for from_value, to_value, rule in rules:
+            row = self.matrix[self.index[from_value]]
+            row[self.index[to_value]] += (rule,)
+        self.restricts_initial = any(self.matrix[width])
+
+    def check(
+        self,
+        from_value: Optional[str],
+        to_value: str,
+        facts: Mapping[str, Any] = _NO_FACTS,
+        agent_role: Optional[str] = None,
+    ) -> Decision:
+        """Whether ``from_value -> to_value`` is allowed, and by which rule.
+
+        ``required_agent_role`` is enforced when ``agent_role`` is given.
+        """
+        if from_value == to_value or (
+            from_value is None and not self.restricts_initial
+        ):
+            return ALLOWED
+        i, j = self.index.get(from_value), self.index.get(to_value)
+        if i is None or j is None or to_value is None:
+            return Decision(
+                False,
+                reason=f"{from_value} -> {to_value} is not a {self.name} transition",
+            )
+        reason = None
+        for rule in self.matrix[i][j]:
+            if rule.condition is not None and not eval(
+                rule.condition, {"__builtins__": {}}, facts
+            ):
+                reason = f"condition of {rule.transition_name or rule.id} not met"
+                continue
+            required = rule.required_agent_role
+            if required and agent_role is not None and agent_role != required:
+                name = rule.transition_name or rule.id
+                reason = f"{name} requires agent role {required}"
+                continue
+            return Decision(True, rule)
+        return Decision(
+            False, reason=reason or f"no rule allows {from_value} -> {to_value}"
+        )
+
+
+class StatusMachines:
+    """Compiled machines for every enum with active rules; see the module docstring."""
+
+    def __init__(self):
+        self._machines: Optional[Dict[str, StatusMachine]] = None
+        self.version = 0
+        self._listening = False
+
+    def invalidate(self) -> None:
+        self._machines = None
+
+    async def ensure_loaded(self, db: AsyncSession) -> "StatusMachines":
+        if self._machines is not None:
+            return self
+        if not self._listening:
+            get_shared_state().on_invalidate(TRANSITION_RULES_NAME, self.invalidate)
+            self._listening = True
+        enums = dict(
+            (await db.execute(select(REGISTRY.c.id, REGISTRY.c.enum_name))).all()
+        )
+        values: Dict[str, List[str]] = {}
+        names: Dict[str, Tuple[str, str]] = {}
+        for value_id, registry_id, value in await db.execute(
+            select(VALUES.c.id, VALUES.c.enum_registry_id, VALUES.c.value)
+            .order_by(VALUES.c.sort_order, VALUES.c.value)
+        ):
+            values.setdefault(registry_id, []).append(value)
+            names[value_id] = (registry_id, value)
+        rules: Dict[str, list] = {}
+        for row in await db.execute(select(RULES).where(RULES.c.is_active.is_(True))):
+            ends = [names.get(row.to_status_id)]
+            if row.from_status_id is not None:
+                ends.append(names.get(row.from_status_id))
+            if row.enum_registry_id not in enums or any(
+                end is None or end[0] != row.enum_registry_id for end in ends
+            ):
+                logger.warning(
+                    f"Skipping status transition rule {row.id}: unknown enum or value"
+                )
+                continue
+            try:
+                condition = (
+                    compile_condition(row.condition_expression)
+                    if row.condition_expression else None
+                )
+            except ValidationError as e:
+                # A rule that cannot be evaluated allows nothing.
+                logger.warning(f"Skipping status transition rule {row.id}: {e}")
+                continue
+            rules.setdefault(row.enum_registry_id, []).append((
+                None if row.from_status_id is None else names[row.from_status_id][1],
+                names[row.to_status_id][1],
+                CompiledRule(
+                    row.id, condition, row.requires_approval, row.required_agent_role,
+                    row.transition_name,
+                ),
+            ))
+        self.version += 1
+        self._machines = {
+            enums[registry_id]: StatusMachine(
+                enums[registry_id], values.get(registry_id, ()), enum_rules,
+                self.version,
+            )
+            for registry_id, enum_rules in rules.items()
+        }
+        return self
+
+    def machine(self, enum_name: str) -> Optional[StatusMachine]:
+        """The loaded machine for ``enum_name``; ``None`` when it is unrestricted."""
+        if self._machines is None:
+            raise RuntimeError(
+                "Status transition rules are not loaded; await ensure_loaded(db) first"
+            )
+        return self._machines.get(enum_name)
+
+    def check(
+        self,
+        enum_name: str,
+        from_value: Optional[str],
+        to_value: str,
+        facts: Mapping[str, Any] = _NO_FACTS,
+        agent_role: Optional[str] = None,
+    ) -> Decision:
+        machine = self.machine(enum_name)
+        return ALLOWED if machine is None else machine.check(
+            from_value, to_value, facts, agent_role
+        )
+
+    def validate(
+        self,
+        enum_name: str,
+        from_value: Optional[str],
+        to_value: str,
+        facts: Mapping[str, Any] = _NO_FACTS,
+        agent_role: Optional[str] = None,
+    ) -> Decision:
+        """Like :meth:`check`, raising ValidationError when the move is not allowed."""
+        decision = self.check(enum_name, from_value, to_value, facts, agent_role)
+        if not decision.allowed:
+            raise ValidationError(
+                f"Status transition {from_value} -> {to_value} is not allowed: "
+                f"{decision.reason}"
+            )
+        return decision
+
+
+status_machines = StatusMachines()
+
+
+class StatusTransitionService:
+    """Edits ``status_transition_rules``.
+
+    Every change recompiles :data:`status_machines` in every worker.
+    """
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def _value_id(self, registry_id: str, value: str) -> str:
+        value_id = (await self.db.execute(
+            select(VALUES.c.id).where(
+                VALUES.c.enum_registry_id == registry_id, VALUES.c.value == value
+            )
+        )).scalar()
+        if value_id is None:
+            raise EntityNotFoundError("Enum value", value)
+        return value_id
+
+    async def create_rule(
+        self, enum_name: str, from_value: Optional[str], to_value: str, **fields: Any
+    ) -> Dict[str, Any]:
+        """Allow ``from_value -> to_value`` (``None`` allows an initial status)."""
+        unknown = set(fields) - set(RULE_FIELDS)
+        if unknown:
+            raise ValidationError(f"Unknown rule fields: {', '.join(sorted(unknown))}")
+        if fields.get("condition_expression"):
+            compile_condition(fields["condition_expression"])
+        registry_id = (await self.db.execute(
+            select(REGISTRY.c.id).where(REGISTRY.c.enum_name == enum_name)
+        )).scalar()
+        if registry_id is None:
+            raise EntityNotFoundError("Enum", enum_name)
+        now = datetime.utcnow()
+        row = {
+            "id": generate_uuid_with_hyphens(), "enum_registry_id": registry_id,
+            "from_status_id": None if from_value is None else await self._value_id(
+                registry_id, from_value
+            ),
+            "to_status_id": await self._value_id(registry_id, to_value),
+            "created_at": now, "updated_at": now,
+            **fields,
+        }
+        await self.db.execute(insert(RULES).values(**row))
+        await self.db.commit()
+        await get_shared_state().invalidate(TRANSITION_RULES_NAME)
+        return row
+
+    async def update_rule(self, rule_id: str, **fields: Any) -> None:
+        unknown = set(fields) - set(RULE_FIELDS)
+        if unknown:
+            raise ValidationError(f"Unknown rule fields: {', '.join(sorted(unknown))}")
+        if fields.get("condition_expression"):
+            compile_condition(fields["condition_expression"])
+        result = await self.db.execute(
+            update(RULES).where(RULES.c.id == rule_id).values(
+                updated_at=datetime.utcnow(), **fields
+            )
+        )
+        if result.rowcount == 0:
+            raise EntityNotFoundError("Status transition rule", rule_id)
+        await self.db.commit()
+        await get_shared_state().invalidate(TRANSITION_RULES_NAME)
+
+    async def delete_rule(self, rule_id: str) -> None:
+        result = await self.db.execute(delete(RULES).where(RULES.c.id == rule_id))
+        if result.rowcount == 0:
+            raise EntityNotFoundError("Status transition rule", rule_id)
+        await self.db.commit()
+        await get_shared_state().invalidate(TRANSITION_RULES_NAME)
@@ -0,0 +1,250 @@
+"""
+Flow analytics over task status transitions.
+
+:meth:`TaskAnalyticsService.project_flow` reports, for one project:
+
+- cycle time: first entry into a working status (anything but ``To Do``,
+  ``Blocked``, a done status, ``Cancelled`` or ``Failed``) to the first
+  entry into ``Completed`` or ``Completed Handoff``;
+- lead time: task creation to that same completion;
+- throughput: completions per ISO week (Monday start), empty weeks included;
+- cumulative flow: tasks in each status at the end of every day.
+
+The transitions and tasks are loaded in two queries and aggregated with
+NumPy: per-task firsts are ``np.fmin.at`` scatters, throughput is a
+``bincount`` and cumulative flow is a day-by-status grid of +1/-1 events
+summed down the days. Tasks created before history was recorded enter the
+flow in their earliest known status on the day they were created.
+
+Results are cached per project and keyed by the project's transition count
+and latest ``transitioned_at`` (one probe of
+``idx_task_status_project_time``), so any new transition, from any worker,
+invalidates them.
+"""
+from collections import OrderedDict
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, Optional, Tuple
+
+from sqlalchemy import String, cast, func, select, type_coerce
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend import models
+from backend.enums import TaskStatusEnum
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - optional dependency
+    np = None
+
+TASKS = models.Task.__table__
+TRANSITIONS = models.TaskStatusTransition.__table__
+
+STATUSES = tuple(TaskStatusEnum)
+# Keyed by the stored enum name. Rows are read with raw status names and
+# timestamps cast to text, which skips building an enum and a datetime per
+# row; NumPy parses the timestamps.
+STATUS_CODES = {status.name: code for code, status in enumerate(STATUSES)}
+DONE_STATUSES = (TaskStatusEnum.COMPLETED, TaskStatusEnum.COMPLETED_HANDOFF)
+NOT_STARTED_STATUSES = (
+    TaskStatusEnum.TO_DO, TaskStatusEnum.BLOCKED, TaskStatusEnum.CANCELLED,
+    TaskStatusEnum.FAILED,
+) + DONE_STATUSES
+PERCENTILES = (50, 85, 95)
+
+DAY = 86400
+# 1970-01-01 was a Thursday: shifting by three days makes weeks start on Monday.
+WEEK_OFFSET_DAYS = 3
+EPOCH = date(1970, 1, 1)
+
+MAX_CACHED_PROJECTS = 256
+_cache: "OrderedDict[str, Tuple[Tuple[Any, ...], Dict[str, Any]]]" = OrderedDict()
+
+
+def require_numpy() -> None:
+    if np is None:
+        raise RuntimeError(
+            "numpy is not installed; install 'numpy' to use task analytics"
+        )
+
+
+def _seconds(values) -> "np.ndarray":
+    # ISO strings parse in C; datetime objects are converted one by one.
+    return np.array(values, dtype="datetime64[s]").astype(np.int64)
+
+
+def _codes(statuses) -> "np.ndarray":
+    return np.fromiter((STATUS_CODES[status] for status in statuses), np.int64)
+
+
+def _day(days: int) -> str:
+    return (EPOCH + timedelta(days=int(days))).isoformat()
+
+
+def _summary(hours: "np.ndarray") -> Dict[str, Any]:
+    if not hours.size:
+        return {
+            "count": 0, "mean_hours": None, **{f"p{p}_hours": None for p in PERCENTILES}
+        }
+    values = np.percentile(hours, PERCENTILES)
+    return {
+        "count": int(hours.size),
+        "mean_hours": round(float(hours.mean()), 2),
+        **{f"p{p}_hours": round(float(v), 2) for p, v in zip(PERCENTILES, values)},
+    }
+
+
+def compute_flow(transitions, tasks, today: date) -> Dict[str, Any]:
+    """Aggregate flow metrics.
+
+    ``transitions`` are ``(task_number, from_status, to_status,
+    transitioned_at)`` rows ordered by ``transitioned_at``; ``tasks`` are
+    ``(task_number, created_at, status)`` rows. Statuses are enum names;
+    timestamps are ISO strings or datetimes.
+    """
+    require_numpy()
+    task_numbers, created_at, statuses = zip(*tasks) if tasks else ((), (), ())
+    numbers = np.fromiter(task_numbers, np.int64)
+    order = np.argsort(numbers, kind="stable")
+    numbers = numbers[order]
+    created = _seconds(created_at)[order]
+    current = _codes(statuses)[order]
+    count = numbers.size
+
+    transition_numbers, from_statuses, to_statuses, at = (
+        zip(*transitions) if transitions else ((), (), (), ())
+    )
+    transition_numbers = np.fromiter(transition_numbers, np.int64)
+    from_code = np.fromiter(
+        (-1 if status is None else STATUS_CODES[status] for status in from_statuses),
+        np.int64,
+    )
+    to_code = _codes(to_statuses)
+    at = _seconds(at)
+    # Transitions of deleted tasks are dropped.
+    task_idx = np.searchsorted(numbers, transition_numbers)
+    known = task_idx < count
+    known[known] = numbers[task_idx[known]] == transition_numbers[known]
+    task_idx, from_code, to_code = task_idx[known], from_code[known], to_code[known]
+    at = at[known]
+    rows = task_idx.size
+
+    # Per-task firsts.
+    started_at = np.full(count, np.inf)
+    done_at = np.full(count, np.inf)
+    working = ~np.isin(to_code, [STATUS_CODES[s.name] for s in NOT_STARTED_STATUSES])
+    done = np.isin(to_code, [STATUS_CODES[s.name] for s in DONE_STATUSES])
+    np.fmin.at(started_at, task_idx[working], at[working])
+    np.fmin.at(done_at, task_idx[done], at[done])
+    completed = np.isfinite(done_at)
+    cycled = completed & np.isfinite(started_at) & (started_at <= done_at)
+
+    # Throughput per week.
+    done_weeks = (done_at[completed].astype(np.int64) // DAY + WEEK_OFFSET_DAYS) // 7
+    throughput = []
+    if done_weeks.size:
+        first_week = done_weeks.min()
+        last_week = max(
+            done_weeks.max(), ((today - EPOCH).days + WEEK_OFFSET_DAYS) // 7
+        )
+        per_week = np.bincount(
+            done_weeks - first_week, minlength=last_week - first_week + 1
+        )
+        throughput = [
+            {"week_start": _day(week * 7 - WEEK_OFFSET_DAYS), "completed": int(n)}
+            for week, n in zip(range(first_week, last_week + 1), per_week)
+        ]
+
+    # Cumulative flow: each task enters in its earliest known status on its
+    # creation day, then every transition moves it between columns.
+    first_seen = np.full(count, rows, dtype=np.int64)
+    np.minimum.at(first_seen, task_idx, np.arange(rows))
+    has_history = first_seen < rows
+    initial = current.copy()
+    first_from = from_code[first_seen[has_history]]
+    first_to = to_code[first_seen[has_history]]
+    initial[has_history] = np.where(first_from >= 0, first_from, first_to)
+    # An initial (None -> status) transition is the creation entry itself.
+    moves = from_code >= 0
+    day = np.concatenate([created // DAY, at[moves] // DAY, at // DAY])
+    status = np.concatenate([initial, from_code[moves], to_code])
+    delta = np.concatenate([
+        np.ones(count, dtype=np.int64), -np.ones(int(moves.sum()), dtype=np.int64),
+        np.where(moves, 1, 0),
+    ])
+    cumulative_flow = []
+    if day.size:
+        first_day = int(day.min())
+        last_day = max(int(day.max()), (today - EPOCH).days)
+        grid = np.zeros((last_day - first_day + 1, len(STATUSES)), dtype=np.int64)
+        np.add.at(grid, (day - first_day, status), delta)
+        grid = grid.cumsum(axis=0)
+        columns = np.flatnonzero(grid.any(axis=0))
+        cumulative_flow = [
+            {
+                "date": _day(first_day + offset),
+                **{STATUSES[c].value: int(counts[c]) for c in columns}
+            }
+            for offset, counts in enumerate(grid)
+        ]
+
+    return {
+        "tasks": int(count),
+        "completed": int(completed.sum()),
+        "cycle_time": _summary((done_at[cycled] - started_at[cycled]) / 3600),
+        "lead_time": _summary((done_at[completed] - created[completed]) / 3600),
+        "throughput": throughput,
+        "cumulative_flow": cumulative_flow,
+    }
+
+
+class TaskAnalyticsService:
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def _stamp(self, project_id: str) -> Tuple[Any, ...]:
+        count, latest = (await self.db.execute(
+            select(func.count(), func.max(TRANSITIONS.c.transitioned_at))
+            .where(TRANSITIONS.c.task_project_id == project_id)
+        )).one()
+        return count, latest
+
+    async def project_flow(
+        self, project_id: str, days: Optional[int] = 90, today: Optional[date] = None
+    ) -> Dict[str, Any]:
+        """Cycle/lead time percentiles, weekly throughput and cumulative flow.
+
+        The flow covers the last ``days`` days, or all of them without ``days``.
+        """
+        require_numpy()
+        today = today or datetime.utcnow().date()
+        stamp = (*await self._stamp(project_id), today)
+        cached = _cache.get(project_id)
+        if cached is not None and cached[0] == stamp:
+            _cache.move_to_end(project_id)
+            flow = cached[1]
+        else:
+            transitions = (await self.db.execute(
+                select(
+                    TRANSITIONS.c.task_task_number,
+                    type_coerce(TRANSITIONS.c.from_status, String),
+                    type_coerce(TRANSITIONS.c.to_status, String),
+                    cast(TRANSITIONS.c.transitioned_at, String),
+                )
+                .where(TRANSITIONS.c.task_project_id == project_id)
+                .order_by(TRANSITIONS.c.transitioned_at, TRANSITIONS.c.id)
+            )).all()
+            tasks = (await self.db.execute(
+                select(
+                    TASKS.c.task_number, cast(TASKS.c.created_at, String),
+                    type_coerce(TASKS.c.status, String),
+                )
+                .where(TASKS.c.project_id == project_id)
+            )).all()
+            flow = compute_flow(transitions, tasks, today)
+            _cache[project_id] = (stamp, flow)
+            if len(_cache) > MAX_CACHED_PROJECTS:
+                _cache.popitem(last=False)
+        cumulative_flow = flow["cumulative_flow"]
+        if days:
+            cumulative_flow = cumulative_flow[-days:]
+        return {"project_id": project_id, **flow, "cumulative_flow": cumulative_flow}
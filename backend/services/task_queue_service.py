@@ -0,0 +1,359 @@
+"""
+Agent work queue: lease-based task claiming.
+
+:meth:`TaskQueueService.claim` hands an agent the next ready task in one
+indexed probe instead of a poll over ``GET /tasks``. A task is ready when it
+is ``To Do``, not archived, every predecessor is in a final status, and the
+agent declared every capability in its ``task_capability_requirements``.
+Ready tasks are walked in ``ix_tasks_claim`` order (status, priority rank,
+age); the dependency and capability checks are ``NOT EXISTS`` probes on
+primary keys and ``idx_task_dependencies_successor``.
+
+Claiming moves the task to ``In Progress`` with a lease that expires after
+``TASK_LEASE_SECONDS``. The agent renews it on heartbeat and releases it
+when done. Leases that ran out are reclaimed (back to ``To Do``) at the
+start of a claim; a probe of ``ix_tasks_lease_expires_at`` keeps claims
+that find nothing expired from writing anything. Claiming and
+reclaiming are system moves; the status an agent releases a task into is
+checked against the task status transition rules like any other update.
+
+:meth:`TaskQueueService.ready_tasks` is the scheduler's view of a project:
+every open task whose predecessors are all final, in claim order, from the
+same single query.
+
+Two agents never get the same task: the claim itself is a conditional
+``UPDATE`` that only succeeds while the task is still unclaimed, and a loser
+moves on to the next candidate. On PostgreSQL candidates are selected
+``FOR UPDATE SKIP LOCKED`` so concurrent claimers skip each other's rows
+instead of contending for them.
+"""
+import logging
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterable, Optional
+
+from sqlalchemy import and_, exists, func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend import models
+from backend.crud.task_transitions import record_transitions
+from backend.enums import TaskStatusEnum
+from backend.models.task_dependency import TaskDependency
+from .exceptions import ConflictError, EntityNotFoundError, ValidationError
+from .status_transition_service import TASK_STATUS_ENUM, ObjectFacts, status_machines
+
+try:
+    from backend.config.app_config import settings
+except ImportError:
+    from config.app_config import settings
+
+logger = logging.getLogger(__name__)
+
+TASKS = models.Task.__table__
+DEPENDENCIES = TaskDependency.__table__
+REQUIREMENTS = models.TaskCapabilityRequirement.__table__
+
+# A predecessor in one of these statuses no longer blocks its successors.
+FINAL_STATUSES = (
+    TaskStatusEnum.COMPLETED,
+    TaskStatusEnum.COMPLETED_HANDOFF,
+    TaskStatusEnum.CANCELLED,
+)
+READY_STATUS = TaskStatusEnum.TO_DO
+CLAIMED_STATUS = TaskStatusEnum.IN_PROGRESS
+
+# Candidates fetched per claim attempt; more only matter under contention.
+CLAIM_CANDIDATES = 8
+MAX_LEASE_SECONDS = 24 * 3600
+
+READY_COLUMNS = (
+    TASKS.c.task_number, TASKS.c.title, TASKS.c.status, TASKS.c.priority,
+    TASKS.c.agent_id, TASKS.c.lease_owner, TASKS.c.due_date,
+)
+
+LEASE_COLUMNS = (
+    TASKS.c.project_id, TASKS.c.task_number, TASKS.c.title, TASKS.c.priority,
+    TASKS.c.status, TASKS.c.lease_owner, TASKS.c.lease_expires_at,
+)
+
+
+def unblocked():
+    """Clause: the task has no predecessor outside :data:`FINAL_STATUSES`."""
+    predecessor = TASKS.alias("predecessor")
+    return ~exists().where(
+        DEPENDENCIES.c.successor_project_id == TASKS.c.project_id,
+        DEPENDENCIES.c.successor_task_number == TASKS.c.task_number,
+        predecessor.c.project_id == DEPENDENCIES.c.predecessor_project_id,
+        predecessor.c.task_number == DEPENDENCIES.c.predecessor_task_number,
+        predecessor.c.status.notin_(FINAL_STATUSES),
+    )
+
+
+def capable(capabilities: Iterable[str]):
+    """Clause: every capability the task requires is in ``capabilities``."""
+    missing = [
+        REQUIREMENTS.c.project_id == TASKS.c.project_id,
+        REQUIREMENTS.c.task_number == TASKS.c.task_number,
+    ]
+    capabilities = sorted(set(capabilities))
+    if capabilities:
+        missing.append(REQUIREMENTS.c.capability.notin_(capabilities))
+    return ~exists().where(*missing)
+
+
+def lease_dict(row) -> Dict[str, Any]:
+    return {
+        "project_id": row.project_id,
+        "task_number": row.task_number,
+        "title": row.title,
+        "priority": row.priority,
+        "status": row.status.value,
+        "lease_owner": row.lease_owner,
+        "lease_expires_at": (
+            row.lease_expires_at.isoformat() if row.lease_expires_at else None
+        ),
+    }
+
+
+class TaskQueueService:
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    def _lease_for(self, lease_seconds: Optional[int]) -> timedelta:
+        if lease_seconds is None:
+            lease_seconds = settings.task_lease_seconds
+        if not 0 < lease_seconds <= MAX_LEASE_SECONDS:
+            raise ValidationError(
+                f"lease_seconds must be between 1 and {MAX_LEASE_SECONDS}"
+            )
+        return timedelta(seconds=lease_seconds)
+
+    async def reclaim_expired(self, now: Optional[datetime] = None) -> int:
+        """Return tasks whose lease ran out to the queue; commits if any did."""
+        expired = (
+            TASKS.c.lease_expires_at < (now or datetime.utcnow()),
+            TASKS.c.status == CLAIMED_STATUS,
+        )
+        probe = select(TASKS.c.task_number).where(*expired).limit(1)
+        if (await self.db.execute(probe)).first() is None:
+            return 0
+        reclaimed = (await self.db.execute(
+            update(TASKS)
+            .where(*expired)
+            .values(
+                status=READY_STATUS, lease_owner=None, lease_expires_at=None,
+                updated_at=datetime.utcnow(),
+            )
+            .returning(TASKS.c.project_id, TASKS.c.task_number)
+        )).all()
+        if reclaimed:
+            await record_transitions(
+                self.db, [
+                    (row.project_id, row.task_number, CLAIMED_STATUS, READY_STATUS)
+                    for row in reclaimed
+                ],
+                trigger_type="timeout", reason="Lease expired",
+            )
+            logger.info("Reclaimed %d tasks with expired leases", len(reclaimed))
+        await self.db.commit()
+        return len(reclaimed)
+
+    async def claim(
+        self,
+        agent_id: str,
+        capabilities: Iterable[str] = (),
+        project_id: Optional[str] = None,
+        lease_seconds: Optional[int] = None,
+    ) -> Optional[Dict[str, Any]]:
+        """Lease the next ready task to ``agent_id``; None if there is none."""
+        if not agent_id:
+            raise ValidationError("agent_id is required to claim a task")
+        lease = self._lease_for(lease_seconds)
+        await self.reclaim_expired()
+        query = (
+            select(TASKS.c.project_id, TASKS.c.task_number)
+            .where(
+                TASKS.c.status == READY_STATUS,
+                TASKS.c.is_archived.is_(False),
+                unblocked(),
+                capable(capabilities),
+            )
+            .order_by(TASKS.c.status, TASKS.c.priority_rank, TASKS.c.created_at)
+            .limit(CLAIM_CANDIDATES)
+            .with_for_update(skip_locked=True, of=TASKS)
+        )
+        if project_id is not None:
+            query = query.where(TASKS.c.project_id == project_id)
+        while True:
+            candidates = (await self.db.execute(query)).all()
+            if not candidates:
+                await self.db.commit()
+                return None
+            for candidate in candidates:
+                now = datetime.utcnow()
+                claimed = (await self.db.execute(
+                    update(TASKS)
+                    .where(
+                        TASKS.c.project_id == candidate.project_id,
+                        TASKS.c.task_number == candidate.task_number,
+                        TASKS.c.status == READY_STATUS,
+                    )
+                    .values(
+                        status=CLAIMED_STATUS, lease_owner=agent_id,
+                        lease_expires_at=now + lease, updated_at=now,
+                    )
+                    .returning(*LEASE_COLUMNS)
+                )).first()
+                if claimed is not None:
+                    await record_transitions(
+                        self.db,
+                        [(
+                            claimed.project_id, claimed.task_number, READY_STATUS,
+                            CLAIMED_STATUS,
+                        )],
+                        trigger_type="lease", context={"lease_owner": agent_id},
+                        now=now,
+                    )
+                    await self.db.commit()
+                    return lease_dict(claimed)
+            # Every candidate was taken by another agent; look again.
+            await self.db.commit()
+
+    async def ready_tasks(
+        self, project_id: str, unclaimed_only: bool = False, skip: int = 0,
+        limit: int = 100
+    ) -> Dict[str, Any]:
+        """Open tasks of a project with no unfinished predecessor, in claim order.
+
+        With ``unclaimed_only`` just the ``To Do`` tasks an agent could claim
+        now; otherwise in-progress and other open statuses are included.
+        """
+        if unclaimed_only:
+            open_tasks = TASKS.c.status == READY_STATUS
+        else:
+            open_tasks = TASKS.c.status.notin_(FINAL_STATUSES)
+        ready = (
+            TASKS.c.project_id == project_id, TASKS.c.is_archived.is_(False),
+            open_tasks, unblocked(),
+        )
+        total = await self.db.scalar(
+            select(func.count()).select_from(TASKS).where(*ready)
+        )
+        rows = (await self.db.execute(
+            select(*READY_COLUMNS)
+            .where(*ready)
+            .order_by(TASKS.c.priority_rank, TASKS.c.created_at)
+            .offset(skip)
+            .limit(limit)
+        )).all()
+        return {
+            "project_id": project_id,
+            "total": total,
+            "tasks": [
+                {
+                    "task_number": row.task_number,
+                    "title": row.title,
+                    "status": row.status.value,
+                    "priority": row.priority,
+                    "agent_id": row.agent_id,
+                    "lease_owner": row.lease_owner,
+                    "due_date": row.due_date.isoformat() if row.due_date else None,
+                }
+                for row in rows
+            ],
+        }
+
+    async def renew(
+        self, project_id: str, task_number: int, agent_id: str,
+        lease_seconds: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """Extend ``agent_id``'s lease on a task; ConflictError if it was lost."""
+        lease = self._lease_for(lease_seconds)
+        now = datetime.utcnow()
+        renewed = (await self.db.execute(
+            update(TASKS)
+            .where(self._held_by(project_id, task_number, agent_id, now))
+            .values(lease_expires_at=now + lease)
+            .returning(*LEASE_COLUMNS)
+        )).first()
+        await self.db.commit()
+        if renewed is None:
+            await self._lease_lost(project_id, task_number, agent_id)
+        return lease_dict(renewed)
+
+    async def release(
+        self,
+        project_id: str,
+        task_number: int,
+        agent_id: str,
+        status: TaskStatusEnum = READY_STATUS,
+    ) -> Dict[str, Any]:
+        """End ``agent_id``'s lease, leaving the task in ``status``.
+
+        Releasing with ``To Do`` (the default) hands the task back to the
+        queue; a final status completes it. Raises ValidationError when the
+        transition rules do not allow ``In Progress -> status``.
+        """
+        if status == CLAIMED_STATUS:
+            raise ValidationError(
+                "A released task cannot stay In Progress; renew the lease instead"
+            )
+        now = datetime.utcnow()
+        held = (await self.db.execute(
+            select(TASKS).where(self._held_by(project_id, task_number, agent_id, now))
+        )).first()
+        if held is None:
+            await self.db.commit()
+            await self._lease_lost(project_id, task_number, agent_id)
+        machines = await status_machines.ensure_loaded(self.db)
+        facts = ObjectFacts(held)
+        facts["status"] = status.name
+        decision = machines.validate(
+            TASK_STATUS_ENUM, CLAIMED_STATUS.name, status.name, facts
+        )
+        values = {
+            "status": status, "lease_owner": None, "lease_expires_at": None,
+            "updated_at": now,
+        }
+        if status == TaskStatusEnum.COMPLETED:
+            values["completed_at"] = now
+        released = (await self.db.execute(
+            update(TASKS)
+            .where(self._held_by(project_id, task_number, agent_id, now))
+            .values(**values)
+            .returning(*LEASE_COLUMNS)
+        )).first()
+        if released is not None:
+            await record_transitions(
+                self.db, [(project_id, task_number, CLAIMED_STATUS, status)],
+                trigger_type="lease", context={"lease_owner": agent_id}, now=now,
+                requires_approval=decision.requires_approval,
+            )
+        await self.db.commit()
+        if released is None:
+            await self._lease_lost(project_id, task_number, agent_id)
+        return lease_dict(released)
+
+    @staticmethod
+    def _held_by(project_id: str, task_number: int, agent_id: str, now: datetime):
+        return and_(
+            TASKS.c.project_id == project_id,
+            TASKS.c.task_number == task_number,
+            TASKS.c.status == CLAIMED_STATUS,
+            TASKS.c.lease_owner == agent_id,
+            TASKS.c.lease_expires_at >= now,
+        )
+
+    async def _lease_lost(
+        self, project_id: str, task_number: int, agent_id: str
+    ) -> None:
+        found = (await self.db.execute(
+            select(TASKS.c.task_number).where(
+                TASKS.c.project_id == project_id, TASKS.c.task_number == task_number
+            )
+        )).first()
+        if found is None:
+            raise EntityNotFoundError("Task", f"{project_id}:{task_number}")
+        raise ConflictError(
+            f"Agent {agent_id} does not hold the lease on task "
+            f"{project_id}:{task_number}"
+        )
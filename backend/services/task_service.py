@@ -1,17 +1,31 @@
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 from sqlalchemy.orm import selectinload
-from sqlalchemy import and_, func, or_
-from typing import List, Optional, Tuple
+from sqlalchemy import and_, func, insert, or_
+from sqlalchemy.engine import Row
+from typing import List, Optional, Sequence, Tuple
 import uuid
 
 import backend.models as models
 from backend.schemas.task import TaskCreate, TaskUpdate
 from backend.schemas.comment import CommentCreate
 from backend.enums import TaskStatusEnum
+from backend.crud.task_transitions import record_transitions
+from .status_transition_service import TASK_STATUS_ENUM, ObjectFacts, status_machines
 from .exceptions import EntityNotFoundError, ValidationError
 from .utils import service_transaction
 
+TASKS_TABLE = models.Task.__table__
+
+# Columns exposed by the ``Task`` response schema, in schema order.
+TASK_ROW_FIELDS = (
+    "title", "description", "status", "agent_id", "start_date", "due_date",
+    "project_id", "task_number", "created_at", "updated_at", "is_archived",
+)
+
+# Relationships that callers may ask ``get_tasks`` to eager-load.
+TASK_RELATIONS = ("project", "agent")
+
 class TaskService:
     def __init__(self, db: AsyncSession):
         self.db = db
@@ -21,7 +35,7 @@ class TaskService:
             and_(models.Task.project_id == project_id, models.Task.task_number == task_number)
         ).options(
             selectinload(models.Task.project),
-            selectinload(models.Task.assignee)
+            selectinload(models.Task.agent)
         )
         result = await self.db.execute(query)
         task = result.scalar_one_or_none()
@@ -30,13 +44,49 @@ class TaskService:
         return task
 
     async def get_tasks_for_project(self, project_id: str, skip: int = 0, limit: int = 100) -> List[models.Task]:
-        query = select(models.Task).where(models.Task.project_id == project_id).offset(skip).limit(limit).options(
-            selectinload(models.Task.project),
-            selectinload(models.Task.assignee)
-        )
+        query = select(models.Task).where(models.Task.project_id == project_id).offset(skip).limit(limit)
         result = await self.db.execute(query)
         return result.scalars().all()
 
+    def _task_filters(
+        self,
+        project_id: Optional[uuid.UUID] = None,
+        agent_id: Optional[str] = None,
+        search: Optional[str] = None,
+        status: Optional[TaskStatusEnum] = None,
+        is_archived: Optional[bool] = None,
+    ) -> list:
+        """Build the WHERE clauses shared by the entity and row list paths."""
+        columns = TASKS_TABLE.c
+        filters = []
+        if project_id:
+            filters.append(columns.project_id == str(project_id))
+        if agent_id:
+            filters.append(columns.agent_id == agent_id)
+        if status:
+            filters.append(columns.status == status)
+        if is_archived is not None:
+            filters.append(columns.is_archived == is_archived)
+        if search:
+            filters.append(or_(
+                columns.title.ilike(f"%{search}%"),
+                columns.description.ilike(f"%{search}%")
+            ))
+        return filters
+
+    def _task_ordering(self, sort_by: Optional[str], sort_direction: Optional[str]):
+        sort_field = TASKS_TABLE.c.get(sort_by or "created_at", TASKS_TABLE.c.created_at)
+        if (sort_direction or "desc").lower() == "desc":
+            return sort_field.desc()
+        return sort_field.asc()
+
+    async def _count_tasks(self, filters: list) -> int:
+        count_query = select(func.count()).select_from(TASKS_TABLE)
+        if filters:
+            count_query = count_query.where(and_(*filters))
+        count_result = await self.db.execute(count_query)
+        return count_result.scalar()
+
     async def get_tasks(
         self, 
         project_id: uuid.UUID = None, 
@@ -47,63 +97,90 @@ class TaskService:
         status: Optional[TaskStatusEnum] = None,
         is_archived: Optional[bool] = None,
         sort_by: Optional[str] = "created_at",
-        sort_direction: Optional[str] = "desc"
+        sort_direction: Optional[str] = "desc",
+        load_relations: Sequence[str] = ()
     ) -> Tuple[List[models.Task], int]:
-        """Get tasks with filtering, sorting, and pagination"""
+        """Get tasks with filtering, sorting, and pagination.
+
+        Relationships are only eager-loaded when named in ``load_relations``
+        (``"project"``, ``"agent"``).
+        """
+        filters = self._task_filters(project_id, agent_id, search, status, is_archived)
+
         query = select(models.Task)
-        count_query = select(func.count()).select_from(models.Task)
-        
-        # Base filters
-        filters = []
-        if project_id:
-            filters.append(models.Task.project_id == str(project_id))
-        if agent_id:
-            filters.append(models.Task.assigned_to == agent_id)
-        if status:
-            filters.append(models.Task.status == status)
-        if is_archived is not None:
-            filters.append(models.Task.is_archived == is_archived)
-        
-        # Search filter
-        if search:
-            search_filter = or_(
-                models.Task.title.ilike(f"%{search}%"),
-                models.Task.description.ilike(f"%{search}%")
-            )
-            filters.append(search_filter)
-        
         if filters:
             query = query.where(and_(*filters))
-            count_query = count_query.where(and_(*filters))
-        
-        # Sorting
-        sort_field = getattr(models.Task, sort_by, models.Task.created_at)
-        if sort_direction.lower() == "desc":
-            query = query.order_by(sort_field.desc())
-        else:
-            query = query.order_by(sort_field.asc())
-        
-        # Pagination with correct relationship names
-        query = query.offset(skip).limit(limit).options(
-            selectinload(models.Task.project),
-            selectinload(models.Task.assignee)
-        )
-        
-        # Execute queries
+        query = query.order_by(self._task_ordering(sort_by, sort_direction))
+        query = query.offset(skip).limit(limit)
+
+        relation_options = [
+            selectinload(getattr(models.Task, name))
+            for name in load_relations if name in TASK_RELATIONS
+        ]
+        if relation_options:
+            query = query.options(*relation_options)
+
         result = await self.db.execute(query)
         tasks = result.scalars().all()
-        
-        count_result = await self.db.execute(count_query)
-        total = count_result.scalar()
-        
+
+        total = await self._count_tasks(filters)
         return tasks, total
 
+    async def get_task_rows(
+        self,
+        project_id: uuid.UUID = None,
+        skip: int = 0,
+        limit: int = 100,
+        agent_id: Optional[str] = None,
+        search: Optional[str] = None,
+        status: Optional[TaskStatusEnum] = None,
+        is_archived: Optional[bool] = None,
+        sort_by: Optional[str] = "created_at",
+        sort_direction: Optional[str] = "desc",
+        fields: Optional[Sequence[str]] = None
+    ) -> Tuple[List[Row], int]:
+        """Get tasks as column-projected rows instead of ORM entities.
+
+        Only the requested ``fields`` are selected (defaults to the columns of
+        the ``Task`` response schema). ``project_name`` and ``agent_name`` are
+        resolved with an outer join only when asked for.
+        """
+        fields = tuple(fields or TASK_ROW_FIELDS)
+        filters = self._task_filters(project_id, agent_id, search, status, is_archived)
+
+        columns = []
+        from_clause = TASKS_TABLE
+        for name in fields:
+            if name == "project_name":
+                projects = models.Project.__table__
+                from_clause = from_clause.outerjoin(
+                    projects, projects.c.id == TASKS_TABLE.c.project_id)
+                columns.append(projects.c.name.label("project_name"))
+            elif name == "agent_name":
+                agents = models.Agent.__table__
+                from_clause = from_clause.outerjoin(
+                    agents, agents.c.id == TASKS_TABLE.c.agent_id)
+                columns.append(agents.c.name.label("agent_name"))
+            elif name in TASKS_TABLE.c:
+                columns.append(TASKS_TABLE.c[name])
+            else:
+                raise ValidationError(f"Unknown task field: {name}")
+
+        query = select(*columns).select_from(from_clause)
+        if filters:
+            query = query.where(and_(*filters))
+        query = query.order_by(self._task_ordering(sort_by, sort_direction))
+        query = query.offset(skip).limit(limit)
+
+        result = await self.db.execute(query)
+        rows = result.all()
+
+        total = await self._count_tasks(filters)
+        return rows, total
+
     async def get_all_tasks(self, skip: int = 0, limit: int = 100) -> List[models.Task]:
         """Get all tasks across all projects"""
-        query = select(models.Task).offset(skip).limit(limit).options(
-            selectinload(models.Task.project),
-            selectinload(models.Task.assignee)
-        )
+        query = select(models.Task).offset(skip).limit(limit)
         result = await self.db.execute(query)
         return result.scalars().all()
 
@@ -126,6 +203,7 @@ class TaskService:
         
         # Create task with correct field mapping
         task_dict = task_data.model_dump()
+        required_capabilities = sorted(set(task_dict.pop('required_capabilities', None) or ()))
         # Remove assignee_id if it exists (legacy field) and use assigned_to
         if 'assignee_id' in task_dict:
             task_dict['assigned_to'] = task_dict.pop('assignee_id')
@@ -134,9 +212,20 @@ class TaskService:
             **task_dict,
             task_number=next_task_number
         )
+        machines = await status_machines.ensure_loaded(self.db)
+        decision = machines.validate(TASK_STATUS_ENUM, None, db_task.status.name, ObjectFacts(db_task))
         self.db.add(db_task)
         await self.db.flush()
-        await self.db.refresh(db_task, attribute_names=['project', 'assignee'])
+        await record_transitions(
+            self.db, [(db_task.project_id, next_task_number, None, db_task.status)], agent_id=db_task.agent_id,
+            requires_approval=decision.requires_approval,
+        )
+        if required_capabilities:
+            await self.db.execute(insert(models.TaskCapabilityRequirement.__table__), [
+                {"project_id": db_task.project_id, "task_number": next_task_number, "capability": capability}
+                for capability in required_capabilities
+            ])
+        await self.db.refresh(db_task, attribute_names=['project', 'agent'])
         return db_task
 
     @service_transaction
@@ -148,9 +237,19 @@ class TaskService:
         if "assignee_id" in update_data:
             update_data["assigned_to"] = update_data.pop("assignee_id")
 
+        previous_status = db_task.status
         for key, value in update_data.items():
             setattr(db_task, key, value)
-            
+
+        if db_task.status != previous_status:
+            machines = await status_machines.ensure_loaded(self.db)
+            decision = machines.validate(
+                TASK_STATUS_ENUM, previous_status.name, db_task.status.name, ObjectFacts(db_task)
+            )
+            await record_transitions(
+                self.db, [(project_id, task_number, previous_status, db_task.status)], agent_id=db_task.agent_id,
+                requires_approval=decision.requires_approval,
+            )
         await self.db.flush()
         await self.db.refresh(db_task)
         return db_task
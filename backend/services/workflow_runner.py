@@ -0,0 +1,749 @@
+"""
+Workflow execution engine.
+
+:class:`WorkflowRunner` drives ``task_workflow_executions`` through the
+ordered, active steps of their workflow. It keeps every open execution in
+memory, so thousands of in-flight executions cost a dict entry each plus a
+task only while an automated step is running.
+
+- A step ends when :meth:`WorkflowRunner.advance` reports its outcome
+  (``completed``, ``failed``, ``blocked`` or ``cancelled``), typically from
+  the agent doing the work. Steps whose title has a handler registered with
+  :meth:`WorkflowRunner.register` run automatically and advance on return.
+- Each agent runs at most ``WORKFLOW_AGENT_CONCURRENCY`` executions at a
+  time. Further executions wait as ``initialized`` and start, oldest first,
+  as slots free up.
+- State changes are applied in memory and written in batches every
+  ``WORKFLOW_FLUSH_SECONDS`` (one executemany insert and one update), and on
+  shutdown. If the database rejects a batch, its rows are written one at a
+  time and an execution whose row is still rejected is dropped, so one bad
+  row cannot hold back every other execution's writes.
+- The step index and step outputs live in ``execution_context``.
+  :meth:`WorkflowRunner.resume` reloads open executions after a restart and
+  re-runs automated steps that were interrupted.
+- Step definitions are loaded once per workflow and cached until a workflow
+  changes in any worker.
+
+Executions are held by one process: the worker holding the
+``workflow_runner`` row in ``worker_leases`` (workers with
+``WORKFLOW_RUNNER`` off never take it). On the other workers, and while no
+worker holds the lease, :meth:`WorkflowRunner.start_execution` writes the
+new execution as ``initialized`` with no current step, and
+:meth:`WorkflowRunner.advance` checks the stored execution and queues the
+outcome in ``workflow_execution_commands``. The holder adopts those
+executions and applies those outcomes on every tick, deleting the queued
+outcomes in the transaction that writes their effects, and resumes all
+open executions when it takes the lease over. :meth:`WorkflowRunner.get` falls
+back to the stored execution.
+"""
+import asyncio
+import logging
+import os
+import socket
+import uuid
+from collections import defaultdict, deque
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import (
+    Any, Awaitable, Callable, Deque, Dict, List, NamedTuple, Optional, Set, Tuple,
+)
+
+from sqlalchemy import bindparam, delete, insert, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend import models
+from backend.core.shared_state import get_shared_state
+from backend.crud.worker_leases import (  # noqa: F401
+    LEASES, acquire_lease, release_lease,
+)
+from backend.models.base import generate_uuid_with_hyphens
+from .exceptions import ConflictError, EntityNotFoundError, ValidationError
+
+try:
+    from backend.config.app_config import settings
+except ImportError:
+    from config.app_config import settings
+
+logger = logging.getLogger(__name__)
+
+EXECUTIONS = models.TaskWorkflowExecution.__table__
+STEPS = models.WorkflowStep.__table__
+COMMANDS = models.WorkflowExecutionCommand.__table__
+TASKS = models.Task.__table__
+AGENTS = models.Agent.__table__
+
+WORKFLOW_DEFINITIONS_NAME = "workflow_definitions"
+LEASE_NAME = "workflow_runner"
+COMMAND_BATCH = 500
+
+WAITING = "initialized"
+ACTIVE = "in_progress"
+BLOCKED = "blocked"
+COMPLETED = "completed"
+FAILED = "failed"
+CANCELLED = "cancelled"
+OPEN_STATUSES = (WAITING, ACTIVE, BLOCKED)
+OUTCOMES = (COMPLETED, FAILED, BLOCKED, CANCELLED)
+
+STATE_COLUMNS = (
+    "current_step_id", "current_agent_id", "status", "completed_at", "last_activity_at",
+    "steps_completed", "steps_total", "progress_percentage", "execution_context",
+    "error_details",
+)
+
+
+class StepDefinition(NamedTuple):
+    id: str
+    title: str
+    step_order: int
+    agent_role_id: str
+
+
+# handler(execution, step) -> output stored under the step's id
+StepHandler = Callable[
+    [Dict[str, Any], StepDefinition], Awaitable[Optional[Dict[str, Any]]]
+]
+
+
+class WorkflowDefinitions:
+    """Active steps of each workflow, loaded once and cached until invalidated."""
+
+    def __init__(self):
+        self._steps: Dict[str, Tuple[StepDefinition, ...]] = {}
+        self._listening = False
+
+    def invalidate(self) -> None:
+        self._steps.clear()
+
+    async def steps(
+        self, db: AsyncSession, workflow_id: str
+    ) -> Tuple[StepDefinition, ...]:
+        steps = self._steps.get(workflow_id)
+        if steps is not None:
+            return steps
+        if not self._listening:
+            get_shared_state().on_invalidate(WORKFLOW_DEFINITIONS_NAME, self.invalidate)
+            self._listening = True
+        rows = await db.execute(
+            select(STEPS.c.id, STEPS.c.title, STEPS.c.step_order, STEPS.c.agent_role_id)
+            .where(STEPS.c.workflow_id == workflow_id, STEPS.c.is_active.isnot(False))
+            .order_by(STEPS.c.step_order)
+        )
+        steps = self._steps[workflow_id] = tuple(StepDefinition(*row) for row in rows)
+        return steps
+
+
+@dataclass
+class Execution:
+    id: str
+    workflow_id: str
+    project_id: str
+    task_number: int
+    agent_id: Optional[str]
+    steps: Tuple[StepDefinition, ...]
+    status: str = WAITING
+    step_index: int = 0
+    outputs: Dict[str, Any] = field(default_factory=dict)
+    input: Dict[str, Any] = field(default_factory=dict)
+    error: Optional[Dict[str, Any]] = None
+    started_at: datetime = field(default_factory=datetime.utcnow)
+    completed_at: Optional[datetime] = None
+    last_activity_at: datetime = field(default_factory=datetime.utcnow)
+
+    @classmethod
+    def from_row(cls, row, steps: Tuple[StepDefinition, ...]) -> "Execution":
+        context = row.execution_context or {}
+        return cls(
+            id=row.id, workflow_id=row.workflow_id, project_id=row.task_project_id,
+            task_number=row.task_task_number, agent_id=row.current_agent_id,
+            steps=steps, status=row.status,
+            step_index=context.get("step_index", row.steps_completed),
+            outputs=context.get("outputs", {}), input=context.get("input", {}),
+            error=row.error_details, started_at=row.started_at,
+            completed_at=row.completed_at, last_activity_at=row.last_activity_at,
+        )
+
+    @property
+    def step(self) -> Optional[StepDefinition]:
+        if self.step_index < len(self.steps):
+            return self.steps[self.step_index]
+        return None
+
+    def row(self) -> Dict[str, Any]:
+        total = len(self.steps)
+        step = self.step if self.status in OPEN_STATUSES else None
+        return {
+            "current_step_id": step.id if step else None,
+            "current_agent_id": self.agent_id,
+            "status": self.status,
+            "completed_at": self.completed_at,
+            "last_activity_at": self.last_activity_at,
+            "steps_completed": self.step_index,
+            "steps_total": total,
+            "progress_percentage": (
+                round(100 * self.step_index / total, 2) if total else 100
+            ),
+            "execution_context": {
+                "step_index": self.step_index, "outputs": self.outputs,
+                "input": self.input,
+            },
+            "error_details": self.error,
+        }
+
+    def to_dict(self) -> Dict[str, Any]:
+        row = self.row()
+        step = self.step if self.status in OPEN_STATUSES else None
+        return {
+            "id": self.id,
+            "workflow_id": self.workflow_id,
+            "project_id": self.project_id,
+            "task_number": self.task_number,
+            "agent_id": self.agent_id,
+            "status": self.status,
+            "current_step": {
+                "id": step.id, "title": step.title, "step_order": step.step_order,
+            } if step else None,
+            "steps_completed": row["steps_completed"],
+            "steps_total": row["steps_total"],
+            "progress_percentage": float(row["progress_percentage"]),
+            "outputs": self.outputs,
+            "error": self.error,
+            "started_at": self.started_at.isoformat(),
+            "completed_at": (
+                self.completed_at.isoformat() if self.completed_at else None
+            ),
+        }
+
+
+class WorkflowRunner:
+    """Advances open workflow executions; see the module docstring."""
+
+    def __init__(
+        self,
+        session_maker=None,
+        agent_concurrency: Optional[int] = None,
+        definitions: Optional[WorkflowDefinitions] = None,
+        owner: Optional[str] = None,
+    ):
+        self._session_maker = session_maker
+        self.owner = owner or (
+            f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        )
+        self._lease_until: Optional[datetime] = None
+        if agent_concurrency is None:
+            agent_concurrency = settings.workflow_agent_concurrency
+        self.agent_concurrency = agent_concurrency
+        self.definitions = definitions or WorkflowDefinitions()
+        self._handlers: Dict[str, StepHandler] = {}
+        self._executions: Dict[str, Execution] = {}
+        self._running: Dict[str, int] = defaultdict(int)
+        self._waiting: Dict[str, Deque[str]] = defaultdict(deque)
+        self._new: Set[str] = set()
+        self._dirty: Set[str] = set()
+        self._step_tasks: Set[asyncio.Task] = set()
+        # Queued outcomes up to ``_applied_through`` are applied in memory;
+        # the next flush deletes them along with the state they produced.
+        self._applied_through = 0
+        self._deleted_through = 0
+        self._flush_lock = asyncio.Lock()
+        self._task: Optional[asyncio.Task] = None
+
+    def register(self, step_title: str, handler: StepHandler) -> None:
+        """Run ``handler`` automatically for every step titled ``step_title``."""
+        self._handlers[step_title] = handler
+
+    def _sessions(self):
+        if self._session_maker is None:
+            from backend.database import async_session_maker
+
+            self._session_maker = async_session_maker
+        return self._session_maker
+
+    @property
+    def owns(self) -> bool:
+        """Whether this runner holds the lease, and so the open executions."""
+        return self._lease_until is not None and datetime.utcnow() < self._lease_until
+
+    # -- public API -----------------------------------------------------------
+
+    async def start_execution(
+        self,
+        workflow_id: str,
+        project_id: str,
+        task_number: int,
+        agent_id: Optional[str] = None,
+        context: Optional[Dict[str, Any]] = None,
+        db: Optional[AsyncSession] = None,
+    ) -> Dict[str, Any]:
+        """Create an execution; it starts now or once ``agent_id`` has a free slot."""
+        if db is None:
+            async with self._sessions()() as db:
+                return await self.start_execution(
+                    workflow_id, project_id, task_number, agent_id, context, db
+                )
+        steps = await self.definitions.steps(db, workflow_id)
+        if not steps:
+            raise ValidationError(f"Workflow {workflow_id} has no active steps")
+        # The holder writes the row later, so a bad reference must fail now.
+        await self._check_references(db, project_id, task_number, agent_id)
+        execution = Execution(
+            id=generate_uuid_with_hyphens(), workflow_id=workflow_id,
+            project_id=project_id, task_number=task_number, agent_id=agent_id,
+            steps=steps, input=context or {},
+        )
+        if not self.owns:
+            # The lease holder adopts it on its next tick.
+            await db.execute(
+                insert(EXECUTIONS).values(self._insert_row(
+                    execution, current_step_id=None
+                ))
+            )
+            await db.commit()
+            return execution.to_dict()
+        self._executions[execution.id] = execution
+        self._new.add(execution.id)
+        self._schedule(execution)
+        return execution.to_dict()
+
+    @staticmethod
+    async def _check_references(
+        db: AsyncSession, project_id: str, task_number: int, agent_id: Optional[str]
+    ) -> None:
+        task = (await db.execute(
+            select(TASKS.c.task_number)
+            .where(TASKS.c.project_id == project_id, TASKS.c.task_number == task_number)
+        )).first()
+        if task is None:
+            raise EntityNotFoundError("Task", f"{project_id}:{task_number}")
+        if agent_id is not None and (await db.execute(
+            select(AGENTS.c.id).where(AGENTS.c.id == agent_id)
+        )).first() is None:
+            raise EntityNotFoundError("Agent", agent_id)
+
+    async def advance(
+        self,
+        execution_id: str,
+        outcome: str = COMPLETED,
+        output: Optional[Dict[str, Any]] = None,
+        error: Optional[str] = None,
+        db: Optional[AsyncSession] = None,
+    ) -> Dict[str, Any]:
+        """Report the outcome of the current step of an execution.
+
+        Away from the lease holder the outcome is checked against the stored
+        execution and queued; the result then carries ``pending_outcome``.
+        """
+        if outcome not in OUTCOMES:
+            raise ValidationError(f"outcome must be one of: {', '.join(OUTCOMES)}")
+        if self.owns:
+            if execution_id not in self._executions:
+                await self.sync()
+            if execution_id in self._executions:
+                return self._advance(execution_id, outcome, output, error)
+        if db is None:
+            async with self._sessions()() as db:
+                return await self.advance(execution_id, outcome, output, error, db)
+        execution = await self._stored(db, execution_id)
+        if execution is None:
+            raise EntityNotFoundError("Workflow execution", execution_id)
+        self._check_open(execution, outcome)
+        await db.execute(insert(COMMANDS).values(
+            execution_id=execution_id, outcome=outcome, output=output, error=error,
+            created_at=datetime.utcnow(),
+        ))
+        await db.commit()
+        return {**execution.to_dict(), "pending_outcome": outcome}
+
+    async def get(
+        self, execution_id: str, db: Optional[AsyncSession] = None
+    ) -> Optional[Dict[str, Any]]:
+        """An execution as held by this runner, or else as last written."""
+        execution = self._executions.get(execution_id)
+        if execution is not None:
+            return execution.to_dict()
+        if db is None:
+            async with self._sessions()() as db:
+                return await self.get(execution_id, db)
+        execution = await self._stored(db, execution_id)
+        return execution.to_dict() if execution else None
+
+    def stats(self) -> Dict[str, int]:
+        counts: Dict[str, int] = defaultdict(int)
+        for execution in self._executions.values():
+            counts[execution.status] += 1
+        return {
+            "owns_lease": int(self.owns), "in_memory": len(self._executions),
+            "step_tasks": len(self._step_tasks), **counts,
+        }
+
+    # -- state machine ----------------------------------------------------------
+
+    @staticmethod
+    def _check_open(execution: Execution, outcome: str) -> None:
+        if execution.status not in OPEN_STATUSES:
+            raise ConflictError(
+                f"Workflow execution {execution.id} is already {execution.status}"
+            )
+        if execution.status == WAITING and outcome != CANCELLED:
+            raise ConflictError(
+                f"Workflow execution {execution.id} is waiting for an agent slot"
+            )
+
+    def _advance(
+        self, execution_id: str, outcome: str, output: Optional[Dict[str, Any]],
+        error: Optional[str]
+    ) -> Dict[str, Any]:
+        execution = self._executions.get(execution_id)
+        if execution is None:
+            raise EntityNotFoundError("Workflow execution", execution_id)
+        self._check_open(execution, outcome)
+        if execution.status == WAITING:
+            self._waiting[execution.agent_id].remove(execution.id)
+            self._finish(execution, CANCELLED)
+        else:
+            self._apply(execution, outcome, output, error)
+        return execution.to_dict()
+
+    def _touch(self, execution: Execution) -> None:
+        execution.last_activity_at = datetime.utcnow()
+        self._dirty.add(execution.id)
+
+    def _schedule(self, execution: Execution) -> None:
+        agent = execution.agent_id
+        if agent is not None and self._running[agent] >= self.agent_concurrency:
+            execution.status = WAITING
+            self._waiting[agent].append(execution.id)
+            self._touch(execution)
+            return
+        if agent is not None:
+            self._running[agent] += 1
+        self._enter(execution)
+
+    def _enter(self, execution: Execution) -> None:
+        execution.status = ACTIVE
+        self._touch(execution)
+        handler = self._handlers.get(execution.step.title)
+        if handler is not None:
+            task = asyncio.create_task(self._run_step(
+                execution, execution.step_index, handler
+            ))
+            self._step_tasks.add(task)
+            task.add_done_callback(self._step_tasks.discard)
+
+    async def _run_step(
+        self, execution: Execution, step_index: int, handler: StepHandler
+    ) -> None:
+        try:
+            output = await handler(execution.to_dict(), execution.steps[step_index])
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            outcome, output, error = FAILED, None, str(e)
+        else:
+            outcome, error = COMPLETED, None
+        # The step may have been advanced or cancelled by hand meanwhile.
+        if execution.status == ACTIVE and execution.step_index == step_index:
+            self._apply(execution, outcome, output, error)
+
+    def _apply(
+        self, execution: Execution, outcome: str, output: Optional[Dict[str, Any]],
+        error: Optional[str],
+    ) -> None:
+        step = execution.step
+        if outcome == COMPLETED:
+            if output is not None:
+                execution.outputs[step.id] = output
+            execution.step_index += 1
+            if execution.step is None:
+                self._finish(execution, COMPLETED)
+            else:
+                self._enter(execution)
+        elif outcome == BLOCKED:
+            execution.status = BLOCKED
+            self._touch(execution)
+        else:
+            if error is not None:
+                execution.error = {
+                    "step_id": step.id, "step": step.title, "error": error
+                }
+            self._finish(execution, outcome)
+
+    def _finish(self, execution: Execution, status: str) -> None:
+        was_running = execution.status != WAITING
+        execution.status = status
+        execution.completed_at = datetime.utcnow()
+        self._touch(execution)
+        agent = execution.agent_id
+        if agent is not None and was_running:
+            self._running[agent] -= 1
+            if self._waiting[agent]:
+                self._schedule_waiting(agent)
+
+    def _schedule_waiting(self, agent: str) -> None:
+        execution = self._executions[self._waiting[agent].popleft()]
+        self._running[agent] += 1
+        self._enter(execution)
+
+    # -- persistence ------------------------------------------------------------
+
+    async def flush(self) -> int:
+        """Write new and changed executions in two batched statements.
+
+        Applied queued outcomes are deleted in the same transaction.
+        """
+        async with self._flush_lock:
+            applied = self._applied_through
+            if not self._dirty and not self._new and applied == self._deleted_through:
+                return 0
+            new, dirty = self._new, self._dirty - self._new
+            self._new, self._dirty = set(), set()
+            try:
+                await self._write(new, dirty, applied)
+            except IntegrityError as e:
+                logger.warning(f"Workflow state batch rejected, writing singly: {e}")
+                new, dirty = await self._write_singly(new, dirty, applied)
+            except Exception as e:
+                logger.warning(f"Workflow state flush failed, will retry: {e}")
+                self._new |= new
+                self._dirty |= dirty
+                return 0
+            # Finished executions leave memory once written.
+            for execution_id in new | dirty:
+                finished = self._executions[execution_id].status not in OPEN_STATUSES
+                if execution_id not in self._dirty and finished:
+                    del self._executions[execution_id]
+            return len(new) + len(dirty)
+
+    async def _write(self, new: Set[str], dirty: Set[str], applied: int) -> None:
+        inserts = [self._insert_row(self._executions[i]) for i in new]
+        updates = [{"_id": i, **self._executions[i].row()} for i in dirty]
+        async with self._sessions()() as db:
+            if inserts:
+                await db.execute(insert(EXECUTIONS), inserts)
+            if updates:
+                await db.execute(
+                    update(EXECUTIONS)
+                    .where(EXECUTIONS.c.id == bindparam("_id"))
+                    .values({column: bindparam(column) for column in STATE_COLUMNS}),
+                    updates,
+                )
+            if applied > self._deleted_through:
+                await db.execute(delete(COMMANDS).where(COMMANDS.c.id <= applied))
+            await db.commit()
+        self._deleted_through = max(self._deleted_through, applied)
+
+    async def _write_singly(
+        self, new: Set[str], dirty: Set[str], applied: int
+    ) -> Tuple[Set[str], Set[str]]:
+        """Write rows one transaction each; returns the ones written."""
+        written_new, written_dirty = set(), set()
+        for execution_id in new | dirty:
+            inserting = execution_id in new
+            try:
+                await self._write(
+                    {execution_id} if inserting else set(),
+                    set() if inserting else {execution_id}, 0,
+                )
+            except IntegrityError as e:
+                logger.error(
+                    f"Dropping workflow execution {execution_id}: "
+                    f"the database rejects its state: {e}"
+                )
+                self._discard(execution_id)
+                continue
+            except Exception as e:
+                logger.warning(f"Workflow state write failed, will retry: {e}")
+                (self._new if inserting else self._dirty).add(execution_id)
+                continue
+            (written_new if inserting else written_dirty).add(execution_id)
+        # Queued outcomes go only once everything they changed is written.
+        if not self._new and not self._dirty and applied > self._deleted_through:
+            try:
+                await self._write(set(), set(), applied)
+            except Exception as e:
+                logger.warning(f"Could not delete applied workflow outcomes: {e}")
+        return written_new, written_dirty
+
+    def _discard(self, execution_id: str) -> None:
+        """Forget an execution without writing it, freeing its agent's slot."""
+        execution = self._executions[execution_id]
+        if execution.status == WAITING:
+            self._waiting[execution.agent_id].remove(execution_id)
+        elif execution.status in OPEN_STATUSES:
+            self._finish(execution, FAILED)
+        del self._executions[execution_id]
+        self._new.discard(execution_id)
+        self._dirty.discard(execution_id)
+
+    @staticmethod
+    def _insert_row(execution: Execution, **values: Any) -> Dict[str, Any]:
+        return {
+            "id": execution.id,
+            "task_project_id": execution.project_id,
+            "task_task_number": execution.task_number,
+            "workflow_id": execution.workflow_id,
+            "started_at": execution.started_at,
+            **execution.row(),
+            **values,
+        }
+
+    async def _stored(self, db: AsyncSession, execution_id: str) -> Optional[Execution]:
+        row = (await db.execute(
+            select(EXECUTIONS).where(EXECUTIONS.c.id == execution_id)
+        )).first()
+        if row is None:
+            return None
+        return Execution.from_row(
+            row, await self.definitions.steps(db, row.workflow_id)
+        )
+
+    async def resume(self) -> int:
+        """Load open executions written by a previous holder; returns how many."""
+        async with self._sessions()() as db:
+            resumed = await self._load(db, EXECUTIONS.c.status.in_(OPEN_STATUSES))
+        if resumed:
+            logger.info("Resumed %d workflow executions", resumed)
+        return resumed
+
+    async def sync(self) -> Tuple[int, int]:
+        """Adopt executions started elsewhere and apply outcomes queued
+        elsewhere; returns how many of each.
+
+        Applied outcomes stay queued until :meth:`flush` writes their effects.
+        """
+        async with self._sessions()() as db:
+            adopted = await self._load(
+                db, EXECUTIONS.c.status == WAITING,
+                EXECUTIONS.c.current_step_id.is_(None),
+            )
+            commands = (await db.execute(
+                select(COMMANDS)
+                .where(COMMANDS.c.id > self._applied_through)
+                .order_by(COMMANDS.c.id)
+                .limit(COMMAND_BATCH)
+            )).all()
+        if commands:
+            self._applied_through = commands[-1].id
+        for command in commands:
+            try:
+                self._advance(
+                    command.execution_id, command.outcome, command.output, command.error
+                )
+            except (EntityNotFoundError, ConflictError) as e:
+                logger.warning(f"Dropped queued workflow outcome: {e}")
+        return adopted, len(commands)
+
+    async def _load(self, db: AsyncSession, *where) -> int:
+        rows = (await db.execute(
+            select(EXECUTIONS).where(*where).order_by(EXECUTIONS.c.started_at)
+        )).all()
+        loaded: List[Execution] = []
+        for row in rows:
+            if row.id not in self._executions:
+                execution = Execution.from_row(
+                    row, await self.definitions.steps(db, row.workflow_id)
+                )
+                self._executions[execution.id] = execution
+                loaded.append(execution)
+        for execution in loaded:
+            if execution.step is None:
+                # The workflow lost steps since the execution was written.
+                self._running[execution.agent_id] += execution.agent_id is not None
+                self._finish(execution, COMPLETED if execution.steps else FAILED)
+            elif execution.status == WAITING:
+                self._schedule(execution)
+            elif execution.status == BLOCKED:
+                self._running[execution.agent_id] += execution.agent_id is not None
+            else:
+                if execution.agent_id is not None:
+                    self._running[execution.agent_id] += 1
+                self._enter(execution)
+        return len(loaded)
+
+    def _drop(self) -> None:
+        """Forget all executions; the next lease holder resumes them as written."""
+        for task in list(self._step_tasks):
+            task.cancel()
+        self._executions.clear()
+        self._running.clear()
+        self._waiting.clear()
+        self._new, self._dirty = set(), set()
+        self._applied_through = self._deleted_through = 0
+
+    # -- lifecycle -------------------------------------------------------------
+
+    async def tick(self, now: Optional[datetime] = None) -> Dict[str, int]:
+        """Take or renew the lease; as its holder, adopt, apply and flush.
+
+        Returns what was done, or ``{}`` without the lease.
+        """
+        now = now or datetime.utcnow()
+        lease = timedelta(seconds=settings.workflow_lease_seconds)
+        done: Dict[str, int] = {}
+        # Renew at most every third of the lease, however often this runs.
+        if self._lease_until is None or now >= self._lease_until - lease * 2 / 3:
+            async with self._sessions()() as db:
+                until = await acquire_lease(
+                    db, LEASE_NAME, self.owner, settings.workflow_lease_seconds, now
+                )
+            if until is None:
+                if self._lease_until is not None:
+                    logger.warning(
+                        "Lost the workflow runner lease; dropping in-memory executions"
+                    )
+                    self._drop()
+                self._lease_until = None
+                return done
+            if self._lease_until is None:
+                self._lease_until = until
+                done["resumed"] = await self.resume()
+            self._lease_until = until
+        done["adopted"], done["applied"] = await self.sync()
+        done["flushed"] = await self.flush()
+        return {name: count for name, count in done.items() if count}
+
+    def start(self, interval: Optional[float] = None) -> None:
+        """Start the periodic tick on the running loop."""
+        interval = settings.workflow_flush_seconds if interval is None else interval
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run(interval))
+
+    async def stop(self) -> None:
+        """Stop automated steps and the tick, write pending state and
+        release the lease.
+
+        Interrupted steps are still current in the written state and run
+        again on :meth:`resume`.
+        """
+        for task in list(self._step_tasks):
+            task.cancel()
+        await asyncio.gather(*self._step_tasks, return_exceptions=True)
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self._lease_until is None:
+            return
+        await self.flush()
+        try:
+            async with self._sessions()() as db:
+                await release_lease(db, LEASE_NAME, self.owner)
+        except Exception as e:
+            logger.warning(f"Could not release the workflow runner lease: {e}")
+        self._lease_until = None
+        self._drop()
+
+    async def _run(self, interval: float) -> None:
+        while True:
+            try:
+                await self.tick()
+            except Exception as e:
+                logger.warning(f"Workflow runner tick failed, will retry: {e}")
+            await asyncio.sleep(interval)
+
+
+workflow_runner = WorkflowRunner()
@@ -7,6 +7,8 @@ from .. import models
 from ..schemas.workflow import WorkflowCreate, WorkflowUpdate
 from ..services.exceptions import EntityNotFoundError
 from ..database import get_db
+from ..core.shared_state import get_shared_state
+from .workflow_runner import WORKFLOW_DEFINITIONS_NAME
 
 
 class WorkflowService:
@@ -54,6 +56,7 @@ class WorkflowService:
         for key, value in update_data.items():
             setattr(db_workflow, key, value)
         await self.db.commit()
+        await get_shared_state().invalidate(WORKFLOW_DEFINITIONS_NAME)
         await self.db.refresh(db_workflow)
         return db_workflow
 
@@ -63,4 +66,5 @@ class WorkflowService:
             return False
         await self.db.delete(db_workflow)
         await self.db.commit()
+        await get_shared_state().invalidate(WORKFLOW_DEFINITIONS_NAME)
         return True
@@ -3,6 +3,7 @@ import asyncio
 import pytest
 import pytest_asyncio
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.pool import StaticPool
 from fastapi.testclient import TestClient
@@ -15,6 +16,7 @@ from backend.models.agent import Agent
 from backend.models.project import Project
 from backend.models.task import Task
 from backend.enums import ProjectStatus, ProjectPriority, TaskStatusEnum, ProjectVisibility
+from backend.services.status_transition_service import status_machines
 
 # Test database URL
 SQLALCHEMY_TEST_DATABASE_URL = "sqlite:///./test.db"
@@ -74,6 +76,29 @@ async def async_client(db_session):
         yield ac
 
 
+@pytest.fixture
+async def sessions(request, tmp_path):
+    """Async session factory on a fresh SQLite file database.
+
+    Creates the test module's ``TABLES`` and runs its optional
+    ``async def seed(conn, tmp_path)`` in the same transaction. Parametrize
+    indirectly with ``{"tables": [...], "seed": ...}`` to override either
+    for one test.
+    """
+    options = getattr(request, "param", {})
+    tables = options.get("tables", getattr(request.module, "TABLES", None))
+    seed = options.get("seed", getattr(request.module, "seed", None))
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'test.db'}")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all, tables=tables)
+        if seed is not None:
+            await seed(conn, tmp_path)
+    # Rules are cached per process; the shared state listener drops them in the app.
+    status_machines.invalidate()
+    yield async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    await engine.dispose()
+
+
 @pytest.fixture
 def sample_user(db_session):
     """Create a sample user for testing."""
@@ -0,0 +1,79 @@
+"""Tests for MCP tool admission control."""
+import asyncio
+
+import pytest
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+from backend import models
+from backend.core.admission import AdmissionController, LocalRateLimiter, Overloaded
+from backend.database import Base
+
+
+@pytest.fixture
+async def engine(tmp_path):
+    engine = create_async_engine(
+        f"sqlite+aiosqlite:///{tmp_path / 'tools.db'}",
+        poolclass=AsyncAdaptedQueuePool, pool_size=1, max_overflow=0,
+    )
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all, tables=[models.MCPTool.__table__])
+        await conn.execute(insert(models.MCPTool.__table__), [
+            {"name": "slow_tool", "timeout_seconds": 0, "rate_limit_per_minute": 60},
+            {"name": "strict_tool", "timeout_seconds": 5, "rate_limit_per_minute": 2},
+        ])
+    yield engine
+    await engine.dispose()
+
+
+@pytest.fixture
+def controller(engine):
+    return AdmissionController(
+        LocalRateLimiter(), async_sessionmaker(engine, class_=AsyncSession), engine,
+        enabled=True)
+
+
+async def echo(value):
+    return value
+
+
+async def test_token_bucket_refills_over_time():
+    limiter = LocalRateLimiter()
+    assert [await limiter.take("k", 2) for _ in range(2)] == [0.0, 0.0]
+    wait = await limiter.take("k", 2)
+    assert 29 < wait <= 30
+    limiter._buckets["k"] = (0.0, limiter._buckets["k"][1] - 30)
+    assert await limiter.take("k", 2) == 0.0
+
+
+async def test_rate_limits_come_from_tool_rows_per_agent(controller):
+    """Test a tool's rate_limit_per_minute applies to each agent separately."""
+    assert await controller.run("strict_tool", "a", echo, 1) == 1
+    assert await controller.run("strict_tool", "a", echo, 2) == 2
+    with pytest.raises(Overloaded) as rejected:
+        await controller.run("strict_tool", "a", echo, 3)
+    assert rejected.value.retry_after > 0
+    assert await controller.run("strict_tool", "b", echo, 4) == 4
+    assert await controller.run("unlisted_tool", "a", echo, 5) == 5
+
+
+async def test_deadline_and_load_shedding(controller, engine, monkeypatch):
+    with pytest.raises(asyncio.TimeoutError):
+        await controller.run("slow_tool", None, asyncio.sleep, 0.05)
+
+    async with engine.connect():
+        with pytest.raises(Overloaded, match="pool"):
+            await controller.run("unlisted_tool", None, echo, 1)
+
+    from backend.core import admission
+    monkeypatch.setattr(admission.settings, "mcp_tool_concurrency", 1)
+    monkeypatch.setattr(admission.settings, "mcp_tool_queue", 1)
+    release = asyncio.Event()
+    running = asyncio.ensure_future(controller.run("busy_tool", None, release.wait))
+    queued = asyncio.ensure_future(controller.run("busy_tool", None, echo, "queued"))
+    await asyncio.sleep(0)
+    with pytest.raises(Overloaded, match="queued"):
+        await controller.run("busy_tool", None, echo, "shed")
+    release.set()
+    assert await running is True and await queued == "queued"
@@ -0,0 +1,100 @@
+"""Tests for agent performance metric rollups."""
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import insert
+
+from backend.enums import TaskStatusEnum
+from backend.services.agent_metrics_service import (
+    EXECUTIONS, HANDOFFS, METRICS_TABLE, TRANSITIONS, WATERMARKS, AgentMetricsService,
+    rollup,
+)
+from backend.services.exceptions import ValidationError
+
+MONDAY = datetime(2025, 7, 7, 9)
+
+
+def completion(agent_id, at, duration):
+    return {
+        "task_project_id": "p1", "task_task_number": 1,
+        "from_status": TaskStatusEnum.IN_PROGRESS,
+        "to_status": TaskStatusEnum.COMPLETED, "agent_id": agent_id, "automated": False,
+        "requires_approval": False, "transitioned_at": at, "duration_seconds": duration,
+    }
+
+
+def execution(n, agent_id, at, status):
+    return {
+        "tool_name": "claim_task_tool", "agent_id": agent_id,
+        "execution_id": f"exec-{n}", "execution_status": status, "execution_time_ms": 5,
+        "retry_count": 0, "executed_at": at,
+    }
+
+
+TABLES = [TRANSITIONS, HANDOFFS, EXECUTIONS, METRICS_TABLE, WATERMARKS]
+
+
+async def seed(conn, tmp_path):
+    await conn.execute(insert(TRANSITIONS), [
+        completion("a", MONDAY, 600),
+        completion("a", MONDAY + timedelta(minutes=30), 1200),
+        completion("b", MONDAY + timedelta(days=1), None),
+    ])
+    await conn.execute(insert(HANDOFFS).values(
+        task_project_id="p1", task_task_number=2, from_agent_id="a", to_agent_id="b",
+        handoff_reason="specialization", handoff_at=MONDAY + timedelta(minutes=10),
+        status="accepted",
+    ))
+    await conn.execute(insert(EXECUTIONS), [
+        execution(1, "a", MONDAY, "success"),
+        execution(2, "a", MONDAY, "error"),
+        execution(3, "a", MONDAY, "success"),
+        execution(4, "a", MONDAY, "success"),
+    ])
+
+
+def values(rows):
+    return {row["metric_type"]: (row["value"], row["samples"]) for row in rows}
+
+
+async def test_rollup_aggregates_windows_and_only_adds_new_rows(sessions):
+    async with sessions() as db:
+        first = await rollup(db, now=MONDAY + timedelta(days=2), lag_seconds=0)
+        assert first["since"] is None and first["windows"]
+        metrics = AgentMetricsService(db)
+        hourly = await metrics.agent_metrics("a", "hourly")
+        assert values(hourly) == {
+            "task_completion": (2, 2), "avg_duration": (900, 2),
+            "handoff_rate": (0.3333, 3), "error_rate": (0.25, 4),
+        }
+        assert hourly[0]["period_start"] == "2025-07-07T09:00:00"
+        assert hourly[0]["period_end"] == "2025-07-07T10:00:00"
+        weekly = await metrics.agent_metrics("b", "weekly")
+        assert values(weekly) == {"task_completion": (1, 1), "handoff_rate": (0, 1)}
+        assert weekly[0]["period_start"] == "2025-07-07T00:00:00"
+
+        # Nothing new: the watermark holds and nothing is counted twice.
+        again = await rollup(db, now=MONDAY + timedelta(days=2), lag_seconds=0)
+        assert again["windows"] == 0
+        # Rows newer than the lag wait for the next run.
+        await db.execute(
+            insert(TRANSITIONS).values(**completion(
+                "a", MONDAY + timedelta(days=2, seconds=30), 2700
+            ))
+        )
+        await db.commit()
+        early = await rollup(
+            db, now=MONDAY + timedelta(days=2, seconds=60), lag_seconds=60
+        )
+        assert early["windows"] == 0
+        await rollup(db, now=MONDAY + timedelta(days=2, seconds=120), lag_seconds=60)
+        weekly = values(await metrics.agent_metrics("a", "weekly"))
+        assert weekly["task_completion"] == (3, 3) and weekly["avg_duration"] == (
+            1500, 3
+        )
+        assert weekly["handoff_rate"] == (0.25, 4)
+
+        top = await metrics.top_agents("task_completion", "weekly", at=MONDAY)
+        assert [(row["agent_id"], row["value"]) for row in top] == [("a", 3), ("b", 1)]
+        with pytest.raises(ValidationError):
+            await metrics.agent_metrics("a", "monthly")
@@ -0,0 +1,56 @@
+"""Tests for the profile-based application factory."""
+import pytest
+from fastapi.testclient import TestClient
+
+from backend import models
+from backend.app_factory import (
+    PROFILES, background_services, create_app, resolve_features,
+)
+
+
+def route_paths(app):
+    return {getattr(route, "path", "") for route in app.routes}
+
+
+def test_minimal_profile_only_serves_health():
+    """Test the minimal profile mounts no feature routers."""
+    app = create_app("minimal", init_db=False)
+    assert not any(path.startswith("/api/v1") for path in route_paths(app))
+
+    response = TestClient(app).get("/health")
+    assert response.status_code == 200
+    assert response.json()["profile"] == "minimal"
+
+
+def test_core_profile_mounts_task_routes():
+    """Test the core profile mounts the project and task routers."""
+    app = create_app("core", init_db=False)
+    assert "/api/v1/projects/{project_id}/tasks/" in route_paths(app)
+    assert set(app.state.import_timings) == set(PROFILES["core"])
+
+
+def test_background_services_follow_features():
+    """Test only the features a profile enables start background services."""
+    assert background_services(PROFILES["minimal"]) == ()
+    core = [service.attribute for service in background_services(PROFILES["core"])]
+    assert core == ["counters", "agent_metrics_rollup", "deadline_scheduler"]
+
+
+def test_extra_features_are_added_to_profile():
+    """Test individual features can be layered onto a profile."""
+    assert resolve_features("minimal", ["memory"]) == ("memory",)
+
+
+def test_unknown_profile_and_feature_are_rejected():
+    """Test invalid profile or feature names raise."""
+    with pytest.raises(ValueError):
+        resolve_features("nope")
+    with pytest.raises(ValueError):
+        resolve_features("core", ["nope"])
+
+
+def test_lazy_models_resolve_on_access():
+    """Test lazily loaded models are importable through the package."""
+    assert models.MCPTool.__tablename__ == "mcp_tools"
+    models.load_all_models()
+    assert "audit_logs" in models.Base.metadata.tables
@@ -0,0 +1,60 @@
+"""Tests for the precomputed OpenAPI document and tool catalogue."""
+import orjson
+from fastapi.testclient import TestClient
+
+from backend.app_factory import create_app
+from backend.core import catalogue
+from backend.core.catalogue import catalogue_for, write_artifact
+
+
+def test_openapi_is_served_with_etag_and_compression():
+    client = TestClient(create_app("core", init_db=False))
+    response = client.get("/openapi.json", headers={"Accept-Encoding": "gzip"})
+    assert response.status_code == 200
+    assert response.headers["content-encoding"] == "gzip"
+    assert "/api/v1/projects/" in response.json()["paths"]
+
+    etag = response.headers["etag"]
+    cached = client.get("/openapi.json", headers={"If-None-Match": etag})
+    assert cached.status_code == 304
+
+
+def test_tool_catalogue_compact_and_full():
+    """Test compact entries carry no schema and full entries inline theirs."""
+    client = TestClient(create_app("minimal", features=["mcp"], init_db=False))
+    compact = client.get("/api/v1/mcp-tools/list")
+    tools = {tool["name"]: tool for tool in compact.json()["tools"]}
+    assert tools["create_task_tool"]["method"] == "POST"
+    assert "input_schema" not in tools["create_task_tool"]
+
+    full = client.get(
+        "/api/v1/mcp-tools/list",
+        params={"detail": "full", "names": "create_task_tool,nope"},
+    ).json()
+    assert full["success"] is True
+    [tool] = full["tools"]
+    schema = tool["input_schema"]
+    assert {"project_id", "title"} <= set(schema["properties"])
+    assert "title" in schema["required"]
+    assert "$ref" not in orjson.dumps(schema).decode()
+
+    cached = client.get(
+        "/api/v1/mcp-tools/list", headers={"If-None-Match": compact.headers["etag"]}
+    )
+    assert cached.status_code == 304
+
+
+def test_build_artifact_is_loaded_only_while_routes_match(tmp_path, monkeypatch):
+    built = create_app("core", init_db=False)
+    path = write_artifact(built, str(tmp_path))
+    stored = orjson.loads(open(path, "rb").read())
+    stored["openapi"]["info"]["title"] = "From artifact"
+    open(path, "wb").write(orjson.dumps(stored))
+    monkeypatch.setattr(catalogue.settings, "catalogue_dir", str(tmp_path))
+
+    def title(app):
+        return orjson.loads(catalogue_for(app).openapi.body)["info"]["title"]
+
+    assert title(create_app("core", init_db=False)) == "From artifact"
+    changed = create_app("core", features=["memory"], init_db=False)
+    assert title(changed) != "From artifact"
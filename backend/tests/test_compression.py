@@ -0,0 +1,134 @@
+"""Tests for negotiated response compression."""
+import asyncio
+import gzip
+import zlib
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from starlette.responses import Response, StreamingResponse
+
+from backend.core.compression import (
+    CompressionMiddleware, is_compressible, negotiate_encoding,
+)
+from backend.core.responses import ORJSONResponse, setup_response_layer
+
+
+def build_app() -> FastAPI:
+    app = FastAPI()
+    setup_response_layer(app, minimum_size=100)
+
+    @app.get("/big")
+    async def big():
+        return {"items": ["x" * 10] * 100}
+
+    @app.get("/small")
+    async def small():
+        return {"ok": True}
+
+    @app.get("/binary")
+    async def binary():
+        return Response(b"\x00" * 5000, media_type="application/zip")
+
+    @app.get("/stream")
+    async def stream():
+        async def chunks():
+            for n in range(50):
+                yield (f"line {n} " * 20 + "\n").encode()
+        return StreamingResponse(chunks(), media_type="text/plain")
+
+    return app
+
+
+def test_negotiate_encoding_respects_qvalues():
+    """Test client preferences and server tie-breaking."""
+    assert negotiate_encoding("gzip, br;q=0.5", ["br", "gzip"]) == "gzip"
+    assert negotiate_encoding("gzip, br", ["br", "gzip"]) == "br"
+    assert negotiate_encoding("identity", ["gzip"]) is None
+    assert negotiate_encoding("*;q=0.1", ["gzip"]) == "gzip"
+    assert negotiate_encoding("gzip;q=0", ["gzip"]) is None
+
+
+def test_is_compressible_by_content_type():
+    """Test text-like types compress and binary or SSE types do not."""
+    assert is_compressible("application/json")
+    assert is_compressible("application/problem+json")
+    assert is_compressible("text/html; charset=utf-8")
+    assert not is_compressible("application/zip")
+    assert not is_compressible("image/png")
+    assert not is_compressible("text/event-stream")
+
+
+def test_default_response_class_is_orjson():
+    """Test routes registered after setup use ORJSONResponse."""
+    app = build_app()
+    route = next(r for r in app.routes if getattr(r, "path", None) == "/big")
+    assert route.response_class is ORJSONResponse
+
+
+def test_large_json_is_gzipped():
+    """Test bodies above the threshold are compressed."""
+    client = TestClient(build_app())
+    response = client.get("/big", headers={"Accept-Encoding": "gzip"})
+    assert response.headers["content-encoding"] == "gzip"
+    assert "accept-encoding" in response.headers["vary"].lower()
+    assert len(response.json()["items"]) == 100
+
+
+def test_small_and_binary_bodies_are_not_compressed():
+    """Test small bodies and binary downloads pass through untouched."""
+    client = TestClient(build_app())
+    small = client.get("/small", headers={"Accept-Encoding": "gzip"})
+    assert "content-encoding" not in small.headers
+    binary = client.get("/binary", headers={"Accept-Encoding": "gzip"})
+    assert "content-encoding" not in binary.headers
+    assert len(binary.content) == 5000
+
+
+def test_uncompressed_responses_still_vary_on_accept_encoding():
+    """Test caches learn the body depends on Accept-Encoding."""
+    client = TestClient(build_app())
+    small = client.get("/small", headers={"Accept-Encoding": "gzip"})
+    assert "accept-encoding" in small.headers["vary"].lower()
+    identity = client.get("/big", headers={"Accept-Encoding": "identity"})
+    assert "content-encoding" not in identity.headers
+    assert "accept-encoding" in identity.headers["vary"].lower()
+
+
+def test_streaming_body_is_compressed_incrementally():
+    """Test multi-chunk responses are compressed without a content length."""
+    client = TestClient(build_app())
+    headers = {"Accept-Encoding": "gzip"}
+    with client.stream("GET", "/stream", headers=headers) as response:
+        assert response.headers["content-encoding"] == "gzip"
+        assert "content-length" not in response.headers
+        raw = b"".join(response.iter_raw())
+    assert gzip.decompress(raw).decode().startswith("line 0 ")
+
+
+def test_streamed_chunks_are_flushed_as_they_arrive():
+    """Test each compressed chunk decodes to the lines sent so far."""
+    lines = [f'{{"n": {n}}}\n'.encode() for n in range(5)]
+
+    async def app(scope, receive, send):
+        await send({
+            "type": "http.response.start", "status": 200,
+            "headers": [(b"content-type", b"application/x-ndjson")],
+        })
+        for line in lines:
+            await send({"type": "http.response.body", "body": line, "more_body": True})
+        await send({"type": "http.response.body", "body": b""})
+
+    sent = []
+
+    async def send(message):
+        sent.append(message)
+
+    scope = {
+        "type": "http", "method": "GET", "path": "/",
+        "headers": [(b"accept-encoding", b"gzip")],
+    }
+    asyncio.run(CompressionMiddleware(app, minimum_size=1)(scope, None, send))
+    decoder = zlib.decompressobj(31)
+    bodies = [message["body"] for message in sent[1:]]
+    for n, body in enumerate(bodies[:len(lines)]):
+        assert decoder.decompress(body) == lines[n]
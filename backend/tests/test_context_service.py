@@ -0,0 +1,124 @@
+"""Tests for token-budgeted task context assembly."""
+import datetime
+
+import pytest
+from sqlalchemy import insert
+
+from backend import models
+from backend.enums import TaskStatusEnum
+from backend.models.task_dependency import TaskDependency
+from backend.services import context_service, memory_service
+from backend.services.context_service import (
+    ContextItem, ContextService, estimate_tokens, pack,
+)
+from backend.services.exceptions import EntityNotFoundError, ValidationError
+from backend.services.semantic_search_service import SemanticMemoryIndex
+
+TABLES = [model.__table__ for model in (
+    models.Project, models.Agent, models.Task, TaskDependency, models.Comment,
+    models.UniversalMandate, models.MemoryEntity, models.MemoryObservation,
+    models.MemoryPassage, models.ProjectFileAssociation, models.AgentRole,
+)]
+
+
+def test_pack_ranks_truncates_and_omits():
+    """Test sections pack in priority order and the last fitting text is truncated."""
+    items = [
+        ContextItem("files", 0.0, "notes.md", {"name": "notes.md"}),
+        ContextItem("comments", 0.5, "older " * 100, {"text": "older " * 100}),
+        ContextItem("comments", 1.0, "newest", {"text": "newest"}),
+        ContextItem("task", 1.0, "task " * 40, {"text": "task " * 40}),
+    ]
+    sections, used, omitted = pack(items, 120)
+    assert list(sections) == ["task", "comments"]
+    assert sections["comments"][0]["text"] == "newest"
+    assert sections["comments"][1]["truncated"] is True
+    assert used <= 120
+    assert omitted == {"files": 1}
+    assert estimate_tokens("abcde") == 2
+
+
+@pytest.fixture(autouse=True)
+def fresh_indexes(tmp_path, monkeypatch):
+    monkeypatch.setattr(
+        memory_service, "semantic_index", SemanticMemoryIndex(str(tmp_path / "index"))
+    )
+    monkeypatch.setattr(context_service, "_cache", type(context_service._cache)())
+
+
+async def seed(conn, tmp_path):
+    await conn.execute(
+        insert(models.Project.__table__), [{"id": "p1", "name": "Migration"}]
+    )
+    await conn.execute(insert(models.Task.__table__), [
+        {"project_id": "p1", "task_number": n, "title": title, "status": status,
+         "description": description}
+        for n, title, status, description in [
+            (
+                1, "Write schema migration", TaskStatusEnum.IN_PROGRESS,
+                "Move user tables to the new schema.",
+            ),
+            (2, "Design schema", TaskStatusEnum.COMPLETED, None),
+            (3, "Deploy", TaskStatusEnum.TO_DO, None),
+        ]
+    ])
+    await conn.execute(insert(TaskDependency.__table__), [
+        {"predecessor_project_id": "p1", "predecessor_task_number": 2,
+         "successor_project_id": "p1", "successor_task_number": 1,
+         "type": "finish_to_start"},
+        {"predecessor_project_id": "p1", "predecessor_task_number": 1,
+         "successor_project_id": "p1", "successor_task_number": 3,
+         "type": "finish_to_start"},
+    ])
+    await conn.execute(insert(models.Comment.__table__), [
+        {"task_project_id": "p1", "task_task_number": 1, "content": f"comment {n}",
+         "created_at": datetime.datetime(2025, 1, n + 1)}
+        for n in range(3)
+    ])
+    await conn.execute(insert(models.UniversalMandate.__table__), [
+        {"mandate": "Never drop tables without a backup.", "is_active": True},
+        {"mandate": "Retired rule.", "is_active": False},
+    ])
+    await conn.execute(insert(models.MemoryEntity.__table__), [
+        {"id": "m1", "entity_type": "file", "name": "schema.md",
+         "content": "# Schema\nThe user tables move to the new schema in two steps.\n"},
+    ])
+
+
+async def test_assemble_gathers_sections_within_budget(sessions):
+    """Test the context holds every source, fits the budget and is cached."""
+    service = ContextService(sessions)
+    context = await service.assemble("p1", 1, budget_tokens=2000)
+    sections = context["sections"]
+    assert sections["task"][0]["title"] == "Write schema migration"
+    assert {(d["relation"], d["task_number"]) for d in sections["dependencies"]} == {
+        ("blocked_by", 2), ("blocks", 3)
+    }
+    assert [c["text"] for c in sections["comments"]] == [
+        "comment 2", "comment 1", "comment 0"
+    ]
+    assert [m["text"] for m in sections["mandates"]] == [
+        "Never drop tables without a backup."
+    ]
+    assert sections["passages"][0]["entity_id"] == "m1"
+    assert context["used_tokens"] <= 2000 and context["cached"] is False
+
+    assert (await service.assemble("p1", 1, budget_tokens=2000))["cached"] is True
+    async with sessions() as db:
+        await db.execute(insert(models.Comment.__table__).values(
+            task_project_id="p1", task_task_number=1, content="comment 3"))
+        await db.commit()
+    refreshed = await service.assemble("p1", 1, budget_tokens=2000)
+    assert refreshed["cached"] is False
+    assert refreshed["sections"]["comments"][0]["text"] == "comment 3"
+
+    small = await service.assemble("p1", 1, budget_tokens=64)
+    assert small["used_tokens"] <= 64 and small["omitted"]
+
+
+async def test_assemble_rejects_missing_task_and_bad_budget(sessions):
+    service = ContextService(sessions)
+    with pytest.raises(EntityNotFoundError):
+        await service.assemble("p1", 99)
+    with pytest.raises(ValidationError):
+        await service.assemble("p1", 1, budget_tokens=1)
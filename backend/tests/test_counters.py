@@ -0,0 +1,122 @@
+"""Tests for write-coalescing access counters."""
+import datetime
+
+import pytest
+from sqlalchemy import insert, select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from backend import models
+from backend.core.counters import COUNTER_TARGETS, CoalescingCounters, _update_statement
+from backend.core.shared_state import LocalBackend, SharedState
+
+
+TABLES = [models.Project.__table__, models.MemoryEntity.__table__]
+
+
+async def seed(conn, tmp_path):
+    await conn.execute(insert(models.Project.__table__), [
+        {"id": "p1", "name": "One", "view_count": 3},
+        {"id": "p2", "name": "Two", "view_count": 0},
+    ])
+    await conn.execute(insert(models.MemoryEntity.__table__), [{
+        "entity_type": "prompt_template", "name": "plan_1",
+        "entity_metadata": {"prompt_id": "plan_1", "usage_count": 2},
+    }])
+
+
+@pytest.fixture
+def engine(sessions):
+    return sessions.kw["bind"]
+
+
+async def test_flush_adds_deltas_in_one_batch(engine):
+    """Test increments are buffered, merged on read and added on flush."""
+    counters = CoalescingCounters(engine=engine)
+    for _ in range(5):
+        counters.incr("project_views", "p1")
+    counters.incr("project_views", "p2", 2)
+    assert counters.merged("project_views", "p1", 3) == 8
+
+    assert await counters.flush() == 2
+    assert counters.pending("project_views", "p1") == 0
+    assert await counters.flush() == 0
+
+    table = models.Project.__table__
+    async with engine.connect() as conn:
+        rows = dict((await conn.execute(select(table.c.id, table.c.view_count))).all())
+    assert rows == {"p1": 8, "p2": 2}
+
+
+async def test_concurrent_writers_do_not_lose_increments(engine):
+    """Test two buffers (two workers) flushing to one row both count."""
+    first, second = CoalescingCounters(engine=engine), CoalescingCounters(engine=engine)
+    first.incr("project_views", "p2", 4)
+    second.incr("project_views", "p2", 6)
+    await first.flush()
+    await second.flush()
+
+    table = models.Project.__table__
+    async with engine.connect() as conn:
+        value = (await conn.execute(
+            select(table.c.view_count).where(table.c.id == "p2")
+        )).scalar()
+    assert value == 10
+
+
+async def test_json_counter_updates_metadata_in_place(engine):
+    """Test prompt usage is added inside entity_metadata without rewriting it."""
+    counters = CoalescingCounters(engine=engine)
+    at = datetime.datetime(2025, 1, 2, 3, 4, 5)
+    counters.incr("prompt_usage", "plan_1", 3, at=at)
+    await counters.flush()
+
+    table = models.MemoryEntity.__table__
+    async with engine.connect() as conn:
+        metadata = (await conn.execute(select(table.c.entity_metadata))).scalar()
+    assert metadata == {
+        "prompt_id": "plan_1", "usage_count": 5, "last_used": at.isoformat()
+    }
+
+
+async def test_failed_flush_keeps_deltas(engine):
+    """Test deltas survive a failed flush and are written by the next one."""
+    counters = CoalescingCounters(engine=engine)
+    counters.incr("project_views", "p1")
+    await engine.dispose()
+    broken = create_async_engine("sqlite+aiosqlite:////nonexistent/dir/db.sqlite")
+    counters._engine = broken
+    assert await counters.flush() == 0
+    assert counters.pending("project_views", "p1") == 1
+    counters._engine = engine
+    assert await counters.flush() == 1
+    with pytest.raises(KeyError):
+        counters.incr("unknown", "x")
+
+
+async def test_shared_state_counter_flushes_in_one_call(engine, monkeypatch):
+    """Test tool usage is summed in memory and added to shared state per flush."""
+    state = SharedState(LocalBackend())
+    monkeypatch.setattr("backend.core.counters.get_shared_state", lambda: state)
+    counters = CoalescingCounters(engine=engine)
+    for name in ("list_tasks", "list_tasks", "create_task"):
+        counters.incr("tool_usage", name)
+    assert await state.counters("tool_usage") == {}
+    assert counters.pending_all("tool_usage") == {"list_tasks": 2, "create_task": 1}
+
+    assert await counters.flush() == 2
+    counters.incr("tool_usage", "list_tasks")
+    await counters.flush()
+    assert await state.counters("tool_usage") == {"list_tasks": 3, "create_task": 1}
+
+
+def test_json_counter_statement_follows_the_dialect():
+    """Test JSON counters use jsonb_set on PostgreSQL and json_set elsewhere."""
+    target = COUNTER_TARGETS["prompt_usage"]
+    pg = str(
+        _update_statement(target, "postgresql").compile(dialect=postgresql.dialect())
+    )
+    assert "jsonb_set" in pg and "json_extract" not in pg
+    assert "json_set(" in str(
+        _update_statement(target, "sqlite").compile(dialect=sqlite.dialect())
+    )
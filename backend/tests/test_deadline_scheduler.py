@@ -0,0 +1,112 @@
+"""Tests for the deadline scheduler."""
+from datetime import datetime, timedelta
+
+from sqlalchemy import insert, select
+
+from backend.enums import TaskStatusEnum
+from backend.services.deadline_scheduler import (
+    AUDIT, FILE_JOBS, FILE_TAGS, FILES, LEASES, TASKS, TRANSITIONS, WATERMARKS,
+    DeadlineScheduler,
+)
+from backend.services.status_transition_service import REGISTRY, RULES, VALUES
+
+NOW = datetime(2025, 7, 7, 9)
+
+
+def task(number, status, created, priority="medium", due=None):
+    return {
+        "project_id": "p1", "task_number": number, "title": f"task {number}",
+        "status": status, "priority": priority, "created_at": created,
+        "updated_at": created, "due_date": due,
+    }
+
+
+def asset(file_id, path, is_temp, expires_at):
+    return {
+        "id": file_id, "filename": file_id, "sha256_hash": file_id,
+        "file_size_bytes": 1, "mime_type": "text/plain", "storage_path": str(path),
+        "is_temp": is_temp, "expires_at": expires_at,
+    }
+
+
+TABLES = [
+    TASKS, TRANSITIONS, REGISTRY, VALUES, RULES, FILES, FILE_TAGS, FILE_JOBS, AUDIT,
+    WATERMARKS, LEASES,
+]
+
+
+async def seed(conn, tmp_path):
+    await conn.execute(
+        insert(REGISTRY).values(
+            id="e1", enum_name="task_status", display_name="Task Status"
+        )
+    )
+    await conn.execute(insert(VALUES), [
+        {"id": value, "enum_registry_id": "e1", "value": value, "display_name": value}
+        for value in ("IN_PROGRESS", "BLOCKED")
+    ])
+    await conn.execute(insert(RULES).values(
+        id="r1", enum_registry_id="e1", from_status_id="IN_PROGRESS",
+        to_status_id="BLOCKED", auto_transition_after_hours=24,
+        auto_transition_condition="priority != 'low'", transition_name="stale",
+    ))
+    day_ago = NOW - timedelta(hours=30)
+    await conn.execute(insert(TASKS), [
+        task(1, TaskStatusEnum.IN_PROGRESS, day_ago),
+        task(2, TaskStatusEnum.IN_PROGRESS, day_ago),
+        task(3, TaskStatusEnum.IN_PROGRESS, day_ago, priority="low"),
+        task(4, TaskStatusEnum.TO_DO, day_ago, due=NOW + timedelta(minutes=30)),
+        task(5, TaskStatusEnum.COMPLETED, day_ago, due=NOW + timedelta(minutes=10)),
+        task(6, TaskStatusEnum.TO_DO, day_ago, due=NOW - timedelta(hours=1)),
+    ])
+    # Task 2 only re-entered In Progress two hours ago.
+    await conn.execute(insert(TRANSITIONS).values(
+        task_project_id="p1", task_task_number=2, from_status=TaskStatusEnum.BLOCKED,
+        to_status=TaskStatusEnum.IN_PROGRESS, transitioned_at=NOW - timedelta(hours=2),
+        automated=False, requires_approval=False,
+    ))
+    (tmp_path / "scratch.txt").write_text("x")
+    await conn.execute(insert(FILES), [
+        asset("f1", tmp_path / "scratch.txt", True, NOW + timedelta(minutes=5)),
+        asset("f2", tmp_path / "later.txt", True, NOW + timedelta(hours=2)),
+        asset("f3", tmp_path / "kept.txt", False, NOW),
+    ])
+    await conn.execute(
+        insert(FILE_TAGS).values(file_asset_id="f1", tag_id="t1", tagged_at=NOW)
+    )
+
+
+async def test_scheduler_fires_due_deadlines_under_a_lease(sessions, tmp_path):
+    scheduler, standby = DeadlineScheduler(sessions, owner="w1"), DeadlineScheduler(
+        sessions, owner="w2"
+    )
+    assert await scheduler.run_once(now=NOW) == {"transition": 1}
+    assert await standby.run_once(now=NOW) == {}
+    assert scheduler.pending() == 2  # task 4 coming due, f1 expiring
+
+    later = NOW + timedelta(minutes=31)
+    assert await scheduler.run_once(now=later) == {"overdue": 1, "cleanup": 1}
+    assert not (tmp_path / "scratch.txt").exists()
+    async with sessions() as db:
+        statuses = dict(
+            (await db.execute(select(TASKS.c.task_number, TASKS.c.status))).all()
+        )
+        assert statuses[1] == TaskStatusEnum.BLOCKED
+        assert statuses[2] == statuses[3] == TaskStatusEnum.IN_PROGRESS
+        transition = (await db.execute(
+            select(TRANSITIONS).where(TRANSITIONS.c.task_task_number == 1)
+        )).one()
+        assert transition.trigger_type == "timeout" and transition.reason == "stale"
+        assert transition.transition_context == {"rule_id": "r1"}
+        audit = (await db.execute(select(AUDIT))).one()
+        assert audit.action == "task_overdue" and audit.entity_id == "p1:4"
+        assert set((await db.execute(select(FILES.c.id))).scalars()) == {"f2", "f3"}
+        assert (await db.execute(select(FILE_TAGS))).first() is None
+
+    # The standby takes over once the lease lapses, without notifying twice.
+    takeover = later + timedelta(minutes=5)
+    await standby.run_once(now=takeover)
+    assert await scheduler.run_once(now=takeover) == {} and scheduler.pending() == 0
+    async with sessions() as db:
+        assert (await db.execute(select(LEASES.c.owner))).scalar() == "w2"
+        assert len((await db.execute(select(AUDIT))).all()) == 1
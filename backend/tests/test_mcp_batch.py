@@ -0,0 +1,142 @@
+"""Tests for running several MCP tool calls as one batch."""
+import asyncio
+
+import pytest
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.routing import APIRoute
+from pydantic import BaseModel
+from sqlalchemy import func, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend import models
+from backend.core.responses import ORJSONResponse
+from backend.routers.mcp.batch import BatchRunner, tool_routes
+from backend.routers.mcp.core import get_db_session
+from backend.schemas.batch import BatchRequest
+from backend.services.exceptions import ValidationError
+
+projects = models.Project.__table__
+tools = APIRouter()
+sessions_seen = []
+
+
+class ProjectIn(BaseModel):
+    name: str
+
+
+@tools.post("/mcp-tools/project/create", operation_id="create")
+async def create(project: ProjectIn, db: AsyncSession = Depends(get_db_session)):
+    project_id = f"id-{project.name}"
+    await db.execute(insert(projects).values(id=project_id, name=project.name))
+    await db.commit()
+    return ORJSONResponse({
+        "success": True, "project": {"id": project_id, "name": project.name}
+    })
+
+
+@tools.get("/mcp-tools/project/count", operation_id="count")
+async def count(
+    limit: int = Query(5, ge=1, le=10), db: AsyncSession = Depends(get_db_session)
+):
+    sessions_seen.append(db)
+    await asyncio.sleep(0.01)
+    total = (await db.execute(select(func.count()).select_from(projects))).scalar()
+    return {"count": min(total, limit)}
+
+
+@tools.post("/mcp-tools/project/fail", operation_id="fail")
+async def fail(name: str, db: AsyncSession = Depends(get_db_session)):
+    await db.execute(insert(projects).values(id=f"id-{name}", name=name))
+    await db.commit()
+    raise HTTPException(status_code=409, detail="conflict")
+
+
+ROUTES = {route.operation_id: route for route in tools.routes if isinstance(
+    route, APIRoute
+)}
+
+
+TABLES = [projects]
+
+
+@pytest.fixture
+def engine(sessions):
+    sessions_seen.clear()
+    return sessions.kw["bind"]
+
+
+async def names(engine):
+    async with engine.connect() as conn:
+        return sorted((await conn.execute(select(projects.c.name))).scalars())
+
+
+async def test_batch_passes_results_between_steps(engine):
+    """Test references resolve and every step commits together."""
+    result = await BatchRunner(ROUTES, engine).run(BatchRequest(steps=[
+        {"id": "a", "tool": "create", "args": {"name": "alpha"}},
+        {"tool": "create", "args": {"name": "${a.project.name}-copy"}},
+        {"id": "n", "tool": "count", "args": {"limit": 10}},
+    ]))
+    assert [r["status"] for r in result["results"]] == ["ok", "ok", "ok"]
+    assert result["results"][2]["result"] == {"count": 2}
+    assert result["committed"] is True
+    assert await names(engine) == ["alpha", "alpha-copy"]
+
+
+async def test_atomic_batch_rolls_back_on_first_failure(engine):
+    result = await BatchRunner(ROUTES, engine).run(BatchRequest(steps=[
+        {"id": "a", "tool": "create", "args": {"name": "alpha"}},
+        {"tool": "fail", "args": {"name": "beta"}},
+        {"tool": "create", "args": {"name": "gamma"}},
+    ]))
+    assert [r["status"] for r in result["results"]] == ["skipped", "error", "skipped"]
+    assert result["results"][1]["status_code"] == 409
+    assert result["committed"] is False and result["success"] is False
+    assert await names(engine) == []
+
+
+async def test_savepoint_batch_keeps_successful_steps(engine):
+    """Test a failing step undoes only its own writes and its dependents are skipped.
+
+    Query constraints still apply.
+    """
+    runner = BatchRunner(ROUTES, engine)
+    result = await runner.run(BatchRequest(mode="savepoint", steps=[
+        {"id": "a", "tool": "create", "args": {"name": "alpha"}},
+        {"id": "b", "tool": "fail", "args": {"name": "beta"}},
+        {"tool": "create", "args": {"name": "${b.project.name}"}},
+        {"tool": "create", "args": {"name": "gamma"}},
+        {"tool": "count", "args": {"limit": 99}},
+    ]))
+    assert [r["status"] for r in result["results"]] == [
+        "ok", "error", "skipped", "ok", "error"
+    ]
+    assert result["results"][4]["status_code"] == 422
+    assert result["committed"] is True
+    assert await names(engine) == ["alpha", "gamma"]
+
+
+async def test_independent_reads_run_concurrently_until_first_write(engine):
+    await BatchRunner(ROUTES, engine).run(BatchRequest(steps=[
+        {"tool": "count"}, {"tool": "count"},
+        {"tool": "create", "args": {"name": "alpha"}},
+        {"tool": "count"}, {"tool": "count"},
+    ]))
+    first, second, third, fourth = sessions_seen
+    assert first is not second
+    assert third is fourth
+
+
+async def test_batch_rejects_invalid_plans(engine):
+    runner = BatchRunner(ROUTES, engine)
+    with pytest.raises(ValidationError):
+        await runner.run(BatchRequest(steps=[{"tool": "missing"}]))
+    with pytest.raises(ValidationError):
+        await runner.run(BatchRequest(steps=[
+            {"tool": "create", "args": {"name": "${later.id}"}},
+            {"id": "later", "tool": "count"},
+        ]))
+    with pytest.raises(ValidationError, match="outside a batch"):
+        await runner.run(BatchRequest(steps=[{"tool": "start_workflow_tool"}]))
+    assert "create_task_tool" in tool_routes() and "batch_tools" not in tool_routes()
+    assert "advance_workflow_tool" not in tool_routes()
@@ -0,0 +1,116 @@
+"""Tests for passage splitting and passage retrieval over memory entities."""
+import pytest
+from sqlalchemy import insert, select
+
+from backend import models
+from backend.core.passages import passage_kind, split_passages
+from backend.services.exceptions import EntityNotFoundError, ValidationError
+from backend.services.memory_service import MemoryService
+
+MARKDOWN = (
+    "Intro paragraph.\n\n"
+    "# Install\n" + "Run the installer and follow the prompts.\n" * 40 +
+    "```\n# not a heading\n```\n"
+    "## Linux\nUse the package manager.\n"
+    "# Usage\nStart the server with the launcher. Café.\n"
+)
+
+CODE = (
+    "import os\n\n\n"
+    "@cached\n# Loads settings.\ndef load_settings(path):\n"
+    + "    value = os.getenv(path)\n" * 60 +
+    "\n\nclass Loader:\n    def run(self):\n        return load_settings('x')\n"
+)
+
+
+def test_markdown_passages_follow_headings():
+    """Test markdown is cut at headings, not at '#' lines inside code fences."""
+    passages = split_passages(
+        MARKDOWN, passage_kind("guide.md", MARKDOWN), size=600, overlap=80
+    )
+    headings = [passage.heading for passage in passages]
+    assert headings[0] is None
+    assert "Install" in headings and "Install > Linux" in headings
+    assert all("not a heading" not in (heading or "") for heading in headings)
+    install = [passage for passage in passages if passage.heading == "Install"]
+    assert len(install) > 1
+    assert install[0].end > install[1].start  # windows overlap
+
+
+def test_code_passages_keep_decorators_with_definitions():
+    """Test code is cut at top-level definitions, keeping decorators and comments."""
+    passages = split_passages(
+        CODE, passage_kind("settings.py", CODE), size=800, overlap=100
+    )
+    first = next(
+        passage for passage in passages if passage.heading == "def load_settings(path):"
+    )
+    assert first.text.startswith("@cached\n# Loads settings.\n")
+    assert passages[-1].heading == "class Loader:"
+
+
+def test_passage_offsets_are_utf8_bytes():
+    """Test every passage's byte offsets slice the encoded text back to the passage."""
+    encoded = MARKDOWN.encode()
+    for passage in split_passages(MARKDOWN, "markdown", size=300, overlap=50):
+        assert encoded[passage.start:passage.end].decode() == passage.text
+    assert passage_kind("notes", "plain words") == "text"
+
+
+TABLES = [models.MemoryEntity.__table__, models.MemoryPassage.__table__]
+
+
+async def seed(conn, tmp_path):
+    await conn.execute(insert(models.MemoryEntity.__table__), [
+        {"id": "doc", "entity_type": "file", "name": "guide.md", "content": MARKDOWN},
+    ])
+
+
+@pytest.fixture
+async def session(sessions):
+    async with sessions() as session:
+        yield session
+
+
+async def test_search_passages_and_byte_ranges(session):
+    """Test passage search splits stored entities on first use and returns offsets."""
+    service = MemoryService(session)
+    results = await service.search_passages(
+        "package manager linux", entity_id="doc", limit=2
+    )
+    assert results[0]["heading"] == "Install > Linux"
+    assert len(results[0]["content"]) < len(MARKDOWN)
+
+    table = models.MemoryPassage.__table__
+    stored = (await session.execute(
+        select(table.c.ordinal).where(table.c.entity_id == "doc")
+    )).all()
+    assert len(stored) == len(split_passages(MARKDOWN, "markdown"))
+
+    excerpt = await service.get_content_range(
+        "doc", results[0]["start"], results[0]["end"]
+    )
+    assert excerpt["content"] == results[0]["content"]
+    assert excerpt["total_bytes"] == len(MARKDOWN.encode())
+
+    with pytest.raises(ValidationError):
+        await service.get_content_range("doc", 10, 5)
+    with pytest.raises(EntityNotFoundError):
+        await service.search_passages("anything", entity_id="missing")
+
+
+async def test_content_range_counts_utf8_bytes(session):
+    """Test byte ranges are cut in SQL on UTF-8 bytes, not characters."""
+    text = "naïve café — done"
+    await session.execute(insert(models.MemoryEntity.__table__).values(
+        id="utf", entity_type="file", name="utf.txt", content=text))
+    await session.commit()
+    service = MemoryService(session)
+    data = text.encode()
+    start = data.index("café".encode())
+    excerpt = await service.get_content_range(
+        "utf", start, start + len("café".encode())
+    )
+    assert excerpt["content"] == "café" and excerpt["total_bytes"] == len(data)
+    tail = await service.get_content_range("utf", start)
+    assert tail["content"] == "café — done" and tail["end"] == len(data)
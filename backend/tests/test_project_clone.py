@@ -0,0 +1,157 @@
+"""Tests for cloning projects."""
+from datetime import datetime
+
+import pytest
+from sqlalchemy import insert, select
+
+from backend.core.responses import loads
+from backend.crud.task_transitions import TRANSITIONS
+from backend.enums import TaskStatusEnum
+from backend.routers.projects import core as projects_router
+from backend.schemas.project import ProjectClone
+from backend.services.exceptions import DuplicateEntityError, EntityNotFoundError
+from backend.services.project_service import (
+    CAPABILITIES, COMMENTS, DEPENDENCIES, PROJECT_FILES, PROJECTS, TASKS,
+    ProjectService, settings,
+)
+
+THEN = datetime(2025, 7, 1)
+NOW = datetime(2025, 7, 7)
+
+
+def edge(predecessor, successor, predecessor_project="p1"):
+    return {
+        "predecessor_project_id": predecessor_project,
+        "predecessor_task_number": predecessor, "successor_project_id": "p1",
+        "successor_task_number": successor, "type": "finishes_to_start",
+    }
+
+
+TABLES = [
+    PROJECTS, TASKS, CAPABILITIES, DEPENDENCIES, COMMENTS, PROJECT_FILES, TRANSITIONS,
+]
+
+
+async def seed(conn, tmp_path):
+    await conn.execute(insert(PROJECTS), [
+        {"id": project_id, "name": name, "tags": ["x"], "view_count": 7,
+         "is_archived": False, "created_at": THEN, "updated_at": THEN}
+        for project_id, name in (("p1", "Source"), ("p2", "Other"))
+    ])
+    await conn.execute(insert(TASKS), [
+        {"project_id": project_id, "task_number": number, "title": f"task {number}",
+         "status": TaskStatusEnum.IN_PROGRESS if number == 3 else TaskStatusEnum.TO_DO,
+         "priority": "high",
+         "lease_owner": "a1" if number == 3 else None, "created_at": THEN,
+         "updated_at": THEN}
+        for project_id, numbers in (("p1", (1, 2, 3, 5, 8)), ("p2", (1,)))
+        for number in numbers
+    ])
+    await conn.execute(
+        insert(CAPABILITIES).values(project_id="p1", task_number=5, capability="python")
+    )
+    await conn.execute(
+        insert(DEPENDENCIES),
+        [edge(1, 2), edge(2, 8), edge(1, 5, predecessor_project="p2")],
+    )
+    # A p1 task blocking a task elsewhere is not copied.
+    await conn.execute(insert(DEPENDENCIES).values(
+        predecessor_project_id="p1", predecessor_task_number=3,
+        successor_project_id="p2", successor_task_number=1, type="finishes_to_start",
+    ))
+    await conn.execute(insert(COMMENTS), [
+        {"id": f"c{n}", "content": f"note {n}", "task_project_id": "p1",
+         "task_task_number": n, "created_at": THEN, "updated_at": THEN}
+        for n in (1, 8)
+    ])
+    await conn.execute(insert(PROJECT_FILES).values(
+        id="f1", project_id="p1", file_memory_entity_id=42, created_at=THEN,
+        updated_at=THEN,
+    ))
+
+
+async def test_clone_copies_tasks_edges_comments_and_links(sessions, monkeypatch):
+    monkeypatch.setattr(settings, "project_clone_batch_size", 3)
+    progress = []
+    async with sessions() as db:
+        cloned = await ProjectService(db).clone_project(
+            "p1", "Copy", on_progress=lambda *page: progress.append(page), now=NOW,
+        )
+    assert cloned == {
+        "project_id": cloned["project_id"], "source_project_id": "p1", "tasks": 5,
+        "capabilities": 1, "dependencies": 3, "comments": 2, "memory_links": 1,
+    }
+    assert progress == [(3, 5), (5, 5)]  # pages of existing numbers: 1-3, then 5 and 8
+    clone = cloned["project_id"]
+
+    async with sessions() as db:
+        project = (await db.execute(
+            select(PROJECTS).where(PROJECTS.c.id == clone)
+        )).one()
+        assert (project.name, project.tags, project.view_count) == ("Copy", ["x"], 0)
+        tasks = (await db.execute(
+            select(TASKS).where(TASKS.c.project_id == clone)
+            .order_by(TASKS.c.task_number)
+        )).all()
+        assert [task.task_number for task in tasks] == [1, 2, 3, 5, 8]
+        assert tasks[2].status == TaskStatusEnum.IN_PROGRESS
+        assert tasks[2].lease_owner is None
+        assert all(task.created_at == NOW for task in tasks)
+        edges = set((await db.execute(select(
+            DEPENDENCIES.c.predecessor_project_id,
+            DEPENDENCIES.c.predecessor_task_number,
+            DEPENDENCIES.c.successor_task_number,
+        ).where(DEPENDENCIES.c.successor_project_id == clone))).all())
+        assert edges == {(clone, 1, 2), (clone, 2, 8), ("p2", 1, 5)}
+        capability = await db.execute(
+            select(CAPABILITIES.c.task_number).where(CAPABILITIES.c.project_id == clone)
+        )
+        assert capability.scalar() == 5
+        comments = (await db.execute(
+            select(COMMENTS).where(COMMENTS.c.task_project_id == clone)
+        )).all()
+        assert sorted(c.content for c in comments) == ["note 1", "note 8"]
+        assert len({c.id for c in comments} | {"c1", "c8"}) == 4 and all(
+            len(c.id) == 36 for c in comments
+        )
+        link = (await db.execute(
+            select(PROJECT_FILES).where(PROJECT_FILES.c.project_id == clone)
+        )).one()
+        assert link.file_memory_entity_id == 42 and link.id != "f1"
+        transitions = (await db.execute(select(TRANSITIONS))).all()
+        assert len(transitions) == 5
+        assert {t.trigger_type for t in transitions} == {"clone"}
+        sources = {t.transition_context["source_project_id"] for t in transitions}
+        assert sources == {"p1"}
+
+
+async def test_clone_options_and_errors(sessions):
+    async with sessions() as db:
+        service = ProjectService(db)
+        cloned = await service.clone_project(
+            "p1", "Bare", include_comments=False, include_memory_links=False
+        )
+        assert (cloned["tasks"], cloned["comments"], cloned["memory_links"]) == (
+            5, 0, 0
+        )
+        with pytest.raises(DuplicateEntityError):
+            await service.clone_project("p1", "Bare")
+        with pytest.raises(EntityNotFoundError):
+            await service.clone_project("missing", "Nope")
+        assert len((await db.execute(select(PROJECTS))).all()) == 3
+
+
+async def test_streamed_clone_reports_errors_as_a_final_line(sessions, monkeypatch):
+    monkeypatch.setattr(projects_router, "async_session_maker", sessions)
+    lines = [
+        loads(line) async for line in projects_router._clone_progress(
+            "missing", ProjectClone(name="Copy")
+        )
+    ]
+    assert lines == [{"error": "Project not found", "status_code": 404}]
+    lines = [
+        loads(line) async for line in projects_router._clone_progress(
+            "p1", ProjectClone(name="Other")
+        )
+    ]
+    assert lines[-1]["status_code"] == 409 and len(lines) == 1
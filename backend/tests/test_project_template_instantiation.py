@@ -0,0 +1,157 @@
+"""Tests for instantiating project templates."""
+import pytest
+from sqlalchemy import insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.crud.task_transitions import TRANSITIONS
+from backend.enums import TaskStatusEnum
+from backend.services.exceptions import (
+    ConflictError, EntityNotFoundError, ValidationError,
+)
+from backend.services.project_template_service import (
+    COMMENTS, DEPENDENCIES, PROJECTS, TASKS, TEMPLATES, ProjectTemplateService,
+    parse_template, template_definitions,
+)
+from backend.services.status_transition_service import REGISTRY, RULES, VALUES
+
+TEMPLATE = {
+    "project": {
+        "description": "Release checklist", "priority": "high", "tags": ["release"]
+    },
+    "tasks": [
+        {
+            "key": "spec", "title": "Write spec", "priority": "high",
+            "comments": ["Keep it short", "Link the RFC"],
+        },
+        {"key": "build", "title": "Build", "depends_on": ["spec"]},
+        {
+            "title": "Ship", "status": "BLOCKED",
+            "depends_on": [{"task": "build", "type": "start_to_start"}, 0],
+        },
+    ],
+}
+
+TABLES = [
+    TEMPLATES, PROJECTS, TASKS, DEPENDENCIES, COMMENTS, TRANSITIONS, REGISTRY, VALUES,
+    RULES,
+]
+
+
+async def seed(conn, tmp_path):
+    await conn.execute(
+        insert(TEMPLATES).values(id="t1", name="release", template_data=TEMPLATE)
+    )
+
+
+@pytest.fixture(autouse=True)
+def fresh_templates():
+    # The shared state listener does this in the app.
+    template_definitions.invalidate()
+
+
+async def test_instantiate_creates_project_tasks_dependencies_and_comments(sessions):
+    async with sessions() as db:
+        service = ProjectTemplateService(db)
+        created = await service.instantiate_template("t1", project_name="Release 1.0")
+        assert created["first_task_number"] == 1 and created["last_task_number"] == 3
+        assert [
+            created[key] for key in ("tasks", "dependencies", "comments", "transitions")
+        ] == [3, 3, 2, 3]
+        project_id = created["project_id"]
+
+        # A second application appends a fresh block of numbers to the same project.
+        again = await service.instantiate_template("t1", project_id=project_id)
+        assert (again["first_task_number"], again["last_task_number"]) == (4, 6)
+
+    async with sessions() as db:
+        project = (await db.execute(select(PROJECTS))).one()
+        assert project.name == "Release 1.0" and project.tags == ["release"]
+        assert project.metadata_json == {"template_id": "t1"}
+        tasks = (await db.execute(
+            select(TASKS.c.task_number, TASKS.c.status, TASKS.c.priority_rank)
+            .order_by(TASKS.c.task_number)
+        )).all()
+        assert [task.task_number for task in tasks] == [1, 2, 3, 4, 5, 6]
+        assert tasks[0].priority_rank == 1 and tasks[2].status == TaskStatusEnum.BLOCKED
+        edges = set((await db.execute(select(
+            DEPENDENCIES.c.predecessor_task_number,
+            DEPENDENCIES.c.successor_task_number, DEPENDENCIES.c.type
+        ))).all())
+        assert {
+            (1, 2, "finishes_to_start"), (2, 3, "start_to_start"),
+            (1, 3, "finishes_to_start"),
+        } <= edges
+        assert (4, 5, "finishes_to_start") in edges and len(edges) == 6
+        comments = (await db.execute(select(
+            COMMENTS.c.task_task_number, COMMENTS.c.content
+        ))).all()
+        assert sorted(comments) == [
+            (1, "Keep it short"), (1, "Link the RFC"), (4, "Keep it short"),
+            (4, "Link the RFC"),
+        ]
+        assert len((await db.execute(select(TRANSITIONS))).all()) == 6
+
+
+async def test_instantiate_retries_when_task_numbers_are_taken(sessions, monkeypatch):
+    async with sessions() as db:
+        created = await ProjectTemplateService(db).instantiate_template(
+            "t1", project_name="Release"
+        )
+    project_id = created["project_id"]
+
+    async def take_next_number(session, *args, **kwargs):
+        # Another writer adds a task right after the block was reserved.
+        highest = await real_scalar(session, *args, **kwargs)
+        async with sessions() as other:
+            await other.execute(insert(TASKS).values(
+                project_id=project_id, task_number=(highest or 0) + 1, title="racer",
+                status=TaskStatusEnum.TO_DO,
+            ))
+            await other.commit()
+        return highest
+
+    real_scalar = AsyncSession.scalar
+    monkeypatch.setattr(AsyncSession, "scalar", take_next_number)
+    async with sessions() as db:
+        with pytest.raises(ConflictError):
+            await ProjectTemplateService(db).instantiate_template(
+                "t1", project_id=project_id
+            )
+
+    calls = []
+
+    async def take_once(session, *args, **kwargs):
+        calls.append(1)
+        return await (take_next_number if len(calls) == 1 else real_scalar)(
+            session, *args, **kwargs
+        )
+
+    monkeypatch.setattr(AsyncSession, "scalar", take_once)
+    async with sessions() as db:
+        again = await ProjectTemplateService(db).instantiate_template(
+            "t1", project_id=project_id
+        )
+    assert (again["first_task_number"], again["last_task_number"]) == (8, 10)
+
+
+async def test_instantiate_rejects_bad_targets_and_templates(sessions):
+    async with sessions() as db:
+        service = ProjectTemplateService(db)
+        await service.instantiate_template("t1", project_name="Release 1.0")
+        with pytest.raises(ConflictError):
+            await service.instantiate_template("t1", project_name="Release 1.0")
+        with pytest.raises(EntityNotFoundError):
+            await service.instantiate_template("missing", project_name="Release 2.0")
+        with pytest.raises(EntityNotFoundError):
+            await service.instantiate_template("t1", project_id="missing")
+        with pytest.raises(ValidationError):
+            await service.instantiate_template("t1")
+        assert len((await db.execute(select(TASKS))).all()) == 3
+
+    with pytest.raises(ValidationError, match="cycle"):
+        parse_template({"tasks": [{"key": "a", "title": "A", "depends_on": ["b"]},
+                                  {"key": "b", "title": "B", "depends_on": ["a"]}]})
+    with pytest.raises(ValidationError, match="unknown task"):
+        parse_template({"tasks": [{"title": "A", "depends_on": ["nope"]}]})
+    with pytest.raises(ValidationError, match="unknown status"):
+        parse_template({"tasks": [{"title": "A", "status": "DONE-ISH"}]})
@@ -0,0 +1,77 @@
+"""Tests for the pure-ASGI request middleware."""
+import asyncio
+
+from fastapi import FastAPI, Request
+from fastapi.responses import PlainTextResponse, StreamingResponse
+from fastapi.testclient import TestClient
+
+from backend.middleware.request_middleware import RequestMiddleware
+
+
+def build():
+    app = FastAPI()
+
+    @app.get("/items/{item_id}")
+    async def item(item_id: int, request: Request):
+        return {"id": item_id, "request_id": request.state.request_id}
+
+    @app.get("/docs-like")
+    async def docs_like():
+        return PlainTextResponse(
+            "ok", headers={"Content-Security-Policy": "default-src *"}
+        )
+
+    @app.get("/stream")
+    async def stream():
+        async def events():
+            for n in range(3):
+                yield f"data: {n}\n\n"
+        return StreamingResponse(events(), media_type="text/event-stream")
+
+    observed = []
+    middleware = RequestMiddleware(app, log_sample_rate=0)
+    middleware.observe = lambda *args: observed.append(args)
+    return middleware, observed
+
+
+def test_headers_and_route_template_metrics():
+    """Test request IDs, security headers and route-template metric labels."""
+    middleware, observed = build()
+    client = TestClient(middleware)
+    response = client.get("/items/7")
+    assert response.headers["x-request-id"] == response.json()["request_id"]
+    assert float(response.headers["x-request-duration"]) >= 0
+    assert response.headers["x-frame-options"] == "DENY"
+    docs = client.get("/docs-like")
+    assert docs.headers["content-security-policy"] == "default-src *"
+    client.get("/nowhere")
+    assert [(method, route, status) for method, route, status, _ in observed] == [
+        ("GET", "/items/{item_id}", 200), ("GET", "/docs-like", 200),
+        ("GET", "unmatched", 404),
+    ]
+
+
+async def test_streaming_body_is_passed_through_unbuffered():
+    middleware, _ = build()
+    messages = []
+    requests = [{"type": "http.request", "body": b"", "more_body": False}]
+
+    async def receive():
+        if requests:
+            return requests.pop()
+        await asyncio.Event().wait()  # client stays connected
+
+    async def send(message):
+        messages.append(message)
+
+    scope = {
+        "type": "http", "method": "GET", "path": "/stream", "raw_path": b"/stream",
+        "root_path": "", "query_string": b"", "headers": [], "scheme": "http",
+        "server": ("test", 80), "http_version": "1.1",
+    }
+    await middleware(scope, receive, send)
+    chunks = [
+        message["body"] for message in messages
+        if message["type"] == "http.response.body" and message["body"]
+    ]
+    assert chunks == [b"data: 0\n\n", b"data: 1\n\n", b"data: 2\n\n"]
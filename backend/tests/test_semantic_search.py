@@ -0,0 +1,118 @@
+"""Tests for local embeddings, the vector index and hybrid memory search."""
+import pytest
+from sqlalchemy import insert, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+np = pytest.importorskip("numpy")
+
+from backend import models  # noqa: E402
+from backend.core.embeddings import HashingEmbedder  # noqa: E402
+from backend.core.vector_index import VectorIndex  # noqa: E402
+from backend.services.exceptions import ValidationError  # noqa: E402
+from backend.services.semantic_search_service import SemanticMemoryIndex  # noqa: E402
+
+
+def test_hashing_embedder_matches_rewordings():
+    """Test embeddings are unit length and rewordings score above unrelated text."""
+    embedder = HashingEmbedder(256)
+    vectors = embedder.embed([
+        "migrate the database", "database migration", "lunch menu"
+    ])
+    assert np.allclose(np.linalg.norm(vectors, axis=1), 1.0)
+    assert vectors[0] @ vectors[1] > vectors[0] @ vectors[2]
+
+
+def test_vector_index_add_remove_search():
+    """Test exact search returns the nearest key and honours removals."""
+    rng = np.random.default_rng(1)
+    vectors = HashingEmbedder(64).embed([f"text {n}" for n in range(20)])
+    index = VectorIndex(64)
+    for n, vector in enumerate(vectors):
+        index.add(n, vector)
+    assert index.search(vectors[7], 1)[0][0] == 7
+    index.remove(7)
+    assert 7 not in [key for key, _ in index.search(vectors[7], 5)]
+    index.add(3, rng.standard_normal(64).astype(np.float32))
+    assert len(index) == 19
+
+
+def test_ivf_search_finds_exact_neighbours():
+    """Test the trained IVF layer still finds stored vectors."""
+    rng = np.random.default_rng(2)
+    vectors = rng.standard_normal((400, 32)).astype(np.float32)
+    vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+    index = VectorIndex(32, nprobe=4, train_threshold=200)
+    for n, vector in enumerate(vectors):
+        index.add(n, vector)
+    assert index.is_trained
+    hits = sum(index.search(vectors[n], 1)[0][0] == n for n in range(0, 400, 10))
+    assert hits == 40
+
+
+def test_save_and_load_round_trip(tmp_path):
+    """Test a saved index loads memory-mapped and accepts writes afterwards."""
+    vectors = HashingEmbedder(32).embed(["alpha", "beta", "gamma"])
+    index = VectorIndex(32)
+    for key, vector in zip(["a", "b", "c"], vectors):
+        index.add(key, vector)
+    index.remove("b")
+    index.save(str(tmp_path))
+
+    loaded = VectorIndex.load(str(tmp_path))
+    assert isinstance(loaded._vectors, np.memmap)
+    assert len(loaded) == 2 and "b" not in loaded
+    assert loaded.search(vectors[2], 1)[0][0] == "c"
+    loaded.add("d", vectors[1])
+    assert loaded.search(vectors[1], 1)[0][0] == "d"
+
+
+TABLES = [models.MemoryEntity.__table__, models.MemoryObservation.__table__]
+
+
+async def seed(conn, tmp_path):
+    await conn.execute(insert(models.MemoryEntity.__table__), [
+        {"id": "e1", "entity_type": "note", "name": "Schema migration plan",
+         "content": "Steps for migrating the Postgres database schema"},
+        {"id": "e2", "entity_type": "note", "name": "Release checklist",
+         "content": "Tag the build and publish release notes"},
+    ])
+    await conn.execute(insert(models.MemoryObservation.__table__), [
+        {"entity_id": "e2", "content": "Remember to bump the version"},
+    ])
+
+
+@pytest.fixture
+async def session(sessions):
+    async with sessions() as session:
+        yield session
+
+
+async def test_hybrid_search_and_incremental_updates(session, tmp_path):
+    """Test reworded queries rank the right entity and writes re-index it."""
+    index = SemanticMemoryIndex(str(tmp_path / "index"))
+    await index.ensure_loaded(session)
+    assert index.search("migrate db schemas", 2)[0][0] == "e1"
+    assert index.search("version bump", 2, mode="semantic")[0][0] == "e2"
+    with pytest.raises(ValidationError):
+        index.search("anything", mode="fuzzy")
+
+    await session.execute(insert(models.MemoryEntity.__table__).values(
+        id="e3", entity_type="note", name="Incident review",
+        content="Outage postmortem"))
+    await session.commit()
+    await index.entity_changed(session, "e3")
+    assert index.search("postmortem of the outage", 1)[0][0] == "e3"
+
+    # Another worker wrote e2; only that entity is re-read.
+    await session.execute(update(models.MemoryEntity.__table__).where(
+        models.MemoryEntity.__table__.c.id == "e2").values(content="Incident timeline"))
+    await session.commit()
+    index._session_maker = lambda: AsyncSession(session.bind)
+    await index.entities_changed_elsewhere(["e2"])
+    assert index.search("incident timeline", 1, mode="lexical")[0][0] == "e2"
+
+    index.save()
+    restarted = SemanticMemoryIndex(str(tmp_path / "index"))
+    await restarted.ensure_loaded(session)
+    assert restarted.checksums == index.checksums
+    assert len(restarted.vectors) == 3
@@ -0,0 +1,111 @@
+"""Tests for state shared between worker processes."""
+import multiprocessing
+import os
+import time
+
+import pytest
+
+from backend.core.shared_state import (
+    LocalBackend,
+    SQLiteBackend,
+    SharedState,
+    create_backend,
+    startup_lock,
+)
+
+
+def hold_lock(directory, path):
+    with startup_lock("test", directory):
+        with open(path, "a") as handle:
+            handle.write("enter\n")
+        time.sleep(0.2)
+        with open(path, "a") as handle:
+            handle.write("exit\n")
+
+
+async def test_local_counters():
+    """Test counters accumulate per namespace."""
+    state = SharedState(LocalBackend())
+    await state.incr("tools", "list_tasks")
+    await state.incr_many("tools", {"list_tasks": 2, "create_task": 1})
+    assert await state.counters("tools") == {"list_tasks": 3, "create_task": 1}
+    assert await state.counters("other") == {}
+
+
+async def test_sqlite_counters_are_shared_between_instances(tmp_path):
+    """Test two backends on one file see each other's increments."""
+    path = str(tmp_path / "state.db")
+    first, second = SharedState(SQLiteBackend(path)), SharedState(SQLiteBackend(path))
+    assert await first.incr("tools", "list_tasks") == 1
+    assert await second.incr("tools", "list_tasks", 4) == 5
+    assert await first.counters("tools") == {"list_tasks": 5}
+    await first.close()
+    await second.close()
+
+
+async def test_invalidation_reaches_other_instances(tmp_path):
+    """Test a version bump in one worker fires listeners in another on poll."""
+    path = str(tmp_path / "state.db")
+    writer, reader = SharedState(SQLiteBackend(path)), SharedState(SQLiteBackend(path))
+    calls = []
+    reader.on_invalidate("catalog", lambda: calls.append("catalog"))
+
+    await writer.invalidate("catalog")
+    await reader.poll_invalidations()
+    assert calls == []  # first sighting only records the version
+
+    await writer.invalidate("catalog")
+    assert await reader.poll_invalidations() == ["catalog"]
+    assert calls == ["catalog"]
+    assert await reader.poll_invalidations() == []
+
+
+async def test_keyed_invalidation_names_the_changed_keys(tmp_path):
+    """Test other workers get just the changed keys unless a version named none."""
+    path = str(tmp_path / "state.db")
+    writer, reader = SharedState(SQLiteBackend(path)), SharedState(SQLiteBackend(path))
+    calls = []
+    reader.on_invalidate("index", lambda: calls.append("all"))
+    reader.on_keys_invalidated("index", calls.append)
+    await writer.invalidate("index")
+    await reader.poll_invalidations()
+
+    await writer.invalidate("index", keys=["e1"])
+    await writer.invalidate("index", keys=["e2", "e1"])
+    await reader.poll_invalidations()
+    assert calls == [["e1", "e2"]]
+
+    await writer.invalidate("index", keys=["e3"])
+    await writer.invalidate("index")
+    await reader.poll_invalidations()
+    assert calls == [["e1", "e2"], "all"]
+
+
+def test_auto_backend_follows_worker_count(monkeypatch, tmp_path):
+    """Test auto selection uses SQLite only when several workers run."""
+    from backend.core import shared_state
+
+    monkeypatch.setattr(shared_state.settings, "redis_url", None)
+    monkeypatch.setattr(shared_state.settings, "shared_state_dir", str(tmp_path))
+    monkeypatch.setattr(shared_state.settings, "workers", 1)
+    assert create_backend("auto").name == "local"
+    monkeypatch.setattr(shared_state.settings, "workers", 4)
+    assert create_backend("auto").name == "sqlite"
+    with pytest.raises(ValueError):
+        create_backend("memcached")
+
+
+@pytest.mark.skipif(os.name == "nt", reason="startup_lock is a no-op on Windows")
+def test_startup_lock_serializes_processes(tmp_path):
+    """Test guarded blocks from several processes never overlap."""
+    log = str(tmp_path / "log")
+    processes = [
+        multiprocessing.Process(target=hold_lock, args=(str(tmp_path), log))
+        for _ in range(3)
+    ]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join(timeout=10)
+    with open(log) as handle:
+        assert handle.read().split() == ["enter", "exit"] * 3
@@ -0,0 +1,95 @@
+"""Tests for sparse fieldset parsing and projected list queries."""
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+from backend import models
+from backend.core.projection import parse_fields, project_columns
+from backend.crud.comments import get_comment_rows
+from backend.services.exceptions import ValidationError
+from backend.services.memory_service import MemoryService, MEMORY_SEARCH_FIELDS
+
+
+@pytest.fixture
+async def memory_db():
+    """In-memory async database with memory entities and comments."""
+    engine = create_async_engine("sqlite+aiosqlite://")
+    tables = [models.MemoryEntity.__table__, models.Comment.__table__]
+    async with engine.begin() as conn:
+        await conn.run_sync(lambda sync_conn: models.Base.metadata.create_all(
+            sync_conn, tables=tables
+        ))
+        await conn.execute(models.MemoryEntity.__table__.insert(), [
+            {
+                "id": "1", "entity_type": "text", "name": "alpha notes",
+                "content": "x" * 1000, "source": "text",
+            },
+            {
+                "id": "2", "entity_type": "file", "name": "beta.md",
+                "content": "about alpha", "source": "file",
+            },
+            {
+                "id": "3", "entity_type": "file", "name": "gamma.md",
+                "content": "unrelated", "source": "file",
+            },
+        ])
+        await conn.execute(models.Comment.__table__.insert(), [
+            {
+                "id": f"c{n}", "content": f"comment {n}", "task_project_id": "p1",
+                "task_task_number": 1,
+            }
+            for n in range(3)
+        ])
+    async with AsyncSession(engine) as session:
+        yield session
+    await engine.dispose()
+
+
+def test_parse_fields_strips_and_deduplicates():
+    """Test field lists are trimmed, deduplicated and order-preserving."""
+    assert parse_fields(" name, id ,name,") == ("name", "id")
+    assert parse_fields("") is None
+    assert parse_fields(None) is None
+
+
+def test_project_columns_rejects_unknown_fields():
+    """Test unknown field names are reported."""
+    with pytest.raises(ValueError, match="bogus"):
+        project_columns(models.Comment.__table__, ["id", "bogus"], ())
+
+
+async def test_memory_search_rows_skip_content_by_default(memory_db):
+    """Test search results omit content unless requested."""
+    rows, total = await MemoryService(memory_db).get_entity_rows(
+        search="alpha", fields=MEMORY_SEARCH_FIELDS)
+    assert total == 2
+    assert all("content" not in row._fields for row in rows)
+    assert [row.id for row in rows] == ["1", "2"]
+
+
+async def test_memory_rows_filter_by_source(memory_db):
+    """Test source filtering with an explicit field set."""
+    rows, total = await MemoryService(memory_db).get_entity_rows(
+        source="file", fields=["name"])
+    assert total == 2
+    assert [tuple(row) for row in rows] == [("beta.md",), ("gamma.md",)]
+
+
+async def test_memory_rows_unknown_field(memory_db):
+    """Test unknown memory fields raise a validation error."""
+    with pytest.raises(ValidationError):
+        await MemoryService(memory_db).get_entity_rows(fields=["secret"])
+
+
+async def test_comment_rows_paginate_with_total(memory_db):
+    """Test comment rows report the full total independent of the page."""
+    rows, total = await get_comment_rows(
+        memory_db, "p1", 1, skip=1, limit=1, fields=["id"]
+    )
+    assert total == 3
+    assert len(rows) == 1
+
+
+async def test_comment_rows_unknown_field(memory_db):
+    """Test unknown comment fields raise a validation error."""
+    with pytest.raises(ValidationError):
+        await get_comment_rows(memory_db, "p1", 1, fields=["secret"])
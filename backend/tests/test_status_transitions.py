@@ -0,0 +1,102 @@
+"""Tests for compiled status transition rules."""
+import pytest
+from sqlalchemy import insert
+
+from backend.services.exceptions import ValidationError
+from backend.services.status_transition_service import (
+    REGISTRY, RULES, VALUES, Facts, StatusMachines, StatusTransitionService,
+    compile_condition,
+)
+
+TABLES = [REGISTRY, VALUES, RULES]
+
+
+async def seed(conn, tmp_path):
+    await conn.execute(insert(REGISTRY), [
+        {"id": "e1", "enum_name": "task_status", "display_name": "Task Status"},
+        {"id": "e2", "enum_name": "priority", "display_name": "Priority"},
+    ])
+    await conn.execute(insert(VALUES), [
+        {
+            "id": f"v{n}", "enum_registry_id": "e1", "value": value,
+            "display_name": value, "sort_order": n,
+        }
+        for n, value in enumerate(["TO_DO", "IN_PROGRESS", "COMPLETED"])
+    ])
+    rules = [
+        ("r1", "v0", "v1", None, None, False, None, True),
+        (
+            "r2", "v1", "v2", "agent_id is not None and priority in ('LOW', 'MEDIUM')",
+            "finish", False, None, True,
+        ),
+        ("r3", "v1", "v2", None, None, True, "reviewer", True),
+        ("r4", "v2", "v0", None, None, False, None, False),
+    ]
+    await conn.execute(insert(RULES), [
+        {"id": rule_id, "enum_registry_id": "e1", "from_status_id": frm,
+         "to_status_id": to, "condition_expression": condition, "transition_name": name,
+         "requires_approval": approval, "required_agent_role": role,
+         "is_active": active}
+        for rule_id, frm, to, condition, name, approval, role, active in rules
+    ])
+
+
+async def test_rules_compile_to_a_matrix_and_recompile_on_edit(sessions):
+    machines = StatusMachines()
+    async with sessions() as db:
+        await machines.ensure_loaded(db)
+        version = machines.version
+        assert machines.check("task_status", "TO_DO", "IN_PROGRESS").allowed
+        assert machines.check("task_status", "TO_DO", "TO_DO").allowed
+        # no initial rules
+        assert machines.check("task_status", None, "COMPLETED").allowed
+        assert not machines.check("task_status", "TO_DO", "COMPLETED").allowed
+        # inactive rule
+        assert not machines.check("task_status", "COMPLETED", "TO_DO").allowed
+        assert not machines.check("task_status", "TO_DO", "IN_REVIEW").allowed
+        assert machines.machine("priority") is None
+        assert machines.check("priority", "LOW", "HIGH").allowed
+
+        facts = Facts(agent_id="a1", priority="LOW")
+        decision = machines.check("task_status", "IN_PROGRESS", "COMPLETED", facts)
+        assert decision.rule.id == "r2" and not decision.requires_approval
+        # The condition fails, so the approval rule applies, for reviewers only.
+        facts = Facts(agent_id="a1", priority="HIGH")
+        move = ("task_status", "IN_PROGRESS", "COMPLETED")
+        assert machines.check(*move, facts).requires_approval
+        assert machines.check(*move, facts, agent_role="reviewer").allowed
+        with pytest.raises(ValidationError, match="requires agent role reviewer"):
+            machines.validate(
+                "task_status", "IN_PROGRESS", "COMPLETED", facts, agent_role="coder"
+            )
+
+        service = StatusTransitionService(db)
+        await service.create_rule(
+            "task_status", None, "TO_DO", transition_name="create"
+        )
+        machines.invalidate()  # the shared state listener does this in the app
+        await machines.ensure_loaded(db)
+        assert machines.version == version + 1
+        assert machines.check("task_status", None, "TO_DO").allowed
+        assert not machines.check("task_status", None, "COMPLETED").allowed
+        with pytest.raises(ValidationError):
+            await service.create_rule(
+                "task_status", "TO_DO", "COMPLETED",
+                condition_expression="__import__('os')",
+            )
+
+
+@pytest.mark.parametrize("sessions", [{"seed": None}], indirect=True)
+async def test_without_rules_every_move_is_allowed(sessions):
+    machines = StatusMachines()
+    async with sessions() as db:
+        await machines.ensure_loaded(db)
+    assert machines.machine("task_status") is None
+    assert machines.check("task_status", "COMPLETED", "TO_DO").allowed
+
+
+def test_conditions_only_allow_plain_logic():
+    assert eval(compile_condition("not blocked and points >= 3"), {}, Facts(points=5))
+    for expression in ("open('x')", "a.b", "[x for x in y]", "a +", "lambda: 1"):
+        with pytest.raises(ValidationError):
+            compile_condition(expression)
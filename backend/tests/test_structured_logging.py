@@ -0,0 +1,84 @@
+"""Tests for the queue-backed structured logging pipeline."""
+import json
+import logging
+import queue
+import sys
+
+import pytest
+
+from backend.core.structured_logging import (
+    QueueingHandler, SamplingFilter, build_handlers, lazy, request_id_var,
+    start_logging, stop_logging,
+)
+
+
+@pytest.fixture
+def log_file(tmp_path):
+    root = logging.getLogger()
+    level = root.level
+    path = tmp_path / "app-{pid}.log"
+    start_logging(
+        handlers=build_handlers("json", str(path), max_bytes=4096, backup_count=2)[1:],
+        level=logging.INFO, sampling={"bench.noisy": 0.0},
+    )
+    yield tmp_path
+    stop_logging()
+    root.setLevel(level)
+
+
+def records(directory):
+    lines = []
+    for path in sorted(directory.glob("app-*.log*")):
+        lines.extend(json.loads(line) for line in path.read_text().splitlines())
+    return lines
+
+
+def test_json_records_carry_request_id_and_extras(log_file):
+    token = request_id_var.set("req-1")
+    try:
+        logging.getLogger("bench.app").info("created %s", "task", extra={"task_id": 7})
+    finally:
+        request_id_var.reset(token)
+    logging.getLogger("bench.app").warning("outside a request")
+    stop_logging()
+    first, second = records(log_file)
+    assert first["message"] == "created task"
+    assert first["request_id"] == "req-1" and first["task_id"] == 7
+    assert second["level"] == "WARNING" and second["request_id"] == "-"
+
+
+def test_sampling_rotation_and_lazy_arguments(log_file):
+    calls = []
+    logger = logging.getLogger("bench.noisy.child")
+    for n in range(50):
+        logger.info("dropped %d", n)
+    logger.debug("below level %s", lazy(calls.append, "debug"))
+    for n in range(100):
+        logging.getLogger("bench.noisy").error("kept %d %s", n, "x" * 40)
+    stop_logging()
+    assert calls == []  # never formatted
+    assert len(list(log_file.glob("app-*.log*"))) == 3  # rotated, two backups
+    assert all(entry["level"] == "ERROR" for entry in records(log_file))
+
+
+def test_sampling_uses_longest_prefix():
+    sampler = SamplingFilter({"backend": 0.5, "backend.crud": 0.1})
+    assert sampler.rate_for("backend.crud.memory") == 0.1
+    assert sampler.rate_for("backend.crudx") == 0.5
+    assert sampler.rate_for("uvicorn") == 1.0
+
+
+def test_queueing_leaves_the_logged_record_alone():
+    handler = QueueingHandler(queue.Queue())
+    try:
+        1 / 0
+    except ZeroDivisionError:
+        record = logging.LogRecord(
+            "bench", logging.ERROR, __file__, 1, "failed %s", ("x",), sys.exc_info()
+        )
+    handler.handle(record)
+    queued = handler.queue.get_nowait()
+    assert (queued.msg, queued.args, queued.exc_info) == ("failed x", None, None)
+    assert "ZeroDivisionError" in queued.exc_text
+    assert (record.msg, record.args) == ("failed %s", ("x",))
+    assert record.exc_info is not None
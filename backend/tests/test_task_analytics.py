@@ -0,0 +1,111 @@
+"""Tests for task status transition history and flow analytics."""
+from datetime import date, datetime, timedelta
+
+import pytest
+from sqlalchemy import insert, select
+
+from backend.crud.task_transitions import (
+    TRANSITIONS, _entered_at, record_transitions, task_keys_clause,
+)
+from backend.enums import TaskStatusEnum
+from backend.services import task_analytics_service
+from backend.services.task_analytics_service import TaskAnalyticsService, compute_flow
+from backend.services.status_transition_service import REGISTRY, RULES, VALUES
+from backend.services.task_queue_service import (
+    DEPENDENCIES, REQUIREMENTS, TASKS, TaskQueueService,
+)
+
+TO_DO = TaskStatusEnum.TO_DO
+IN_PROGRESS = TaskStatusEnum.IN_PROGRESS
+COMPLETED = TaskStatusEnum.COMPLETED
+MONDAY = datetime(2025, 7, 7, 9)
+TABLES = [TASKS, DEPENDENCIES, REQUIREMENTS, TRANSITIONS, REGISTRY, VALUES, RULES]
+
+
+async def seed(conn, tmp_path):
+    await conn.execute(insert(TASKS), [
+        {"project_id": "p1", "task_number": n, "title": f"task {n}", "status": TO_DO,
+         "priority": "medium", "priority_rank": 2, "created_at": MONDAY,
+         "updated_at": MONDAY, "is_archived": False}
+        for n in (1, 2)
+    ])
+
+
+@pytest.fixture(autouse=True)
+def fresh_cache():
+    task_analytics_service._cache.clear()
+
+
+def test_compute_flow_percentiles_throughput_and_cumulative_flow():
+    tasks = [
+        (4, MONDAY, "TO_DO"), (1, MONDAY, "COMPLETED"), (2, MONDAY, "COMPLETED"),
+        (3, MONDAY, "IN_PROGRESS"),
+    ]
+    transitions = [
+        (1, "TO_DO", "IN_PROGRESS", MONDAY + timedelta(hours=1)),
+        (2, "TO_DO", "IN_PROGRESS", MONDAY + timedelta(hours=2)),
+        (3, "TO_DO", "IN_PROGRESS", MONDAY + timedelta(days=1)),
+        (1, "IN_PROGRESS", "COMPLETED", MONDAY + timedelta(hours=11)),
+        (2, "IN_PROGRESS", "COMPLETED", MONDAY + timedelta(days=8, hours=2)),
+        (99, "TO_DO", "IN_PROGRESS", MONDAY),  # a deleted task
+    ]
+    flow = compute_flow(transitions, tasks, date(2025, 7, 20))
+    assert flow["completed"] == 2
+    assert flow["cycle_time"]["count"] == 2 and flow["cycle_time"]["p50_hours"] == 101.0
+    assert flow["lead_time"]["mean_hours"] == 102.5
+    assert [(w["week_start"], w["completed"]) for w in flow["throughput"]] == [
+        ("2025-07-07", 1), ("2025-07-14", 1),
+    ]
+    by_day = {row["date"]: row for row in flow["cumulative_flow"]}
+    assert by_day["2025-07-07"] == {
+        "date": "2025-07-07", "To Do": 2, "In Progress": 1, "Completed": 1
+    }
+    assert by_day["2025-07-20"] == {
+        "date": "2025-07-20", "To Do": 1, "In Progress": 1, "Completed": 2
+    }
+    assert len(flow["cumulative_flow"]) == 14
+
+
+async def test_status_changes_are_recorded_and_invalidate_cached_analytics(
+    sessions, monkeypatch
+):
+    computed = []
+    monkeypatch.setattr(
+        task_analytics_service, "compute_flow",
+        lambda *args: computed.append(1) or compute_flow(*args)
+    )
+    async with sessions() as db:
+        queue = TaskQueueService(db)
+        analytics = TaskAnalyticsService(db)
+        await queue.claim("agent-a")
+        await queue.release("p1", 1, "agent-a", COMPLETED)
+        rows = (await db.execute(
+            select(
+                TRANSITIONS.c.from_status, TRANSITIONS.c.to_status,
+                TRANSITIONS.c.trigger_type, TRANSITIONS.c.duration_seconds,
+            )
+            .order_by(TRANSITIONS.c.transitioned_at)
+        )).all()
+        assert [(r.from_status, r.to_status, r.trigger_type) for r in rows] == [
+            (TO_DO, IN_PROGRESS, "lease"), (IN_PROGRESS, COMPLETED, "lease"),
+        ]
+        assert rows[0].duration_seconds >= 0 and rows[1].duration_seconds is not None
+
+        assert (await analytics.project_flow("p1"))["completed"] == 1
+        assert (await analytics.project_flow("p1"))["completed"] == 1
+        assert len(computed) == 1
+
+    async with sessions() as other:
+        await record_transitions(other, [("p1", 2, TO_DO, COMPLETED)])
+        await other.commit()
+    async with sessions() as db:
+        analytics = TaskAnalyticsService(db)
+        assert (await analytics.project_flow("p1"))["completed"] == 2
+        assert len(computed) == 2
+        assert await record_transitions(db, [("p1", 2, COMPLETED, COMPLETED)]) == 0
+
+
+async def test_no_task_keys_match_nothing_without_a_query():
+    clause = task_keys_clause(TASKS.c.project_id, TASKS.c.task_number, [])
+    assert str(clause.compile(compile_kwargs={"literal_binds": True})) == "false"
+    assert await _entered_at(None, []) == {}
@@ -0,0 +1,174 @@
+"""Tests for lease-based task claiming."""
+import asyncio
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy import insert, select, update
+
+from backend.enums import TaskStatusEnum
+from backend.models.task import sync_priority_rank
+from backend.services.exceptions import ConflictError, ValidationError
+from backend.crud.task_transitions import TRANSITIONS
+from backend.services.status_transition_service import REGISTRY, RULES, VALUES
+from backend.services.task_queue_service import (
+    DEPENDENCIES, REQUIREMENTS, TASKS, TaskQueueService,
+)
+
+
+def task(number, priority="medium", minutes_ago=0, status=TaskStatusEnum.TO_DO):
+    created = datetime(2025, 7, 1) - timedelta(minutes=minutes_ago)
+    ranks = {"critical": 0, "high": 1, "medium": 2, "low": 3}
+    return {
+        "project_id": "p1", "task_number": number, "title": f"task {number}",
+        "status": status, "priority": priority, "priority_rank": ranks[priority],
+        "created_at": created, "updated_at": created, "is_archived": False,
+    }
+
+
+TABLES = [TASKS, DEPENDENCIES, REQUIREMENTS, TRANSITIONS, REGISTRY, VALUES, RULES]
+
+
+async def seed(conn, tmp_path):
+    await conn.execute(insert(TASKS), [
+        task(1, "low", minutes_ago=30),
+        task(2, "high", minutes_ago=5),
+        task(3, "high", minutes_ago=10),
+        task(4, "critical"),
+        task(5, "medium", status=TaskStatusEnum.COMPLETED),
+        task(6, "medium"),
+    ])
+    # 4 waits on 1; 6 waits on the completed 5, so it is ready.
+    await conn.execute(insert(DEPENDENCIES), [
+        {"predecessor_project_id": "p1", "predecessor_task_number": 1,
+         "successor_project_id": "p1", "successor_task_number": 4},
+        {"predecessor_project_id": "p1", "predecessor_task_number": 5,
+         "successor_project_id": "p1", "successor_task_number": 6},
+    ])
+    await conn.execute(insert(REQUIREMENTS), [
+        {"project_id": "p1", "task_number": 3, "capability": "python"},
+        {"project_id": "p1", "task_number": 3, "capability": "sql"},
+    ])
+
+
+async def test_claims_follow_priority_dependencies_and_capabilities(sessions):
+    async with sessions() as db:
+        queue = TaskQueueService(db)
+        claimed = [(await queue.claim("agent-a"))["task_number"] for _ in range(3)]
+        assert claimed == [2, 6, 1]  # 3 needs capabilities, 4 waits on 1
+        assert await queue.claim("agent-a") is None
+        capable = await queue.claim("agent-b", ["python", "sql", "docs"])
+        assert capable["task_number"] == 3
+        await queue.release("p1", 1, "agent-a", TaskStatusEnum.COMPLETED)
+        lease = await queue.claim("agent-b")
+        assert lease["task_number"] == 4 and lease["lease_owner"] == "agent-b"
+
+
+async def test_concurrent_claims_never_share_a_task(sessions):
+    async def claim(n):
+        async with sessions() as db:
+            lease = await TaskQueueService(db).claim(f"agent-{n}", ["python", "sql"])
+            return lease and lease["task_number"]
+
+    claimed = await asyncio.gather(*(claim(n) for n in range(8)))
+    numbers = [number for number in claimed if number]
+    assert sorted(numbers) == [1, 2, 3, 6]
+    assert claimed.count(None) == 4
+
+
+async def test_heartbeat_renews_and_expired_leases_are_reclaimed(sessions):
+    async with sessions() as db:
+        queue = TaskQueueService(db)
+        lease = await queue.claim("agent-a", lease_seconds=60)
+        renewed = await queue.renew(
+            "p1", lease["task_number"], "agent-a", lease_seconds=600
+        )
+        assert renewed["lease_expires_at"] > lease["lease_expires_at"]
+        with pytest.raises(ConflictError):
+            await queue.renew("p1", lease["task_number"], "agent-b")
+
+        assert await queue.reclaim_expired() == 0
+        await db.execute(
+            update(TASKS).values(
+                lease_expires_at=datetime.utcnow() - timedelta(seconds=1)
+            )
+        )
+        await db.commit()
+        with pytest.raises(ConflictError):
+            await queue.renew("p1", lease["task_number"], "agent-a")
+        again = await queue.claim("agent-b")
+        assert again["task_number"] == lease["task_number"]
+        assert again["lease_owner"] == "agent-b"
+        status = (await db.execute(
+            select(TASKS.c.status).where(TASKS.c.task_number == lease["task_number"])
+        )).scalar()
+        assert status == TaskStatusEnum.IN_PROGRESS
+
+
+def test_changing_priority_updates_the_claim_rank():
+    task = SimpleNamespace(priority_rank=2)
+    sync_priority_rank(task, "Critical", "medium", None)
+    assert task.priority_rank == 0
+    sync_priority_rank(task, "someday", "critical", None)
+    assert task.priority_rank == 2
+
+
+async def test_ready_set_lists_unblocked_open_tasks(sessions):
+    async with sessions() as db:
+        queue = TaskQueueService(db)
+        ready = await queue.ready_tasks("p1")
+        assert [task["task_number"] for task in ready["tasks"]] == [3, 2, 6, 1]
+        await queue.claim("agent-a")  # takes 2
+        unclaimed = await queue.ready_tasks("p1", unclaimed_only=True)
+        assert [task["task_number"] for task in unclaimed["tasks"]] == [3, 6, 1]
+        await db.execute(
+            update(TASKS).where(TASKS.c.task_number == 1).values(
+                status=TaskStatusEnum.CANCELLED
+            )
+        )
+        await db.commit()
+        ready = await queue.ready_tasks("p1", limit=2)
+        assert ready["total"] == 4
+        assert [task["task_number"] for task in ready["tasks"]] == [4, 3]
+
+
+async def test_release_status_follows_transition_rules(sessions):
+    async with sessions() as db:
+        await db.execute(
+            insert(REGISTRY).values(
+                id="e1", enum_name="task_status", display_name="Task Status"
+            )
+        )
+        await db.execute(insert(VALUES), [
+            {
+                "id": name, "enum_registry_id": "e1", "value": name,
+                "display_name": name, "sort_order": n,
+            }
+            for n, name in enumerate(["TO_DO", "IN_PROGRESS", "COMPLETED", "BLOCKED"])
+        ])
+        await db.execute(insert(RULES), [
+            {"id": f"r{n}", "enum_registry_id": "e1", "from_status_id": frm,
+             "to_status_id": to, "requires_approval": to == "COMPLETED",
+             "is_active": True}
+            for n, (frm, to) in enumerate([
+                ("IN_PROGRESS", "TO_DO"), ("IN_PROGRESS", "COMPLETED")
+            ])
+        ])
+        await db.commit()
+        queue = TaskQueueService(db)
+        lease = await queue.claim("agent-a")
+        with pytest.raises(ValidationError, match="IN_PROGRESS -> BLOCKED"):
+            await queue.release(
+                "p1", lease["task_number"], "agent-a", TaskStatusEnum.BLOCKED
+            )
+        # The lease survives a rejected release.
+        await queue.renew("p1", lease["task_number"], "agent-a")
+        await queue.release(
+            "p1", lease["task_number"], "agent-a", TaskStatusEnum.COMPLETED
+        )
+        approval = (await db.execute(
+            select(TRANSITIONS.c.requires_approval).where(
+                TRANSITIONS.c.to_status == TaskStatusEnum.COMPLETED
+            )
+        )).scalar()
+        assert approval is True
@@ -0,0 +1,78 @@
+"""Tests for column-projected task rows and orjson rendering."""
+import datetime
+from decimal import Decimal
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+from backend import models
+from backend.core.responses import ORJSONResponse, dumps, list_payload, loads
+from backend.enums import TaskStatusEnum
+from backend.services.exceptions import ValidationError
+from backend.services.task_service import TaskService
+
+
+@pytest.fixture
+async def task_db():
+    """In-memory async database with one project and three tasks."""
+    engine = create_async_engine("sqlite+aiosqlite://")
+    tables = [models.Project.__table__, models.Agent.__table__, models.Task.__table__]
+    now = datetime.datetime(2024, 1, 1)
+    async with engine.begin() as conn:
+        await conn.run_sync(lambda sync_conn: models.Base.metadata.create_all(
+            sync_conn, tables=tables
+        ))
+        await conn.execute(
+            models.Project.__table__.insert(), [{"id": "p1", "name": "Project One"}]
+        )
+        await conn.execute(models.Task.__table__.insert(), [
+            {
+                "id": f"t{n}", "project_id": "p1", "task_number": n,
+                "title": f"Task {n}", "description": "secret",
+                "status": TaskStatusEnum.TO_DO,
+                "created_at": now + datetime.timedelta(minutes=n), "updated_at": now,
+            }
+            for n in (1, 2, 3)
+        ])
+    async with AsyncSession(engine) as session:
+        yield session
+    await engine.dispose()
+
+
+def test_dumps_handles_enums_decimals_and_datetimes():
+    """Test orjson fallback encoder covers repo value types."""
+    payload = {"status": TaskStatusEnum.COMPLETED, "score": Decimal("1.50"),
+               "at": datetime.datetime(2024, 1, 1)}
+    assert loads(dumps(payload)) == {
+        "status": "Completed", "score": "1.50", "at": "2024-01-01T00:00:00"}
+
+
+def test_list_payload_pagination():
+    """Test the list envelope computes page and has_more."""
+    payload = list_payload([1, 2], total=5, skip=2, limit=2)
+    assert payload["page"] == 2
+    assert payload["has_more"] is True
+
+
+async def test_get_task_rows_projects_requested_fields(task_db):
+    """Test only requested columns are returned, newest first."""
+    rows, total = await TaskService(task_db).get_task_rows(
+        project_id="p1", fields=["task_number", "title"])
+    assert total == 3
+    assert [tuple(row) for row in rows] == [(3, "Task 3"), (2, "Task 2"), (1, "Task 1")]
+
+    body = loads(ORJSONResponse(list_payload(rows, total, 0, 100)).body)
+    assert body["data"][0] == {"task_number": 3, "title": "Task 3"}
+
+
+async def test_get_task_rows_joins_relation_fields(task_db):
+    """Test relation-derived fields are resolved through a join."""
+    rows, _ = await TaskService(task_db).get_task_rows(
+        project_id="p1", fields=["task_number", "project_name"], limit=1)
+    assert rows[0]._asdict() == {"task_number": 3, "project_name": "Project One"}
+
+
+async def test_get_task_rows_rejects_unknown_field(task_db):
+    """Test unknown fields raise a validation error."""
+    with pytest.raises(ValidationError):
+        await TaskService(task_db).get_task_rows(fields=["nope"])
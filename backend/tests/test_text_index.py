@@ -0,0 +1,99 @@
+"""Tests for the inverted index and the prompt library index built on it."""
+from backend.core.text_index import CorpusStats, InvertedIndex, tokenize
+from backend.mcp_tools.prompt_library_tools import PromptIndex
+
+
+def prompt(prompt_id, name, content, tags=(), roles=(), category="analysis", usage=0):
+    return content, {
+        "prompt_id": prompt_id, "name": name, "category": category, "tags": list(tags),
+        "agent_roles": list(roles), "usage_count": usage,
+    }
+
+
+def test_tokenize_lowercases_words():
+    """Test tokens are lowercase word runs."""
+    assert tokenize("Plan {feature_name}: Testing-Strategy!") == [
+        "plan", "feature_name", "testing", "strategy"
+    ]
+    assert tokenize(None) == []
+
+
+def test_bm25_ranks_field_weighted_matches_first():
+    """Test name matches outrank body matches and non-matching docs are skipped."""
+    index = InvertedIndex({"name": 2.0, "content": 1.0})
+    index.add("a", {"name": "Release checklist", "content": "Steps before shipping"})
+    index.add(
+        "b", {"name": "Bug triage", "content": "Write a release note for each fix"}
+    )
+    index.add("c", {"name": "Code review", "content": "Review the diff"})
+    results = index.search("release", k=5)
+    assert [doc_id for doc_id, _ in results] == ["a", "b"]
+    assert index.search("release", k=1)[0][0] == "a"
+
+
+def test_prefix_terms_match_longer_tokens():
+    """Test a query word also matches indexed words it prefixes."""
+    index = InvertedIndex({"content": 1.0})
+    index.add("a", {"content": "testing strategy"})
+    assert [doc_id for doc_id, _ in index.search("test")] == ["a"]
+    assert index.search("te") == []
+
+
+def test_updates_and_removals_keep_postings_current():
+    """Test re-adding replaces old terms and removal drops attributes."""
+    index = InvertedIndex({"content": 1.0})
+    index.add("a", {"content": "alpha"}, {"tags": ["x"]})
+    index.add("a", {"content": "beta"}, {"tags": ["y"]})
+    assert index.search("alpha") == []
+    assert index.with_attribute("tags", ["x"]) == set()
+    assert index.with_attribute("tags", ["y"]) == {"a"}
+    assert index.remove("a")
+    assert index.search("beta") == [] and len(index) == 0
+    assert not index.remove("a")
+
+
+def test_shared_stats_score_indexes_as_one_corpus():
+    """Test indexes scored with shared stats rank like one combined index."""
+    docs = {
+        "a1": "deploy the service", "a2": "deploy deploy rollback",
+        "b1": "deploy notes", "b2": "unrelated text", "b3": "more unrelated text",
+    }
+    combined, first, second = (InvertedIndex({"content": 1.0}) for _ in range(3))
+    for doc_id, text in docs.items():
+        combined.add(doc_id, {"content": text})
+        (first if doc_id.startswith("a") else second).add(doc_id, {"content": text})
+    stats = CorpusStats.of([first, second], "deploy rollback")
+    split = sorted(
+        first.search("deploy rollback", stats=stats) + second.search(
+            "deploy rollback", stats=stats
+        )
+    )
+    assert split == sorted(combined.search("deploy rollback"))
+
+
+def test_prompt_index_filters_by_postings():
+    """Test list filters and role visibility match the library's rules."""
+    prompts = PromptIndex()
+    prompts.upsert(*prompt(
+        "p1", "Plan feature", "Plan {feature}", ["planning"], ["developer"], usage=5
+    ))
+    prompts.upsert(*prompt("p2", "Review diff", "Review {diff}", ["review"], usage=9))
+    prompts.upsert(*prompt(
+        "p3", "Plan sprint", "Plan sprint", ["planning"], ["manager"], "task_planning",
+        1,
+    ))
+
+    matches, total = prompts.filter(tags=["planning"])
+    assert [p["prompt_id"] for p in matches] == ["p1", "p3"] and total == 2
+
+    matches, _ = prompts.filter(agent_role="developer")
+    assert [p["prompt_id"] for p in matches] == ["p2", "p1"]
+
+    matches, total = prompts.filter(category="task_planning", limit=1)
+    assert [p["prompt_id"] for p in matches] == ["p3"] and total == 1
+
+    matches, total = prompts.filter(limit=2)
+    assert [p["prompt_id"] for p in matches] == ["p2", "p1"] and total == 3
+
+    prompts.remove("p2")
+    assert [entry["prompt_id"] for entry, _ in prompts.search("review", 5)] == []
@@ -0,0 +1,107 @@
+"""Tests for cached MCP tool contracts, compiled validators and lazy discovery."""
+import logging
+import os
+import sys
+
+import pytest
+
+from backend.mcp_tools.contracts import base_contract
+from backend.mcp_tools.contracts.base_contract import BaseMCPTool, ToolRegistry
+
+CONTRACT = """
+name: echo
+display_name: Echo
+description: Echo parameters back
+category: agent
+response: {type: object, description: The parameters}
+parameters:
+  - {name: action, type: string, description: Action, enum: [get, list]}
+  - {name: slug, type: string, description: Slug, required: false,
+     pattern: "^[a-z-]+$", max_length: 8}
+  - {name: limit, type: integer, description: Limit, required: false,
+     min_value: 1, max_value: 50, default: 20}
+"""
+
+
+class EchoTool(BaseMCPTool):
+    async def execute(self, parameters, context=None):
+        return self.validate_parameters(parameters)
+
+
+@pytest.fixture
+def contract_file(tmp_path, monkeypatch):
+    monkeypatch.setattr(base_contract, "_contract_cache", {})
+    path = tmp_path / "echo.yaml"
+    path.write_text(CONTRACT)
+    return path
+
+
+def test_contract_is_parsed_once_and_validates(contract_file):
+    """Test instances share one parsed contract and its compiled validator."""
+    first, second = EchoTool(str(contract_file)), EchoTool(str(contract_file))
+    assert first.contract is second.contract
+    assert first.validate_parameters({"action": "get", "extra": 1}) == {
+        "action": "get", "limit": 20
+    }
+    listed = first.validate_parameters({"action": "list", "slug": "a-b", "limit": 5})
+    assert listed["limit"] == 5
+
+    for parameters, message in [
+        ({}, "Missing required parameter: action"),
+        ({"action": "put"}, "must be one of"),
+        ({"action": "get", "slug": "Not Valid"}, "does not match required pattern"),
+        ({"action": "get", "limit": 99}, "Parameter limit"),
+        ({"action": "get", "limit": "5"}, "Parameter limit"),
+    ]:
+        with pytest.raises(ValueError, match=message):
+            first.validate_parameters(parameters)
+
+
+def test_contract_reloads_on_change_when_enabled(contract_file, monkeypatch):
+    assert EchoTool(str(contract_file)).contract.display_name == "Echo"
+    contract_file.write_text(CONTRACT.replace(
+        "display_name: Echo", "display_name: Changed"
+    ))
+    stat = os.stat(contract_file)
+    os.utime(contract_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    assert EchoTool(str(contract_file)).contract.display_name == "Echo"
+
+    monkeypatch.setattr(base_contract.settings, "mcp_contract_reload", True)
+    assert EchoTool(str(contract_file)).contract.display_name == "Changed"
+
+
+def test_registry_discovers_without_importing(tmp_path, monkeypatch, caplog):
+    package = tmp_path / "lazy_tools_pkg"
+    package.mkdir()
+    (package / "__init__.py").write_text("")
+    (package / "demo_tools.py").write_text(
+        "from backend.mcp_tools.contracts.base_contract import BaseMCPTool\n\n"
+        "class DemoTool(BaseMCPTool):\n"
+        "    async def execute(self, parameters, context=None):\n"
+        "        return {}\n\n"
+        "class SessionTool(BaseMCPTool):\n"
+        "    def __init__(self, db):\n"
+        "        super().__init__()\n\n"
+        "class BrokenTool(BaseMCPTool):\n"
+        "    def __init__(self):\n"
+        "        raise TypeError('bad contract')\n\n"
+        "    async def execute(self, parameters, context=None):\n"
+        "        return {}\n"
+    )
+    monkeypatch.syspath_prepend(str(tmp_path))
+    monkeypatch.setattr(base_contract, "_contract_cache", {})
+    registry = ToolRegistry()
+    registry.auto_discover_tools("lazy_tools_pkg")
+    assert registry.list_tools() == ["demo", "session", "broken"]
+    assert "lazy_tools_pkg.demo_tools" not in sys.modules
+
+    assert type(registry.get_tool("demo")).__name__ == "DemoTool"
+    assert "lazy_tools_pkg.demo_tools" in sys.modules
+    # Needs a session: only its class is available.
+    assert registry.get_tool("session") is None
+    assert registry.get_tool_class("session").__name__ == "SessionTool"
+    with caplog.at_level(logging.ERROR, logger=base_contract.__name__):
+        assert registry.get_tool("broken") is None
+    assert "bad contract" in caplog.text
+    monkeypatch.delitem(sys.modules, "lazy_tools_pkg.demo_tools")
+    monkeypatch.delitem(sys.modules, "lazy_tools_pkg")
@@ -0,0 +1,183 @@
+"""Tests for the workflow execution engine."""
+import asyncio
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import insert, select
+
+from backend.services.exceptions import ConflictError, EntityNotFoundError
+from backend.services.workflow_runner import (
+    AGENTS, COMMANDS, EXECUTIONS, LEASES, STEPS, TASKS, WorkflowRunner,
+)
+
+TABLES = [TASKS, AGENTS, STEPS, EXECUTIONS, COMMANDS, LEASES]
+
+
+async def seed(conn, tmp_path):
+    await conn.execute(insert(STEPS), [
+        {"id": f"s{n}", "workflow_id": "w1", "agent_role_id": "r1", "step_order": n,
+         "title": title, "is_active": True}
+        for n, title in enumerate(["review", "build", "ship"])
+    ])
+    await conn.execute(insert(TASKS), [
+        {"project_id": "p1", "task_number": n, "title": f"task {n}"} for n in (1, 2, 3)
+    ])
+    await conn.execute(insert(AGENTS), [{"id": "a", "name": "agent a"}])
+
+
+async def stored(sessions, execution_id):
+    async with sessions() as db:
+        return (await db.execute(
+            select(EXECUTIONS).where(EXECUTIONS.c.id == execution_id)
+        )).one()
+
+
+async def test_runner_limits_agents_batches_writes_and_resumes(sessions):
+    runner = WorkflowRunner(sessions, agent_concurrency=1, owner="w1")
+    assert await runner.tick() == {} and runner.owns
+    built = asyncio.Event()
+
+    async def build(execution, step):
+        built.set()
+        return {"artifact": f"{execution['task_number']}.tar"}
+
+    runner.register("build", build)
+    first = await runner.start_execution(
+        "w1", "p1", 1, agent_id="a", context={"branch": "main"}
+    )
+    second = await runner.start_execution("w1", "p1", 2, agent_id="a")
+    assert first["status"] == "in_progress"
+    assert first["current_step"]["title"] == "review"
+    assert second["status"] == "initialized"
+    with pytest.raises(ConflictError):
+        await runner.advance(second["id"], "completed")
+
+    # "build" has a handler, so the first execution runs it and moves on.
+    await runner.advance(first["id"], "completed", output={"approved": True})
+    await built.wait()
+    await asyncio.sleep(0)
+    first = await runner.get(first["id"])
+    assert first["current_step"]["title"] == "ship" and first["steps_completed"] == 2
+    assert first["outputs"] == {"s0": {"approved": True}, "s1": {"artifact": "1.tar"}}
+
+    assert await runner.flush() == 2
+    row = await stored(sessions, first["id"])
+    assert row.current_step_id == "s2" and float(row.progress_percentage) == 66.67
+    assert row.execution_context["input"] == {"branch": "main"}
+
+    # Finishing frees the agent's slot for the waiting execution.
+    done = await runner.advance(first["id"], "completed")
+    assert done["status"] == "completed" and done["progress_percentage"] == 100
+    assert (await runner.get(second["id"]))["status"] == "in_progress"
+    await runner.stop()
+    assert not runner.owns and first["id"] not in runner._executions
+    # Finished executions are still readable, from the table.
+    assert (await runner.get(first["id"]))["status"] == "completed"
+    assert await runner.get("missing") is None
+
+    restarted = WorkflowRunner(sessions, agent_concurrency=1, owner="w2")
+    assert await restarted.tick() == {"resumed": 1, "flushed": 1}
+    resumed = await restarted.get(second["id"])
+    assert resumed["status"] == "in_progress"
+    assert resumed["current_step"]["title"] == "review"
+    failed = await restarted.advance(second["id"], "failed", error="tests red")
+    assert failed["error"] == {"step_id": "s0", "step": "review", "error": "tests red"}
+    await restarted.stop()
+    row = await stored(sessions, second["id"])
+    assert row.status == "failed" and row.current_step_id is None
+    assert row.completed_at is not None
+
+
+async def test_non_owner_queues_starts_and_outcomes_for_the_lease_holder(sessions):
+    owner = WorkflowRunner(sessions, agent_concurrency=1, owner="w1")
+    standby = WorkflowRunner(sessions, agent_concurrency=1, owner="w2")
+    await owner.tick()
+    assert await standby.tick() == {} and not standby.owns
+
+    started = await standby.start_execution("w1", "p1", 1, agent_id="a")
+    assert started["status"] == "initialized" and not standby._executions
+    assert (await stored(sessions, started["id"])).current_step_id is None
+    # Outcomes for executions that have not started yet are rejected up front.
+    with pytest.raises(ConflictError):
+        await standby.advance(started["id"], "completed")
+    with pytest.raises(EntityNotFoundError):
+        await standby.advance("missing", "completed")
+
+    assert await owner.tick() == {"adopted": 1, "flushed": 1}
+    assert (await standby.get(started["id"]))["current_step"]["title"] == "review"
+    queued = await standby.advance(started["id"], "completed", output={"ok": True})
+    assert queued["pending_outcome"] == "completed" and queued["steps_completed"] == 0
+
+    assert await owner.tick() == {"applied": 1, "flushed": 1}
+    execution = await standby.get(started["id"])
+    assert execution["current_step"]["title"] == "build"
+    assert execution["outputs"] == {"s0": {"ok": True}}
+
+    # The standby takes over once the holder's lease lapses.
+    later = datetime.utcnow() + timedelta(minutes=5)
+    assert await standby.tick(now=later) == {"resumed": 1, "flushed": 1}
+    assert await owner.tick(now=later) == {} and not owner._executions
+    await standby.stop()
+    await owner.stop()
+
+
+async def test_start_rejects_unknown_task_or_agent_on_every_path(sessions):
+    owner = WorkflowRunner(sessions, agent_concurrency=1, owner="w1")
+    standby = WorkflowRunner(sessions, agent_concurrency=1, owner="w2")
+    await owner.tick()
+    await standby.tick()
+    for runner in (owner, standby):
+        with pytest.raises(EntityNotFoundError):
+            await runner.start_execution("w1", "p1", 99, agent_id="a")
+        with pytest.raises(EntityNotFoundError):
+            await runner.start_execution("w1", "p1", 1, agent_id="ghost")
+    assert not owner._executions and not owner._new
+    await standby.stop()
+    await owner.stop()
+
+
+async def test_flush_drops_a_rejected_row_and_keeps_the_rest(sessions):
+    runner = WorkflowRunner(sessions, agent_concurrency=1, owner="w1")
+    await runner.tick()
+    bad = await runner.start_execution("w1", "p1", 1, agent_id="a")
+    waiting = await runner.start_execution("w1", "p1", 2, agent_id="a")
+    good = await runner.start_execution("w1", "p1", 3)
+    # Something else already holds the first execution's id.
+    async with sessions() as db:
+        await db.execute(insert(EXECUTIONS), [{
+            "id": bad["id"], "workflow_id": "w1", "task_project_id": "p1",
+            "task_task_number": 1, "status": "failed",
+        }])
+        await db.commit()
+
+    assert await runner.flush() == 2
+    assert bad["id"] not in runner._executions and not runner._new
+    assert (await stored(sessions, good["id"])).status == "in_progress"
+    # Dropping the rejected execution freed its agent's slot.
+    assert (await runner.get(waiting["id"]))["status"] == "in_progress"
+    assert await runner.flush() == 1
+    assert (await stored(sessions, waiting["id"])).status == "in_progress"
+    assert (await stored(sessions, bad["id"])).status == "failed"
+    await runner.stop()
+
+
+async def test_queued_outcomes_are_deleted_with_the_state_they_change(sessions):
+    owner = WorkflowRunner(sessions, agent_concurrency=1, owner="w1")
+    standby = WorkflowRunner(sessions, agent_concurrency=1, owner="w2")
+    await owner.tick()
+    await standby.tick()
+    started = await owner.start_execution("w1", "p1", 1, agent_id="a")
+    await owner.flush()
+    await standby.advance(started["id"], "completed")
+
+    assert await owner.sync() == (0, 1)
+    async with sessions() as db:
+        assert len((await db.execute(select(COMMANDS))).all()) == 1
+    # A second sync does not apply the outcome again.
+    assert await owner.sync() == (0, 0)
+    assert await owner.flush() == 1
+    async with sessions() as db:
+        assert not (await db.execute(select(COMMANDS))).all()
+    assert (await stored(sessions, started["id"])).current_step_id == "s1"
+    await standby.stop()
+    await owner.stop()
@@ -345,7 +345,41 @@ class TaskManagerLauncher:
         print("\033[92m* Backend environment ready\033[0m\n")
         return True
 
-    def start_backend_server(self, variant: str = "default"):
+    def multiworker_command(self, python_cmd: str, workers: int, server: str = "auto") -> List[str]:
+        """Build the command for a multi-worker server using the app factory.
+
+        gunicorn (with uvicorn workers) is used when available or requested;
+        otherwise uvicorn's own process manager runs the workers.
+        """
+        use_gunicorn = server == "gunicorn" or (
+            server == "auto" and not self.is_windows and self.run_command(
+                f'"{python_cmd}" -c "import gunicorn"', "Checking for gunicorn"
+            )
+        )
+        if use_gunicorn:
+            return [
+                python_cmd, "-m", "gunicorn", "backend.app_factory:create_app()",
+                "-c", str(self.backend_dir / "gunicorn_conf.py"),
+                "--workers", str(workers), "--bind", "0.0.0.0:8000",
+            ]
+        return [
+            python_cmd, "-m", "uvicorn", "backend.app_factory:create_app", "--factory",
+            "--workers", str(workers), "--host", "0.0.0.0", "--port", "8000",
+        ]
+
+    def multiworker_env(self, env: dict, workers: int, profile: Optional[str]) -> dict:
+        """Environment shared by all workers: worker count, profile and a clean metrics dir."""
+        env['WEB_CONCURRENCY'] = str(workers)
+        if profile:
+            env['APP_PROFILE'] = profile
+        metrics_dir = Path(env.get('PROMETHEUS_MULTIPROC_DIR') or self.backend_dir / ".shared_state" / "prometheus")
+        shutil.rmtree(metrics_dir, ignore_errors=True)
+        metrics_dir.mkdir(parents=True, exist_ok=True)
+        env['PROMETHEUS_MULTIPROC_DIR'] = str(metrics_dir)
+        return env
+
+    def start_backend_server(self, variant: str = "default", workers: int = 1,
+                             server: str = "auto", profile: Optional[str] = None):
         """Start the backend server in the current terminal."""
         print("\n" + "="*60)
         print("    Task Manager Backend Server")
@@ -359,7 +393,9 @@ class TaskManagerLauncher:
         
         try:
             # Choose the appropriate startup command based on variant
-            if variant == "core":
+            if workers > 1:
+                cmd = self.multiworker_command(python_cmd, workers, server)
+            elif variant == "core":
                 cmd = [python_cmd, "-m", "uvicorn", "backend.main_core:app", "--reload", "--host", "0.0.0.0", "--port", "8000"]
             elif variant == "minimal":
                 cmd = [python_cmd, "-m", "uvicorn", "backend.main_minimal:app", "--host", "0.0.0.0", "--port", "8000"]
@@ -369,6 +405,9 @@ class TaskManagerLauncher:
             # Set environment variables
             env = os.environ.copy()
             env['PYTHONPATH'] = str(self.root_dir)
+            if workers > 1:
+                env = self.multiworker_env(env, workers, profile)
+                print(f"Running {workers} workers with {cmd[2]} (profile: {env.get('APP_PROFILE', 'full')})")
             
             print("Starting backend on http://localhost:8000")
             print("API Documentation: http://localhost:8000/docs")
@@ -483,11 +522,12 @@ class TaskManagerLauncher:
             print(f"ERROR: Error starting frontend: {e}")
             return None
 
-    def run_backend_only(self, variant: str = "default"):
+    def run_backend_only(self, variant: str = "default", workers: int = 1,
+                         server: str = "auto", profile: Optional[str] = None):
         """Run the backend server only (no install/setup)."""
         print("\nStarting backend server (no install/setup)...")
         # Assume venv and dependencies are already present
-        self.start_backend_server(variant)
+        self.start_backend_server(variant, workers, server, profile)
         self.wait_for_servers()
         return True
 
@@ -536,12 +576,31 @@ def main():
         action="store_true",
         help="Install dependencies only"
     )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=int(os.getenv("WEB_CONCURRENCY", "1")),
+        help="Number of worker processes (multi-worker mode when > 1)"
+    )
+    parser.add_argument(
+        "--server",
+        choices=["auto", "uvicorn", "gunicorn"],
+        default="auto",
+        help="Process manager for multi-worker mode"
+    )
+    parser.add_argument(
+        "--profile",
+        choices=["minimal", "core", "mcp", "full"],
+        help="App factory profile for multi-worker mode"
+    )
     
     args = parser.parse_args()
     
     # Validate arguments
     if args.core and args.minimal:
         parser.error("--core and --minimal cannot be used together")
+    if args.workers < 1:
+        parser.error("--workers must be at least 1")
     
     launcher = TaskManagerLauncher()
     launcher.setup_signal_handlers()
@@ -551,7 +610,7 @@ def main():
             success = launcher.install_dependencies()
         else:
             variant = "core" if args.core else "minimal" if args.minimal else "default"
-            success = launcher.run_backend_only(variant)
+            success = launcher.run_backend_only(variant, args.workers, args.server, args.profile)
         
         return 0 if success else 1
         
@@ -568,6 +627,7 @@ if __name__ == "__main__":
     print("  python launcher.py --core             # Run core backend variant")
     print("  python launcher.py --minimal          # Run minimal backend variant")
     print("  python launcher.py --install          # Install dependencies only")
+    print("  python launcher.py --workers 4        # Run 4 workers (gunicorn if installed)")
     print()
     
     sys.exit(main()) 